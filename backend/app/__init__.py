@@ -14,9 +14,13 @@ from flask import Flask, request, g
 from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
 
+from provider_endpoints import configure_provider_endpoints
+
 from .extensions import db, migrate, login_manager, celery
 from .models import User
 from .celery_utils import celery_init_app
+from .compression import init_compression
+from .json_provider import OrjsonProvider
 from .security import (
     validate_environment, 
     apply_security_headers, 
@@ -31,6 +35,7 @@ from .pulse_api import pulse_bp
 from .ward_api import ward_bp
 from .epaper_api import bp_epaper
 from .summary_api import summary_bp
+from .search_api import search_bp
 from .multimodel_api import multimodel_bp
 from .strategist_api import strategist_bp as compat_strategist_bp
 from .models import *  # Import all models
@@ -39,6 +44,7 @@ from .models import *  # Import all models
 from .error_tracking import init_error_tracking
 from .error_api import error_api as error_bp
 from .error_analytics import analytics_bp
+from .sql_profiler import init_sql_profiler
 
 # Heat Map API system for widget dashboard
 from .heatmap_api import heatmap_bp
@@ -81,6 +87,10 @@ def create_app(config_class: str = "config.Config") -> Flask:
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = OrjsonProvider(app)
+
+    # Point AI clients at configured (or fake) provider endpoints
+    configure_provider_endpoints(app.config)
 
     # Validate environment before proceeding
     validate_environment()
@@ -115,6 +125,9 @@ def create_app(config_class: str = "config.Config") -> Flask:
     login_manager.login_message = 'Please log in to access this page.'
     celery_init_app(app, celery)
 
+    # Registered before the other after_request hooks so it runs last
+    init_compression(app)
+
     # Security middleware and handlers
     @app.before_request
     def security_before_request():
@@ -175,6 +188,7 @@ def create_app(config_class: str = "config.Config") -> Flask:
         app.register_blueprint(ward_bp)
         app.register_blueprint(bp_epaper)  # NEW registrations
         app.register_blueprint(summary_bp)   # NEW
+        app.register_blueprint(search_bp)  # Full-text search
         app.register_blueprint(multimodel_bp)  # Multi-model AI API
         
         # Register Political Strategist API - use advanced if available, else compatibility
@@ -198,7 +212,19 @@ def create_app(config_class: str = "config.Config") -> Flask:
         # Initialize error tracking system
         init_error_tracking(app)
         
+        # Opt-in per-request SQL profiling (query counts, DB time, slow endpoints)
+        if app.config.get('SQL_PROFILING_ENABLED'):
+            init_sql_profiler(app)
+        
         print("Enhanced error tracking and analytics system initialized")
         
-        # Observability is now included in strategist_bp
+        # Observability endpoints (health, JSON metrics, Prometheus scrape) and tracing
+        if strategist_bp:
+            from strategist.observability import configure_shared_metrics, configure_tracing, instrument_celery
+            from strategist.observability.dashboard import observability_bp
+            configure_shared_metrics(app.config)
+            configure_tracing(app.config)
+            instrument_celery()
+            app.register_blueprint(observability_bp)
+        
         return app
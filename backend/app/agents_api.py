@@ -5,12 +5,15 @@ Flask API endpoints for the integrated agent framework
 
 import asyncio
 import logging
-from flask import Blueprint, request, jsonify, Response, stream_template
+from flask import Blueprint, request, jsonify, Response, stream_template, current_app, url_for
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
+from .agents_batch import (DEFAULT_CONCURRENCY, DEFAULT_WARD_TIMEOUT_SECONDS, batch_payload, gather_batch,
+                           outcome_entry, stream_batch)
 from .agents_service import execute_agent_command, get_agent_capabilities, get_master_agent
 from .async_helper import run_async
+from .tasks_agents import batch_analysis as batch_analysis_job
 
 logger = logging.getLogger(__name__)
 
@@ -322,34 +325,51 @@ def stream_ward_analysis(ward_name: str):
 
 @agents_bp.route('/batch-analysis', methods=['POST'])
 def batch_analysis():
-    """Execute analysis for multiple wards"""
+    """Execute analysis for multiple wards concurrently (see app/agents_batch.py).
+
+    Body: {"wards": [...], "depth": "standard", "mode": "sync"|"async", "stream": "ndjson"|"sse"}
+
+    - JSON (default): every ward once all have finished or timed out.
+    - Streamed: one NDJSON line or SSE event per ward as it completes, then a
+      summary; chosen by ``stream`` or an Accept of application/x-ndjson or
+      text/event-stream.
+    - Job: 202 with a job id when ``mode`` is "async" or the batch is larger
+      than AGENT_BATCH_SYNC_MAX_WARDS; poll GET /batch-analysis/<job_id>.
+    """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         wards = data.get('wards', [])
         depth = data.get('depth', 'standard')
         
         if not wards:
             return jsonify({'error': 'No wards specified'}), 400
+        if not isinstance(wards, list) or not all(isinstance(w, str) and w.strip() for w in wards):
+            return jsonify({'error': 'wards must be a list of ward names'}), 400
+        wards = list(dict.fromkeys(w.strip() for w in wards))
+        
+        config = current_app.config
+        max_wards = config.get('AGENT_BATCH_MAX_WARDS', 150)
+        if len(wards) > max_wards:
+            return jsonify({'error': f'At most {max_wards} wards per batch'}), 400
+        options = {
+            'depth': depth,
+            'concurrency': config.get('AGENT_BATCH_CONCURRENCY', DEFAULT_CONCURRENCY),
+            'timeout': config.get('AGENT_BATCH_WARD_TIMEOUT_SECONDS', DEFAULT_WARD_TIMEOUT_SECONDS),
+        }
         
-        results = {}
-        for ward in wards:
-            try:
-                parameters = {
-                    'ward_name': ward,
-                    'depth': depth
-                }
-                result = run_async(execute_agent_command('analyze-ward', parameters))
-                results[ward] = result
-            except Exception as e:
-                logger.error(f"Error analyzing ward {ward}: {e}")
-                results[ward] = {'error': str(e)}
+        if data.get('mode') == 'async' or len(wards) > config.get('AGENT_BATCH_SYNC_MAX_WARDS', 25):
+            job = batch_analysis_job.delay(wards, **options)
+            return jsonify({
+                'job_id': job.id,
+                'status': 'queued',
+                'total_wards': len(wards),
+                'status_url': url_for('agents.batch_analysis_status', job_id=job.id),
+            }), 202
         
-        return jsonify({
-            'batch_analysis': results,
-            'total_wards': len(wards),
-            'successful_analyses': len([r for r in results.values() if 'error' not in r]),
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        })
+        stream = _stream_format(data.get('stream'))
+        if stream:
+            return _stream_batch_response(wards, stream, options)
+        return jsonify(batch_payload(wards, gather_batch(wards, **options)))
         
     except Exception as e:
         logger.error(f"Error in batch analysis: {e}", exc_info=True)
@@ -358,6 +378,47 @@ def batch_analysis():
             'timestamp': datetime.now(timezone.utc).isoformat()
         }), 500
 
+def _stream_format(requested: Optional[str]) -> Optional[str]:
+    """"ndjson", "sse" or None, from the body's ``stream`` or the Accept header."""
+    if requested in ('ndjson', 'sse'):
+        return requested
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson', 'text/event-stream'])
+    return {'application/x-ndjson': 'ndjson', 'text/event-stream': 'sse'}.get(best)
+
+def _stream_batch_response(wards, stream: str, options: Dict[str, Any]) -> Response:
+    """Stream per-ward outcomes as they complete, then a summary."""
+    dumps = current_app.json.dumps
+    outcomes = stream_batch(wards, **options)
+    
+    def frame(kind: str, body: Dict[str, Any]) -> str:
+        if stream == 'sse':
+            return f"event: {kind}\ndata: {dumps(body)}\n\n"
+        return dumps({'type': kind, **body}) + "\n"
+    
+    def generate():
+        done = []
+        for outcome in outcomes:
+            done.append(outcome)
+            yield frame('ward', {'ward': outcome['ward'], 'status': outcome['status'],
+                                 'seconds': outcome['seconds'], 'result': outcome_entry(outcome)})
+        summary = batch_payload(wards, done)
+        del summary['batch_analysis']
+        yield frame('summary', summary)
+    
+    mimetype = 'text/event-stream' if stream == 'sse' else 'application/x-ndjson'
+    return Response(generate(), mimetype=mimetype, headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@agents_bp.route('/batch-analysis/<job_id>', methods=['GET'])
+def batch_analysis_status(job_id: str):
+    """Progress, partial results or the final result of a batch analysis job"""
+    result = batch_analysis_job.AsyncResult(job_id)
+    body = {'job_id': job_id, 'status': result.state.lower()}
+    if result.state in ('PROGRESS', 'SUCCESS') and isinstance(result.info, dict):
+        body.update(result.info)
+    elif result.state == 'FAILURE':
+        body['error'] = str(result.info)
+    return jsonify(body)
+
 # Health check endpoint
 @agents_bp.route('/health', methods=['GET'])
 def health_check():
@@ -0,0 +1,193 @@
+"""
+Concurrent ward analysis for /api/v1/agents/batch-analysis.
+
+Each ward runs ``analyze-ward`` under its own timeout; a semaphore bounds
+how many run at once, so a batch takes roughly ``ceil(wards / concurrency)``
+analyses instead of one per ward. A failing or slow ward yields an error or
+timeout entry instead of failing the batch.
+
+:func:`gather_batch` collects all wards with ``asyncio.gather`` (input
+order); :func:`stream_batch` yields each ward as it completes, for NDJSON/SSE
+responses and for Celery job progress. Both run their event loop on a
+dedicated thread with the Flask app context pushed, so they work from a
+request, a streaming generator or a worker.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List
+
+from flask import current_app
+
+from .agents_service import execute_agent_command
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 5
+DEFAULT_WARD_TIMEOUT_SECONDS = 45.0
+
+_DONE = object()
+
+
+class _ClosingIterator:
+    """Iterator whose ``close()`` also runs ``on_close``, even before the first item."""
+
+    def __init__(self, items: Iterator, on_close: Callable[[], None]):
+        self._items = items
+        self._on_close = on_close
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def close(self):
+        self._items.close()
+        self._on_close()
+
+
+async def _analyze_ward(ward: str, depth: str, semaphore: asyncio.Semaphore, timeout: float) -> Dict[str, Any]:
+    """One ward's outcome: ``{"ward", "status", "result" | "error", "seconds"}``. Never raises."""
+    async with semaphore:
+        started = time.monotonic()
+        outcome: Dict[str, Any] = {"ward": ward}
+        try:
+            result = await asyncio.wait_for(
+                execute_agent_command("analyze-ward", {"ward_name": ward, "depth": depth}), timeout)
+            if isinstance(result, dict) and "error" in result:
+                outcome.update(status="error", error=result.get("details") or result["error"])
+            else:
+                outcome.update(status="ok", result=result)
+        except asyncio.TimeoutError:
+            outcome.update(status="timeout", error=f"analysis exceeded {timeout:g}s")
+        except Exception as e:
+            logger.error(f"Error analyzing ward {ward}: {e}")
+            outcome.update(status="error", error=str(e))
+        outcome["seconds"] = round(time.monotonic() - started, 2)
+        return outcome
+
+
+async def gather_wards(wards: List[str], depth: str = "standard", concurrency: int = DEFAULT_CONCURRENCY,
+                       timeout: float = DEFAULT_WARD_TIMEOUT_SECONDS) -> List[Dict[str, Any]]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return list(await asyncio.gather(*(_analyze_ward(w, depth, semaphore, timeout) for w in wards)))
+
+
+async def iter_wards(wards: List[str], depth: str = "standard", concurrency: int = DEFAULT_CONCURRENCY,
+                     timeout: float = DEFAULT_WARD_TIMEOUT_SECONDS) -> AsyncIterator[Dict[str, Any]]:
+    """Ward outcomes in completion order; pending analyses are cancelled if the consumer stops."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [asyncio.ensure_future(_analyze_ward(w, depth, semaphore, timeout)) for w in wards]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def gather_batch(wards: List[str], **options) -> List[Dict[str, Any]]:
+    """All outcomes in input order (blocking)."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            return asyncio.run(gather_wards(wards, **options))
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="agents-batch") as pool:
+        return pool.submit(run).result()
+
+
+def stream_batch(wards: List[str], **options) -> Iterator[Dict[str, Any]]:
+    """Outcomes as each ward completes (blocking iterator)."""
+    return _run_on_loop_thread(lambda: iter_wards(wards, **options))
+
+
+def _run_on_loop_thread(make_agen: Callable[[], AsyncIterator]) -> Iterator:
+    """Drive the async generator from ``make_agen()`` on a new loop in a worker thread.
+
+    Closing the returned iterator early cancels the remaining work, including
+    a close that arrives before the worker thread has scheduled it.
+    """
+    app = current_app._get_current_object()
+    items: "queue.Queue" = queue.Queue()
+    loop = asyncio.new_event_loop()
+    main: Dict[str, asyncio.Task] = {}
+    cancelled = threading.Event()
+
+    async def produce():
+        async for item in make_agen():
+            items.put(item)
+
+    def run():
+        asyncio.set_event_loop(loop)
+        with app.app_context():
+            try:
+                main["task"] = loop.create_task(produce())
+                if cancelled.is_set():  # closed before the task existed
+                    main["task"].cancel()
+                loop.run_until_complete(main["task"])
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                items.put(e)
+            finally:
+                loop.close()
+                items.put(_DONE)
+
+    def cancel():
+        # Set the flag first: run() checks it after publishing main["task"]
+        cancelled.set()
+        if "task" in main:
+            try:
+                loop.call_soon_threadsafe(main["task"].cancel)
+            except RuntimeError:  # loop already closed
+                pass
+
+    threading.Thread(target=run, name="agents-batch", daemon=True).start()
+
+    def consume():
+        finished = False
+        try:
+            while True:
+                item = items.get()
+                if item is _DONE:
+                    finished = True
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not finished:
+                cancel()
+
+    return _ClosingIterator(consume(), cancel)
+
+
+def outcome_entry(outcome: Dict[str, Any]) -> Dict[str, Any]:
+    """The per-ward value of the batch response: the analysis, or its error."""
+    if outcome["status"] == "ok":
+        return outcome["result"]
+    return {"error": outcome["error"], "status": outcome["status"]}
+
+
+def batch_payload(wards: List[str], outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Response body for a finished batch, wards in request order."""
+    by_ward = {o["ward"]: o for o in outcomes}
+    statuses = [o["status"] for o in outcomes]
+    return {
+        "batch_analysis": {w: outcome_entry(by_ward[w]) for w in wards if w in by_ward},
+        "total_wards": len(wards),
+        "successful_analyses": statuses.count("ok"),
+        "failed_analyses": statuses.count("error"),
+        "timed_out": statuses.count("timeout"),
+        "seconds": {o["ward"]: o["seconds"] for o in outcomes},
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
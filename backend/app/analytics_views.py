@@ -0,0 +1,180 @@
+"""
+Materialized analytics views: scheduled refresh, staleness tracking and
+freshness-gated reads.
+
+The views live in Postgres (migrations 005, 006 and 3f1d9a7c2b64).
+``refresh_views`` runs ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` for each one
+under an advisory lock, so readers are never blocked and overlapping beat runs
+skip instead of queueing. The outcome is recorded in
+``materialized_view_refresh``. Endpoints call :func:`fresh_view` and read the
+view only when its last successful refresh is within
+``ANALYTICS_VIEW_MAX_AGE_SECONDS``; otherwise they run their live query.
+:func:`mark_freshness` reports which path was used in the
+``X-Data-Freshness`` header.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from .extensions import db
+from .models import MaterializedViewRefresh
+from .utils.ward import normalize_ward, resolve_ward_id
+
+log = logging.getLogger(__name__)
+
+FRESHNESS_HEADER = "X-Data-Freshness"
+
+# Refresh order: the views the APIs read first
+VIEWS = ("daily_ward_trends", "ward_activity_windows", "ward_analytics_summary", "stream_performance_summary")
+
+# daily_ward_trends keeps this many days of history
+DAILY_TRENDS_HORIZON_DAYS = 400
+# ward_activity_windows precomputes these trailing windows
+ACTIVITY_WINDOWS = (7, 30, 90)
+
+_REFRESH_LOCK_KEY = 0x4C4B4456  # "LKDV"
+_AGE_CACHE_SECONDS = 30.0
+_refreshed_at_cache: Dict[str, tuple] = {}
+
+daily_ward_trends = sa.table(
+    "daily_ward_trends",
+    sa.column("trend_date", sa.Date),
+    sa.column("ward_id", sa.String),
+    sa.column("city", sa.String),
+    sa.column("emotion", sa.String),
+    sa.column("party", sa.String),
+    sa.column("posts", sa.Integer),
+)
+
+ward_activity_windows = sa.table(
+    "ward_activity_windows",
+    sa.column("window_days", sa.Integer),
+    sa.column("city", sa.String),
+    sa.column("posts", sa.Integer),
+    sa.column("authors", sa.Integer),
+    sa.column("party_mentions", sa.JSON),
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def views_supported() -> bool:
+    """Views exist only on Postgres and can be switched off with ANALYTICS_VIEWS_ENABLED."""
+    return current_app.config.get("ANALYTICS_VIEWS_ENABLED", True) and db.engine.dialect.name == "postgresql"
+
+
+def view_ward_filter(view, label: Optional[str]):
+    """Ward filter on a view's ward_id/city columns, mirroring Post.ward_filter."""
+    if not label or label.strip().lower() == "all":
+        return None
+    ward_id = resolve_ward_id(label)
+    if ward_id:
+        return view.c.ward_id == ward_id
+    return sa.func.lower(view.c.city) == normalize_ward(label).lower()
+
+
+def record_refresh(name: str, started: datetime, duration_ms: int,
+                   concurrent: bool, error: Optional[str] = None) -> MaterializedViewRefresh:
+    """Store the outcome of a refresh; refreshed_at only moves on success."""
+    row = db.session.get(MaterializedViewRefresh, name) or MaterializedViewRefresh(view_name=name)
+    row.attempted_at = started
+    row.duration_ms = duration_ms
+    row.concurrent = concurrent
+    row.last_error = error
+    if error is None:
+        row.refreshed_at = started
+    db.session.add(row)
+    db.session.commit()
+    _refreshed_at_cache.pop(name, None)
+    return row
+
+
+def refresh_views(names: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+    """Refresh the analytics views, each in its own transaction.
+
+    A view that has never been populated cannot be refreshed concurrently, so
+    its first refresh takes the blocking path. One failing view does not stop
+    the others.
+    """
+    if not views_supported():
+        return {"skipped": "materialized views require PostgreSQL"}
+    names = list(names or VIEWS)
+    results: Dict[str, dict] = {}
+    with db.engine.connect() as conn:
+        if not conn.execute(sa.text("SELECT pg_try_advisory_lock(:key)"), {"key": _REFRESH_LOCK_KEY}).scalar():
+            conn.rollback()
+            return {"skipped": "refresh already running"}
+        conn.commit()
+        try:
+            for name in names:
+                populated = conn.execute(
+                    sa.text("SELECT ispopulated FROM pg_matviews WHERE matviewname = :name"), {"name": name}
+                ).scalar()
+                conn.commit()
+                if populated is None:
+                    results[name] = {"status": "missing"}
+                    continue
+                concurrent = bool(populated)
+                started = _utcnow()
+                t0 = time.perf_counter()
+                error = None
+                try:
+                    with conn.begin():
+                        conn.execute(sa.text(
+                            f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if concurrent else ''}{name}"
+                        ))
+                except SQLAlchemyError as e:
+                    error = str(getattr(e, "orig", e))[:2000]
+                    log.warning(f"Refreshing {name} failed: {error}")
+                duration_ms = int((time.perf_counter() - t0) * 1000)
+                record_refresh(name, started, duration_ms, concurrent, error)
+                results[name] = {
+                    "status": "error" if error else "ok",
+                    "concurrent": concurrent,
+                    "duration_ms": duration_ms,
+                }
+        finally:
+            conn.execute(sa.text("SELECT pg_advisory_unlock(:key)"), {"key": _REFRESH_LOCK_KEY})
+            conn.commit()
+    return results
+
+
+def view_age(name: str) -> Optional[float]:
+    """Seconds since the view's last successful refresh, or None if never refreshed.
+
+    The refresh time is cached per process for a few seconds so hot endpoints
+    do not pay an extra query per request.
+    """
+    cached = _refreshed_at_cache.get(name)
+    if cached is None or time.monotonic() - cached[0] > _AGE_CACHE_SECONDS:
+        row = db.session.get(MaterializedViewRefresh, name)
+        cached = (time.monotonic(), row.refreshed_at if row else None)
+        _refreshed_at_cache[name] = cached
+    refreshed_at = cached[1]
+    if refreshed_at is None:
+        return None
+    return max(0.0, (_utcnow() - refreshed_at).total_seconds())
+
+
+def fresh_view(name: str, max_age: Optional[float] = None) -> Optional[float]:
+    """Age in seconds if the view may be served, else None (caller goes live)."""
+    if not views_supported():
+        return None
+    if max_age is None:
+        max_age = current_app.config.get("ANALYTICS_VIEW_MAX_AGE_SECONDS", 900)
+    age = view_age(name)
+    return age if age is not None and age <= max_age else None
+
+
+def mark_freshness(response, view: Optional[str], age: Optional[float]):
+    """Set X-Data-Freshness to ``view=<name>; age=<s>`` or ``live``."""
+    response.headers[FRESHNESS_HEADER] = f"view={view}; age={int(age)}" if view and age is not None else "live"
+    return response
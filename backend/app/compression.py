@@ -0,0 +1,155 @@
+"""
+Negotiated response compression for the LokDarpan API.
+
+:func:`init_compression` installs an ``after_request`` hook that compresses
+JSON/text responses at or above ``COMPRESS_MIN_BYTES`` with the best encoding
+the client accepts: brotli when the ``brotli`` module is installed, else gzip.
+Smaller bodies, streamed or already-encoded responses and ``no-transform``
+responses pass through untouched.
+
+Content that only changes on deploy (ward GeoJSON) should not be serialized
+and compressed per request: :func:`precompressed` builds a
+:class:`PrecompressedBlob` once per content version, holding the body, every
+encoding at maximum compression and a strong ETag, and serves it with
+conditional-request (304) support.
+"""
+
+import gzip
+import hashlib
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = (
+    "application/json",
+    "application/geo+json",
+    "application/javascript",
+    "image/svg+xml",
+)
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_GZIP_LEVEL = 6
+# Per-request brotli quality: 4-5 beats gzip -6 on size at similar CPU cost;
+# pre-compressed blobs use the maximum for both encodings
+BROTLI_QUALITY = 5
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(encodings: Tuple[str, ...] = None) -> Optional[str]:
+    """Best coding for the current request's Accept-Encoding, or None for identity."""
+    return request.accept_encodings.best_match(encodings or available_encodings())
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    if encoding == "gzip":
+        # mtime=0 keeps the output (and any ETag derived from it) deterministic
+        return gzip.compress(body, compresslevel=DEFAULT_GZIP_LEVEL if level is None else level, mtime=0)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def _is_compressible(mimetype: Optional[str]) -> bool:
+    return bool(mimetype) and (mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES)
+
+
+def compress_response(response, min_bytes: int = DEFAULT_MIN_BYTES, gzip_level: int = DEFAULT_GZIP_LEVEL):
+    """Compress ``response`` in place for the current request when worthwhile."""
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or "no-transform" in (response.headers.get("Cache-Control") or "")
+            or not _is_compressible(response.mimetype)):
+        return response
+
+    body = response.get_data()
+    if len(body) < min_bytes:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress(body, encoding, gzip_level if encoding == "gzip" else None))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def init_compression(app):
+    """Register the compression hook (``COMPRESS_ENABLED``, default on).
+
+    Register before other ``after_request`` hooks: Flask runs them in reverse,
+    so this one sees the final body.
+    """
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    min_bytes = app.config.get("COMPRESS_MIN_BYTES", DEFAULT_MIN_BYTES)
+    gzip_level = app.config.get("COMPRESS_LEVEL", DEFAULT_GZIP_LEVEL)
+
+    @app.after_request
+    def compress_after_request(response):
+        return compress_response(response, min_bytes=min_bytes, gzip_level=gzip_level)
+
+
+class PrecompressedBlob:
+    """A serialized body with every supported encoding built up front."""
+
+    def __init__(self, body: bytes, mimetype: str = "application/json"):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.encodings: Dict[str, bytes] = {"gzip": compress(body, "gzip", STATIC_GZIP_LEVEL)}
+        if brotli is not None:
+            self.encodings["br"] = compress(body, "br", STATIC_BROTLI_QUALITY)
+
+    def response(self):
+        """Response for the current request, honouring Accept-Encoding and If-None-Match."""
+        encoding = negotiate_encoding(tuple(e for e in available_encodings() if e in self.encodings))
+        response = current_app.response_class(self.encodings[encoding] if encoding else self.body,
+                                              mimetype=self.mimetype)
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.set_etag(f"{self.etag}-{encoding}" if encoding else self.etag)
+        return response.make_conditional(request)
+
+
+_blobs: Dict[Hashable, Tuple[Hashable, PrecompressedBlob]] = {}
+_blobs_lock = threading.Lock()
+
+
+def precompressed(key: Hashable, version: Hashable, build: Callable[[], Optional[bytes]],
+                  mimetype: str = "application/json") -> Optional[PrecompressedBlob]:
+    """Cached blob for ``key``, rebuilt when ``version`` (e.g. file mtime) changes.
+
+    ``build`` returns the serialized body, or None when the content is
+    unusable (nothing is cached then).
+    """
+    cached = _blobs.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _blobs_lock:
+        cached = _blobs.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        body = build()
+        if body is None:
+            return None
+        blob = PrecompressedBlob(body, mimetype)
+        _blobs[key] = (version, blob)
+        return blob
@@ -10,6 +10,7 @@ from .models import (
     WardDemographics, WardFeatures
 )
 from .etl.form20_parser import parse_form20_csv
+from .services.semantic_cache import invalidate_ward_caches
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,16 @@ def ingest_form20_ls24(self, csv_path: str) -> str:
     logger.info(msg)
     return msg
 
+@shared_task(bind=True)
+def assign_station_wards(self) -> str:
+    """Re-derive polling station wards from coordinates (run before aggregate_to_ward)."""
+    from .ward_index import assign_polling_station_wards
+
+    stats = assign_polling_station_wards(db.session)
+    db.session.commit()
+    return (f"assign_station_wards: {stats['assigned']}/{stats['located']} located stations assigned, "
+            f"{stats['changed']} corrected, {stats['outside']} outside GHMC")
+
 @shared_task(bind=True)
 def aggregate_to_ward(self, election_type: str, year: int) -> str:
     e = Election.query.filter_by(type=election_type, year=year).first()
@@ -132,6 +143,7 @@ def compute_features(self) -> str:
         wrote += 1
 
     db.session.commit()
+    invalidate_ward_caches(ls)
     return f"compute_features: updated {wrote} wards"
 
 @shared_task(bind=True)
@@ -0,0 +1,304 @@
+"""
+Local emotion and issue-driver labelling for posts.
+
+Ingestion used to make one LLM call per post. Posts are now labelled in
+batches on the CPU:
+
+* Emotion: a multinomial naive Bayes model (linear in hashed unigram and
+  bigram features) trained from posts that already carry ``Post.emotion``.
+  The emotion lexicon of the heat map engine is added as pseudo-counts, so
+  the model can label posts before any training data exists.
+* Drivers: issue, party and locality phrases found in the text, most
+  frequent first, matched with one combined regex.
+
+The LLM only sees posts whose top-class probability is below
+EMOTION_CONFIDENCE_THRESHOLD, at most EMOTION_LLM_MAX_PER_BATCH per batch,
+sent EMOTION_LLM_CHUNK at a time. ``Post.emotion_source`` records which one
+labelled a post. Model-labelled posts are never used for training.
+
+The model is cached per process. It is retrained when the labelled-post
+watermark (count and highest id of trainable posts) changes, which is
+checked at most every RETRAIN_CHECK_SECONDS.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import func, or_, select
+
+from . import llm
+from .extensions import db
+from .heatmap_engine import DEFAULT_ISSUE_KEYWORDS, EMOTION_KEYWORDS, PARTY_MAPPING
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+FEATURE_BITS = 18
+FEATURE_MASK = (1 << FEATURE_BITS) - 1
+SMOOTHING = 0.5
+SEED_WEIGHT = 3.0
+MAX_TRAINING_POSTS = 50000
+RETRAIN_CHECK_SECONDS = 600
+EMOTION_LLM_CHUNK = 20
+
+SOURCE_MODEL = "model"
+SOURCE_LLM = "llm"
+UNLABELLED = ("", "unknown", "error", "none")
+
+ISSUE_DRIVERS = {
+    **{keyword: keyword for keyword in DEFAULT_ISSUE_KEYWORDS},
+    "drainage": "drainage", "water supply": "water", "garbage": "sanitation", "road repairs": "roads",
+    "potholes": "roads", "street lights": "electricity", "power cuts": "electricity", "metro": "transportation",
+    "traffic": "transportation", "flooding": "flooding", "2bhk": "housing", "property tax": "property tax",
+    "encroachments": "encroachments", "stray dogs": "stray dogs", "schools": "education",
+    "hospital": "healthcare", "jobs": "unemployment",
+}
+PARTY_DRIVERS = {**PARTY_MAPPING, "BJP": "BJP", "BRS": "BRS", "INC": "INC", "MIM": "AIMIM"}
+LOCALITY_DRIVERS = ("GHMC", "HMDA", "Old City", "Hitech City", "Secunderabad", "Cyberabad")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _driver_pattern() -> Tuple["re.Pattern", Dict[str, str]]:
+    phrases = {phrase.lower(): driver for phrase, driver in ISSUE_DRIVERS.items()}
+    phrases.update({name.lower(): party for name, party in PARTY_DRIVERS.items()})
+    phrases.update({name.lower(): name for name in LOCALITY_DRIVERS})
+    alternation = "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b"), phrases
+
+
+_DRIVERS, _DRIVER_NAMES = _driver_pattern()
+
+
+def _features(text: str) -> np.ndarray:
+    """Hashed unigram and bigram indices of ``text``."""
+    words = _TOKEN.findall((text or "").lower())
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return np.fromiter((zlib.crc32(g.encode()) & FEATURE_MASK for g in grams), dtype=np.int64, count=len(grams))
+
+
+def extract_drivers(text: str, limit: int = 3) -> List[str]:
+    """Issues, parties and localities mentioned in ``text``, most frequent first."""
+    hits = Counter(_DRIVER_NAMES[m] for m in _DRIVERS.findall((text or "").lower()))
+    return [driver for driver, _ in hits.most_common(limit)]
+
+
+def _label_key(label: Optional[str]) -> str:
+    return (label or "").strip().lower()
+
+
+class EmotionClassifier:
+    """Multinomial naive Bayes over hashed features, seeded with the emotion lexicon."""
+
+    def __init__(self, smoothing: float = SMOOTHING, seed_weight: float = SEED_WEIGHT):
+        self.smoothing = smoothing
+        self.seed_weight = seed_weight
+        self.classes: List[str] = []
+        self.trained_on = 0
+        self._log_prior = np.zeros(0)
+        self._weights = np.zeros((0, 0))  # (features, classes); zero rows for unseen features
+        self._known = np.zeros(0, dtype=np.int64)
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "EmotionClassifier":
+        # Display name per class: the most common spelling among the training labels
+        spellings: Dict[str, Counter] = {}
+        for label in labels:
+            spellings.setdefault(_label_key(label), Counter())[label.strip()] += 1
+        for emotion in EMOTION_KEYWORDS:
+            spellings.setdefault(emotion, Counter())[emotion.title()] += 0
+        keys = sorted(k for k in spellings if k not in UNLABELLED)
+        self.classes = [spellings[k].most_common(1)[0][0] for k in keys]
+        index = {k: i for i, k in enumerate(keys)}
+
+        counts = np.zeros((1 << FEATURE_BITS, len(keys)), dtype=np.float64)
+        for emotion, keywords in EMOTION_KEYWORDS.items():
+            for keyword in keywords:
+                np.add.at(counts[:, index[emotion]], _features(keyword), self.seed_weight)
+
+        rows = [(_features(text), index[_label_key(label)]) for text, label in zip(texts, labels)
+                if _label_key(label) in index]
+        class_counts = np.bincount([k for _, k in rows], minlength=len(keys))
+        if rows:
+            features = np.concatenate([f for f, _ in rows])
+            targets = np.concatenate([np.full(len(f), k) for f, k in rows])
+            np.add.at(counts, (features, targets), 1.0)
+
+        seen = counts.sum(axis=1) > 0
+        vocabulary = max(1, int(seen.sum()))
+        totals = counts.sum(axis=0) + self.smoothing * vocabulary
+        self._weights = np.where(seen[:, None], np.log((counts + self.smoothing) / totals), 0.0)
+        self._known = seen.astype(np.int64)
+        self._log_prior = np.log((class_counts + 1.0) / (len(rows) + len(keys)))
+        self.trained_on = len(rows)
+        return self
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Class probabilities, one row per text (columns follow ``classes``)."""
+        features = [_features(t) for t in texts]
+        lengths = np.array([len(f) for f in features])
+        scores = np.tile(self._log_prior, (len(texts), 1))
+        present = lengths > 0
+        if present.any():
+            flat = np.concatenate([f for f in features if len(f)])
+            offsets = np.concatenate(([0], np.cumsum(lengths[present])[:-1]))
+            evidence = np.add.reduceat(self._weights[flat], offsets, axis=0)
+            known = np.maximum(np.add.reduceat(self._known[flat], offsets), 1)
+            # Temper by sqrt(known features) so long posts do not saturate the softmax
+            scores[present] += evidence / np.sqrt(known)[:, None]
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """``(emotion, confidence)`` per text."""
+        if not texts:
+            return []
+        probs = self.predict_proba(texts)
+        best = probs.argmax(axis=1)
+        return [(self.classes[k], float(probs[i, k])) for i, k in enumerate(best)]
+
+
+@dataclass
+class EmotionLabel:
+    emotion: str
+    drivers: List[str] = field(default_factory=list)
+    confidence: float = 0.0
+    source: str = SOURCE_MODEL
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _trainable():
+    return (
+        Post.emotion.isnot(None),
+        func.lower(Post.emotion).notin_(UNLABELLED),
+        or_(Post.emotion_source.is_(None), Post.emotion_source != SOURCE_MODEL),
+    )
+
+
+def training_watermark() -> tuple:
+    """(count, highest id) of posts the model may train on, in one statement."""
+    return tuple(db.session.execute(select(func.count(Post.id), func.max(Post.id)).where(*_trainable())).one())
+
+
+def load_training_posts(limit: int = MAX_TRAINING_POSTS) -> Tuple[List[str], List[str]]:
+    rows = db.session.execute(
+        select(Post.text, Post.emotion).where(*_trainable()).order_by(Post.id.desc()).limit(limit)
+    ).all()
+    return [r.text for r in rows], [r.emotion for r in rows]
+
+
+_cache: Dict = {"model": None, "watermark": None, "checked": 0.0}
+_cache_lock = threading.Lock()
+
+
+def get_classifier(max_age: float = RETRAIN_CHECK_SECONDS) -> EmotionClassifier:
+    """The process-wide classifier, retrained when new trainable labels have arrived."""
+    now = time.monotonic()
+    with _cache_lock:
+        model = _cache["model"]
+        if model is not None and now - _cache["checked"] < max_age:
+            return model
+    try:
+        watermark = training_watermark()
+    except Exception as e:  # no app context or database: the lexicon-only model still works
+        logger.debug(f"Emotion training data unavailable: {e}")
+        watermark = None
+    if model is not None and watermark in (None, _cache["watermark"]):
+        with _cache_lock:
+            _cache["checked"] = now
+        return model
+
+    texts, labels = load_training_posts() if watermark else ([], [])
+    model = EmotionClassifier().fit(texts, labels)
+    logger.info(f"Emotion classifier trained on {model.trained_on} posts, {len(model.classes)} classes")
+    with _cache_lock:
+        _cache.update(model=model, watermark=watermark, checked=now)
+    return model
+
+
+def clear_classifier_cache():
+    with _cache_lock:
+        _cache.update(model=None, watermark=None, checked=0.0)
+
+
+def _config(key: str, default):
+    return current_app.config.get(key, default) if has_app_context() else default
+
+
+def llm_enabled() -> bool:
+    return llm.LLM_PROVIDER != "none"
+
+
+def _llm_labels(texts: Sequence[str], emotions: Sequence[str]) -> List[Optional[dict]]:
+    """One LLM call labelling ``texts``; entries it did not label are None."""
+    system = ("You label social media posts and news items about Hyderabad politics. For each item give the "
+              "dominant emotion and 1-3 short drivers (issues, names or places causing it). "
+              f"Prefer one of these emotions: {', '.join(emotions)}. "
+              'Reply as JSON: {"labels": [{"id": 0, "emotion": "...", "drivers": ["..."]}]}')
+    user = json.dumps([{"id": i, "text": text[:1000]} for i, text in enumerate(texts)], ensure_ascii=False)
+    result = llm.call_llm_json(system, user)
+    by_id = {item.get("id"): item for item in result.get("labels", []) if isinstance(item, dict)}
+    return [by_id.get(i) if by_id.get(i, {}).get("emotion") else None for i in range(len(texts))]
+
+
+def label_texts(texts: Sequence[str], llm_fallback: bool = True,
+                classifier: Optional[EmotionClassifier] = None) -> List[EmotionLabel]:
+    """Emotion and drivers for each text; low-confidence items go to the LLM when one is configured."""
+    classifier = classifier or get_classifier()
+    labels = [EmotionLabel(emotion, extract_drivers(text), round(confidence, 3))
+              for text, (emotion, confidence) in zip(texts, classifier.predict(texts))]
+    if not (llm_fallback and llm_enabled()):
+        return labels
+
+    threshold = _config("EMOTION_CONFIDENCE_THRESHOLD", 0.5)
+    limit = _config("EMOTION_LLM_MAX_PER_BATCH", 20)
+    unsure = sorted((i for i, label in enumerate(labels) if label.confidence < threshold),
+                    key=lambda i: labels[i].confidence)[:limit]
+    for start in range(0, len(unsure), EMOTION_LLM_CHUNK):
+        chunk = unsure[start:start + EMOTION_LLM_CHUNK]
+        try:
+            answers = _llm_labels([texts[i] for i in chunk], classifier.classes)
+        except Exception as e:
+            logger.warning(f"LLM emotion labelling failed, keeping model labels: {e}")
+            break
+        for i, answer in zip(chunk, answers):
+            if answer:
+                labels[i].emotion = str(answer["emotion"]).strip()[:64]
+                labels[i].drivers = [str(d) for d in answer.get("drivers") or []][:3] or labels[i].drivers
+                labels[i].source = SOURCE_LLM
+    return labels
+
+
+def label_posts(posts: Iterable[Post], llm_fallback: bool = True) -> int:
+    """Set ``emotion`` and ``emotion_source`` on ``posts`` (not committed); returns how many."""
+    posts = list(posts)
+    for post, label in zip(posts, label_texts([p.text for p in posts], llm_fallback)):
+        post.emotion, post.emotion_source = label.emotion, label.source
+    return len(posts)
+
+
+def label_unlabelled_posts(batch_size: int = 2000, max_batches: int = 50, llm_fallback: bool = True) -> Dict[str, int]:
+    """Label posts that have no emotion yet, oldest first, committing per batch."""
+    labelled = batches = 0
+    last_id = 0
+    while batches < max_batches:
+        posts = (Post.query.filter(Post.emotion.is_(None), Post.id > last_id)
+                 .order_by(Post.id).limit(batch_size).all())
+        if not posts:
+            break
+        labelled += label_posts(posts, llm_fallback)
+        last_id = posts[-1].id
+        db.session.commit()
+        batches += 1
+    return {"labelled": labelled, "batches": batches}
@@ -1,14 +1,22 @@
 # app/epaper_api.py
+from datetime import date
+
 from flask import Blueprint, jsonify, request, abort
-from sqlalchemy import desc, func
+from sqlalchemy import desc, exists, func
 from .extensions import db
 from .models import Epaper, Post
+from .pagination import InvalidCursor, before, decode_cursor, next_cursor
 
 bp_epaper = Blueprint("bp_epaper", __name__, url_prefix="/api/v1/epaper")
 
 
-def _serialize_epaper(e: Epaper, preview_chars: int | None = 300):
-    txt = e.raw_text or ""
+PREVIEW_CHARS = 300
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _serialize_epaper(e, preview_chars: int | None = PREVIEW_CHARS):
+    """List item from a projected row; ``e.preview`` holds at most preview_chars + 1 chars."""
+    txt = e.preview or ""
     if preview_chars is not None and len(txt) > preview_chars:
         txt = txt[:preview_chars].rstrip() + "…"
     return {
@@ -25,9 +33,13 @@ def _serialize_epaper(e: Epaper, preview_chars: int | None = 300):
 @bp_epaper.get("")
 def list_epaper():
     """
-    GET /api/v1/epaper?city=Allapur&limit=20
+    GET /api/v1/epaper?city=Allapur&limit=20&cursor=<X-Next-Cursor>
     If city=All or missing → latest across all wards.
-    Otherwise join Post to respect city filter (distinct on Epaper).
+    Otherwise only articles with a mirrored Post in that ward.
+
+    Newest first by (publication_date, id). When more rows exist, the
+    X-Next-Cursor response header carries the cursor for the next page.
+    Only the preview prefix of raw_text is read.
     """
     city = (request.args.get("city") or "").strip()
     try:
@@ -35,18 +47,33 @@ def list_epaper():
     except ValueError:
         limit = 20
 
-    q = db.session.query(Epaper)
+    q = db.session.query(
+        Epaper.id,
+        Epaper.publication_name,
+        Epaper.publication_date,
+        Epaper.created_at,
+        Epaper.sha256,
+        func.substr(Epaper.raw_text, 1, PREVIEW_CHARS + 1).label("preview"),
+    )
+
+    ward_clause = Post.ward_filter(city)
+    if ward_clause is not None:
+        q = q.filter(exists().where(Post.epaper_id == Epaper.id, ward_clause))
 
-    if city and city.lower() != "all":
-        q = (
-            q.join(Post, Post.epaper_id == Epaper.id)
-            .filter(Post.city == city)
-            .group_by(Epaper.id)
-        )
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            after = decode_cursor(cursor, date.fromisoformat, int)
+        except InvalidCursor:
+            abort(400, description="invalid cursor")
+        q = q.filter(before((Epaper.publication_date, Epaper.id), after))
 
-    q = q.order_by(desc(Epaper.publication_date), desc(Epaper.created_at)).limit(limit)
-    rows = q.all()
-    return jsonify([_serialize_epaper(e) for e in rows])
+    rows = q.order_by(desc(Epaper.publication_date), desc(Epaper.id)).limit(limit + 1).all()
+    rows, cursor = next_cursor(rows, limit, key=lambda r: (r.publication_date, r.id))
+    response = jsonify([_serialize_epaper(e) for e in rows])
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return response
 
 
 @bp_epaper.get("/<int:epaper_id>")
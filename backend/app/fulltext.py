@@ -0,0 +1,67 @@
+"""
+Full-text match/rank expressions over post and epaper, shared by
+/api/v1/search and hybrid RAG retrieval.
+
+On PostgreSQL queries are parsed with ``websearch_to_tsquery`` and matched
+against the GIN-indexed ``search_vector`` columns (migration a7c4e19d2f35),
+ranked with ``ts_rank_cd``. Other databases (SQLite in tests) fall back to an
+ILIKE match on every word with rank 0.
+"""
+import re
+
+from sqlalchemy import and_, func, literal, literal_column
+from sqlalchemy.types import Float
+
+from .models import Epaper, Post
+
+SEARCH_CONFIG = "english"
+SNIPPET_CHARS = 240
+
+# ts_rank_cd normalization: 1 divides by 1 + log(length) so long epaper
+# articles do not outrank short posts on volume alone; 32 maps to [0, 1).
+RANK_NORMALIZATION = 1 | 32
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=12, "
+    "MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+SOURCES = ("post", "epaper")
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def text_search(q: str, dialect: str):
+    """(match, rank, headline) builders for ``dialect``.
+
+    ``match(source)`` and ``rank(source)`` take "post" or "epaper";
+    ``headline(document)`` wraps a text column.
+    """
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+        def match(source):
+            return literal_column(f"{source}.search_vector").op("@@")(tsquery)
+
+        def rank(source):
+            return func.ts_rank_cd(literal_column(f"{source}.search_vector"), tsquery, RANK_NORMALIZATION)
+
+        def headline(document):
+            return func.ts_headline(SEARCH_CONFIG, document, tsquery, HEADLINE_OPTIONS)
+
+        return match, rank, headline
+
+    words = _WORD.findall(q)[:10]
+    columns = {"post": Post.text, "epaper": Epaper.raw_text}
+
+    def match(source):
+        if not words:
+            return literal(False)
+        return and_(*[columns[source].ilike(f"%{w}%") for w in words])
+
+    def rank(source):
+        return literal(0.0, Float)
+
+    def headline(document):
+        return func.substr(document, 1, SNIPPET_CHARS)
+
+    return match, rank, headline
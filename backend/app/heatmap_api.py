@@ -4,44 +4,25 @@ Heat Map API - Specialized endpoints for heat map widget data processing
 Provides aggregated data for various political intelligence heat map visualizations
 """
 
-from datetime import datetime, timedelta, timezone
-from collections import defaultdict
-import json
-import re
-from typing import Dict, List, Optional, Union
+from datetime import datetime, timedelta
 
 from flask import Blueprint, jsonify, request
 from flask_login import login_required
-from sqlalchemy import func, and_, or_, desc, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func
 
 from . import db
-from .models import Post, Author, Alert
-from .utils.ward import normalize_ward
+from .analytics_views import (
+    ACTIVITY_WINDOWS, DAILY_TRENDS_HORIZON_DAYS, daily_ward_trends, fresh_view, mark_freshness,
+    view_ward_filter, ward_activity_windows,
+)
+from .models import Post, Author
+from .heatmap_engine import (
+    DEFAULT_ISSUE_KEYWORDS, EMOTION_CATEGORIES, PARTY_MAPPING, get_date_range, heatmap_window, normalize_party_name,
+)
+from .utils.ward import normalize_ward, resolve_ward_id
 
 heatmap_bp = Blueprint("heatmap_bp", __name__, url_prefix="/api/v1/heatmap")
 
-# Political party configuration
-PARTY_MAPPING = {
-    "BJP Telangana": "BJP",
-    "BRS Party": "BRS", 
-    "Telangana Rashtra Samithi": "BRS",
-    "TRS": "BRS",
-    "Indian National Congress": "INC",
-    "Telangana Congress": "INC",
-    "Congress": "INC",
-    "AIMIM": "AIMIM",
-    "All India Majlis-e-Ittehad-ul-Muslimeen": "AIMIM",
-    "Aam Aadmi Party": "AAP",
-    "AAP": "AAP"
-}
-
-# Emotion categories for sentiment analysis
-EMOTION_CATEGORIES = [
-    'hopeful', 'angry', 'concerned', 'satisfied', 
-    'disappointed', 'optimistic', 'frustrated'
-]
-
 # Robust date parsing function
 def parse_date_safely(date_str):
     """Parse date string into datetime object safely"""
@@ -61,46 +42,6 @@ def parse_date_safely(date_str):
         print(f"Date parsing error: {e} for date: {date_str}")
         return None
 
-def normalize_party_name(party_name):
-    """Normalize party names to standard format"""
-    if not party_name:
-        return "Others"
-    
-    party_clean = str(party_name).strip()
-    return PARTY_MAPPING.get(party_clean, "Others")
-
-def extract_emotions_from_text(text):
-    """Extract emotion counts from post text using keyword matching"""
-    if not text:
-        return {}
-    
-    text_lower = text.lower()
-    emotions = {}
-    
-    # Simple keyword-based emotion extraction
-    emotion_keywords = {
-        'hopeful': ['hope', 'hopeful', 'optimistic', 'positive', 'bright', 'promising'],
-        'angry': ['angry', 'furious', 'outraged', 'mad', 'enraged', 'livid'],
-        'concerned': ['concerned', 'worried', 'anxious', 'troubled', 'uneasy'],
-        'satisfied': ['satisfied', 'pleased', 'content', 'happy', 'glad'],
-        'disappointed': ['disappointed', 'let down', 'frustrated', 'upset'],
-        'optimistic': ['optimistic', 'confident', 'upbeat', 'encouraged'],
-        'frustrated': ['frustrated', 'annoyed', 'irritated', 'exasperated']
-    }
-    
-    for emotion, keywords in emotion_keywords.items():
-        count = sum(1 for keyword in keywords if keyword in text_lower)
-        if count > 0:
-            emotions[emotion] = count
-    
-    return emotions
-
-def get_date_range(days):
-    """Get date range for the specified number of days"""
-    end_date = datetime.now(timezone.utc)
-    start_date = end_date - timedelta(days=days)
-    return start_date, end_date
-
 @heatmap_bp.route('/sentiment', methods=['GET'])
 @login_required
 def sentiment_heatmap():
@@ -116,99 +57,14 @@ def sentiment_heatmap():
         aggregation = request.args.get('aggregation', 'sum')  # sum, average, max, count
         
         # Normalize ward
+        ward_label = ward
         if ward != 'All':
             ward = normalize_ward(ward)
         
-        # Get date range
-        start_date, end_date = get_date_range(days)
-        
-        # Base query
-        query = db.session.query(Post).filter(
-            Post.created_at >= start_date,
-            Post.created_at <= end_date
-        )
-        
-        # Apply ward filter
-        if ward != 'All':
-            query = query.filter(Post.city == ward)
-        
-        # Execute query
-        posts = query.all()
-        
-        # Process data by date
-        daily_data = defaultdict(lambda: {
-            'emotions': defaultdict(int),
-            'total_posts': 0,
-            'total_mentions': 0
-        })
-        
-        for post in posts:
-            if not post.created_at:
-                continue
-                
-            date_key = post.created_at.strftime('%Y-%m-%d')
-            
-            # Extract emotions from post text
-            post_emotions = extract_emotions_from_text(post.text)
-            
-            # Aggregate emotions
-            for emotion, count in post_emotions.items():
-                if emotion in emotions:
-                    daily_data[date_key]['emotions'][emotion] += count
-                    daily_data[date_key]['total_mentions'] += count
-            
-            daily_data[date_key]['total_posts'] += 1
-        
-        # Format data for calendar heatmap
-        result_data = []
-        for date_str, data in daily_data.items():
-            emotion_totals = data['emotions']
-            
-            # Calculate aggregate value based on aggregation method
-            if aggregation == 'sum':
-                count = sum(emotion_totals.values())
-            elif aggregation == 'average':
-                count = sum(emotion_totals.values()) / max(len(emotion_totals), 1)
-            elif aggregation == 'max':
-                count = max(emotion_totals.values()) if emotion_totals else 0
-            elif aggregation == 'count':
-                count = data['total_posts']
-            else:
-                count = sum(emotion_totals.values())
-            
-            result_data.append({
-                'date': date_str,
-                aggregation: count,
-                'total': sum(emotion_totals.values()),
-                'emotions': dict(emotion_totals),
-                'posts': data['total_posts'],
-                'details': {
-                    'dominant_emotion': max(emotion_totals.items(), key=lambda x: x[1])[0] if emotion_totals else None
-                }
-            })
-        
-        # Fill in missing dates with zero values
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-        filled_data = []
-        
-        while current_date <= end_date_only:
-            date_str = current_date.strftime('%Y-%m-%d')
-            existing_data = next((d for d in result_data if d['date'] == date_str), None)
-            
-            if existing_data:
-                filled_data.append(existing_data)
-            else:
-                filled_data.append({
-                    'date': date_str,
-                    aggregation: 0,
-                    'total': 0,
-                    'emotions': {},
-                    'posts': 0,
-                    'details': {}
-                })
-            
-            current_date += timedelta(days=1)
+        # Project the shared single-pass window for (ward, days)
+        window = heatmap_window(ward_label, days)
+        start_date, end_date = window.start, window.end
+        filled_data = window.sentiment_series(emotions, aggregation)
         
         return jsonify({
             'success': True,
@@ -251,148 +107,14 @@ def party_activity_heatmap():
         focus_party = request.args.get('focus_party', 'BJP')
         
         # Normalize ward
+        ward_label = ward
         if ward != 'All':
             ward = normalize_ward(ward)
         
-        # Get date range
-        start_date, end_date = get_date_range(days)
-        
-        # Base query with author information for party extraction
-        query = db.session.query(Post, Author).outerjoin(Author, Post.author_id == Author.id).filter(
-            Post.created_at >= start_date,
-            Post.created_at <= end_date
-        )
-        
-        # Apply ward filter
-        if ward != 'All':
-            query = query.filter(Post.city == ward)
-        
-        # Execute query
-        results = query.all()
-        
-        # Process data by date and party
-        daily_data = defaultdict(lambda: defaultdict(lambda: {
-            'mentions': 0,
-            'posts': 0,
-            'sentiment_score': 0,
-            'engagement': 0
-        }))
-        
-        for post, author in results:
-            if not post.created_at:
-                continue
-                
-            date_key = post.created_at.strftime('%Y-%m-%d')
-            
-            # Determine party from author or post content
-            party = "Others"
-            if author and author.party:
-                party = normalize_party_name(author.party)
-            else:
-                # Try to extract party from post text
-                post_text = (post.text or "").lower()
-                for party_name, normalized in PARTY_MAPPING.items():
-                    if party_name.lower() in post_text:
-                        party = normalized
-                        break
-            
-            # Only process requested parties
-            if party in parties or parties == []:
-                daily_data[date_key][party]['mentions'] += 1
-                daily_data[date_key][party]['posts'] += 1
-                
-                # Extract sentiment score (simplified)
-                sentiment_keywords = {
-                    'positive': ['good', 'great', 'excellent', 'success', 'achievement'],
-                    'negative': ['bad', 'terrible', 'failure', 'corruption', 'scandal']
-                }
-                
-                sentiment_score = 0
-                post_text_lower = (post.text or "").lower()
-                for word in sentiment_keywords['positive']:
-                    sentiment_score += post_text_lower.count(word) * 1
-                for word in sentiment_keywords['negative']:
-                    sentiment_score += post_text_lower.count(word) * -1
-                
-                daily_data[date_key][party]['sentiment_score'] += sentiment_score
-                
-                # Simple engagement metric (based on text length and mentions)
-                engagement = len(post.text or "") / 100  # Simplified engagement metric
-                daily_data[date_key][party]['engagement'] += engagement
-        
-        # Calculate daily totals and format data
-        result_data = []
-        for date_str, party_data in daily_data.items():
-            # Calculate totals for share of voice
-            total_mentions = sum(data['mentions'] for data in party_data.values())
-            
-            party_metrics = {}
-            for party, data in party_data.items():
-                share_of_voice = (data['mentions'] / max(total_mentions, 1)) * 100
-                avg_sentiment = data['sentiment_score'] / max(data['mentions'], 1)
-                activity_score = (data['mentions'] * 0.4 + 
-                                data['engagement'] * 0.3 + 
-                                abs(avg_sentiment) * 0.3)
-                
-                party_metrics[party] = {
-                    'mentions': data['mentions'],
-                    'sentiment_score': round(avg_sentiment, 2),
-                    'engagement': round(data['engagement'], 2),
-                    'share_of_voice': round(share_of_voice, 1),
-                    'activity_score': round(activity_score, 2)
-                }
-            
-            # Determine count based on view mode and metric
-            if view_mode == 'single':
-                count = party_metrics.get(focus_party, {}).get(metric, 0)
-            elif view_mode == 'comparative':
-                # Use the party with highest activity for the day
-                if party_metrics:
-                    dominant_party = max(party_metrics.keys(), 
-                                       key=lambda p: party_metrics[p].get(metric, 0))
-                    count = party_metrics[dominant_party].get(metric, 0)
-                else:
-                    dominant_party = None
-                    count = 0
-            else:  # aggregate
-                count = sum(data.get(metric, 0) for data in party_metrics.values())
-                dominant_party = None
-            
-            result_entry = {
-                'date': date_str,
-                'count': count,
-                'parties': {p: data.get(metric, 0) for p, data in party_metrics.items()},
-                'details': {
-                    'total_mentions': total_mentions,
-                    'party_breakdown': party_metrics
-                }
-            }
-            
-            if view_mode == 'comparative':
-                result_entry['dominantParty'] = dominant_party
-            
-            result_data.append(result_entry)
-        
-        # Fill in missing dates
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-        filled_data = []
-        
-        while current_date <= end_date_only:
-            date_str = current_date.strftime('%Y-%m-%d')
-            existing_data = next((d for d in result_data if d['date'] == date_str), None)
-            
-            if existing_data:
-                filled_data.append(existing_data)
-            else:
-                filled_data.append({
-                    'date': date_str,
-                    'count': 0,
-                    'parties': {party: 0 for party in parties},
-                    'details': {'total_mentions': 0, 'party_breakdown': {}}
-                })
-            
-            current_date += timedelta(days=1)
+        # Project the shared single-pass window for (ward, days)
+        window = heatmap_window(ward_label, days)
+        start_date, end_date = window.start, window.end
+        filled_data = window.party_series(parties, metric, view_mode, focus_party)
         
         return jsonify({
             'success': True,
@@ -436,100 +158,17 @@ def issue_intensity_heatmap():
         
         # Default political keywords if none specified
         if not keywords:
-            keywords = [
-                'development', 'infrastructure', 'education', 'healthcare', 
-                'corruption', 'unemployment', 'housing', 'transportation',
-                'water', 'electricity', 'roads', 'sanitation'
-            ]
+            keywords = list(DEFAULT_ISSUE_KEYWORDS)
         
         # Normalize ward
+        ward_label = ward
         if ward != 'All':
             ward = normalize_ward(ward)
         
-        # Get date range
-        start_date, end_date = get_date_range(days)
-        
-        # Base query
-        query = db.session.query(Post).filter(
-            Post.created_at >= start_date,
-            Post.created_at <= end_date
-        )
-        
-        # Apply ward filter
-        if ward != 'All':
-            query = query.filter(Post.city == ward)
-        
-        # Execute query
-        posts = query.all()
-        
-        # Process data by date and keywords
-        daily_data = defaultdict(lambda: {
-            'keywords': defaultdict(int),
-            'total_mentions': 0,
-            'posts': 0
-        })
-        
-        for post in posts:
-            if not post.created_at or not post.text:
-                continue
-                
-            date_key = post.created_at.strftime('%Y-%m-%d')
-            post_text_lower = post.text.lower()
-            
-            keyword_mentions = 0
-            for keyword in keywords:
-                count = post_text_lower.count(keyword.lower())
-                if count > 0:
-                    daily_data[date_key]['keywords'][keyword] += count
-                    keyword_mentions += count
-            
-            if keyword_mentions > 0:
-                daily_data[date_key]['total_mentions'] += keyword_mentions
-                daily_data[date_key]['posts'] += 1
-        
-        # Format data
-        result_data = []
-        for date_str, data in daily_data.items():
-            if aggregation == 'mentions':
-                count = data['total_mentions']
-            elif aggregation == 'posts':
-                count = data['posts']
-            elif aggregation == 'diversity':
-                count = len([k for k, v in data['keywords'].items() if v > 0])
-            else:
-                count = data['total_mentions']
-            
-            result_data.append({
-                'date': date_str,
-                'count': count,
-                'keywords': dict(data['keywords']),
-                'details': {
-                    'total_mentions': data['total_mentions'],
-                    'posts': data['posts'],
-                    'top_issue': max(data['keywords'].items(), key=lambda x: x[1])[0] if data['keywords'] else None
-                }
-            })
-        
-        # Fill missing dates
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-        filled_data = []
-        
-        while current_date <= end_date_only:
-            date_str = current_date.strftime('%Y-%m-%d')
-            existing_data = next((d for d in result_data if d['date'] == date_str), None)
-            
-            if existing_data:
-                filled_data.append(existing_data)
-            else:
-                filled_data.append({
-                    'date': date_str,
-                    'count': 0,
-                    'keywords': {},
-                    'details': {'total_mentions': 0, 'posts': 0}
-                })
-            
-            current_date += timedelta(days=1)
+        # Project the shared single-pass window for (ward, days)
+        window = heatmap_window(ward_label, days)
+        start_date, end_date = window.start, window.end
+        filled_data = window.issue_series(keywords, aggregation)
         
         return jsonify({
             'success': True,
@@ -571,18 +210,42 @@ def geographic_heatmap():
         # Get date range
         start_date, end_date = get_date_range(days)
         
-        # Base query grouped by ward
-        query = db.session.query(
-            Post.city,
-            func.count(Post.id).label('post_count'),
-            func.count(func.distinct(Post.author_id)).label('author_count')
-        ).filter(
-            Post.created_at >= start_date,
-            Post.created_at <= end_date,
-            Post.city.isnot(None)
-        ).group_by(Post.city)
-        
-        results = query.all()
+        # Fresh ward_activity_windows rows (7/30/90 days) replace the live aggregates
+        age = fresh_view("ward_activity_windows") if days in ACTIVITY_WINDOWS else None
+        if age is not None:
+            v = ward_activity_windows
+            view_rows = db.session.query(v.c.city, v.c.posts, v.c.authors, v.c.party_mentions) \
+                .filter(v.c.window_days == days).all()
+            results = [(city, posts, authors) for city, posts, authors, _ in view_rows]
+            party_by_ward = {city: list((mentions or {}).items()) for city, _, _, mentions in view_rows}
+        else:
+            # Base query grouped by ward
+            query = db.session.query(
+                Post.city,
+                func.count(Post.id).label('post_count'),
+                func.count(func.distinct(Post.author_id)).label('author_count')
+            ).filter(
+                Post.created_at >= start_date,
+                Post.created_at <= end_date,
+                Post.city.isnot(None)
+            ).group_by(Post.city)
+
+            results = query.all()
+
+            # Party mentions for every ward in one grouped query
+            party_by_ward = {}
+            party_query = db.session.query(
+                Post.city,
+                Author.party,
+                func.count(Post.id).label('mentions')
+            ).join(Author, Post.author_id == Author.id).filter(
+                Post.created_at >= start_date,
+                Post.created_at <= end_date,
+                Post.city.isnot(None),
+                Author.party.isnot(None)
+            ).group_by(Post.city, Author.party)
+            for city, party, mentions in party_query:
+                party_by_ward.setdefault(city, []).append((party, mentions))
         
         # Process geographic data
         geographic_data = []
@@ -596,17 +259,7 @@ def geographic_heatmap():
             activity_score = post_count + (author_count * 2)  # Weight unique authors more
             
             # Get party breakdown for this ward
-            party_query = db.session.query(
-                Author.party,
-                func.count(Post.id).label('mentions')
-            ).join(Post, Post.author_id == Author.id).filter(
-                Post.city == ward,
-                Post.created_at >= start_date,
-                Post.created_at <= end_date,
-                Author.party.isnot(None)
-            ).group_by(Author.party)
-            
-            party_results = party_query.all()
+            party_results = party_by_ward.get(ward, [])
             party_breakdown = {}
             total_party_mentions = 0
             
@@ -633,6 +286,7 @@ def geographic_heatmap():
             
             geographic_data.append({
                 'ward': normalized_ward,
+                'ward_id': resolve_ward_id(ward),  # joins /geojson/topology geometry ids
                 'value': value,
                 'posts': post_count,
                 'authors': author_count,
@@ -647,7 +301,7 @@ def geographic_heatmap():
         # Sort by value descending
         geographic_data.sort(key=lambda x: x['value'], reverse=True)
         
-        return jsonify({
+        return mark_freshness(jsonify({
             'success': True,
             'data': geographic_data,
             'metadata': {
@@ -659,7 +313,7 @@ def geographic_heatmap():
                     'end': end_date.isoformat()
                 }
             }
-        })
+        }), "ward_activity_windows", age)
         
     except Exception as e:
         print(f"Geographic heatmap error: {e}")
@@ -683,64 +337,42 @@ def calendar_heatmap():
         metric = request.args.get('metric', 'posts')  # posts, mentions, alerts, activity
         
         # Normalize ward
+        ward_label = ward
+        view_clause = view_ward_filter(daily_ward_trends, ward)
         if ward != 'All':
             ward = normalize_ward(ward)
         
-        # Get date range
-        start_date, end_date = get_date_range(days)
-        
-        # Base query
-        query = db.session.query(
-            func.date(Post.created_at).label('date'),
-            func.count(Post.id).label('post_count')
-        ).filter(
-            Post.created_at >= start_date,
-            Post.created_at <= end_date
-        )
-        
-        # Apply ward filter
-        if ward != 'All':
-            query = query.filter(Post.city == ward)
-        
-        query = query.group_by(func.date(Post.created_at))
-        results = query.all()
-        
-        # Process calendar data
-        calendar_data = []
-        for date_obj, post_count in results:
-            if metric == 'posts':
-                value = post_count
-            else:
-                value = post_count  # Simplified for now
-            
-            calendar_data.append({
-                'date': date_obj.strftime('%Y-%m-%d'),
-                'count': value,
-                'details': {
-                    'posts': post_count
-                }
-            })
-        
-        # Fill in missing dates with zero values
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-        date_map = {item['date']: item for item in calendar_data}
-        filled_data = []
-        
-        while current_date <= end_date_only:
-            date_str = current_date.strftime('%Y-%m-%d')
-            if date_str in date_map:
-                filled_data.append(date_map[date_str])
-            else:
-                filled_data.append({
-                    'date': date_str,
-                    'count': 0,
-                    'details': {'posts': 0}
-                })
-            
-            current_date += timedelta(days=1)
+        age = fresh_view("daily_ward_trends") if days < DAILY_TRENDS_HORIZON_DAYS else None
+        if age is not None:
+            start_date, end_date = get_date_range(days)
+            v = daily_ward_trends
+            query = db.session.query(
+                v.c.trend_date,
+                func.sum(v.c.posts)
+            ).filter(
+                v.c.trend_date >= start_date.date(),
+                v.c.trend_date <= end_date.date()
+            )
+            if view_clause is not None:
+                query = query.filter(view_clause)
+            counts = {
+                day.strftime('%Y-%m-%d'): int(posts)
+                for day, posts in query.group_by(v.c.trend_date)
+            }
+            filled_data = []
+            current_date = start_date.date()
+            while current_date <= end_date.date():
+                date_str = current_date.strftime('%Y-%m-%d')
+                posts = counts.get(date_str, 0)
+                filled_data.append({'date': date_str, 'count': posts, 'details': {'posts': posts}})
+                current_date += timedelta(days=1)
+        else:
+            # Project the shared single-pass window for (ward, days)
+            window = heatmap_window(ward_label, days)
+            start_date, end_date = window.start, window.end
+            filled_data = window.calendar_series()
         
-        return jsonify({
+        return mark_freshness(jsonify({
             'success': True,
             'data': filled_data,
             'metadata': {
@@ -753,7 +385,7 @@ def calendar_heatmap():
                     'end': end_date.isoformat()
                 }
             }
-        })
+        }), "daily_ward_trends", age)
         
     except Exception as e:
         print(f"Calendar heatmap error: {e}")
@@ -0,0 +1,406 @@
+# backend/app/heatmap_engine.py
+"""
+Single-pass engine behind the /heatmap/* day series.
+
+The sentiment, party-activity, issues and calendar heat maps for a ward and
+window all derive from the same posts. :class:`HeatmapWindow` reads
+(created_at, text, author party) for the window once and keeps per-day
+aggregates; each endpoint is a projection of it with its own query
+parameters. Day series are filled from a dict, one step per day.
+
+Windows are cached per process by (ward, days). An entry is reused while the
+post watermark (row count and latest ``updated_at``, so inserts, edits and
+deletes all move it) is unchanged and it is younger than
+HEATMAP_CACHE_TTL_SECONDS; the TTL also bounds how far the window's
+"now - days" start may drift and how long an author's party change goes
+unseen.
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from flask import current_app
+from sqlalchemy import func
+
+from .extensions import db
+from .models import Author, Post
+from .utils.ward import normalize_ward, resolve_ward_id
+
+# Political party configuration
+PARTY_MAPPING = {
+    "BJP Telangana": "BJP",
+    "BRS Party": "BRS",
+    "Telangana Rashtra Samithi": "BRS",
+    "TRS": "BRS",
+    "Indian National Congress": "INC",
+    "Telangana Congress": "INC",
+    "Congress": "INC",
+    "AIMIM": "AIMIM",
+    "All India Majlis-e-Ittehad-ul-Muslimeen": "AIMIM",
+    "Aam Aadmi Party": "AAP",
+    "AAP": "AAP"
+}
+
+# Emotion categories for sentiment analysis
+EMOTION_CATEGORIES = [
+    'hopeful', 'angry', 'concerned', 'satisfied',
+    'disappointed', 'optimistic', 'frustrated'
+]
+
+# Simple keyword-based emotion extraction
+EMOTION_KEYWORDS = {
+    'hopeful': ['hope', 'hopeful', 'optimistic', 'positive', 'bright', 'promising'],
+    'angry': ['angry', 'furious', 'outraged', 'mad', 'enraged', 'livid'],
+    'concerned': ['concerned', 'worried', 'anxious', 'troubled', 'uneasy'],
+    'satisfied': ['satisfied', 'pleased', 'content', 'happy', 'glad'],
+    'disappointed': ['disappointed', 'let down', 'frustrated', 'upset'],
+    'optimistic': ['optimistic', 'confident', 'upbeat', 'encouraged'],
+    'frustrated': ['frustrated', 'annoyed', 'irritated', 'exasperated']
+}
+
+PARTY_SENTIMENT_KEYWORDS = {
+    'positive': ['good', 'great', 'excellent', 'success', 'achievement'],
+    'negative': ['bad', 'terrible', 'failure', 'corruption', 'scandal']
+}
+
+# Default political keywords for the issues heat map
+DEFAULT_ISSUE_KEYWORDS = [
+    'development', 'infrastructure', 'education', 'healthcare',
+    'corruption', 'unemployment', 'housing', 'transportation',
+    'water', 'electricity', 'roads', 'sanitation'
+]
+
+_PARTY_NAMES_LOWER = [(name.lower(), party) for name, party in PARTY_MAPPING.items()]
+_CACHE_MAX_ENTRIES = 64
+
+
+def normalize_party_name(party_name):
+    """Normalize party names to standard format"""
+    if not party_name:
+        return "Others"
+
+    party_clean = str(party_name).strip()
+    return PARTY_MAPPING.get(party_clean, "Others")
+
+
+def _emotion_counts(text_lower: str) -> Dict[str, int]:
+    emotions = {}
+    for emotion, keywords in EMOTION_KEYWORDS.items():
+        count = sum(1 for keyword in keywords if keyword in text_lower)
+        if count > 0:
+            emotions[emotion] = count
+    return emotions
+
+
+def extract_emotions_from_text(text):
+    """Extract emotion counts from post text using keyword matching"""
+    if not text:
+        return {}
+    return _emotion_counts(text.lower())
+
+
+def get_date_range(days):
+    """Get date range for the specified number of days"""
+    end_date = datetime.now(timezone.utc)
+    start_date = end_date - timedelta(days=days)
+    return start_date, end_date
+
+
+def _issue_counts(text_lower: str, keywords: Iterable[str]) -> Dict[str, int]:
+    counts = {}
+    for keyword in keywords:
+        count = text_lower.count(keyword.lower())
+        if count > 0:
+            counts[keyword] = count
+    return counts
+
+
+class _Day:
+    """Per-day aggregates every projection is computed from."""
+
+    __slots__ = ("posts", "emotions", "parties", "issues", "issue_posts")
+
+    def __init__(self):
+        self.posts = 0
+        self.emotions = Counter()
+        # party -> [mentions, sentiment_score, engagement]
+        self.parties = {}
+        self.issues = Counter()
+        # frozenset of matched issue keywords -> posts
+        self.issue_posts = Counter()
+
+    def add_issues(self, counts: Dict[str, int]):
+        if counts:
+            self.issues.update(counts)
+            self.issue_posts[frozenset(counts)] += 1
+
+    def issue_totals(self, keywords: List[str]):
+        wanted = set(keywords)
+        mentions = {k: self.issues[k] for k in keywords if self.issues.get(k)}
+        posts = sum(n for matched, n in self.issue_posts.items() if matched & wanted)
+        return mentions, posts
+
+
+class HeatmapWindow:
+    """Per-day aggregates for one (ward, days) window, built in a single scan."""
+
+    def __init__(self, ward: str, days: int, start: datetime, end: datetime, watermark: tuple = ()):
+        self.ward = ward
+        self.days = days
+        self.start = start
+        self.end = end
+        self.watermark = watermark
+        self.built_at = time.monotonic()
+        self.by_day: Dict[str, _Day] = {}
+
+    def _query(self, *columns):
+        query = db.session.query(*columns).filter(
+            Post.created_at >= self.start,
+            Post.created_at <= self.end
+        )
+        ward_clause = Post.ward_filter(self.ward)
+        if ward_clause is not None:
+            query = query.filter(ward_clause)
+        return query
+
+    @classmethod
+    def build(cls, ward: str, days: int, watermark: tuple = ()) -> "HeatmapWindow":
+        start, end = get_date_range(days)
+        window = cls(ward, days, start, end, watermark)
+        query = window._query(Post.created_at, Post.text, Author.party) \
+            .outerjoin(Author, Post.author_id == Author.id)
+        by_day = window.by_day
+        for created_at, text, author_party in query.yield_per(10_000):
+            if not created_at:
+                continue
+            date_key = created_at.strftime('%Y-%m-%d')
+            day = by_day.get(date_key)
+            if day is None:
+                day = by_day[date_key] = _Day()
+            day.posts += 1
+            text_lower = (text or "").lower()
+
+            day.emotions.update(_emotion_counts(text_lower))
+
+            # Determine party from author or post content
+            party = "Others"
+            if author_party:
+                party = normalize_party_name(author_party)
+            else:
+                for name_lower, normalized in _PARTY_NAMES_LOWER:
+                    if name_lower in text_lower:
+                        party = normalized
+                        break
+            sentiment_score = sum(text_lower.count(w) for w in PARTY_SENTIMENT_KEYWORDS['positive']) \
+                - sum(text_lower.count(w) for w in PARTY_SENTIMENT_KEYWORDS['negative'])
+            stats = day.parties.get(party)
+            if stats is None:
+                stats = day.parties[party] = [0, 0, 0.0]
+            stats[0] += 1
+            stats[1] += sentiment_score
+            # Simple engagement metric (based on text length)
+            stats[2] += len(text or "") / 100
+
+            if text:
+                day.add_issues(_issue_counts(text_lower, DEFAULT_ISSUE_KEYWORDS))
+        return window
+
+    def dates(self) -> Iterable[str]:
+        current, last = self.start.date(), self.end.date()
+        while current <= last:
+            yield current.strftime('%Y-%m-%d')
+            current += timedelta(days=1)
+
+    # ---- projections ------------------------------------------------------
+
+    def sentiment_series(self, emotions: List[str], aggregation: str) -> List[dict]:
+        wanted = set(emotions)
+        data = []
+        for date_str in self.dates():
+            day = self.by_day.get(date_str)
+            if day is None:
+                data.append({'date': date_str, aggregation: 0, 'total': 0, 'emotions': {},
+                             'posts': 0, 'details': {}})
+                continue
+            emotion_totals = {e: n for e, n in day.emotions.items() if e in wanted}
+            total = sum(emotion_totals.values())
+
+            # Calculate aggregate value based on aggregation method
+            if aggregation == 'average':
+                count = total / max(len(emotion_totals), 1)
+            elif aggregation == 'max':
+                count = max(emotion_totals.values()) if emotion_totals else 0
+            elif aggregation == 'count':
+                count = day.posts
+            else:
+                count = total
+
+            data.append({
+                'date': date_str,
+                aggregation: count,
+                'total': total,
+                'emotions': emotion_totals,
+                'posts': day.posts,
+                'details': {
+                    'dominant_emotion': max(emotion_totals.items(), key=lambda x: x[1])[0] if emotion_totals else None
+                }
+            })
+        return data
+
+    def party_series(self, parties: List[str], metric: str, view_mode: str, focus_party: str) -> List[dict]:
+        data = []
+        for date_str in self.dates():
+            day = self.by_day.get(date_str)
+            party_data = {
+                p: stats for p, stats in (day.parties.items() if day else ())
+                if p in parties or parties == []
+            }
+            if not party_data:
+                data.append({
+                    'date': date_str,
+                    'count': 0,
+                    'parties': {party: 0 for party in parties},
+                    'details': {'total_mentions': 0, 'party_breakdown': {}}
+                })
+                continue
+
+            # Calculate totals for share of voice
+            total_mentions = sum(stats[0] for stats in party_data.values())
+
+            party_metrics = {}
+            for party, (mentions, sentiment, engagement) in party_data.items():
+                share_of_voice = (mentions / max(total_mentions, 1)) * 100
+                avg_sentiment = sentiment / max(mentions, 1)
+                activity_score = (mentions * 0.4 + engagement * 0.3 + abs(avg_sentiment) * 0.3)
+                party_metrics[party] = {
+                    'mentions': mentions,
+                    'sentiment_score': round(avg_sentiment, 2),
+                    'engagement': round(engagement, 2),
+                    'share_of_voice': round(share_of_voice, 1),
+                    'activity_score': round(activity_score, 2)
+                }
+
+            # Determine count based on view mode and metric
+            dominant_party = None
+            if view_mode == 'single':
+                count = party_metrics.get(focus_party, {}).get(metric, 0)
+            elif view_mode == 'comparative':
+                # Use the party with highest activity for the day
+                dominant_party = max(party_metrics.keys(), key=lambda p: party_metrics[p].get(metric, 0))
+                count = party_metrics[dominant_party].get(metric, 0)
+            else:  # aggregate
+                count = sum(m.get(metric, 0) for m in party_metrics.values())
+
+            entry = {
+                'date': date_str,
+                'count': count,
+                'parties': {p: m.get(metric, 0) for p, m in party_metrics.items()},
+                'details': {
+                    'total_mentions': total_mentions,
+                    'party_breakdown': party_metrics
+                }
+            }
+            if view_mode == 'comparative':
+                entry['dominantParty'] = dominant_party
+            data.append(entry)
+        return data
+
+    def _custom_issue_days(self, keywords: List[str]) -> Dict[str, _Day]:
+        """Keywords outside the defaults need their own pass over the texts."""
+        by_day = {}
+        for created_at, text in self._query(Post.created_at, Post.text).yield_per(10_000):
+            if not created_at or not text:
+                continue
+            counts = _issue_counts(text.lower(), keywords)
+            if counts:
+                date_key = created_at.strftime('%Y-%m-%d')
+                by_day.setdefault(date_key, _Day()).add_issues(counts)
+        return by_day
+
+    def issue_series(self, keywords: List[str], aggregation: str) -> List[dict]:
+        by_day = self.by_day if set(keywords) <= set(DEFAULT_ISSUE_KEYWORDS) else self._custom_issue_days(keywords)
+        data = []
+        for date_str in self.dates():
+            day = by_day.get(date_str)
+            mentions, posts = day.issue_totals(keywords) if day else ({}, 0)
+            total_mentions = sum(mentions.values())
+            if not total_mentions:
+                data.append({
+                    'date': date_str,
+                    'count': 0,
+                    'keywords': {},
+                    'details': {'total_mentions': 0, 'posts': 0}
+                })
+                continue
+
+            if aggregation == 'posts':
+                count = posts
+            elif aggregation == 'diversity':
+                count = len(mentions)
+            else:
+                count = total_mentions
+
+            data.append({
+                'date': date_str,
+                'count': count,
+                'keywords': mentions,
+                'details': {
+                    'total_mentions': total_mentions,
+                    'posts': posts,
+                    'top_issue': max(mentions.items(), key=lambda x: x[1])[0]
+                }
+            })
+        return data
+
+    def calendar_series(self) -> List[dict]:
+        data = []
+        for date_str in self.dates():
+            day = self.by_day.get(date_str)
+            posts = day.posts if day else 0
+            data.append({'date': date_str, 'count': posts, 'details': {'posts': posts}})
+        return data
+
+
+# ---- cache ------------------------------------------------------------------
+
+_cache: "OrderedDict[tuple, HeatmapWindow]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _ward_key(ward: Optional[str]) -> str:
+    if not ward or ward.strip().lower() == "all":
+        return "All"
+    return resolve_ward_id(ward) or normalize_ward(ward)
+
+
+def post_watermark() -> tuple:
+    """(post count, latest updated_at) in one statement; both are index lookups."""
+    return tuple(db.session.query(func.count(Post.id), func.max(Post.updated_at)).one())
+
+
+def heatmap_window(ward: str, days: int) -> HeatmapWindow:
+    """Cached window for (ward, days), rebuilt when posts changed or it aged out."""
+    key = (_ward_key(ward), days)
+    watermark = post_watermark()
+    ttl = current_app.config.get("HEATMAP_CACHE_TTL_SECONDS", 120)
+    with _cache_lock:
+        window = _cache.get(key)
+        if window is not None and window.watermark == watermark and time.monotonic() - window.built_at < ttl:
+            _cache.move_to_end(key)
+            return window
+
+    window = HeatmapWindow.build(ward, days, watermark)
+    with _cache_lock:
+        _cache[key] = window
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return window
+
+
+def clear_heatmap_cache():
+    with _cache_lock:
+        _cache.clear()
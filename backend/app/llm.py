@@ -14,6 +14,8 @@ import time
 import logging
 import requests
 
+from provider_endpoints import provider_base_url
+
 log = logging.getLogger(__name__)
 
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "none").lower()
@@ -22,6 +24,7 @@ EMBED_PROVIDER = os.getenv("EMBED_PROVIDER", "openai").lower()
 EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-small")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = provider_base_url("openai") or "https://api.openai.com/v1"
 
 
 def get_embedding(text: str) -> list[float]:
@@ -29,7 +32,7 @@ def get_embedding(text: str) -> list[float]:
         if not OPENAI_API_KEY:
             raise RuntimeError("OPENAI_API_KEY not set for embeddings")
         r = requests.post(
-            "https://api.openai.com/v1/embeddings",
+            f"{OPENAI_BASE_URL}/embeddings",
             headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
             json={"model": EMBED_MODEL, "input": text},
             timeout=30,
@@ -46,7 +49,7 @@ def call_llm_json(system: str, user: str) -> dict:
         if not OPENAI_API_KEY:
             raise RuntimeError("OPENAI_API_KEY not set for LLM")
         r = requests.post(
-            "https://api.openai.com/v1/chat/completions",
+            f"{OPENAI_BASE_URL}/chat/completions",
             headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
             json={
                 "model": LLM_MODEL,
@@ -28,9 +28,12 @@ documentation for more details about the meaning of each field.
 
 from datetime import datetime, timezone, timedelta
 from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, validates
 from sqlalchemy.sql import func
 from werkzeug.security import check_password_hash, generate_password_hash
 from .extensions import db
+from .utils.ward import normalize_ward, resolve_ward_id
 
 class User(UserMixin, db.Model):
     """Basic user account with secure password handling."""
@@ -87,6 +90,9 @@ class User(UserMixin, db.Model):
 # --- Epaper (raw archive) ---
 class Epaper(db.Model):
     __tablename__ = "epaper"
+    __table_args__ = (
+        db.Index("ix_epaper_publication_date_id", "publication_date", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     publication_name = db.Column(db.String(100), nullable=False)
@@ -114,23 +120,101 @@ class Author(db.Model):
 
 class Post(db.Model):
     __tablename__ = "post"
+    __table_args__ = (
+        db.Index("ix_post_ward_id_created_at", "ward_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
     author_id = db.Column(db.Integer, db.ForeignKey('author.id'))
     author = db.relationship('Author', backref='posts')
     city = db.Column(db.String(120))
+    # Canonical GHMC ward id resolved from city; ward filters compare on this
+    ward_id = db.Column(db.String(64), index=True)
     emotion = db.Column(db.String(64))
+    # Who set emotion: "model" (local classifier) or "llm"; NULL for imported labels
+    emotion_source = db.Column(db.String(16))
     party = db.Column(db.String(64))
     created_at = db.Column(db.DateTime, nullable=False, index=True,
                            default=lambda: datetime.now(timezone.utc))
+    # Set on every insert and ORM/Core update; caches compare (count, max(updated_at))
+    updated_at = db.Column(db.DateTime, nullable=False, index=True, server_default=func.now(),
+                           default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
     # NEW: FK to Epaper
     epaper_id = db.Column(db.Integer, db.ForeignKey("epaper.id"), index=True)
 
+    @validates("city")
+    def _resolve_ward_id(self, key, city):
+        self.ward_id = resolve_ward_id(city)
+        return city
+
+    @classmethod
+    def ward_filter(cls, label):
+        """Equality filter for a ward label or alias; None for "All" or empty.
+
+        Labels that are not GHMC wards (e.g. "Hyderabad") fall back to a
+        case-insensitive match on the normalized city, which the
+        ix_post_city_lower expression index serves.
+        """
+        if not label or label.strip().lower() == "all":
+            return None
+        ward_id = resolve_ward_id(label)
+        if ward_id:
+            return cls.ward_id == ward_id
+        return func.lower(cls.city) == normalize_ward(label).lower()
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"<Post {self.id} city={self.city}>"
 
 
+db.Index("ix_post_city_lower", func.lower(Post.city))
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_ward_keywords(session, flush_context):
+    """Keep ward_keyword_daily in step with posts inserted, edited or deleted via the ORM."""
+    from .ward_keywords import apply_post_changes
+    apply_post_changes(session)
+
+
+@event.listens_for(Post.text, "set", active_history=True)
+@event.listens_for(Post.ward_id, "set", active_history=True)
+@event.listens_for(Post.created_at, "set", active_history=True)
+def _load_counted_value(target, value, oldvalue, initiator):
+    """Load the old value on assignment so the keyword hook can uncount it."""
+
+
+class WardKeywordDaily(db.Model):
+    """Token counts per ward and UTC day, maintained at ingest (see ward_keywords)."""
+
+    __tablename__ = "ward_keyword_daily"
+
+    ward_id = db.Column(db.String(64), primary_key=True)  # GHMC ward id or "all"
+    day = db.Column(db.Date, primary_key=True, index=True)
+    token = db.Column(db.String(64), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<WardKeywordDaily {self.ward_id} {self.day} {self.token}={self.count}>"
+
+
+class MaterializedViewRefresh(db.Model):
+    """Last refresh of each analytics materialized view (see analytics_views)."""
+
+    __tablename__ = "materialized_view_refresh"
+
+    view_name = db.Column(db.String(64), primary_key=True)
+    refreshed_at = db.Column(db.DateTime)  # last successful refresh (UTC)
+    attempted_at = db.Column(db.DateTime, nullable=False)
+    duration_ms = db.Column(db.Integer)
+    concurrent = db.Column(db.Boolean)
+    last_error = db.Column(db.Text)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<MaterializedViewRefresh {self.view_name} {self.refreshed_at}>"
+
+
 class Alert(db.Model):
     """Table for storing strategic alerts and briefings generated by the system."""
 
@@ -422,6 +506,9 @@ class GeopoliticalReport(db.Model):
     """
     
     __tablename__ = 'geopolitical_report'
+    __table_args__ = (
+        db.Index('ix_geopolitical_report_user_requested', 'user_id', 'requested_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     report_uuid = db.Column(db.String(36), unique=True, nullable=False, index=True)
@@ -10,13 +10,15 @@ import asyncio
 import json
 import logging
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 
 from flask import Blueprint, request, jsonify, Response, current_app
 from flask_login import login_required, current_user
+from sqlalchemy import func
 
 from .models import GeopoliticalReport, AIModelExecution, BudgetTracker, db
+from .pagination import InvalidCursor, before, decode_cursor, encode_cursor, next_cursor
 from .services.ai_orchestrator import get_orchestrator
 from .services.report_generator import get_report_generator, ReportRequest
 from .services.budget_manager import get_budget_manager
@@ -26,6 +28,9 @@ logger = logging.getLogger(__name__)
 
 multimodel_bp = Blueprint('multimodel', __name__, url_prefix='/api/v1/multimodel')
 
+# Characters of the query text shown in report lists
+REPORT_QUERY_PREVIEW_CHARS = 100
+
 
 @multimodel_bp.before_request
 def check_multimodel_enabled():
@@ -837,21 +842,37 @@ def list_reports():
     
     Query Parameters:
     - page: Page number (default: 1)
+    - cursor: next_cursor from a previous page; switches to keyset pagination,
+      which skips the totals (pass it empty to start from the newest report)
     - per_page: Items per page (default: 20, max: 100)
     - status: Filter by status
     - ward: Filter by ward
     - days: Reports from last N days
+    
+    Newest first by (requested_at, id). Only the list columns are loaded;
+    the query text preview is cut in SQL.
     """
     try:
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 20)), 100)
+        cursor = request.args.get('cursor')  # None: offset pagination
         status_filter = request.args.get('status')
         ward_filter = request.args.get('ward')
         days_filter = request.args.get('days')
         
         # Build query
-        query = db.session.query(GeopoliticalReport)\
-            .filter(GeopoliticalReport.user_id == current_user.id)
+        query = db.session.query(
+            GeopoliticalReport.id,
+            GeopoliticalReport.report_uuid,
+            func.substr(GeopoliticalReport.query_text, 1, REPORT_QUERY_PREVIEW_CHARS + 1).label('query_preview'),
+            GeopoliticalReport.ward_context,
+            GeopoliticalReport.status,
+            GeopoliticalReport.analysis_depth,
+            GeopoliticalReport.requested_at,
+            GeopoliticalReport.completed_at,
+            GeopoliticalReport.confidence_score,
+            GeopoliticalReport.total_cost_usd,
+        ).filter(GeopoliticalReport.user_id == current_user.id)
         
         if status_filter:
             query = query.filter(GeopoliticalReport.status == status_filter)
@@ -863,16 +884,43 @@ def list_reports():
             cutoff = datetime.now(timezone.utc) - timedelta(days=int(days_filter))
             query = query.filter(GeopoliticalReport.requested_at >= cutoff)
         
-        # Get paginated results
-        paginated = query.order_by(GeopoliticalReport.requested_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        query = query.order_by(GeopoliticalReport.requested_at.desc(), GeopoliticalReport.id.desc())
+        
+        if cursor is None:
+            paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+            rows = paginated.items
+            pagination = {
+                "page": page,
+                "per_page": per_page,
+                "total": paginated.total,
+                "pages": paginated.pages,
+                "has_next": paginated.has_next,
+                "has_prev": paginated.has_prev,
+                "next_cursor": (encode_cursor(rows[-1].requested_at, rows[-1].id)
+                                if paginated.has_next and rows else None)
+            }
+        else:
+            if cursor:
+                try:
+                    after = decode_cursor(cursor, datetime.fromisoformat, int)
+                except InvalidCursor:
+                    return jsonify({"error": "invalid cursor"}), 400
+                query = query.filter(before((GeopoliticalReport.requested_at, GeopoliticalReport.id), after))
+            rows, next_page = next_cursor(query.limit(per_page + 1).all(), per_page,
+                                          key=lambda r: (r.requested_at, r.id))
+            pagination = {
+                "per_page": per_page,
+                "next_cursor": next_page,
+                "has_next": next_page is not None
+            }
         
         # Format response
         reports = []
-        for report in paginated.items:
+        for report in rows:
+            preview = report.query_preview or ""
             reports.append({
                 "report_uuid": report.report_uuid,
-                "query": report.query_text[:100] + "..." if len(report.query_text) > 100 else report.query_text,
+                "query": preview[:REPORT_QUERY_PREVIEW_CHARS] + "..." if len(preview) > REPORT_QUERY_PREVIEW_CHARS else preview,
                 "ward_context": report.ward_context,
                 "status": report.status,
                 "analysis_depth": report.analysis_depth,
@@ -884,14 +932,7 @@ def list_reports():
         
         return jsonify({
             "reports": reports,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": paginated.total,
-                "pages": paginated.pages,
-                "has_next": paginated.has_next,
-                "has_prev": paginated.has_prev
-            },
+            "pagination": pagination,
             "filters": {
                 "status": status_filter,
                 "ward": ward_filter,
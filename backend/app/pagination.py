@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and
+base64url-wrapped so clients treat it as opaque. The next page filters on a
+row-value comparison against it, e.g. ``(publication_date, id) < (:d, :i)``,
+which an index on the same columns answers with a range scan, so page 500
+costs the same as page 1.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Callable, Sequence
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    """Cursor token that cannot be decoded for this endpoint."""
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *types: Callable) -> tuple:
+    """Decode ``token`` and convert each value with the matching entry of ``types``.
+
+    Use ``date.fromisoformat`` / ``datetime.fromisoformat`` for date keys.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(values)
+        return tuple(convert(v) for convert, v in zip(types, values))
+    except (ValueError, TypeError):
+        raise InvalidCursor("invalid cursor")
+
+
+def before(columns: Sequence, values: Sequence):
+    """Rows after the cursor when ordering by ``columns`` descending."""
+    return tuple_(*columns) < tuple_(*values)
+
+
+def next_cursor(rows: list, limit: int, key: Callable) -> tuple:
+    """Trim a ``limit + 1`` fetch to ``limit`` rows and return (rows, cursor or None)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -0,0 +1,222 @@
+"""
+Nightly precompute of strategist reports and ward summaries.
+
+Both are generated on demand (retrieval plus LLM), so the first user of the
+morning waits for every ward they open. The nightly pipeline
+(app/tasks_precompute.py) fills the strategist cache and the ``summary``
+table for every ward ahead of office hours:
+
+* :func:`plan_wards` orders wards by how often they were opened. Endpoints
+  call :func:`record_ward_access`, which counts the exact label requested
+  (the cache and summary keys are labels) in a Redis sorted set per kind.
+  Counts are halved after each nightly run so the order follows recent use.
+* :func:`assign_lanes` deals the plan round-robin into ``concurrency``
+  lanes. Each lane runs as a Celery chain, so at most that many wards hit
+  the LLM providers at once and the most-used wards finish first.
+* :func:`precompute_ward` checks the budget with ``BudgetManager`` before
+  each ward and skips it when the spend would exceed the limits.
+* Per-ward outcomes go to a Redis progress record; :func:`progress_report`
+  summarizes a run while it is going and after it finishes.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .extensions import redis_client
+from .utils.ward import load_ghmc_wards, resolve_ward_id
+
+log = logging.getLogger(__name__)
+
+ACCESS_KEYS = {
+    "strategist": "precompute:access:strategist",
+    "summary": "precompute:access:summary",
+}
+LATEST_RUN_KEY = "precompute:latest"
+RUN_KEY = "precompute:run:{run_id}"
+RUN_WARDS_KEY = "precompute:run:{run_id}:wards"
+RUN_RETENTION_SECONDS = 3 * 24 * 3600
+
+# Access counts are multiplied by this after each run
+ACCESS_DECAY = 0.5
+SUMMARY_WINDOWS = ("P7D",)
+
+
+def record_ward_access(kind: str, ward: str) -> None:
+    """Count one request for ``ward`` (as labelled by the client). Never raises."""
+    if not ward or kind not in ACCESS_KEYS:
+        return
+    try:
+        redis_client.zincrby(ACCESS_KEYS[kind], 1, ward.strip()[:64])
+    except Exception as e:
+        log.debug(f"Ward access not recorded: {e}")
+
+
+def _access_counts(kind: str) -> List[tuple]:
+    try:
+        return redis_client.zrevrange(ACCESS_KEYS[kind], 0, -1, withscores=True) or []
+    except Exception as e:
+        log.warning(f"Ward access counts unavailable, using ward order: {e}")
+        return []
+
+
+def plan_wards(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Every GHMC ward, most accessed first.
+
+    Each entry carries the label to precompute under for each kind: the
+    most requested label for that ward, else its canonical name. Labels
+    that do not resolve to a ward ("All", city names) are ignored.
+    """
+    plan: Dict[str, Dict[str, Any]] = {}
+    for number, ward in enumerate(load_ghmc_wards()):
+        plan.setdefault(ward["ward_id"], {
+            "ward_id": ward["ward_id"],
+            "strategist": ward["name"],
+            "summary": ward["name"],
+            "hits": 0.0,
+            "order": number,
+        })
+    for kind in ACCESS_KEYS:
+        seen = set()
+        for label, hits in _access_counts(kind):
+            entry = plan.get(resolve_ward_id(label))
+            if entry is None:
+                continue
+            if entry["ward_id"] not in seen:
+                entry[kind] = label
+                seen.add(entry["ward_id"])
+            entry["hits"] += float(hits)
+
+    ordered = sorted(plan.values(), key=lambda e: (-e["hits"], e["order"]))
+    for entry in ordered:
+        del entry["order"]
+    return ordered[:limit] if limit else ordered
+
+
+def decay_ward_access(factor: float = ACCESS_DECAY) -> None:
+    """Scale every access count by ``factor`` and drop the ones that faded out."""
+    for key in ACCESS_KEYS.values():
+        try:
+            redis_client.zunionstore(key, {key: factor})
+            redis_client.zremrangebyscore(key, "-inf", 0.1)
+        except Exception as e:
+            log.warning(f"Ward access decay failed for {key}: {e}")
+
+
+def assign_lanes(plan: List[Dict[str, Any]], concurrency: int) -> List[List[Dict[str, Any]]]:
+    """Deal ``plan`` round-robin into at most ``concurrency`` non-empty lanes."""
+    concurrency = max(1, min(int(concurrency), len(plan)))
+    return [plan[i::concurrency] for i in range(concurrency)] if plan else []
+
+
+def _budget_allows(estimated_cost_usd: float) -> bool:
+    from .async_helper import run_async
+    from .services.budget_manager import get_budget_manager
+
+    try:
+        return run_async(get_budget_manager().can_afford_request(estimated_cost_usd, "claude"))
+    except Exception as e:
+        # Same policy as BudgetManager: an unavailable budget check does not block work
+        log.warning(f"Budget check failed, continuing: {e}")
+        return True
+
+
+def precompute_ward(entry: Dict[str, Any], depth: str = "standard", report_ttl: int = 18 * 3600,
+                    estimated_cost_usd: float = 0.05) -> Dict[str, Any]:
+    """
+    Regenerate the strategist report and summaries for one plan entry.
+
+    Returns ``{"ward_id", "status", "seconds", "errors"}`` with status
+    ``ok``, ``partial``, ``failed`` or ``skipped_budget``. Never raises, so
+    one bad ward does not stop the rest of its lane.
+    """
+    from strategist.service import get_ward_report
+
+    from .tasks_summary import generate_summary
+
+    started = time.monotonic()
+    result = {"ward_id": entry["ward_id"], "status": "ok", "seconds": 0.0, "errors": []}
+    if not _budget_allows(estimated_cost_usd):
+        result["status"] = "skipped_budget"
+        return result
+
+    steps = 0
+    try:
+        data, _, _ = get_ward_report(entry["strategist"], depth, ttl=report_ttl, refresh=True)
+        steps += 1
+        if data.get("fallback_mode"):
+            result["errors"].append("strategist: fallback report")
+    except Exception as e:
+        result["errors"].append(f"strategist: {e}")
+    for window in SUMMARY_WINDOWS:
+        steps += 1
+        try:
+            generate_summary(entry["summary"], window)
+        except Exception as e:
+            result["errors"].append(f"summary {window}: {e}")
+
+    if result["errors"]:
+        result["status"] = "failed" if len(result["errors"]) >= steps else "partial"
+    result["seconds"] = round(time.monotonic() - started, 2)
+    return result
+
+
+# ---- progress ---------------------------------------------------------------
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def start_progress(run_id: str, plan: List[Dict[str, Any]], concurrency: int) -> None:
+    key = RUN_KEY.format(run_id=run_id)
+    redis_client.hset(key, mapping={
+        "run_id": run_id,
+        "total": len(plan),
+        "concurrency": concurrency,
+        "order": json.dumps([e["ward_id"] for e in plan]),
+        "started_at": _now(),
+    })
+    redis_client.expire(key, RUN_RETENTION_SECONDS)
+    redis_client.set(LATEST_RUN_KEY, run_id, ex=RUN_RETENTION_SECONDS)
+
+
+def record_progress(run_id: str, result: Dict[str, Any]) -> None:
+    key = RUN_WARDS_KEY.format(run_id=run_id)
+    redis_client.hset(key, result["ward_id"], json.dumps(result))
+    redis_client.expire(key, RUN_RETENTION_SECONDS)
+
+
+def finish_progress(run_id: str) -> Dict[str, Any]:
+    redis_client.hset(RUN_KEY.format(run_id=run_id), "finished_at", _now())
+    return progress_report(run_id)
+
+
+def progress_report(run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Counts by status, pending wards and timings for ``run_id`` (default: latest run)."""
+    run_id = run_id or redis_client.get(LATEST_RUN_KEY)
+    if not run_id:
+        return None
+    meta = redis_client.hgetall(RUN_KEY.format(run_id=run_id))
+    if not meta:
+        return None
+    done = {ward: json.loads(raw) for ward, raw in
+            (redis_client.hgetall(RUN_WARDS_KEY.format(run_id=run_id)) or {}).items()}
+
+    counts = {"ok": 0, "partial": 0, "failed": 0, "skipped_budget": 0}
+    for result in done.values():
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    order = json.loads(meta.get("order") or "[]")
+    return {
+        "run_id": run_id,
+        "total": int(meta.get("total", 0)),
+        "completed": len(done),
+        **counts,
+        "pending": [w for w in order if w not in done],
+        "failed_wards": {w: r["errors"] for w, r in done.items() if r["status"] in ("failed", "partial")},
+        "compute_seconds": round(sum(r.get("seconds", 0.0) for r in done.values()), 1),
+        "started_at": meta.get("started_at"),
+        "finished_at": meta.get("finished_at"),
+    }
@@ -1,41 +1,16 @@
 # backend/app/pulse_api.py
 from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta, timezone
-import re
 
 from .models import Post
 from .extensions import db
+from .utils.ward import normalize_ward
+from .ward_keywords import count_tokens, keyword_scope, top_keywords
 
 pulse_bp = Blueprint("pulse_bp", __name__, url_prefix="/api/v1")
 
-STOP = set("""
-the a an and or but of to in for on with at from by this that is are am be as it its was were
-will we our you your they their he she his her them us i about into after before over under
-again more most very can cannot could would should has have had do does did not no yes
-""".split())
-
-def _norm(label: str) -> str:
-    if not label:
-        return ""
-    s = re.sub(r"(?i)^ward\s*no\.?\s*\d+\s*", "", str(label))
-    s = re.sub(r"(?i)^ward\s*\d+\s*", "", s)
-    s = re.sub(r"(?i)^\d+\s*-\s*", "", s)
-    s = re.sub(r"(?i)^\d+\s+", "", s)
-    return re.sub(r"\s+", " ", s).strip()
-
-def _tokens(text: str):
-    return [
-        t for t in re.sub(r"(?:https?://\S+)|[#@]|[^a-z0-9\s]", " ", (text or "").lower()).split()
-        if len(t) > 2 and t not in STOP
-    ]
-
-def _make_briefing(ward: str, posts):
-    bag = {}
-    for p in (posts or [])[:200]:
-        txt = getattr(p, "text", None) or getattr(p, "content", None) or ""
-        for t in _tokens(txt):
-            bag[t] = bag.get(t, 0) + 1
-    keywords = [w for w, _ in sorted(bag.items(), key=lambda x: x[1], reverse=True)[:10]]
+def _make_briefing(ward: str, keywords, has_posts: bool):
+    keywords = [w for w, _ in keywords]
 
     key_issue = (
         f"Local sentiment centers on: {', '.join(keywords[:3])}."
@@ -74,7 +49,7 @@ def _make_briefing(ward: str, posts):
     ]
 
     return {
-        "status": "Actionable intelligence found." if posts else "No ward-specific intelligence in recent posts.",
+        "status": "Actionable intelligence found." if has_posts else "No ward-specific intelligence in recent posts.",
         "briefing": {
             "key_issue": key_issue,
             "our_angle": our_angle,
@@ -90,7 +65,7 @@ def pulse_for_ward(ward):
     except Exception:
         days = 14
 
-    ward_clean = _norm(ward)
+    ward_clean = normalize_ward(ward)
     since = datetime.utcnow() - timedelta(days=days)
 
     q = Post.query
@@ -98,10 +73,17 @@ def pulse_for_ward(ward):
     if hasattr(Post, "created_at"):
         q = q.filter(Post.created_at >= since)
 
-    if ward_clean.lower() != "all":
-        like = f"%{ward_clean}%"
-        q = q.filter(db.func.lower(Post.city).like(db.func.lower(like)))
-
-    posts = q.order_by(getattr(Post, "created_at", db.func.now()).desc()).all()
-    payload = _make_briefing(ward_clean, posts)
+    ward_clause = Post.ward_filter(ward)
+    if ward_clause is not None:
+        q = q.filter(ward_clause)
+
+    scope = keyword_scope(ward)
+    if scope:
+        keywords = top_keywords(scope, since, k=10)
+        has_posts = bool(keywords) or db.session.query(q.exists()).scalar()
+    else:
+        texts = [t for (t,) in q.with_entities(Post.text).order_by(Post.created_at.desc()).limit(200)]
+        keywords = count_tokens(texts, k=10)
+        has_posts = bool(texts)
+    payload = _make_briefing(ward_clean, keywords, has_posts)
     return jsonify(payload), 200
@@ -1,6 +1,25 @@
-from typing import List, Dict
-from sqlalchemy import text
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import literal, select, text, union_all
+from sqlalchemy.types import String
+
 from .extensions import db
+from .fulltext import text_search
+from .models import Epaper, Post
+
+log = logging.getLogger(__name__)
+
+# Reciprocal rank fusion constant (Cormack et al.): a hit contributes
+# 1 / (RRF_K + rank) from each list it appears in.
+RRF_K = 60
+# Each retriever returns this many candidates per fused result
+CANDIDATES_PER_RESULT = 4
+
 
 def ann_retrieve(ward: str, window_days: int = 7, k: int = 12) -> List[Dict]:
     """
@@ -18,3 +37,196 @@ def ann_retrieve(ward: str, window_days: int = 7, k: int = 12) -> List[Dict]:
     """)
     rows = db.session.execute(sql, {"ward": ward or "", "window_days": window_days, "k": k}).mappings().all()
     return [dict(r) for r in rows]
+
+
+def _lexical_hits(conn, dialect: str, query: str, ward: str, since: datetime, limit: int) -> List[tuple]:
+    """(source_type, source_id) by ts_rank_cd over post and epaper search vectors.
+
+    Posts are scoped to the ward; articles are not ward-tagged and always
+    compete, as in ann_retrieve.
+    """
+    match, rank, _ = text_search(query, dialect)
+    posts = select(literal("post", String).label("kind"), Post.id.label("id"), rank("post").label("rank")).where(
+        match("post"), Post.created_at >= since)
+    ward_clause = Post.ward_filter(ward)
+    if ward_clause is not None:
+        posts = posts.where(ward_clause)
+    epapers = select(literal("epaper", String).label("kind"), Epaper.id.label("id"), rank("epaper").label("rank")).where(
+        match("epaper"), Epaper.publication_date >= since.date())
+    hits = union_all(posts, epapers).subquery("hits")
+    rows = conn.execute(
+        select(hits.c.kind, hits.c.id).order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit)
+    ).all()
+    return [(kind, ident) for kind, ident in rows]
+
+
+_VECTOR_SQL = text("""
+  SELECT source_type, source_id, similarity
+  FROM (
+    SELECT source_type, source_id,
+           1 - (CAST(translate(vec, '{}', '[]') AS vector) <=> CAST(:query_vec AS vector)) AS similarity
+    FROM embedding
+    WHERE (ward = :ward OR :ward = '' OR ward IS NULL)
+      AND created_at >= :since
+      AND vec IS NOT NULL
+      AND vector_dims(CAST(translate(vec, '{}', '[]') AS vector)) = :dims
+  ) scored
+  WHERE similarity >= :min_similarity
+  ORDER BY similarity DESC
+  LIMIT :k
+""")
+
+
+def _parse_vec(raw) -> Optional[List[float]]:
+    if not raw:
+        return None
+    try:
+        return [float(x) for x in json.loads(str(raw).translate(str.maketrans("{}", "[]")))]
+    except (ValueError, TypeError):
+        return None
+
+
+def _vector_hits(conn, dialect: str, query_vec: Sequence[float], ward: str, since: datetime,
+                 min_similarity: float, limit: int) -> List[tuple]:
+    """(source_type, source_id, similarity) by cosine similarity over the embedding table.
+
+    embedding.vec is text (either pgvector "[..]" or array "{..}" literals),
+    cast to pgvector per row; other databases score in Python.
+    """
+    params = {"ward": ward or "", "since": since, "min_similarity": min_similarity, "k": limit}
+    if dialect == "postgresql":
+        params.update(query_vec=json.dumps(list(query_vec)), dims=len(query_vec))
+        return [tuple(r) for r in conn.execute(_VECTOR_SQL, params).all()]
+
+    rows = conn.execute(text("""
+      SELECT source_type, source_id, vec FROM embedding
+      WHERE (ward = :ward OR :ward = '' OR ward IS NULL) AND created_at >= :since AND vec IS NOT NULL
+    """), params).all()
+    q_norm = math.sqrt(sum(x * x for x in query_vec)) or 1.0
+    scored = []
+    for source_type, source_id, raw in rows:
+        vec = _parse_vec(raw)
+        if not vec or len(vec) != len(query_vec):
+            continue
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        similarity = sum(a * b for a, b in zip(vec, query_vec)) / (norm * q_norm)
+        if similarity >= min_similarity:
+            scored.append((source_type, source_id, similarity))
+    scored.sort(key=lambda r: r[2], reverse=True)
+    return scored[:limit]
+
+
+def rrf_fuse(ranked_lists: Sequence[Sequence[tuple]], k: int) -> List[tuple]:
+    """Fuse ranked lists of (source_type, source_id, ...) into the top-k keys by RRF score.
+
+    A source appearing in several lists (or twice in one) is counted once per
+    list at its best rank.
+    """
+    scores: Dict[tuple, float] = {}
+    for hits in ranked_lists:
+        seen = set()
+        for rank, hit in enumerate(hits, start=1):
+            key = (hit[0], int(hit[1]))
+            if key in seen:
+                continue
+            seen.add(key)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+    return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+
+
+def _hydrate(conn, keys: Sequence[tuple]) -> Dict[tuple, Dict]:
+    """Source text and citation meta for fused keys, one query per source type."""
+    from .tasks_embeddings import _make_doc_from_epaper, _make_doc_from_post
+
+    docs: Dict[tuple, Dict] = {}
+    post_ids = [i for kind, i in keys if kind == "post"]
+    epaper_ids = [i for kind, i in keys if kind == "epaper"]
+    if post_ids:
+        for row in conn.execute(
+            select(Post.id, Post.text, Post.city, Post.created_at).where(Post.id.in_(post_ids))
+        ).mappings():
+            body, meta = _make_doc_from_post(dict(row))
+            meta["date"] = row["created_at"].isoformat() if row["created_at"] else None
+            docs[("post", row["id"])] = {"ward": row["city"], "created_at": row["created_at"],
+                                        "text": body, "meta": meta}
+    if epaper_ids:
+        for row in conn.execute(
+            select(Epaper.id, Epaper.publication_name, Epaper.publication_date, Epaper.raw_text,
+                   Epaper.created_at).where(Epaper.id.in_(epaper_ids))
+        ).mappings():
+            body, meta = _make_doc_from_epaper(dict(row))
+            meta["date"] = row["publication_date"].isoformat() if row["publication_date"] else None
+            docs[("epaper", row["id"])] = {"ward": None, "created_at": row["created_at"],
+                                          "text": body, "meta": meta}
+    return docs
+
+
+def hybrid_retrieve(query: str, ward: str = "", window_days: int = 30, k: int = 12,
+                    query_vec: Optional[Sequence[float]] = None,
+                    embed: Optional[Callable[[str], List[float]]] = None,
+                    min_similarity: float = 0.0) -> List[Dict]:
+    """
+    Top-k sources for a query, fusing full-text and vector retrieval with RRF.
+
+    The full-text query (post/epaper search vectors) and the vector top-k
+    (embedding table) run concurrently on separate connections under
+    PostgreSQL; when ``query_vec`` is not given, the query embedding is
+    fetched while the full-text query runs. Recency (``window_days``), ward
+    and ``min_similarity`` are applied in SQL. Results are deduplicated by
+    (source_type, source_id) and carry ``text`` and ``meta`` for prompting,
+    plus ``score``, ``lexical_rank``, ``vector_rank`` and ``similarity``.
+    """
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=window_days)
+    limit = max(k * CANDIDATES_PER_RESULT, k)
+    engine = db.engine
+    dialect = engine.dialect.name
+
+    def lexical(conn):
+        return _lexical_hits(conn, dialect, query, ward, since, limit) if query.strip() else []
+
+    def vector(conn):
+        vec = query_vec
+        if vec is None and embed is not None and query.strip():
+            try:
+                vec = embed(query)
+            except Exception as e:
+                log.warning(f"Query embedding failed, using full-text hits only: {e}")
+                return []
+        if not vec or not any(vec):
+            return []
+        return _vector_hits(conn, dialect, vec, ward, since, min_similarity, limit)
+
+    if dialect == "postgresql":
+        def on_connection(fn):
+            with engine.connect() as conn:
+                return fn(conn)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            lexical_future = pool.submit(on_connection, lexical)
+            vector_future = pool.submit(on_connection, vector)
+            lexical_hits, vector_hits = lexical_future.result(), vector_future.result()
+    else:
+        # Single shared connection (SQLite): run in turn on the session
+        lexical_hits, vector_hits = lexical(db.session), vector(db.session)
+
+    fused = rrf_fuse([lexical_hits, vector_hits], k)
+    docs = _hydrate(db.session, [key for key, _ in fused])
+    lexical_rank = {(kind, int(i)): n for n, (kind, i) in enumerate(lexical_hits, start=1)}
+    vector_rank = {(kind, int(i)): (n, sim) for n, (kind, i, sim) in enumerate(vector_hits, start=1)}
+
+    items = []
+    for key, score in fused:
+        doc = docs.get(key)
+        if doc is None:  # embedding row whose source was deleted
+            continue
+        v_rank, similarity = vector_rank.get(key, (None, None))
+        items.append({
+            "source_type": key[0],
+            "source_id": key[1],
+            **doc,
+            "score": score,
+            "lexical_rank": lexical_rank.get(key),
+            "vector_rank": v_rank,
+            "similarity": similarity,
+        })
+    return items
@@ -11,7 +11,11 @@ from flask_login import login_required, login_user, logout_user, current_user
 from sqlalchemy import func
 
 from . import db
+from .compression import precompressed
 from .models import User, Post, Author, Alert
+from .utils.ward import GEOJSON_PATH, normalize_ward
+from .ward_tiles import load_ward_tile, snap_zoom, tile_path
+from .ward_keywords import count_tokens, keyword_scope, top_keywords
 from .security import (
     rate_limit, 
     InputValidator, 
@@ -25,10 +29,6 @@ main_bp = Blueprint("main", __name__, url_prefix="/api/v1")
 # ---------------------------
 # Helpers for Pulse
 # ---------------------------
-def normalize_ward_name(name: str) -> str:
-    return (name or "").strip()
-
-
 def window_start(days: int) -> datetime:
     return datetime.utcnow() - timedelta(days=max(1, min(days, 90)))
 
@@ -53,7 +53,7 @@ def compute_metrics(posts: list[dict]):
     }
 
 
-def build_briefing(ward: str, texts: list[str], sentiment_counts: Counter, author_counts: Counter):
+def build_briefing(ward: str, keywords: list[tuple[str, int]], sentiment_counts: Counter, author_counts: Counter):
     top_emotions = sentiment_counts.most_common(3)
     top_sources = author_counts.most_common(3)
 
@@ -67,14 +67,7 @@ def build_briefing(ward: str, texts: list[str], sentiment_counts: Counter, autho
         "and redirect to our concrete plan."
     )
 
-    # lightweight keywords (very simple heuristic)
-    from collections import Counter as C
-    tokens = []
-    for t in texts:
-        for w in (t.lower().replace(",", " ").replace(".", " ").split()):
-            if len(w) >= 4:
-                tokens.append(w)
-    top_keywords = [{"term": k, "count": n} for k, n in C(tokens).most_common(10)]
+    top_keywords = [{"term": k, "count": n} for k, n in keywords]
 
     recs = [
         {
@@ -209,8 +202,9 @@ def logout():
 def get_posts():
     ward = request.args.get("city") or request.args.get("ward") or ""
     q = Post.query
-    if ward:
-        q = q.filter(func.lower(Post.city).like(f"%{ward.lower()}%"))
+    ward_clause = Post.ward_filter(ward)
+    if ward_clause is not None:
+        q = q.filter(ward_clause)
     q = q.order_by(Post.created_at.desc()).limit(1000)
     rows = q.all()
 
@@ -230,16 +224,42 @@ def get_posts():
     return jsonify({"items": items})
 
 
+def _load_geojson(p: str):
+    """Serialized FeatureCollection from ``p``, or None if unreadable or empty."""
+    try:
+        with open(p, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        # Normalize: ensure FeatureCollection with "features" list
+        if isinstance(data, dict) and data.get("type") == "FeatureCollection":
+            feats = data.get("features") or []
+            # Quick sanity check
+            if isinstance(feats, list) and len(feats) > 0:
+                # Optional: stamp the source path for debugging
+                data["_source_path"] = p
+                return current_app.json.dumps(data).encode("utf-8")
+        # If structure is unexpected, try to wrap a flat features list
+        if isinstance(data, list):
+            wrapped = {"type": "FeatureCollection", "features": data, "_source_path": p}
+            return current_app.json.dumps(wrapped).encode("utf-8")
+
+        # If we got here, structure wasn’t usable
+        current_app.logger.warning("GeoJSON at %s has no features; using fallback.", p)
+    except Exception as e:
+        current_app.logger.error("Failed reading GeoJSON %s: %s", p, e)
+    return None
+
+
 @main_bp.route("/geojson", methods=["GET"])
 @login_required
 def get_geojson():
     """
     Serve GHMC ward boundaries from backend/app/data/ghmc_wards.geojson.
     Falls back to a tiny demo FeatureCollection if the file is missing or invalid.
-    """
-    import json, os
-    from flask import current_app
 
+    The file is parsed, serialized and compressed once per modification time
+    and served from memory with an ETag (see app.compression.precompressed).
+    """
     # 1) Prefer the app/data copy you have
     data_path = os.path.join(current_app.root_path, "data", "ghmc_wards.geojson")
 
@@ -253,27 +273,9 @@ def get_geojson():
 
     for p in paths_to_try:
         if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # Normalize: ensure FeatureCollection with "features" list
-                if isinstance(data, dict) and data.get("type") == "FeatureCollection":
-                    feats = data.get("features") or []
-                    # Quick sanity check
-                    if isinstance(feats, list) and len(feats) > 0:
-                        # Optional: stamp the source path for debugging
-                        data["_source_path"] = p
-                        return jsonify(data)
-                # If structure is unexpected, try to wrap a flat features list
-                if isinstance(data, list):
-                    wrapped = {"type": "FeatureCollection", "features": data, "_source_path": p}
-                    return jsonify(wrapped)
-
-                # If we got here, structure wasn’t usable
-                current_app.logger.warning("GeoJSON at %s has no features; using fallback.", p)
-            except Exception as e:
-                current_app.logger.error("Failed reading GeoJSON %s: %s", p, e)
+            blob = precompressed(("geojson", p), os.path.getmtime(p), lambda: _load_geojson(p))
+            if blob is not None:
+                return blob.response()
 
     # 3) Fallback so the map is never empty (two tiny wards near Hyderabad)
     fallback = {
@@ -295,14 +297,39 @@ def get_geojson():
     return jsonify(fallback)
 
 
+@main_bp.route("/geojson/topology", methods=["GET"])
+@login_required
+def get_ward_topology():
+    """
+    Simplified ward boundaries as TopoJSON for a map zoom level (?zoom=12).
+
+    Shared borders are stored once and simplified per zoom (see
+    app.ward_tiles); geometries are keyed by canonical ward id. The zoom snaps
+    to the coarsest built level at least as detailed as requested.
+    """
+    try:
+        zoom = snap_zoom(int(request.args.get("zoom", 12)))
+    except ValueError:
+        return jsonify({"error": "zoom must be an integer"}), 400
+
+    tile = tile_path(zoom)
+    version = (os.path.getmtime(GEOJSON_PATH) if os.path.exists(GEOJSON_PATH) else None,
+               os.path.getmtime(tile) if os.path.exists(tile) else None)
+    blob = precompressed(("ward-topology", zoom), version, lambda: load_ward_tile(zoom))
+    if blob is None:
+        return jsonify({"error": "ward boundaries unavailable"}), 404
+    return blob.response()
+
+
 @main_bp.route("/competitive-analysis", methods=["GET"])
 @login_required
 def competitive_analysis():
     ward = (request.args.get("city") or "").strip()
     q = db.session.query(Post.emotion, Author.name, func.count().label("n")) \
         .join(Author, Author.id == Post.author_id)
-    if ward and ward.lower() != "all":
-        q = q.filter(func.lower(Post.city).like(f"%{ward.lower()}%"))
+    ward_clause = Post.ward_filter(ward)
+    if ward_clause is not None:
+        q = q.filter(ward_clause)
     q = q.group_by(Post.emotion, Author.name)
     rows = q.all()
 
@@ -321,7 +348,7 @@ def competitive_analysis():
 @main_bp.route("/alerts/<ward>", methods=["GET"])
 @login_required
 def get_alerts(ward):
-    ward = normalize_ward_name(ward)
+    ward = normalize_ward(ward)
     row = Alert.query.filter(func.lower(Alert.ward) == ward.lower()).order_by(Alert.created_at.desc()).first()
     if not row:
         return jsonify([])  # Return empty array instead of 404
@@ -332,7 +359,7 @@ def get_alerts(ward):
 @login_required
 def trigger_analysis():
     data = request.get_json(silent=True) or {}
-    ward = normalize_ward_name(data.get("ward", ""))
+    ward = normalize_ward(data.get("ward", ""))
     if not ward:
         return jsonify({"message": "Ward is required."}), 400
     return jsonify({"message": f"Analysis triggered for {ward}."})
@@ -348,25 +375,26 @@ def pulse(ward):
         days = int(request.args.get("days", 14))
     except Exception:
         days = 14
-    ward = normalize_ward_name(ward)
+    ward = normalize_ward(ward)
     if not ward:
         return jsonify({"message": "Ward is required."}), 400
 
     start_dt = window_start(days)
 
-    q = db.session.query(Post, Author.name.label("author")) \
+    q = db.session.query(Post.text, Post.emotion, Post.created_at, Author.name.label("author")) \
         .outerjoin(Author, Author.id == Post.author_id) \
-        .filter(func.lower(Post.city).like(f"%{ward.lower()}%")) \
-        .filter(Post.created_at >= start_dt) \
-        .order_by(Post.created_at.desc()) \
-        .limit(800)
+        .filter(Post.created_at >= start_dt)
+    ward_clause = Post.ward_filter(ward)
+    if ward_clause is not None:
+        q = q.filter(ward_clause)
+    q = q.order_by(Post.created_at.desc()).limit(800)
     rows = q.all()
 
     posts = [{
-        "text": r.Post.text or "",
-        "emotion": r.Post.emotion or "",
+        "text": r.text or "",
+        "emotion": r.emotion or "",
         "author": r.author or "Unknown",
-        "created_at": r.Post.created_at.isoformat() if r.Post.created_at else None
+        "created_at": r.created_at.isoformat() if r.created_at else None
     } for r in rows]
 
     if not posts:
@@ -378,8 +406,11 @@ def pulse(ward):
         }), 200
 
     m = compute_metrics(posts)
-    from collections import Counter
-    briefing = build_briefing(ward, m["texts"], Counter(m["sentiments"]), Counter(m["top_authors"]))
+    # Ward and city-wide keywords come from the ingest-time count table over
+    # the whole window; other labels tokenize the posts already loaded.
+    scope = keyword_scope(ward)
+    keywords = top_keywords(scope, start_dt, k=10) if scope else count_tokens(m["texts"], k=10)
+    briefing = build_briefing(ward, keywords, Counter(m["sentiments"]), Counter(m["top_authors"]))
     return jsonify({
         "status": "ok",
         "ward": ward,
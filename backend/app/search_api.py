@@ -0,0 +1,157 @@
+# backend/app/search_api.py
+"""
+Full-text search over posts and epaper articles.
+
+GET /api/v1/search?q=<words>&ward=<label>&since=YYYY-MM-DD&until=YYYY-MM-DD
+                  &type=all|post|epaper&limit=20&cursor=<next_cursor>
+
+Matching and ranking come from :mod:`app.fulltext` (``websearch_to_tsquery``
+over the GIN-indexed search vectors on PostgreSQL, so quoted phrases, ``or``
+and ``-word`` work as in a web search box). Hits are ordered by
+``ts_rank_cd`` and paged with an opaque keyset cursor over (rank, type, id),
+so deep pages cost the same as the first. ``ts_headline`` runs only for the
+rows of the returned page.
+"""
+from datetime import date, datetime, time, timedelta
+
+from flask import Blueprint, jsonify, request
+from flask_login import login_required
+from sqlalchemy import and_, case, exists, literal, or_, select, union_all
+from sqlalchemy.types import String
+
+from .extensions import db
+from .fulltext import SOURCES, text_search
+from .models import Author, Epaper, Post
+from .pagination import InvalidCursor, decode_cursor, next_cursor
+
+search_bp = Blueprint("search_bp", __name__, url_prefix="/api/v1")
+
+MAX_QUERY_CHARS = 200
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+def _decode_search_cursor(token: str):
+    rank, kind, ident = decode_cursor(token, float, str, int)
+    if kind not in SOURCES:
+        raise InvalidCursor("invalid cursor")
+    return rank, kind, ident
+
+
+def _parse_day(name: str):
+    value = (request.args.get(name) or "").strip()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise _BadRequest(f"{name} must be YYYY-MM-DD")
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+@search_bp.route("/search", methods=["GET"])
+@login_required
+def search():
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+    if len(q) > MAX_QUERY_CHARS:
+        return jsonify({"error": f"q must be at most {MAX_QUERY_CHARS} characters"}), 400
+
+    kind = (request.args.get("type") or "all").strip().lower()
+    if kind != "all" and kind not in SOURCES:
+        return jsonify({"error": "type must be all, post or epaper"}), 400
+    sources = SOURCES if kind == "all" else (kind,)
+
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    try:
+        since = _parse_day("since")
+        until = _parse_day("until")
+        cursor = request.args.get("cursor")
+        after = _decode_search_cursor(cursor) if cursor else None
+    except (_BadRequest, InvalidCursor) as e:
+        return jsonify({"error": str(e)}), 400
+
+    match, rank, headline = text_search(q, db.engine.dialect.name)
+    ward_clause = Post.ward_filter(request.args.get("ward"))
+
+    branches = []
+    if "post" in sources:
+        post_hits = select(
+            literal("post", String).label("kind"), Post.id.label("id"), rank("post").label("rank"),
+        ).where(match("post"))
+        if ward_clause is not None:
+            post_hits = post_hits.where(ward_clause)
+        if since:
+            post_hits = post_hits.where(Post.created_at >= datetime.combine(since, time.min))
+        if until:
+            post_hits = post_hits.where(Post.created_at < datetime.combine(until + timedelta(days=1), time.min))
+        branches.append(post_hits)
+    if "epaper" in sources:
+        epaper_hits = select(
+            literal("epaper", String).label("kind"), Epaper.id.label("id"), rank("epaper").label("rank"),
+        ).where(match("epaper"))
+        if ward_clause is not None:
+            # An article belongs to the wards of the posts mirrored from it
+            epaper_hits = epaper_hits.where(exists().where(Post.epaper_id == Epaper.id, ward_clause))
+        if since:
+            epaper_hits = epaper_hits.where(Epaper.publication_date >= since)
+        if until:
+            epaper_hits = epaper_hits.where(Epaper.publication_date <= until)
+        branches.append(epaper_hits)
+
+    hits = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery("hits")
+    order = (hits.c.rank.desc(), hits.c.kind.asc(), hits.c.id.desc())
+    page = select(hits)
+    if after:
+        r, k, i = after
+        page = page.where(or_(
+            hits.c.rank < r,
+            and_(hits.c.rank == r, or_(hits.c.kind > k, and_(hits.c.kind == k, hits.c.id < i))),
+        ))
+    page = page.order_by(*order).limit(limit + 1).subquery("page")
+
+    # One round trip: rank and page in the inner query, then join the page's
+    # rows for display fields and highlighted snippets.
+    document = case((page.c.kind == "post", Post.text), else_=Epaper.raw_text)
+    rows = db.session.execute(
+        select(
+            page.c.kind, page.c.id, page.c.rank,
+            Post.city, Post.ward_id, Post.created_at, Author.name.label("author"),
+            Epaper.publication_name, Epaper.publication_date,
+            headline(document).label("snippet"),
+        )
+        .select_from(page)
+        .outerjoin(Post, and_(page.c.kind == "post", Post.id == page.c.id))
+        .outerjoin(Author, Author.id == Post.author_id)
+        .outerjoin(Epaper, and_(page.c.kind == "epaper", Epaper.id == page.c.id))
+        .order_by(page.c.rank.desc(), page.c.kind.asc(), page.c.id.desc())
+    ).all()
+
+    rows, cursor = next_cursor(rows, limit, key=lambda row: (row.rank, row.kind, row.id))
+
+    results = []
+    for row in rows:
+        item = {"type": row.kind, "id": row.id, "rank": round(float(row.rank or 0.0), 6), "snippet": row.snippet}
+        if row.kind == "post":
+            item.update(ward=row.city, ward_id=row.ward_id, author=row.author, created_at=_iso(row.created_at))
+        else:
+            item.update(publication_name=row.publication_name, publication_date=_iso(row.publication_date))
+        results.append(item)
+
+    return jsonify({
+        "query": q,
+        "results": results,
+        "next_cursor": cursor,
+    })
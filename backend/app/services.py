@@ -6,6 +6,7 @@ import tweepy
 from newsapi import NewsApiClient
 from datetime import datetime, timedelta
 from .models import db, Post, Author, Alert
+from .emotion_classifier import label_texts
 
 # --- CONFIGURATION ---
 
@@ -134,29 +135,10 @@ def generate_proactive_analysis(context_level, context_name):
 # --- AI & DATA PROCESSING SERVICES ---
 
 def get_emotion_and_drivers(text):
-    """Analyzes text to extract emotion and drivers."""
-    # This function remains as is from Phase 1 & 2
-    if not model:
-        logging.error("AI model is not available. Cannot analyze text.")
-        return {"emotion": "Unknown", "drivers": []}
-    
-    prompt = f"""
-    Analyze the following text from a social media post or news article in a political context for Hyderabad, India.
-    Your task is to identify the primary emotion and the specific topics or entities driving that emotion.
-    Text: "{text}"
-    Provide your response as a JSON object with two keys:
-    1. "emotion": A single string representing the dominant emotion.
-    2. "drivers": A JSON list of short, specific strings (1-3 words each) that are the key topics, names, or issues causing the emotion.
-    """
+    """Analyzes text to extract emotion and drivers (local classifier; LLM only when it is unsure)."""
     try:
-        logging.debug(f"Sending text for analysis: '{text[:100]}...'")
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace('```json', '').replace('```', '').strip()
-        result = json.loads(cleaned_response)
-        if isinstance(result, dict) and 'emotion' in result and 'drivers' in result:
-            return result
-        else:
-            return {"emotion": "Unknown", "drivers": []}
+        label = label_texts([text])[0]
+        return {"emotion": label.emotion, "drivers": label.drivers}
     except Exception as e:
         logging.error(f"Error in get_emotion_and_drivers: {e}")
         return {"emotion": "Error", "drivers": []}
@@ -40,6 +40,7 @@ from .llama_client import LlamaClient
 from .gemini_client import GeminiClient
 from .budget_manager import get_budget_manager
 from .quality_validator import QualityValidator
+from .semantic_cache import CacheHit, SemanticCache, record_cache_hit
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +105,7 @@ class AIOrchestrator:
         self.gemini_client = GeminiClient()
         self.budget_manager = get_budget_manager()
         self.quality_validator = QualityValidator()
+        self.semantic_cache = SemanticCache("orchestrator")
         
         # Circuit breaker states
         self._circuit_breakers = {
@@ -431,6 +433,17 @@ class AIOrchestrator:
             # Analyze query for optimal routing
             analysis = await self.analyze_query(query, context)
             
+            # Serve a cached answer to the same ward question, even when over budget
+            ward = (context or {}).get('ward_context')
+            cache_type = self._cache_query_type(analysis)
+            cache_variant = self._cache_variant(context)
+            hit = self.semantic_cache.lookup(ward, cache_type, query, cache_variant)
+            if hit:
+                response = self._response_from_cache(hit, start_time)
+                await record_cache_hit(hit, "geopolitical_analysis", response.latency_ms, request_id)
+                logger.info(f"Semantic cache hit for {ward} (similarity {hit.similarity:.2f}, saved ${hit.saved_usd:.4f})")
+                return response
+            
             # Check budget constraints
             if not await self.budget_manager.can_afford_request(analysis.estimated_cost_usd):
                 return AIResponse(
@@ -445,6 +458,8 @@ class AIOrchestrator:
                     error="Budget limit exceeded"
                 )
             
+            context = self.with_ward_profile(context)
+            
             # Try each recommended model in order
             last_error = None
             for provider in analysis.recommended_models:
@@ -469,6 +484,12 @@ class AIOrchestrator:
                     # Reset circuit breaker on success
                     self._circuit_breakers[provider]["failures"] = 0
                     
+                    if not response.error:
+                        self.semantic_cache.store(
+                            ward, cache_type, query, self._cache_payload(response),
+                            response.cost_usd, provider.value, response.model_used, cache_variant
+                        )
+                    
                     total_time = int((time.time() - start_time) * 1000)
                     logger.info(f"Successfully generated response using {provider.value} in {total_time}ms")
                     
@@ -523,6 +544,65 @@ class AIOrchestrator:
                 error=str(e)
             )
 
+    @staticmethod
+    def _cache_query_type(analysis: QueryAnalysis) -> str:
+        """Semantic cache bucket for a query; also selects the cache TTL bounds."""
+        if analysis.complexity == QueryComplexity.URGENT:
+            return "urgent"
+        if analysis.requires_real_time_data:
+            return "real_time_intelligence"
+        return analysis.complexity.value
+
+    @staticmethod
+    def _cache_variant(context: Optional[Dict[str, Any]]) -> str:
+        """Context parameters that change the answer, so they never share cache entries."""
+        context = context or {}
+        return "|".join(str(context.get(key, "")) for key in
+                        ("analysis_depth", "strategic_context", "region_context"))
+
+    def with_ward_profile(self, context: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Attach the ward snapshot as ``ward_profile``; Claude sends it as a cacheable prompt block."""
+        if not context or not context.get('ward_context') or 'ward_profile' in context:
+            return context
+        try:
+            from ..tasks_summary import fetch_ward_meta
+            profile = fetch_ward_meta(context['ward_context'])
+        except Exception as e:
+            logger.debug(f"Ward profile unavailable for {context['ward_context']}: {e}")
+            return context
+        return {**context, 'ward_profile': profile} if profile else context
+
+    @staticmethod
+    def _cache_payload(response: AIResponse) -> Dict[str, Any]:
+        return {
+            "content": response.content,
+            "model_used": response.model_used,
+            "tokens_used": response.tokens_used,
+            "quality_score": response.quality_score,
+            "metadata": response.metadata,
+        }
+
+    @staticmethod
+    def _response_from_cache(hit: CacheHit, start_time: float) -> AIResponse:
+        payload = hit.payload
+        return AIResponse(
+            content=payload["content"],
+            model_used=payload["model_used"],
+            provider=ModelProvider(hit.provider),
+            tokens_used={"input": 0, "output": 0},
+            cost_usd=0.0,
+            latency_ms=int((time.time() - start_time) * 1000),
+            quality_score=payload.get("quality_score", 0.0),
+            metadata={
+                **(payload.get("metadata") or {}),
+                "cached": True,
+                "cache_hit": True,
+                "similarity": hit.similarity,
+                "cached_query": hit.cached_query,
+                "saved_usd": hit.saved_usd,
+            }
+        )
+
     async def _call_model(self, provider: ModelProvider, query: str, 
                          context: Dict[str, Any], request_id: str) -> AIResponse:
         """Call specific AI model provider."""
@@ -583,7 +663,9 @@ Last error: {last_error[:200] if last_error else 'Unknown error'}
                 model_name=response.model_used,
                 input_tokens=response.tokens_used.get("input", 0),
                 output_tokens=response.tokens_used.get("output", 0),
-                total_tokens=sum(response.tokens_used.values()),
+                total_tokens=response.tokens_used.get("total") or sum(response.tokens_used.values()),
+                prompt_caching_enabled=bool(response.metadata.get("prompt_caching_enabled")),
+                cached_tokens=response.tokens_used.get("cached", 0),
                 latency_ms=response.latency_ms,
                 cost_usd=response.cost_usd,
                 success_status=status,
@@ -191,6 +191,21 @@ class BudgetManager:
             logger.error(f"Error recording spend: {e}")
             db.session.rollback()
 
+    async def record_cache_savings(self, saved_usd: float, service: str) -> None:
+        """Record the cost avoided by serving a cached response."""
+        
+        try:
+            current_tracker = await self._get_or_create_current_tracker()
+            current_tracker.cache_savings_usd = (current_tracker.cache_savings_usd or Decimal("0")) + Decimal(str(saved_usd))
+            
+            db.session.commit()
+            
+            logger.debug(f"Recorded cache savings: ${saved_usd:.4f} for {service}")
+            
+        except Exception as e:
+            logger.error(f"Error recording cache savings: {e}")
+            db.session.rollback()
+
     async def record_failed_request(self, service: str, error: str) -> None:
         """Record a failed request for budget tracking."""
         
@@ -253,6 +268,7 @@ class BudgetManager:
                 "service_breakdown": service_breakdown,
                 "operation_breakdown": current_tracker.spend_by_operation or {},
                 "circuit_breaker_active": current_tracker.circuit_breaker_active,
+                "cache_savings_usd": float(current_tracker.cache_savings_usd or 0),
                 "last_updated": current_tracker.updated_at.isoformat()
             }
             
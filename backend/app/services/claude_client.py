@@ -11,11 +11,12 @@ import json
 import logging
 import time
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone
 
 import anthropic
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
+from provider_endpoints import sdk_base_url_kwargs
 
 from .base_client import BaseAIClient, AIResponse, ModelProvider
 
@@ -27,7 +28,9 @@ class ClaudeClient(BaseAIClient):
     Claude client optimized for political intelligence and strategic analysis.
     
     Features:
-    - Prompt caching for system instructions (90% cost reduction)
+    - Prompt-prefix caching: system prompt, ward profile and retrieved context
+      are sent as stable leading blocks with cache-control markers, so repeated
+      ward queries read them from cache (90% cheaper, faster time to first token)
     - Strategic analysis prompts for political intelligence
     - Multi-turn conversation support for complex queries
     - Cost tracking and budget management
@@ -41,7 +44,7 @@ class ClaudeClient(BaseAIClient):
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
         
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = AsyncAnthropic(api_key=self.api_key, **sdk_base_url_kwargs("anthropic"))
         
         # Claude-specific configuration
         self.config = {
@@ -59,6 +62,7 @@ class ClaudeClient(BaseAIClient):
             "input_cost_per_token": 0.000003,   # $3/M input tokens
             "output_cost_per_token": 0.000015,  # $15/M output tokens  
             "cached_input_discount": 0.9,       # 90% discount for cached content
+            "cache_write_premium": 0.25,        # cache writes cost 25% more than input
         }
         
         # System prompt for political intelligence (will be cached)
@@ -123,14 +127,14 @@ Respond with professional intelligence briefing format suitable for campaign str
         start_time = time.time()
         
         try:
-            # Build context-aware user prompt
-            user_prompt = self._build_user_prompt(query, context)
+            # Stable blocks first (system prompt, ward profile, retrieved context), query last
+            system_blocks, user_blocks = self._build_prompt_blocks(query, context)
             
             # Prepare messages for Claude API
             messages = [
                 {
                     "role": "user", 
-                    "content": user_prompt
+                    "content": user_blocks
                 }
             ]
             
@@ -140,21 +144,25 @@ Respond with professional intelligence briefing format suitable for campaign str
                 extra_headers["anthropic-beta"] = "prompt-caching-2024-07-31"
             
             # Call Claude API with retry logic
-            response = await self._call_with_retries(messages, extra_headers)
+            response = await self._call_with_retries(system_blocks, messages, extra_headers)
             
             # Process response and calculate metrics
             content = response.content[0].text if response.content else ""
             
-            # Calculate token usage and costs
-            input_tokens = response.usage.input_tokens
+            # Token usage: input_tokens excludes the prefix read from or written to the cache
+            uncached_tokens = response.usage.input_tokens
             output_tokens = response.usage.output_tokens
-            cached_tokens = getattr(response.usage, 'cache_read_input_tokens', 0)
+            cached_tokens = getattr(response.usage, 'cache_read_input_tokens', 0) or 0
+            cache_write_tokens = getattr(response.usage, 'cache_creation_input_tokens', 0) or 0
+            input_tokens = uncached_tokens + cached_tokens + cache_write_tokens
             
-            # Calculate costs with caching discount
-            cached_input_cost = cached_tokens * self.pricing["input_cost_per_token"] * (1 - self.pricing["cached_input_discount"])
-            regular_input_cost = (input_tokens - cached_tokens) * self.pricing["input_cost_per_token"]
+            # Calculate costs with caching discount and cache-write premium
+            input_rate = self.pricing["input_cost_per_token"]
+            cached_input_cost = cached_tokens * input_rate * (1 - self.pricing["cached_input_discount"])
+            cache_write_cost = cache_write_tokens * input_rate * (1 + self.pricing["cache_write_premium"])
+            regular_input_cost = uncached_tokens * input_rate
             output_cost = output_tokens * self.pricing["output_cost_per_token"]
-            total_cost = cached_input_cost + regular_input_cost + output_cost
+            total_cost = cached_input_cost + cache_write_cost + regular_input_cost + output_cost
             
             latency_ms = int((time.time() - start_time) * 1000)
             
@@ -165,7 +173,9 @@ Respond with professional intelligence briefing format suitable for campaign str
             metadata = {
                 "model_version": self.config["model"],
                 "temperature": self.config["temperature"],
+                "prompt_caching_enabled": self.config["enable_prompt_caching"],
                 "cached_tokens": cached_tokens,
+                "cache_write_tokens": cache_write_tokens,
                 "cache_efficiency": cached_tokens / max(input_tokens, 1),
                 "analysis_type": context.get("analysis_depth", "standard") if context else "standard",
                 "ward_context": context.get("ward_context") if context else None,
@@ -184,6 +194,7 @@ Respond with professional intelligence briefing format suitable for campaign str
                     "input": input_tokens,
                     "output": output_tokens,
                     "cached": cached_tokens,
+                    "cache_write": cache_write_tokens,
                     "total": input_tokens + output_tokens
                 },
                 cost_usd=round(total_cost, 6),
@@ -200,7 +211,7 @@ Respond with professional intelligence briefing format suitable for campaign str
                 content="",
                 model_used=self.config["model"],
                 provider=ModelProvider.CLAUDE,
-                tokens_used={"input": 0, "output": 0, "cached": 0, "total": 0},
+                tokens_used={"input": 0, "output": 0, "cached": 0, "cache_write": 0, "total": 0},
                 cost_usd=0.0,
                 latency_ms=int((time.time() - start_time) * 1000),
                 quality_score=0.0,
@@ -208,19 +219,60 @@ Respond with professional intelligence briefing format suitable for campaign str
                 error=str(e)
             )
 
+    def _build_prompt_blocks(self, query: str, context: Dict[str, Any] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Build system and user content blocks, most stable material first.
+        
+        The system prompt, the ward block and the retrieved-context block each
+        end a cacheable prefix: every request for the same ward reuses the first
+        two, and calls that share retrieved context (primary analysis and
+        synthesis of one report) reuse all three. Everything that varies per
+        request (query, depth, timestamp) comes after the last marker.
+        """
+        system_blocks = [self._text_block(self.system_prompt, cache=True)]
+        user_blocks = []
+        
+        ward_block = self._build_ward_block(context)
+        if ward_block:
+            user_blocks.append(self._text_block(ward_block, cache=True))
+        
+        retrieved = (context or {}).get("retrieved_context")
+        if retrieved:
+            if not isinstance(retrieved, str):
+                retrieved = json.dumps(retrieved, sort_keys=True, ensure_ascii=False, default=str)
+            user_blocks.append(self._text_block(f"**Retrieved Context**:\n{retrieved}", cache=True))
+        
+        user_blocks.append(self._text_block(self._build_user_prompt(query, context)))
+        return system_blocks, user_blocks
+
+    def _text_block(self, text: str, cache: bool = False) -> Dict[str, Any]:
+        block = {"type": "text", "text": text}
+        if cache and self.config["enable_prompt_caching"]:
+            block["cache_control"] = {"type": "ephemeral"}
+        return block
+
+    def _build_ward_block(self, context: Dict[str, Any] = None) -> Optional[str]:
+        """Ward and region context; identical text for every request about the same ward."""
+        if not context or not (context.get("ward_context") or context.get("ward_profile")):
+            return None
+        
+        parts = []
+        if context.get("ward_context"):
+            parts.append(f"**Ward Context**: {context['ward_context']}")
+        if context.get("region_context"):
+            parts.append(f"**Region**: {context['region_context']}")
+        if context.get("ward_profile"):
+            profile = json.dumps(context["ward_profile"], sort_keys=True, ensure_ascii=False, default=str)
+            parts.append(f"**Ward Profile**:\n{profile}")
+        return "\n\n".join(parts)
+
     def _build_user_prompt(self, query: str, context: Dict[str, Any] = None) -> str:
-        """Build context-aware user prompt for political intelligence query."""
+        """Build the per-request part of the prompt: instructions, time and query."""
         
         prompt_parts = []
         
         # Add context information if available
         if context:
-            if context.get("ward_context"):
-                prompt_parts.append(f"**Ward Context**: {context['ward_context']}")
-            
-            if context.get("region_context"):
-                prompt_parts.append(f"**Region**: {context['region_context']}")
-            
             if context.get("analysis_depth"):
                 depth_map = {
                     "quick": "Provide a concise 2-3 paragraph analysis focusing on key points",
@@ -267,7 +319,11 @@ Respond with professional intelligence briefing format suitable for campaign str
         
         return "\n\n".join(prompt_parts)
 
-    async def _call_with_retries(self, messages: List[Dict], extra_headers: Dict) -> Any:
+    def _messages_api(self):
+        # anthropic<0.16 (the version pinned in requirements.txt) serves the Messages API under client.beta
+        return getattr(self.client, "messages", None) or self.client.beta.messages
+
+    async def _call_with_retries(self, system_blocks: List[Dict], messages: List[Dict], extra_headers: Dict) -> Any:
         """Call Claude API with retry logic and error handling."""
         
         last_error = None
@@ -278,15 +334,11 @@ Respond with professional intelligence briefing format suitable for campaign str
                 if attempt > 0:
                     await asyncio.sleep(2 ** attempt)
                 
-                response = self.client.messages.create(
+                response = await self._messages_api().create(
                     model=self.config["model"],
                     max_tokens=self.config["max_tokens"],
                     temperature=self.config["temperature"],
-                    system=[{
-                        "type": "text",
-                        "text": self.system_prompt,
-                        "cache_control": {"type": "ephemeral"} if self.config["enable_prompt_caching"] else None
-                    }],
+                    system=system_blocks,
                     messages=messages,
                     extra_headers=extra_headers
                 )
@@ -0,0 +1,624 @@
+"""
+Local stand-in for the AI providers, for offline latency and throughput tests.
+
+One aiohttp server speaks the request/response shapes (including streaming)
+of every provider the backend calls, each under its own path prefix:
+
+    /gemini      POST /v1beta/models/{model}:generateContent | :streamGenerateContent | :embedContent
+    /openai      POST /v1/chat/completions | /v1/embeddings
+    /perplexity  POST /chat/completions
+    /anthropic   POST /v1/messages
+    /llama       POST /v1/chat/completions   (OpenAI-compatible, as served by vLLM)
+
+Each provider has a latency distribution (time to first token), a streaming
+rate, 500 and 429 error rates and an output-token range. Token usage is
+counted per provider and model and exposed at ``GET /_fake/stats``; profiles
+can be changed live with ``POST /_fake/config``.
+
+The Anthropic endpoint also simulates prompt caching: each ``cache_control``
+marker ends a prefix that, once long enough (``min_cache_tokens``), is kept
+for ``cache_ttl_seconds`` and refreshed on every hit. Usage reports
+``cache_creation_input_tokens`` / ``cache_read_input_tokens`` like the real
+API, and prompt processing (``prefill_tokens_per_sec``) is
+``cached_prefill_speedup`` times faster for cached tokens.
+
+Point the app at it with ``FAKE_AI_PROVIDER_URL`` (see
+``provider_endpoints.py``) and run::
+
+    python -m app.services.fake_provider --port 8900 --profile profile.json
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("gemini", "openai", "perplexity", "anthropic", "llama")
+
+DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "gemini": {"latency": {"dist": "lognormal", "median_ms": 900, "p95_ms": 2500}, "tokens_per_sec": 120,
+               "error_rate": 0.0, "rate_limit_rate": 0.0, "output_tokens": [300, 900]},
+    "openai": {"latency": {"dist": "lognormal", "median_ms": 600, "p95_ms": 1800}, "tokens_per_sec": 90,
+               "error_rate": 0.0, "rate_limit_rate": 0.0, "output_tokens": [200, 700]},
+    "perplexity": {"latency": {"dist": "lognormal", "median_ms": 2500, "p95_ms": 6000}, "tokens_per_sec": 70,
+                   "error_rate": 0.0, "rate_limit_rate": 0.0, "output_tokens": [300, 900]},
+    "anthropic": {"latency": {"dist": "lognormal", "median_ms": 1200, "p95_ms": 3500}, "tokens_per_sec": 80,
+                  "error_rate": 0.0, "rate_limit_rate": 0.0, "output_tokens": [400, 1200],
+                  "prefill_tokens_per_sec": 4000, "cached_prefill_speedup": 10,
+                  "min_cache_tokens": 1024, "cache_ttl_seconds": 300},
+    "llama": {"latency": {"dist": "normal", "median_ms": 1500, "p95_ms": 2500}, "tokens_per_sec": 40,
+              "error_rate": 0.0, "rate_limit_rate": 0.0, "output_tokens": [200, 600]},
+}
+
+# Fields the strategist and report paths read when they ask for JSON output
+JSON_RESPONSE_TEMPLATE = {
+    "queries": [
+        "{ward} political news recent",
+        "{ward} development issues infrastructure",
+        "{ward} opposition activity",
+    ],
+    "strategic_overview": "Synthetic strategic overview for {ward}.",
+    "key_intelligence": [{"category": "development", "content": "Synthetic intelligence item", "impact_level": "medium"}],
+    "opportunities": [{"description": "Synthetic opportunity", "timeline": "48h", "priority": 2}],
+    "threats": [{"description": "Synthetic threat", "severity": "medium", "mitigation_strategy": "Monitor"}],
+    "recommended_actions": [{"category": "immediate", "description": "Synthetic action", "timeline": "24h", "priority": 1}],
+    "overall_sentiment": "neutral",
+    "sentiment_score": 0.5,
+    "entities": {"people": [], "organizations": [], "locations": ["{ward}"]},
+    "confidence_score": 0.72,
+    "confidence": 0.72,
+    "source_citations": [],
+}
+
+FILLER_WORDS = (
+    "ward residents report continued concern about drainage and road repairs while "
+    "party workers intensify door to door outreach ahead of the municipal polls and "
+    "local leaders weigh development promises against anti incumbency sentiment"
+).split()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough provider-agnostic token count (about four characters per token)."""
+    return max(1, math.ceil(len(text or "") / 4))
+
+
+class ProviderProfile:
+    """Latency, error and token behaviour for one provider."""
+
+    def __init__(self, settings: Dict[str, Any], rng: random.Random):
+        self.settings = settings
+        self.rng = rng
+
+    def first_token_delay(self) -> float:
+        """Seconds before the first byte, drawn from the configured distribution."""
+        latency = self.settings.get("latency", {})
+        dist = latency.get("dist", "fixed")
+        median = float(latency.get("median_ms", 0))
+        p95 = float(latency.get("p95_ms", median))
+        if dist == "fixed" or median <= 0:
+            ms = median
+        elif dist == "uniform":
+            ms = self.rng.uniform(float(latency.get("min_ms", 0)), float(latency.get("max_ms", 2 * median)))
+        elif dist == "normal":
+            ms = self.rng.gauss(median, max(p95 - median, 0.0) / 1.645)
+        else:  # lognormal: median and p95 pin mu and sigma
+            sigma = math.log(p95 / median) / 1.645 if p95 > median else 0.0
+            ms = self.rng.lognormvariate(math.log(median), sigma)
+        return max(ms, 0.0) / 1000.0
+
+    def token_interval(self) -> float:
+        rate = float(self.settings.get("tokens_per_sec", 0) or 0)
+        return 1.0 / rate if rate > 0 else 0.0
+
+    def prefill_delay(self, uncached_tokens: int, cached_tokens: int = 0) -> float:
+        """Seconds spent reading the prompt; cached prefix tokens are cheaper to process."""
+        rate = float(self.settings.get("prefill_tokens_per_sec", 0) or 0)
+        if rate <= 0:
+            return 0.0
+        speedup = float(self.settings.get("cached_prefill_speedup", 1) or 1)
+        return (uncached_tokens + cached_tokens / speedup) / rate
+
+    def output_tokens(self, max_tokens: Optional[int]) -> int:
+        low, high = self.settings.get("output_tokens", [200, 600])
+        count = self.rng.randint(int(low), int(high))
+        return min(count, int(max_tokens)) if max_tokens else count
+
+    def fault(self) -> Optional[int]:
+        """HTTP status to fail with (429 or 500), or None to succeed."""
+        roll = self.rng.random()
+        if roll < float(self.settings.get("rate_limit_rate", 0)):
+            return 429
+        if roll < float(self.settings.get("rate_limit_rate", 0)) + float(self.settings.get("error_rate", 0)):
+            return 500
+        return None
+
+
+class UsageLedger:
+    """Per provider/model request, token and error accounting."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.time()
+        self.rows = defaultdict(lambda: {
+            "requests": 0, "streamed": 0, "input_tokens": 0, "output_tokens": 0,
+            "cache_read_tokens": 0, "cache_write_tokens": 0, "errors": 0, "rate_limited": 0, "latency_ms_total": 0.0,
+        })
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def enter(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def leave(self):
+        self.in_flight -= 1
+
+    def record(self, provider: str, model: str, status: int, input_tokens: int = 0,
+               output_tokens: int = 0, latency_ms: float = 0.0, streamed: bool = False,
+               cache_read_tokens: int = 0, cache_write_tokens: int = 0):
+        row = self.rows[(provider, model)]
+        row["requests"] += 1
+        row["streamed"] += int(streamed)
+        row["input_tokens"] += input_tokens
+        row["output_tokens"] += output_tokens
+        row["cache_read_tokens"] += cache_read_tokens
+        row["cache_write_tokens"] += cache_write_tokens
+        row["latency_ms_total"] += latency_ms
+        if status == 429:
+            row["rate_limited"] += 1
+        elif status >= 400:
+            row["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        providers = []
+        for (provider, model), row in sorted(self.rows.items()):
+            ok = row["requests"] - row["errors"] - row["rate_limited"]
+            providers.append({
+                "provider": provider,
+                "model": model,
+                **{k: v for k, v in row.items() if k != "latency_ms_total"},
+                "avg_latency_ms": round(row["latency_ms_total"] / ok, 1) if ok else None,
+            })
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "providers": providers,
+        }
+
+
+class FakeProviderServer:
+    """aiohttp application serving every fake provider endpoint."""
+
+    def __init__(self, profiles: Optional[Dict[str, Dict[str, Any]]] = None, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.profiles: Dict[str, ProviderProfile] = {}
+        self.ledger = UsageLedger()
+        self.prompt_cache: Dict[str, float] = {}  # prefix key -> expiry (monotonic seconds)
+        self.configure(profiles or {})
+
+    def configure(self, overrides: Dict[str, Dict[str, Any]]):
+        for provider in PROVIDERS:
+            current = self.profiles[provider].settings if provider in self.profiles else DEFAULT_PROFILES[provider]
+            settings = copy.deepcopy(current)
+            for key, value in (overrides.get(provider) or overrides.get("*") or {}).items():
+                if isinstance(value, dict) and isinstance(settings.get(key), dict):
+                    settings[key].update(value)
+                else:
+                    settings[key] = value
+            self.profiles[provider] = ProviderProfile(settings, self.rng)
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_post("/gemini/{version}/models/{model_action}", self.gemini)
+        app.router.add_post("/openai/v1/chat/completions", self.openai_chat)
+        app.router.add_post("/openai/v1/embeddings", self.openai_embeddings)
+        app.router.add_post("/perplexity/chat/completions", self.perplexity_chat)
+        app.router.add_post("/anthropic/v1/messages", self.anthropic_messages)
+        app.router.add_post("/llama/v1/chat/completions", self.llama_chat)
+        app.router.add_get("/_fake/stats", self.stats)
+        app.router.add_get("/_fake/config", self.get_config)
+        app.router.add_post("/_fake/config", self.set_config)
+        app.router.add_post("/_fake/reset", self.reset)
+        return app
+
+    # -- admin -------------------------------------------------------------
+
+    async def stats(self, request):
+        return web.json_response(self.ledger.snapshot())
+
+    async def get_config(self, request):
+        return web.json_response({p: prof.settings for p, prof in self.profiles.items()})
+
+    async def set_config(self, request):
+        self.configure(await request.json())
+        return await self.get_config(request)
+
+    async def reset(self, request):
+        self.ledger.reset()
+        self.prompt_cache.clear()
+        return web.json_response({"status": "reset"})
+
+    # -- shared plumbing ----------------------------------------------------
+
+    async def _call(self, request, provider: str, model: str, prompt: str, max_tokens: Optional[int],
+                    want_json: bool, stream: bool, emit, input_tokens: Optional[int] = None,
+                    cached_tokens: int = 0, cache_write_tokens: int = 0):
+        """Apply latency/faults, build the completion text and hand it to ``emit``.
+
+        ``cached_tokens`` of the prompt were read from the prompt cache and
+        ``cache_write_tokens`` written to it; ``emit`` receives the rest.
+        """
+        profile = self.profiles[provider]
+        input_tokens = input_tokens if input_tokens is not None else estimate_tokens(prompt)
+        uncached_tokens = max(0, input_tokens - cached_tokens - cache_write_tokens)
+        started = time.perf_counter()
+        self.ledger.enter()
+        try:
+            await asyncio.sleep(profile.first_token_delay())
+            status = profile.fault()
+            if status is not None:
+                self.ledger.record(provider, model, status, input_tokens=input_tokens, streamed=stream)
+                return self._error(provider, status)
+
+            await asyncio.sleep(profile.prefill_delay(input_tokens - cached_tokens, cached_tokens))
+            output_tokens = profile.output_tokens(max_tokens)
+            text = self._completion_text(prompt, output_tokens, want_json)
+            response = await emit(request, model, text, uncached_tokens, output_tokens, profile)
+            self.ledger.record(provider, model, 200, input_tokens, output_tokens,
+                               (time.perf_counter() - started) * 1000, streamed=stream,
+                               cache_read_tokens=cached_tokens, cache_write_tokens=cache_write_tokens)
+            return response
+        finally:
+            self.ledger.leave()
+
+    def _prompt_cache_usage(self, provider: str, model: str,
+                            blocks: List[Tuple[str, bool]]) -> Tuple[int, int, int]:
+        """``(input_tokens, cache_read, cache_write)`` for prompt ``blocks`` of ``(text, cache_marker)``.
+
+        Each marker ends a candidate prefix. The longest live cached prefix is
+        read (and its TTL refreshed); longer marked prefixes are written.
+        """
+        settings = self.profiles[provider].settings
+        min_tokens = int(settings.get("min_cache_tokens", 1024))
+        ttl = float(settings.get("cache_ttl_seconds", 300))
+        now = time.monotonic()
+
+        digest = hashlib.sha256(f"{provider}:{model}".encode())
+        total = 0
+        breakpoints: List[Tuple[str, int]] = []
+        for text, marked in blocks:
+            digest.update(b"\x00" + text.encode("utf-8"))
+            total += estimate_tokens(text)
+            if marked and total >= min_tokens:
+                breakpoints.append((digest.hexdigest(), total))
+
+        cache_read = 0
+        for key, tokens in breakpoints:
+            if self.prompt_cache.get(key, 0.0) > now:
+                cache_read = tokens
+        for key, _ in breakpoints:
+            self.prompt_cache[key] = now + ttl
+        cache_write = breakpoints[-1][1] - cache_read if breakpoints else 0
+        return total, cache_read, cache_write
+
+    def _error(self, provider: str, status: int) -> web.Response:
+        message = "Rate limit exceeded" if status == 429 else "Internal server error"
+        headers = {"Retry-After": "1"} if status == 429 else {}
+        if provider == "gemini":
+            body = {"error": {"code": status, "message": message,
+                              "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+        elif provider == "anthropic":
+            body = {"type": "error", "error": {"type": "rate_limit_error" if status == 429 else "api_error", "message": message}}
+        else:
+            body = {"error": {"message": message, "type": "rate_limit_exceeded" if status == 429 else "server_error", "code": status}}
+        return web.json_response(body, status=status, headers=headers)
+
+    def _completion_text(self, prompt: str, output_tokens: int, want_json: bool) -> str:
+        if want_json:
+            ward = self._guess_ward(prompt)
+            return json.dumps(json.loads(json.dumps(JSON_RESPONSE_TEMPLATE).replace("{ward}", ward)))
+        words = [FILLER_WORDS[i % len(FILLER_WORDS)] for i in range(max(1, int(output_tokens * 0.75)))]
+        return " ".join(words).capitalize() + "."
+
+    @staticmethod
+    def _guess_ward(prompt: str) -> str:
+        marker = "ward:"
+        lowered = prompt.lower()
+        if marker in lowered:
+            tail = prompt[lowered.index(marker) + len(marker):].strip().splitlines()
+            if tail and tail[0].strip():
+                return tail[0].strip()[:60].replace('"', "")
+        return "the ward"
+
+    @staticmethod
+    def _chunks(text: str, output_tokens: int) -> List[Tuple[str, int]]:
+        """Split text into roughly token-sized streaming deltas."""
+        words = text.split(" ")
+        per_chunk = max(1, len(words) // max(1, min(output_tokens, 64)))
+        pieces = [" ".join(words[i:i + per_chunk]) + " " for i in range(0, len(words), per_chunk)]
+        pieces[-1] = pieces[-1].rstrip()
+        tokens_each = max(1, output_tokens // len(pieces))
+        return [(p, tokens_each) for p in pieces]
+
+    async def _sse(self, request, events, profile: ProviderProfile, output_tokens: int) -> web.StreamResponse:
+        """Write (event, payload) pairs as server-sent events at the profile's token rate."""
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        interval = profile.token_interval()
+        for event, payload, tokens in events:
+            if tokens and interval:
+                await asyncio.sleep(interval * tokens)
+            prefix = f"event: {event}\n" if event else ""
+            data = payload if isinstance(payload, str) else json.dumps(payload)
+            await response.write(f"{prefix}data: {data}\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def _pace(self, profile: ProviderProfile, output_tokens: int):
+        """Non-streaming responses still take generation time."""
+        interval = profile.token_interval()
+        if interval:
+            await asyncio.sleep(interval * output_tokens)
+
+    # -- Gemini -------------------------------------------------------------
+
+    async def gemini(self, request):
+        model, _, action = request.match_info["model_action"].partition(":")
+        body = await request.json()
+        if action in ("embedContent", "batchEmbedContents"):
+            return self._gemini_embed(model, action, body)
+        if action not in ("generateContent", "streamGenerateContent"):
+            raise web.HTTPNotFound()
+
+        prompt = " ".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        config = body.get("generationConfig") or body.get("generation_config") or {}
+        want_json = (config.get("responseMimeType") or config.get("response_mime_type")) == "application/json"
+        max_tokens = config.get("maxOutputTokens") or config.get("max_output_tokens")
+        stream = action == "streamGenerateContent"
+
+        async def emit(request, model, text, input_tokens, output_tokens, profile):
+            usage = {"promptTokenCount": input_tokens, "candidatesTokenCount": output_tokens,
+                     "totalTokenCount": input_tokens + output_tokens}
+
+            def chunk(piece, finish=None, with_usage=False):
+                candidate = {"content": {"parts": [{"text": piece}], "role": "model"}, "index": 0}
+                if finish:
+                    candidate["finishReason"] = finish
+                payload = {"candidates": [candidate], "modelVersion": model}
+                if with_usage:
+                    payload["usageMetadata"] = usage
+                return payload
+
+            if not stream:
+                await self._pace(profile, output_tokens)
+                return web.json_response(chunk(text, "STOP", True))
+            pieces = self._chunks(text, output_tokens)
+            events = [(None, chunk(p, "STOP" if i == len(pieces) - 1 else None, i == len(pieces) - 1), t)
+                      for i, (p, t) in enumerate(pieces)]
+            if request.query.get("alt") == "sse":
+                return await self._sse(request, events, profile, output_tokens)
+            await self._pace(profile, output_tokens)
+            return web.json_response([e[1] for e in events])
+
+        return await self._call(request, "gemini", model, prompt, max_tokens, want_json, stream, emit)
+
+    def _gemini_embed(self, model: str, action: str, body: Dict[str, Any]) -> web.Response:
+        requests_ = body.get("requests") if action == "batchEmbedContents" else [body]
+        embeddings = []
+        tokens = 0
+        for req in requests_:
+            text = " ".join(p.get("text", "") for p in (req.get("content") or {}).get("parts", []))
+            tokens += estimate_tokens(text)
+            embeddings.append({"values": _embedding(text, int(req.get("outputDimensionality") or 768))})
+        self.ledger.record("gemini", model, 200, input_tokens=tokens)
+        if action == "batchEmbedContents":
+            return web.json_response({"embeddings": embeddings})
+        return web.json_response({"embedding": embeddings[0]})
+
+    # -- OpenAI-compatible (OpenAI, Perplexity, Llama) ------------------------
+
+    async def openai_chat(self, request):
+        return await self._openai_style(request, "openai")
+
+    async def perplexity_chat(self, request):
+        return await self._openai_style(request, "perplexity")
+
+    async def llama_chat(self, request):
+        return await self._openai_style(request, "llama")
+
+    async def _openai_style(self, request, provider: str):
+        body = await request.json()
+        model = body.get("model", provider)
+        prompt = "\n".join(_message_text(m.get("content")) for m in body.get("messages", []))
+        want_json = (body.get("response_format") or {}).get("type") == "json_object"
+        stream = bool(body.get("stream"))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        async def emit(request, model, text, input_tokens, output_tokens, profile):
+            usage = {"prompt_tokens": input_tokens, "completion_tokens": output_tokens,
+                     "total_tokens": input_tokens + output_tokens}
+            extra = {}
+            if provider == "perplexity":
+                extra["citations"] = [
+                    {"title": f"Synthetic source {i}", "url": f"https://news.example.com/{i}",
+                     "source": "news.example.com", "date": time.strftime("%Y-%m-%d"), "relevance": 0.7}
+                    for i in range(1, 4)
+                ]
+            if not stream:
+                await self._pace(profile, output_tokens)
+                return web.json_response({
+                    "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": usage, **extra,
+                })
+
+            def chunk(delta, finish=None):
+                return {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+
+            pieces = self._chunks(text, output_tokens)
+            events = [(None, chunk({"role": "assistant", "content": ""}), 0)]
+            events += [(None, chunk({"content": p}), t) for p, t in pieces]
+            final = chunk({}, "stop")
+            if (body.get("stream_options") or {}).get("include_usage") or provider != "openai":
+                final["usage"] = usage
+            events += [(None, {**final, **extra}, 0), (None, "[DONE]", 0)]
+            return await self._sse(request, events, profile, output_tokens)
+
+        return await self._call(request, provider, model, prompt, body.get("max_tokens"), want_json, stream, emit)
+
+    async def openai_embeddings(self, request):
+        body = await request.json()
+        inputs = body.get("input")
+        inputs = [inputs] if isinstance(inputs, str) else list(inputs or [])
+        dims = int(body.get("dimensions") or 1536)
+        model = body.get("model", "text-embedding-3-small")
+        tokens = sum(estimate_tokens(t) for t in inputs)
+        profile = self.profiles["openai"]
+        await asyncio.sleep(profile.first_token_delay() / 4)
+        status = profile.fault()
+        if status is not None:
+            self.ledger.record("openai", model, status, input_tokens=tokens)
+            return self._error("openai", status)
+        self.ledger.record("openai", model, 200, input_tokens=tokens)
+        return web.json_response({
+            "object": "list",
+            "model": model,
+            "data": [{"object": "embedding", "index": i, "embedding": _embedding(t, dims)} for i, t in enumerate(inputs)],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    # -- Anthropic ----------------------------------------------------------
+
+    async def anthropic_messages(self, request):
+        body = await request.json()
+        model = body.get("model", "claude")
+        blocks = _content_blocks(body.get("system")) + [
+            block for m in body.get("messages", []) for block in _content_blocks(m.get("content"))]
+        prompt = "\n".join(text for text, _ in blocks)
+        stream = bool(body.get("stream"))
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        input_tokens, cache_read, cache_write = self._prompt_cache_usage("anthropic", model, blocks)
+
+        async def emit(request, model, text, input_tokens, output_tokens, profile):
+            message = {"id": message_id, "type": "message", "role": "assistant", "model": model,
+                       "stop_reason": None, "stop_sequence": None}
+            usage = {"input_tokens": input_tokens, "cache_creation_input_tokens": cache_write,
+                     "cache_read_input_tokens": cache_read}
+            if not stream:
+                await self._pace(profile, output_tokens)
+                return web.json_response({
+                    **message, "content": [{"type": "text", "text": text}], "stop_reason": "end_turn",
+                    "usage": {**usage, "output_tokens": output_tokens},
+                })
+            events = [
+                ("message_start", {"type": "message_start", "message": {
+                    **message, "content": [], "usage": {**usage, "output_tokens": 1}}}, 0),
+                ("content_block_start", {"type": "content_block_start", "index": 0,
+                                         "content_block": {"type": "text", "text": ""}}, 0),
+            ]
+            events += [("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                "delta": {"type": "text_delta", "text": p}}, t)
+                       for p, t in self._chunks(text, output_tokens)]
+            events += [
+                ("content_block_stop", {"type": "content_block_stop", "index": 0}, 0),
+                ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                   "usage": {"output_tokens": output_tokens}}, 0),
+                ("message_stop", {"type": "message_stop"}, 0),
+            ]
+            return await self._sse(request, events, profile, output_tokens)
+
+        want_json = "json" in prompt[-400:].lower()
+        return await self._call(request, "anthropic", model, prompt, body.get("max_tokens"), want_json, stream, emit,
+                                input_tokens=input_tokens, cached_tokens=cache_read, cache_write_tokens=cache_write)
+
+
+def _message_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _content_blocks(content: Any) -> List[Tuple[str, bool]]:
+    """``(text, has_cache_control)`` for a system prompt or message content."""
+    if isinstance(content, str):
+        return [(content, False)] if content else []
+    if isinstance(content, list):
+        return [(part.get("text", ""), bool(part.get("cache_control")))
+                for part in content if isinstance(part, dict)]
+    return []
+
+
+def _embedding(text: str, dims: int) -> List[float]:
+    """Deterministic unit vector seeded by the text, so equal inputs embed equally."""
+    rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    values = [rng.gauss(0.0, 1.0) for _ in range(dims)]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [round(v / norm, 6) for v in values]
+
+
+def _parse_overrides(items: List[str]) -> Dict[str, Dict[str, Any]]:
+    """``provider.key=value`` CLI overrides, e.g. ``gemini.error_rate=0.05``."""
+    overrides: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    for item in items:
+        path, _, raw = item.partition("=")
+        provider, _, key = path.partition(".")
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        if "." in key:
+            outer, inner = key.split(".", 1)
+            overrides[provider].setdefault(outer, {})[inner] = value
+        else:
+            overrides[provider][key] = value
+    return overrides
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fake AI provider server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--profile", help="JSON file with per-provider overrides")
+    parser.add_argument("--set", action="append", default=[], metavar="PROVIDER.KEY=VALUE",
+                        help="Override a profile value, e.g. anthropic.rate_limit_rate=0.1 or gemini.latency.median_ms=300")
+    parser.add_argument("--seed", type=int, help="Seed latency/fault sampling for repeatable runs")
+    args = parser.parse_args(argv)
+
+    overrides: Dict[str, Dict[str, Any]] = {}
+    if args.profile:
+        with open(args.profile, "r", encoding="utf-8") as fh:
+            overrides = json.load(fh)
+    server = FakeProviderServer(overrides, seed=args.seed)
+    if args.set:
+        server.configure(_parse_overrides(args.set))
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Fake AI providers on http://{args.host}:{args.port} ({', '.join(PROVIDERS)})")
+    web.run_app(server.make_app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from provider_endpoints import gemini_configure_kwargs
 
 from .base_client import BaseAIClient, AIResponse, ModelProvider
 
@@ -43,7 +44,7 @@ class GeminiClient(BaseAIClient):
         
         # Configure Gemini API
         if self.api_key:
-            genai.configure(api_key=self.api_key)
+            genai.configure(api_key=self.api_key, **gemini_configure_kwargs())
         
         # Gemini-specific configuration
         self.config = {
@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 
 import openai
 from openai import OpenAI, AsyncOpenAI
+from provider_endpoints import sdk_base_url_kwargs
 
 from .base_client import BaseAIClient, AIResponse, ModelProvider
 
@@ -41,8 +42,8 @@ class OpenAIClient(BaseAIClient):
         if not self.api_key:
             logger.warning("OPENAI_API_KEY not found, OpenAI client will fail")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
-        self.sync_client = OpenAI(api_key=self.api_key)
+        self.client = AsyncOpenAI(api_key=self.api_key, **sdk_base_url_kwargs("openai"))
+        self.sync_client = OpenAI(api_key=self.api_key, **sdk_base_url_kwargs("openai"))
         
         # OpenAI-specific configuration
         self.config = {
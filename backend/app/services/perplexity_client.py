@@ -16,6 +16,7 @@ from datetime import datetime, timezone, timedelta
 
 import aiohttp
 import hashlib
+from provider_endpoints import perplexity_chat_url
 
 from .base_client import BaseAIClient, AIResponse, ModelProvider
 from ..extensions import redis_client
@@ -42,7 +43,7 @@ class PerplexityClient(BaseAIClient):
         if not self.api_key:
             logger.warning("PERPLEXITY_API_KEY not found, Perplexity client will fail")
         
-        self.base_url = "https://api.perplexity.ai/chat/completions"
+        self.base_url = perplexity_chat_url()
         
         # Perplexity-specific configuration
         self.config = {
@@ -20,6 +20,7 @@ from flask import current_app
 
 from ..models import GeopoliticalReport, EmbeddingStore, AIModelExecution, db
 from ..extensions import redis_client
+from ..rag import hybrid_retrieve
 from .ai_orchestrator import orchestrator, QueryComplexity
 from .openai_client import OpenAIClient
 from .budget_manager import budget_manager
@@ -194,6 +195,12 @@ class ReportGenerator:
         await self._update_stage(report, ProcessingStage.RAG_SEARCH)
         rag_context = await self._perform_rag_search(request.query, context)
         
+        # Ward profile and retrieved material are shared by both Claude calls as a cached prompt prefix
+        context = orchestrator.with_ward_profile({
+            **context,
+            "retrieved_context": self._build_retrieved_context(real_time_data, rag_context)
+        })
+        
         # Stage 4: Primary analysis
         await self._update_stage(report, ProcessingStage.ANALYSIS)
         primary_analysis = await self._generate_primary_analysis(
@@ -262,13 +269,12 @@ class ReportGenerator:
             embedding_data = json.loads(embedding_response.content)
             query_embedding = embedding_data["embedding"]
             
-            # Search for relevant chunks in embedding store
-            # This would use pgvector similarity search in production
+            # Search for relevant posts and articles
             relevant_chunks = await self._vector_similarity_search(
-                query_embedding, context, self.config["rag_top_k"]
+                query, query_embedding, context, self.config["rag_top_k"]
             )
             
-            # Filter by relevance and recency
+            # Rank chunks from the requested ward first
             filtered_chunks = self._filter_chunks_by_quality(relevant_chunks, context)
             
             return {
@@ -282,69 +288,59 @@ class ReportGenerator:
             logger.error(f"RAG search error: {e}")
             return {"chunks": [], "total_chunks": 0, "error": str(e)}
 
-    async def _vector_similarity_search(self, query_embedding: List[float], 
+    async def _vector_similarity_search(self, query: str, query_embedding: List[float],
                                       context: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
-        """Perform vector similarity search (placeholder for pgvector integration)."""
+        """Hybrid full-text + pgvector retrieval fused with reciprocal rank fusion.
+
+        The similarity threshold and source age limit from ``self.config`` are
+        applied in SQL by :func:`app.rag.hybrid_retrieve`.
+        """
         
         try:
-            # In production, this would use pgvector with HNSW index
-            # For now, return sample relevant chunks based on context
-            
-            sample_chunks = [
-                {
-                    "content": "Recent political developments in Hyderabad show increased activity...",
-                    "ward_context": context.get("ward_context"),
-                    "similarity_score": 0.85,
-                    "source_type": "news",
-                    "published_at": datetime.now(timezone.utc) - timedelta(days=2)
-                },
+            items = await asyncio.to_thread(
+                hybrid_retrieve,
+                query,
+                ward=context.get("ward_context") or "",
+                window_days=self.config["max_source_age_days"],
+                k=top_k,
+                query_vec=query_embedding,
+                min_similarity=self.config["min_confidence_score"],
+            )
+            return [
                 {
-                    "content": "Electoral dynamics in Telangana indicate shifting voter preferences...",
-                    "ward_context": context.get("ward_context"),
-                    "similarity_score": 0.78,
-                    "source_type": "analysis",
-                    "published_at": datetime.now(timezone.utc) - timedelta(days=5)
+                    "content": item["text"],
+                    "ward_context": item["ward"],
+                    "similarity_score": item["similarity"],
+                    "rrf_score": item["score"],
+                    "source_type": item["source_type"],
+                    "source_id": item["source_id"],
+                    "published_at": item["created_at"],
                 }
+                for item in items
             ]
             
-            return sample_chunks[:top_k]
-            
         except Exception as e:
             logger.error(f"Vector similarity search error: {e}")
             return []
 
     def _filter_chunks_by_quality(self, chunks: List[Dict[str, Any]], 
                                  context: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter chunks by relevance, recency, and quality scores."""
-        
-        filtered = []
-        max_age = timedelta(days=self.config["max_source_age_days"])
-        now = datetime.now(timezone.utc)
+        """Rank ward-specific chunks ahead of city-wide articles.
+
+        Ward scope, similarity threshold and recency are already enforced by
+        the retrieval query; chunks that only matched on full text have no
+        similarity score.
+        """
         
+        ward_context = context.get("ward_context")
         for chunk in chunks:
-            # Check similarity threshold
-            if chunk.get("similarity_score", 0) < self.config["min_confidence_score"]:
-                continue
-            
-            # Check recency
-            published_at = chunk.get("published_at")
-            if published_at and (now - published_at) > max_age:
-                continue
-            
-            # Check ward context relevance
-            ward_context = context.get("ward_context")
-            if ward_context and chunk.get("ward_context") != ward_context:
-                # Still include but with lower priority
-                chunk["context_match"] = False
-            else:
-                chunk["context_match"] = True
-            
-            filtered.append(chunk)
+            # Articles are not ward-tagged: kept, but after the ward's own posts
+            chunk["context_match"] = not ward_context or chunk.get("ward_context") is not None
         
-        # Sort by relevance and context match
-        filtered.sort(key=lambda x: (x.get("context_match", False), x.get("similarity_score", 0)), reverse=True)
+        # Sort by context match, then fused rank
+        chunks.sort(key=lambda x: (x["context_match"], x.get("rrf_score", 0)), reverse=True)
         
-        return filtered
+        return chunks
 
     async def _generate_primary_analysis(self, query: str, real_time_data: Dict[str, Any],
                                        rag_context: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
@@ -360,7 +356,7 @@ class ReportGenerator:
             }
             
             # Prepare context-enriched query
-            enriched_query = self._build_enriched_query(query, real_time_data, rag_context)
+            enriched_query = self._build_enriched_query(query)
             
             # Generate primary analysis
             analysis_response = await orchestrator.claude_client.generate_response(
@@ -373,6 +369,7 @@ class ReportGenerator:
                     "confidence_score": analysis_response.quality_score,
                     "model_used": analysis_response.model_used,
                     "cost_usd": analysis_response.cost_usd,
+                    "tokens_used": analysis_response.tokens_used,
                     "processing_time_ms": analysis_response.latency_ms
                 }
             else:
@@ -383,25 +380,31 @@ class ReportGenerator:
             logger.error(f"Primary analysis error: {e}")
             return {"analysis": "", "error": str(e)}
 
-    def _build_enriched_query(self, original_query: str, real_time_data: Dict[str, Any],
-                             rag_context: Dict[str, Any]) -> str:
-        """Build query enriched with real-time and historical context."""
+    def _build_retrieved_context(self, real_time_data: Dict[str, Any], rag_context: Dict[str, Any]) -> str:
+        """Real-time and historical material for the report, sent as a cacheable prompt block."""
         
-        query_parts = [f"**Original Query**: {original_query}"]
+        context_parts = []
         
         # Add real-time context
         if real_time_data.get("content"):
-            query_parts.append("**Latest Developments**:")
-            query_parts.append(real_time_data["content"][:1000])  # Truncate for token efficiency
+            context_parts.append("**Latest Developments**:")
+            context_parts.append(real_time_data["content"][:1000])  # Truncate for token efficiency
             
             if real_time_data.get("sources"):
-                query_parts.append(f"**Sources**: {len(real_time_data['sources'])} recent sources")
+                context_parts.append(f"**Sources**: {len(real_time_data['sources'])} recent sources")
         
         # Add historical context
         if rag_context.get("chunks"):
-            query_parts.append("**Historical Context**:")
+            context_parts.append("**Historical Context**:")
             for i, chunk in enumerate(rag_context["chunks"][:3]):  # Top 3 chunks
-                query_parts.append(f"{i+1}. {chunk['content'][:200]}...")
+                context_parts.append(f"{i+1}. {chunk['content'][:200]}...")
+        
+        return "\n\n".join(context_parts)
+
+    def _build_enriched_query(self, original_query: str) -> str:
+        """Build the analysis query; the retrieved material itself travels in ``retrieved_context``."""
+        
+        query_parts = [f"**Original Query**: {original_query}"]
         
         # Add analysis instructions
         query_parts.append("""
@@ -439,7 +442,7 @@ class ReportGenerator:
 **Real-Time Intelligence**:
 - Sources: {real_time_data.get('source_count', 0)}
 - Credibility: {real_time_data.get('credibility_score', 0):.2f}
-- Latest Developments: {real_time_data.get('content', 'No real-time data')[:500]}
+- Latest Developments: see Retrieved Context
 
 **Historical Context**:
 - Relevant Documents: {rag_context.get('total_chunks', 0)}
@@ -482,7 +485,10 @@ Format as professional intelligence briefing for senior political advisors.
                         primary_analysis.get("model_used"),
                         real_time_data.get("model_used", "perplexity"),
                         synthesis_response.model_used
-                    ]
+                    ],
+                    "cache_hit_ratio": self._cache_hit_ratio(
+                        primary_analysis.get("tokens_used") or {}, synthesis_response.tokens_used
+                    )
                 }
             else:
                 logger.error(f"Final synthesis failed: {synthesis_response.error}")
@@ -590,6 +596,13 @@ Format as professional intelligence briefing for senior political advisors.
             quality_metrics["issues"].append(f"Validation error: {str(e)}")
             return quality_metrics
 
+    @staticmethod
+    def _cache_hit_ratio(*tokens_used: Dict[str, int]) -> float:
+        """Share of Claude input tokens read from the prompt cache."""
+        input_tokens = sum(t.get("input", 0) for t in tokens_used)
+        cached_tokens = sum(t.get("cached", 0) for t in tokens_used)
+        return round(cached_tokens / input_tokens, 3) if input_tokens else 0.0
+
     async def _finalize_report(self, report: GeopoliticalReport, final_report: Dict[str, Any],
                              quality_metrics: Dict[str, Any]):
         """Finalize report with all metadata and save to database."""
@@ -599,6 +612,7 @@ Format as professional intelligence briefing for senior political advisors.
             report.full_report_markdown = final_report.get("full_report", "")
             report.confidence_score = quality_metrics.get("overall_score", 0.0)
             report.total_cost_usd = final_report.get("total_cost_usd", 0.0)
+            report.cache_hit_ratio = final_report.get("cache_hit_ratio")
             
             # Store structured sections
             structured_sections = final_report.get("structured_sections", {})
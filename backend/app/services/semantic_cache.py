@@ -0,0 +1,365 @@
+"""
+Semantic Response Cache for Multi-Model AI Services
+
+Reuses a paid model answer when the same ward question comes back with
+slightly different wording ("key issues in Jubilee Hills this week?" vs
+"What are the key issues in Jubilee Hills this week").
+
+Entries are bucketed in Redis by scope (which service answered), ward,
+query type and a variant string for parameters that change the answer
+(depth, strategic context). Within a bucket a lookup compares the query
+embedding with every stored one and returns the closest entry at or above
+the similarity threshold. The ward name is removed from the query before
+embedding: the bucket already pins the ward.
+
+Freshness:
+- Each entry carries the ward's data watermark (post count and latest post
+  for the ward, plus the ward profile/demographics/features watermark).
+  New posts or recomputed ward data make older entries miss.
+- TTLs follow data freshness: half the age of the ward's latest post,
+  clamped to bounds per query type, so real-time questions about an active
+  ward expire in minutes and strategic questions about a quiet ward last
+  hours.
+
+The cache needs an app context (the watermark is read from the database);
+without one, lookups miss and nothing is stored (logged once per process).
+Ingestion and ward feature writes call :func:`invalidate_ward_caches` so
+answers for the affected wards are dropped right away rather than left in
+Redis until their TTL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import has_app_context
+from sqlalchemy import func, select
+
+from ..extensions import db, redis_client
+from ..models import AIModelExecution, Post
+from ..utils.ward import resolve_ward_id
+from ..ward_snapshot import _utc, version_columns
+
+logger = logging.getLogger(__name__)
+
+LOCAL_EMBEDDING_DIMS = 512
+MAX_ENTRIES_PER_BUCKET = 64
+KEY_PREFIX = "semcache"
+
+# Cosine similarity needed for a hit, per embedder. Hashed lexical vectors
+# only match rewordings of the same words; model embeddings also match synonyms.
+DEFAULT_THRESHOLDS = {"local": 0.85, "openai": 0.92}
+
+# TTL = half the age of the ward's latest data, clamped to (min, max) seconds
+DATA_AGE_TTL_FACTOR = 0.5
+TTL_BOUNDS = {
+    "urgent": (300, 900),
+    "crisis_response": (300, 900),
+    "real_time_intelligence": (300, 1800),
+    "conversational": (900, 3 * 3600),
+    "simple": (900, 6 * 3600),
+    "moderate": (900, 6 * 3600),
+}
+DEFAULT_TTL_BOUNDS = (1800, 6 * 3600)
+
+_STOPWORDS = frozenset(
+    "a an the is are was were be been of in on at for to and or what whats which who how "
+    "this that these those with about me us our please tell give show can could you i "
+    "do does ward s".split()
+)
+
+
+# ---- embeddings -------------------------------------------------------------
+
+def query_tokens(text: str, ward: str = "") -> List[str]:
+    """Lower-cased words of ``text`` without stopwords and without the ward's name."""
+    text = text.lower()
+    for word in re.findall(r"[a-z0-9]+", (ward or "").lower()):
+        text = re.sub(rf"\b{re.escape(word)}\b", " ", text)
+    return [w for w in re.findall(r"[a-z0-9]+", text) if w not in _STOPWORDS]
+
+
+def local_embedding(text: str, dims: int = LOCAL_EMBEDDING_DIMS) -> np.ndarray:
+    """Signed feature-hashing vector over words, word bigrams and character trigrams.
+
+    Free and deterministic across processes (blake2b, not ``hash``); used
+    when no embedding provider is configured.
+    """
+    tokens = text.split()
+    features: List[Tuple[str, float]] = []
+    for word in tokens:
+        features.append((word, 1.0))
+        padded = f"<{word}>"
+        features.extend(("#" + padded[i:i + 3], 0.35) for i in range(len(padded) - 2))
+    features.extend((f"{a} {b}", 0.7) for a, b in zip(tokens, tokens[1:]))
+
+    vec = np.zeros(dims)
+    for feature, weight in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+        vec[h % dims] += weight if h >> 63 else -weight
+    return vec
+
+
+def _openai_embedding(text: str) -> Sequence[float]:
+    from ..llm import get_embedding
+    return get_embedding(text)
+
+
+def _default_embedder() -> str:
+    configured = os.getenv("SEMANTIC_CACHE_EMBEDDER", "auto").lower()
+    if configured == "auto":
+        return "openai" if os.getenv("OPENAI_API_KEY") else "local"
+    return configured
+
+
+EMBEDDERS: Dict[str, Callable[[str], Sequence[float]]] = {
+    "local": local_embedding,
+    "openai": _openai_embedding,
+}
+
+
+def _unit(vec: Sequence[float]) -> Optional[np.ndarray]:
+    arr = np.asarray(vec, dtype=float)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm else None
+
+
+# ---- ward data watermark ----------------------------------------------------
+
+_no_context_logged = False
+
+
+def _app_context_ready() -> bool:
+    """Whether the watermark can be read; outside an app context the cache is skipped quietly."""
+    global _no_context_logged
+    if has_app_context():
+        return True
+    if not _no_context_logged:
+        _no_context_logged = True
+        logger.info("Semantic cache skipped outside a Flask app context")
+    return False
+
+
+def ward_data_version(ward_id: str) -> Tuple[str, Optional[datetime]]:
+    """(watermark, latest post time) for ``ward_id``, read in one statement."""
+    row = db.session.execute(select(
+        select(func.count(Post.id)).where(Post.ward_id == ward_id).scalar_subquery(),
+        select(func.max(Post.created_at)).where(Post.ward_id == ward_id).scalar_subquery(),
+        *version_columns(),
+    )).one()
+    return json.dumps([str(value) for value in row]), _utc(row[1])
+
+
+def cache_ttl(query_type: str, latest_data_at: Optional[datetime], now: Optional[datetime] = None) -> int:
+    """Seconds to keep an answer: half the age of the ward's latest data, within the query type's bounds."""
+    low, high = TTL_BOUNDS.get(query_type, DEFAULT_TTL_BOUNDS)
+    if latest_data_at is None:
+        return high
+    age = ((now or datetime.now(timezone.utc)) - latest_data_at).total_seconds()
+    return int(min(high, max(low, age * DATA_AGE_TTL_FACTOR)))
+
+
+# ---- cache ------------------------------------------------------------------
+
+@dataclass
+class CacheHit:
+    """A cached answer close enough to the incoming query."""
+    payload: Dict[str, Any]
+    similarity: float
+    cached_query: str
+    saved_usd: float
+    provider: str
+    model: str
+    cached_at: float
+    ward: str
+    query_type: str
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache of model responses for one service (``scope``).
+
+    ``lookup`` and ``store`` never raise: any Redis, database or embedding
+    failure is logged and treated as a miss.
+    """
+
+    def __init__(self, scope: str, embedder: Optional[str] = None, threshold: Optional[float] = None,
+                 max_entries: int = MAX_ENTRIES_PER_BUCKET):
+        self.scope = scope
+        self.embedder = embedder or _default_embedder()
+        if self.embedder not in EMBEDDERS:
+            raise ValueError(f"Unknown semantic cache embedder: {self.embedder}")
+        env_threshold = os.getenv("SEMANTIC_CACHE_THRESHOLD")
+        self.threshold = threshold if threshold is not None else (
+            float(env_threshold) if env_threshold else DEFAULT_THRESHOLDS.get(self.embedder, 0.9))
+        self.max_entries = max_entries
+        self.enabled = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+
+    # -- keys
+
+    @staticmethod
+    def ward_key(ward: str) -> str:
+        return resolve_ward_id(ward) or (ward or "").strip().lower()
+
+    def bucket_key(self, ward_key: str, query_type: str, variant: str = "") -> str:
+        variant_hash = hashlib.sha1(variant.encode()).hexdigest()[:8]
+        return f"{KEY_PREFIX}:{self.scope}:{self.embedder}:{ward_key}:{query_type}:{variant_hash}"
+
+    def _embed(self, query: str, ward: str) -> Optional[np.ndarray]:
+        text = " ".join(query_tokens(query, ward))
+        if not text:
+            return None
+        return _unit(EMBEDDERS[self.embedder](text))
+
+    # -- operations
+
+    def lookup(self, ward: str, query_type: str, query: str, variant: str = "") -> Optional[CacheHit]:
+        """The closest fresh entry with similarity >= threshold, or None."""
+        if not self.enabled or not ward or not _app_context_ready():
+            return None
+        try:
+            ward_key = self.ward_key(ward)
+            version, _ = ward_data_version(ward_key)
+            key = self.bucket_key(ward_key, query_type, variant)
+            entries = redis_client.hgetall(key) or {}
+            if not entries:
+                return None
+            vec = self._embed(query, ward)
+            if vec is None:
+                return None
+
+            now, stale, candidates = time.time(), [], []
+            for field, raw in entries.items():
+                entry = json.loads(raw)
+                if entry["version"] != version or entry["expires_at"] <= now:
+                    stale.append(field)
+                elif len(entry["vec"]) == len(vec):
+                    candidates.append(entry)
+            if stale:
+                redis_client.hdel(key, *stale)
+            if not candidates:
+                return None
+
+            similarities = np.asarray([entry["vec"] for entry in candidates]) @ vec
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            entry = candidates[best]
+            return CacheHit(
+                payload=entry["payload"],
+                similarity=round(float(similarities[best]), 4),
+                cached_query=entry["query"],
+                saved_usd=float(entry["cost_usd"]),
+                provider=entry["provider"],
+                model=entry["model"],
+                cached_at=entry["created_at"],
+                ward=ward_key,
+                query_type=query_type,
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed for {ward}: {e}")
+            return None
+
+    def store(self, ward: str, query_type: str, query: str, payload: Dict[str, Any], cost_usd: float,
+              provider: str, model: str, variant: str = "") -> bool:
+        """Cache ``payload`` as the answer to ``query``; returns whether it was stored."""
+        if not self.enabled or not ward or not _app_context_ready():
+            return False
+        try:
+            ward_key = self.ward_key(ward)
+            version, latest_data_at = ward_data_version(ward_key)
+            vec = self._embed(query, ward)
+            if vec is None:
+                return False
+            ttl = cache_ttl(query_type, latest_data_at)
+            now = time.time()
+            key = self.bucket_key(ward_key, query_type, variant)
+            field = hashlib.sha1(" ".join(query_tokens(query, ward)).encode()).hexdigest()[:16]
+            redis_client.hset(key, field, json.dumps({
+                "query": query,
+                "vec": [round(float(x), 5) for x in vec],
+                "payload": payload,
+                "cost_usd": float(cost_usd or 0.0),
+                "provider": provider,
+                "model": model,
+                "version": version,
+                "created_at": now,
+                "expires_at": now + ttl,
+            }))
+            redis_client.expire(key, TTL_BOUNDS.get(query_type, DEFAULT_TTL_BOUNDS)[1])
+            self._evict(key)
+            return True
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed for {ward}: {e}")
+            return False
+
+    def _evict(self, key: str) -> None:
+        if redis_client.hlen(key) <= self.max_entries:
+            return
+        entries = {field: json.loads(raw) for field, raw in (redis_client.hgetall(key) or {}).items()}
+        oldest = sorted(entries, key=lambda f: entries[f]["created_at"])
+        redis_client.hdel(key, *oldest[:len(entries) - self.max_entries])
+
+    def invalidate_ward(self, ward: str) -> int:
+        """Drop every entry for ``ward`` in this scope; returns the number of buckets removed."""
+        return _delete_buckets(f"{KEY_PREFIX}:{self.scope}:*:{self.ward_key(ward)}:*", ward)
+
+
+def _delete_buckets(pattern: str, ward: str) -> int:
+    try:
+        keys = list(redis_client.scan_iter(match=pattern))
+        return redis_client.delete(*keys) if keys else 0
+    except Exception as e:
+        logger.warning(f"Semantic cache invalidation failed for {ward}: {e}")
+        return 0
+
+
+def invalidate_ward_caches(wards: Iterable[Optional[str]]) -> int:
+    """Drop cached answers of every scope for ``wards`` (names or ids); returns buckets removed."""
+    removed = 0
+    for ward_key in {SemanticCache.ward_key(w) for w in wards if w}:
+        removed += _delete_buckets(f"{KEY_PREFIX}:*:*:{ward_key}:*", ward_key)
+    return removed
+
+
+async def record_cache_hit(hit: CacheHit, operation_type: str, latency_ms: int = 0,
+                           request_id: Optional[str] = None) -> None:
+    """Record a served hit in AIModelExecution and the budget's cache savings."""
+    from .budget_manager import get_budget_manager
+
+    try:
+        db.session.add(AIModelExecution(
+            request_id=request_id or str(uuid.uuid4()),
+            operation_type=operation_type,
+            provider=hit.provider,
+            model_name=hit.model,
+            input_tokens=0,
+            output_tokens=0,
+            total_tokens=0,
+            latency_ms=latency_ms,
+            cost_usd=Decimal("0"),
+            cost_breakdown={"saved_usd": hit.saved_usd},
+            budget_category="cache",
+            success_status="cache_hit",
+            request_metadata={
+                "cached": True,
+                "ward": hit.ward,
+                "query_type": hit.query_type,
+                "similarity": hit.similarity,
+                "cached_query": hit.cached_query,
+            },
+        ))
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Failed to record cache hit: {e}")
+        db.session.rollback()
+    await get_budget_manager().record_cache_savings(hit.saved_usd, hit.provider)
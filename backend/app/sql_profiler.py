@@ -0,0 +1,258 @@
+"""
+Per-request SQL profiling for the LokDarpan backend.
+
+Opt-in middleware (``SQL_PROFILING_ENABLED``) that hooks SQLAlchemy cursor
+events and records, for every request, how many statements ran, the total time
+spent in the database and the slowest statements. Results are returned as
+response headers and folded into a rolling per-endpoint report served at
+``GET /api/v1/profiling/sql`` (``DELETE`` on the same route clears it).
+
+The same machinery backs :func:`query_budget`, a context manager the test
+suite uses to fail when an endpoint issues more queries than its budget, so
+N+1 regressions break CI instead of production.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from flask import Blueprint, g, jsonify, request
+from flask_login import login_required
+from sqlalchemy import event
+
+from .extensions import db
+
+logger = logging.getLogger(__name__)
+
+sql_profiler_bp = Blueprint('sql_profiler', __name__, url_prefix='/api/v1/profiling')
+
+_active_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("lokdarpan_sql_profile", default=None)
+_instrumented_engines = set()
+
+
+class QueryProfile:
+    """Query count, DB time and slowest statements for one unit of work.
+
+    Profiles nest: statements recorded on a child are also counted on its
+    parent, so a test-level budget still sees queries made while the request
+    middleware has its own profile active. Memory stays bounded however long
+    the unit of work runs: only the ``keep_slowest`` slowest statements and the
+    first ``keep_statements`` statements in order are retained.
+    """
+
+    def __init__(self, keep_slowest: int = 5, parent: Optional["QueryProfile"] = None,
+                 keep_statements: int = 0):
+        self.count = 0
+        self.total_ms = 0.0
+        self.keep_slowest = keep_slowest
+        self.keep_statements = keep_statements
+        self.parent = parent
+        self.statements: List[str] = []
+        self._slowest: List[tuple] = []  # min-heap of (duration_ms, seq, statement)
+
+    def record(self, statement: str, duration_ms: float):
+        profile = self
+        while profile is not None:
+            profile._record(statement, duration_ms)
+            profile = profile.parent
+
+    def _record(self, statement: str, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+        if len(self.statements) < self.keep_statements:
+            self.statements.append(statement)
+        entry = (duration_ms, self.count, statement)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, entry)
+        elif duration_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> List[Dict[str, Any]]:
+        return [
+            {"duration_ms": round(ms, 2), "statement": _shorten(stmt)}
+            for ms, _, stmt in sorted(self._slowest, reverse=True)
+        ]
+
+    @property
+    def slowest_ms(self) -> float:
+        return max((ms for ms, _, _ in self._slowest), default=0.0)
+
+
+class SlowEndpointReport:
+    """Rolling window of request profiles per endpoint."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._slowest = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, profile: QueryProfile, request_ms: float):
+        with self._lock:
+            self._samples[endpoint].append((profile.count, profile.total_ms, request_ms))
+            if profile.slowest and profile.slowest_ms >= self._slowest.get(endpoint, {}).get("duration_ms", 0):
+                self._slowest[endpoint] = profile.slowest[0]
+
+    def report(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Endpoints ordered by p95 DB time over the window."""
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._samples.items()}
+            slowest = dict(self._slowest)
+
+        rows = []
+        for endpoint, samples in snapshot.items():
+            counts = sorted(s[0] for s in samples)
+            db_ms = sorted(s[1] for s in samples)
+            req_ms = sorted(s[2] for s in samples)
+            rows.append({
+                "endpoint": endpoint,
+                "requests": len(samples),
+                "avg_queries": round(sum(counts) / len(counts), 2),
+                "max_queries": counts[-1],
+                "avg_db_ms": round(sum(db_ms) / len(db_ms), 2),
+                "p95_db_ms": round(_percentile(db_ms, 0.95), 2),
+                "p95_request_ms": round(_percentile(req_ms, 0.95), 2),
+                "slowest_statement": slowest.get(endpoint),
+            })
+        rows.sort(key=lambda r: r["p95_db_ms"], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._slowest.clear()
+
+
+slow_endpoint_report = SlowEndpointReport()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "…"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("lokdarpan_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("lokdarpan_query_start")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.record(statement, duration_ms)
+
+
+def instrument_engine(engine):
+    """Attach the cursor event listeners to an engine (idempotent)."""
+    if id(engine) in _instrumented_engines:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented_engines.add(id(engine))
+
+
+@contextmanager
+def query_budget(max_queries: int, engine=None):
+    """Fail with AssertionError if the block runs more than ``max_queries`` statements.
+
+    Usage in tests::
+
+        with query_budget(2):
+            client.get('/api/v1/ward/meta/WARD_001')
+    """
+    instrument_engine(engine or db.engine)
+    profile = QueryProfile(keep_slowest=max_queries + 1, parent=_active_profile.get(),
+                           keep_statements=max_queries + 20)
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+    if profile.count > max_queries:
+        listing = "\n".join(f"  {i + 1}. {_shorten(s, 200)}" for i, s in enumerate(profile.statements))
+        if profile.count > len(profile.statements):
+            listing += f"\n  ... {profile.count - len(profile.statements)} more"
+        raise AssertionError(
+            f"Query budget exceeded: {profile.count} queries (budget {max_queries})\n{listing}"
+        )
+
+
+def init_sql_profiler(app):
+    """Install the request middleware and report endpoint. Call inside an app context."""
+    instrument_engine(db.engine)
+    slow_query_ms = float(app.config.get('SQL_PROFILING_SLOW_QUERY_MS', 100))
+    budgets = app.config.get('SQL_QUERY_BUDGETS') or {}
+
+    @app.before_request
+    def sql_profile_before_request():
+        g.sql_profile = QueryProfile(parent=_active_profile.get())
+        g.sql_profile_token = _active_profile.set(g.sql_profile)
+        g.sql_profile_started = time.perf_counter()
+
+    @app.after_request
+    def sql_profile_after_request(response):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        request_ms = (time.perf_counter() - g.pop('sql_profile_started')) * 1000
+        response.headers['X-DB-Query-Count'] = str(profile.count)
+        response.headers['X-DB-Time-Ms'] = f"{profile.total_ms:.1f}"
+        response.headers['X-DB-Slowest-Ms'] = f"{profile.slowest_ms:.1f}"
+        response.headers.add('Server-Timing', f'db;dur={profile.total_ms:.1f};desc="{profile.count} queries"')
+
+        budget = budgets.get(endpoint)
+        if budget is not None and profile.count > budget:
+            logger.warning(f"Query budget exceeded on {endpoint}: {profile.count} > {budget}")
+        if profile.slowest_ms >= slow_query_ms:
+            logger.warning(f"Slow query on {endpoint} ({profile.slowest_ms:.1f}ms): {profile.slowest[0]['statement']}")
+
+        slow_endpoint_report.add(endpoint, profile, request_ms)
+        return response
+
+    @app.teardown_request
+    def sql_profile_teardown(exc):
+        token = g.pop('sql_profile_token', None)
+        if token is not None:
+            _active_profile.reset(token)
+
+    app.register_blueprint(sql_profiler_bp)
+    logger.info("Per-request SQL profiling enabled")
+
+
+@sql_profiler_bp.route('/sql', methods=['GET'])
+@login_required
+def sql_report():
+    """Rolling per-endpoint query count and DB time report."""
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 200)
+    except ValueError:
+        limit = 20
+    return jsonify({
+        "window": slow_endpoint_report.window,
+        "endpoints": slow_endpoint_report.report(limit),
+    })
+
+
+@sql_profiler_bp.route('/sql', methods=['DELETE'])
+@login_required
+def reset_sql_report():
+    """Clear the rolling report, e.g. before a measurement run."""
+    slow_endpoint_report.reset()
+    return '', 204
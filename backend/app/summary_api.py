@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from sqlalchemy import text
 from .extensions import db
+from .precompute import record_ward_access
 from .tasks_summary import generate_summary
 
 summary_bp = Blueprint("summary_bp", __name__)
@@ -11,6 +12,7 @@ def summary_latest():
     window = request.args.get("window", default="P7D", type=str)
     if not ward:
         return jsonify({"error": "ward is required"}), 400
+    record_ward_access("summary", ward)
 
     row = db.session.execute(text("""
       SELECT id, ward, window, sections, citations, confidence, model, cost_cents, created_at
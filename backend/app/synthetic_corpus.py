@@ -0,0 +1,372 @@
+"""
+Reproducible synthetic corpus for LokDarpan load and benchmark runs.
+
+Generates wards, authors, epapers and posts from the real GHMC ward list in
+``app/data/ghmc_wards.geojson`` and bulk-loads them with Core
+``executemany`` inserts in fixed-size batches, so a 10M-post corpus streams
+through constant memory. The same seed (and ``end_date``) always yields the
+same rows; leaving ``end_date`` unset anchors the corpus at today so
+"last N days" endpoints see data.
+
+Post volume per ward follows a Zipf-like skew (a few hot wards, a long tail)
+and timestamps spread over ``days`` with a weekday bias, which is closer to
+production than uniform data when judging index and aggregation plans.
+
+Used by ``scripts/generate_synthetic_corpus.py`` and ``tests/benchmarks``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.engine import make_url
+
+from .extensions import db
+from .models import Author, Epaper, Post, WardDemographics, WardFeatures, WardKeywordDaily, WardProfile
+from .utils.ward import load_ghmc_wards
+from .ward_keywords import KeywordCounter
+
+log = logging.getLogger(__name__)
+
+# Database names the generator may wipe: in-memory SQLite or names marking a scratch database
+SCRATCH_DATABASE = re.compile(r"test|bench|scratch|synthetic|tmp", re.IGNORECASE)
+
+SCALES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+PARTIES = ["BJP", "BRS", "INC", "AIMIM", "AAP"]
+PARTY_WEIGHTS = [30, 28, 24, 14, 4]
+PARTY_ALIASES = {
+    "BJP": ["BJP", "BJP Telangana"],
+    "BRS": ["BRS", "BRS Party", "Telangana Rashtra Samithi", "TRS"],
+    "INC": ["INC", "Congress", "Telangana Congress", "Indian National Congress"],
+    "AIMIM": ["AIMIM", "All India Majlis-e-Ittehad-ul-Muslimeen"],
+    "AAP": ["AAP", "Aam Aadmi Party"],
+}
+EMOTIONS = [
+    "Hopeful", "Angry", "Concerned", "Satisfied", "Disappointed", "Optimistic",
+    "Frustrated", "Pride", "Positive", "Negative", "Admiration", "Anger",
+]
+PUBLICATIONS = [
+    "Eenadu", "Sakshi", "Deccan Chronicle", "Telangana Today", "The Hindu",
+    "Namasthe Telangana", "Siasat Daily", "Andhra Jyothi", "Times of India Hyderabad",
+]
+ISSUES = [
+    "drainage", "water supply", "road repairs", "garbage collection", "street lights",
+    "metro connectivity", "2BHK housing", "flooding", "traffic congestion", "power cuts",
+    "property tax", "encroachments", "public health", "school upgrades", "stray dogs",
+]
+TEMPLATES = [
+    "{party} corporator in {ward} promises action on {issue} before the monsoon.",
+    "Residents of {ward} protest over {issue}; {party} blames the administration.",
+    "{party} leaders hold padayatra in {ward}, highlight {issue} and {issue2}.",
+    "GHMC sanctions funds for {issue} in {ward} after {party} representation.",
+    "{ward} voters divided on {issue}; {party} sees an opening ahead of polls.",
+    "Opposition slams {party} over delays in {issue} works at {ward}.",
+    "Community meeting in {ward} lists {issue} and {issue2} as top concerns.",
+    "{party} launches helpline for {issue} complaints across {ward} division.",
+]
+
+
+@dataclass
+class CorpusSpec:
+    """Shape of a synthetic corpus; ``seed`` makes it reproducible."""
+    posts: int = 10_000
+    wards: int = 145
+    authors: int = 500
+    epapers: Optional[int] = None  # defaults to posts // 10
+    days: int = 365
+    seed: int = 42
+    epaper_post_ratio: float = 0.6  # share of posts mirrored from an epaper
+    end_date: Optional[str] = None  # ISO date of the newest row; today if unset
+
+    def __post_init__(self):
+        if self.epapers is None:
+            self.epapers = max(1, self.posts // 10)
+
+    @classmethod
+    def for_scale(cls, scale: str, **overrides) -> "CorpusSpec":
+        key = scale.lower()
+        if key not in SCALES:
+            raise ValueError(f"Unknown scale '{scale}', expected one of {sorted(SCALES)}")
+        return cls(posts=SCALES[key], **overrides)
+
+    @property
+    def end(self) -> datetime:
+        if self.end_date:
+            return datetime.fromisoformat(self.end_date).replace(hour=23, minute=59, tzinfo=timezone.utc)
+        return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+class SyntheticCorpus:
+    """Deterministic row generator for a :class:`CorpusSpec`."""
+
+    def __init__(self, spec: CorpusSpec, wards: Optional[List[Dict[str, Any]]] = None):
+        self.spec = spec
+        all_wards = wards if wards is not None else load_ghmc_wards()
+        self.wards = all_wards[:spec.wards]
+        if not self.wards:
+            raise ValueError("No wards available for synthetic corpus")
+        # Zipf-like ward popularity, shuffled so hot wards are not just low numbers
+        weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(self.wards))]
+        random.Random(spec.seed).shuffle(weights)
+        self._ward_cum = list(accumulate(weights))
+        self._party_cum = list(accumulate(PARTY_WEIGHTS))
+
+    def wards_by_volume(self) -> List[Dict[str, Any]]:
+        """Wards ordered from the most to the fewest expected posts."""
+        weights = [c - p for c, p in zip(self._ward_cum, [0.0] + self._ward_cum[:-1])]
+        order = sorted(range(len(self.wards)), key=lambda i: weights[i], reverse=True)
+        return [self.wards[i] for i in order]
+
+    def _rng(self, stream: int) -> random.Random:
+        return random.Random(self.spec.seed * 1_000_003 + stream)
+
+    def authors(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng(1)
+        for i in range(1, self.spec.authors + 1):
+            party = rng.choices(PARTIES, cum_weights=self._party_cum)[0] if rng.random() < 0.7 else None
+            yield {"id": i, "name": f"Synthetic Author {i:06d}", "party": party}
+
+    def epapers(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng(2)
+        end = self.spec.end
+        for i in range(1, self.spec.epapers + 1):
+            pub = PUBLICATIONS[i % len(PUBLICATIONS)]
+            pub_date = (end - timedelta(days=rng.randrange(self.spec.days))).date()
+            raw_text = f"{self._sentence(rng)}\n\n{self._sentence(rng)} {self._sentence(rng)}"
+            yield {
+                "id": i,
+                "publication_name": pub,
+                "publication_date": pub_date,
+                "raw_text": raw_text,
+                "created_at": datetime.combine(pub_date, datetime.min.time()),
+                "sha256": hashlib.sha256(f"synthetic|{self.spec.seed}|{i}".encode()).hexdigest(),
+            }
+
+    def posts(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng(3)
+        end = self.spec.end
+        span_seconds = self.spec.days * 86400
+        for i in range(1, self.spec.posts + 1):
+            ward = self.wards[self._pick(rng, self._ward_cum)]
+            created = end - timedelta(seconds=rng.randrange(span_seconds))
+            if created.weekday() >= 5 and rng.random() < 0.35:
+                created -= timedelta(days=2)  # quieter weekends
+            party = PARTIES[self._pick(rng, self._party_cum)]
+            yield {
+                "id": i,
+                "text": self._sentence(rng, ward["name"], party),
+                "author_id": rng.randint(1, self.spec.authors),
+                "city": ward["name"],
+                "ward_id": ward["ward_id"],
+                "emotion": rng.choice(EMOTIONS),
+                "party": rng.choice(PARTY_ALIASES[party]),
+                "created_at": created.replace(tzinfo=None),
+                "epaper_id": rng.randint(1, self.spec.epapers) if rng.random() < self.spec.epaper_post_ratio else None,
+            }
+
+    def ward_rows(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        rng = self._rng(4)
+        seen = set()
+        for ward in self.wards:
+            # the GeoJSON labels two divisions "Ward 37"; ward tables key on ward_id
+            if ward["ward_id"] in seen:
+                continue
+            seen.add(ward["ward_id"])
+            electors = rng.randint(35_000, 95_000)
+            turnout = round(rng.uniform(38.0, 62.0), 1)
+            shares = self._shares(rng)
+            yield {
+                "profile": {
+                    "ward_id": ward["ward_id"],
+                    "electors": electors,
+                    "votes_cast": int(electors * turnout / 100),
+                    "turnout_pct": turnout,
+                    "last_winner_party": max(shares, key=shares.get),
+                    "last_winner_year": 2020,
+                },
+                "demographics": {
+                    "ward_id": ward["ward_id"],
+                    "literacy_idx": round(rng.uniform(0.55, 0.95), 3),
+                    "muslim_idx": round(rng.uniform(0.02, 0.7), 3),
+                    "scst_idx": round(rng.uniform(0.05, 0.35), 3),
+                    "secc_deprivation_idx": round(rng.uniform(0.1, 0.6), 3),
+                },
+                "features": {
+                    "ward_id": ward["ward_id"],
+                    "as23_party_shares": self._shares(rng),
+                    "ls24_party_shares": shares,
+                    "dvi": {p: round(rng.uniform(-0.1, 0.1), 3) for p in PARTIES[:4]},
+                    "aci_23": round(rng.uniform(0.0, 1.0), 3),
+                    "turnout_volatility": round(rng.uniform(0.0, 0.2), 3),
+                    "incumbency_weakness": {"score": round(rng.uniform(0.0, 1.0), 3)},
+                },
+            }
+
+    def epaper_jsonl_records(self, count: int, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Records in the ingestion JSONL format (see ``tasks_bulk_ingestion``)."""
+        rng = self._rng(5 + offset)
+        end = self.spec.end
+        for i in range(count):
+            ward = self.wards[self._pick(rng, self._ward_cum)]
+            party = PARTIES[self._pick(rng, self._party_cum)]
+            yield {
+                "publication_name": PUBLICATIONS[i % len(PUBLICATIONS)],
+                "publication_date": (end - timedelta(days=rng.randrange(self.spec.days))).date().isoformat(),
+                "title": self._sentence(rng, ward["name"], party),
+                "body": f"{self._sentence(rng, ward['name'], party)} (ref {offset + i})",
+                "city": ward["name"],
+                "party": party,
+            }
+
+    @staticmethod
+    def _pick(rng: random.Random, cum_weights: List[float]) -> int:
+        return min(bisect_left(cum_weights, rng.random() * cum_weights[-1]), len(cum_weights) - 1)
+
+    def _sentence(self, rng: random.Random, ward: Optional[str] = None, party: Optional[str] = None) -> str:
+        issue, issue2 = rng.sample(ISSUES, 2)
+        return rng.choice(TEMPLATES).format(
+            party=party or rng.choice(PARTIES),
+            ward=ward or rng.choice(self.wards)["name"],
+            issue=issue,
+            issue2=issue2,
+        )
+
+    @staticmethod
+    def _shares(rng: random.Random) -> Dict[str, float]:
+        raw = [rng.random() for _ in PARTIES[:4]]
+        total = sum(raw)
+        return {p: round(100 * v / total, 1) for p, v in zip(PARTIES[:4], raw)}
+
+
+def _batched(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk_insert(table, rows: Iterator[Dict[str, Any]], batch_size: int,
+                 keywords: Optional[KeywordCounter] = None) -> int:
+    inserted = 0
+    for batch in _batched(rows, batch_size):
+        db.session.execute(insert(table), batch)
+        if keywords is not None:
+            # Core inserts bypass the ORM flush hook; count each batch here
+            for row in batch:
+                keywords.add(row["ward_id"], row["created_at"], row["text"])
+            keywords.flush(db.session.connection())
+        db.session.commit()
+        inserted += len(batch)
+    return inserted
+
+
+def _reset_sequences(tables: List[str]):
+    if db.engine.dialect.name != "postgresql":
+        return
+    for table in tables:
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+    db.session.commit()
+
+
+def corpus_loaded(spec: CorpusSpec) -> bool:
+    """True if the database already holds a corpus of this size."""
+    return (db.session.query(func.count(Post.id)).scalar() or 0) == spec.posts \
+        and (db.session.query(func.count(Epaper.id)).scalar() or 0) == spec.epapers
+
+
+def is_scratch_database(url) -> bool:
+    """True for in-memory SQLite or a database whose name marks it as test/bench/scratch."""
+    url = make_url(str(url))
+    name = url.database or ""
+    if url.get_backend_name() == "sqlite" and name in ("", ":memory:"):
+        return True
+    return bool(SCRATCH_DATABASE.search(os.path.basename(name)))
+
+
+def clear_corpus():
+    """Delete every row the generator writes (posts first for the FKs).
+
+    This empties the post, epaper, author and ward tables outright, so it
+    refuses to run unless the bound database is a scratch database.
+    """
+    if not is_scratch_database(db.engine.url):
+        raise RuntimeError(
+            f"Refusing to clear {db.engine.url.render_as_string(hide_password=True)}: not a scratch database "
+            "(in-memory SQLite or a name containing test, bench, scratch, synthetic or tmp)"
+        )
+    for model in (WardKeywordDaily, Post, Epaper, Author, WardProfile, WardDemographics, WardFeatures):
+        db.session.query(model).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def load_corpus(spec: CorpusSpec, batch_size: int = 5000, replace: bool = False) -> Dict[str, Any]:
+    """Generate and insert a corpus inside the current app context.
+
+    Primary keys are assigned by the generator so posts can reference
+    authors and epapers without read-backs; Postgres sequences are moved
+    past them afterwards. ``replace`` first empties the target tables via
+    :func:`clear_corpus` (scratch databases only). Returns row counts and
+    per-table throughput.
+    """
+    if replace:
+        clear_corpus()
+
+    corpus = SyntheticCorpus(spec)
+    stats: Dict[str, Any] = {"spec": asdict(spec), "tables": {}}
+    started = time.perf_counter()
+
+    def timed(name, table, rows, keywords=None):
+        t0 = time.perf_counter()
+        count = _bulk_insert(table, rows, batch_size, keywords)
+        elapsed = time.perf_counter() - t0
+        stats["tables"][name] = {
+            "rows": count,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(count / elapsed, 1) if elapsed else None,
+        }
+        log.info(f"Synthetic corpus: {count} {name} rows in {elapsed:.1f}s")
+
+    ward_rows = list(corpus.ward_rows())
+    timed("ward_profile", WardProfile.__table__, (r["profile"] for r in ward_rows))
+    timed("ward_demographics", WardDemographics.__table__, (r["demographics"] for r in ward_rows))
+    timed("ward_features", WardFeatures.__table__, (r["features"] for r in ward_rows))
+    timed("author", Author.__table__, corpus.authors())
+    timed("epaper", Epaper.__table__, corpus.epapers())
+    timed("post", Post.__table__, corpus.posts(), KeywordCounter())
+    _reset_sequences(["author", "epaper", "post"])
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["wards"] = [w["name"] for w in corpus.wards]
+    return stats
+
+
+def write_epaper_jsonl(spec: CorpusSpec, path: str, count: int, offset: int = 0) -> str:
+    """Write ``count`` ingestion-format epaper records to ``path``."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        for record in SyntheticCorpus(spec).epaper_jsonl_records(count, offset=offset):
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
@@ -93,6 +93,25 @@ def _add_post(
     db.session.add(p)
     return p
 
+def _label_emotions(posts: list) -> None:
+    """Emotion for freshly added posts in one classifier batch (LLM only for unsure ones)."""
+    if not posts:
+        return
+    try:
+        from .emotion_classifier import label_posts
+        label_posts(posts)
+    except Exception:
+        # Posts stay unlabelled; label_post_emotions picks them up later
+        log.exception("emotion labelling failed for %d posts", len(posts))
+
+def _invalidate_answer_caches(wards: Iterable[Optional[str]]) -> None:
+    """Drop semantic-cache answers for wards that just received posts."""
+    try:
+        from .services.semantic_cache import invalidate_ward_caches
+        invalidate_ward_caches(wards)
+    except Exception:
+        log.exception("semantic cache invalidation failed")
+
 # ------------------------------ tasks ---------------------------------- #
 
 @shared_task(bind=True, name="app.tasks.ingest_epaper_jsonl")
@@ -122,6 +141,7 @@ def ingest_epaper_jsonl(self, jsonl_path: str, also_create_posts: bool = True) -
     reused_epaper = 0
     inserted_posts = 0
     skipped_posts = 0
+    new_posts = []
 
     try:
         for row in _iter_jsonl(jsonl_path):
@@ -177,28 +197,31 @@ def ingest_epaper_jsonl(self, jsonl_path: str, also_create_posts: bool = True) -
                     if existing_post:
                         skipped_posts += 1
                     else:
-                        _add_post(
+                        new_posts.append(_add_post(
                             text=text,
                             author=author,
                             city=city,
                             party=party,
                             created_at=created_at,
                             epaper_id=epaper_id,
-                        )
+                        ))
                         inserted_posts += 1
                 else:
                     # No Epaper model or epaper_id -> create a plain Post (best effort)
-                    _add_post(
+                    new_posts.append(_add_post(
                         text=text,
                         author=author,
                         city=city,
                         party=party,
                         created_at=created_at,
                         epaper_id=None,
-                    )
+                    ))
                     inserted_posts += 1
 
+        _label_emotions(new_posts)
+        touched_wards = {p.ward_id or p.city for p in new_posts}  # read before commit expires them
         db.session.commit()
+        _invalidate_answer_caches(touched_wards)
         msg = (
             f"ingest_epaper_jsonl: epaper_new={inserted_epaper} "
             f"epaper_reused={reused_epaper} posts={inserted_posts} "
@@ -241,6 +264,14 @@ def ingest_epaper_dir(self, dir_path: str, also_create_posts: bool = True) -> st
     log.info(msg)
     return msg
 
+@shared_task(bind=True, name="app.tasks.label_post_emotions")
+def label_post_emotions(self, batch_size: int = 2000, max_batches: int = 50) -> Dict[str, int]:
+    """Label posts that arrived without an emotion (bulk ingestion, failed labelling)."""
+    from .emotion_classifier import label_unlabelled_posts
+    result = label_unlabelled_posts(batch_size=batch_size, max_batches=max_batches)
+    log.info("label_post_emotions: %s", result)
+    return result
+
 @shared_task(bind=True, name="app.tasks.ping")
 def ping(self) -> Dict[str, Any]:
     """Simple health check task."""
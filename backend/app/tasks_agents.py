@@ -0,0 +1,35 @@
+# backend/app/tasks_agents.py
+"""
+Celery job mode for /api/v1/agents/batch-analysis.
+
+Large batches run here instead of in the request. The task reports each
+completed ward through its result state (``PROGRESS`` with the outcomes so
+far), which GET /api/v1/agents/batch-analysis/<job_id> reads.
+"""
+import logging
+from typing import Any, Dict, List
+
+from celery import shared_task
+
+from .agents_batch import batch_payload, outcome_entry, stream_batch
+
+log = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, name="app.tasks_agents.batch_analysis", ignore_result=False)
+def batch_analysis(self, wards: List[str], depth: str = "standard", concurrency: int = 5,
+                   timeout: float = 45.0) -> Dict[str, Any]:
+    """Analyze ``wards`` concurrently, publishing partial results as they complete."""
+    outcomes = []
+    for outcome in stream_batch(wards, depth=depth, concurrency=concurrency, timeout=timeout):
+        outcomes.append(outcome)
+        self.update_state(state="PROGRESS", meta={
+            "completed": len(outcomes),
+            "total_wards": len(wards),
+            "batch_analysis": {o["ward"]: outcome_entry(o) for o in outcomes},
+        })
+
+    payload = batch_payload(wards, outcomes)
+    log.info(f"Agent batch analysis finished: {payload['successful_analyses']}/{len(wards)} wards, "
+             f"{payload['timed_out']} timed out")
+    return payload
@@ -0,0 +1,26 @@
+# backend/app/tasks_analytics.py
+"""
+Celery tasks for the materialized analytics views.
+
+Scheduled from celery_worker.py every ANALYTICS_VIEW_REFRESH_MINUTES.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from celery import shared_task
+
+from .analytics_views import refresh_views
+
+log = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, name="app.tasks_analytics.refresh_analytics_views")
+def refresh_analytics_views(self, views: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Refresh the analytics views concurrently and record their freshness."""
+    results = refresh_views(views)
+    failed = [name for name, r in results.items() if isinstance(r, dict) and r.get("status") == "error"]
+    if failed:
+        log.warning(f"Analytics view refresh failed for: {', '.join(failed)}")
+    else:
+        log.info(f"Analytics views refreshed: {results}")
+    return results
@@ -27,6 +27,8 @@ from sqlalchemy import text
 
 from .extensions import db
 from .models import Epaper, Author, Post
+from .services.semantic_cache import invalidate_ward_caches
+from .utils.ward import resolve_ward_id
 
 log = logging.getLogger(__name__)
 
@@ -268,6 +270,7 @@ def bulk_ingest_epapers_optimized(
                             'text': record.raw_text,
                             'author_name': record.publication_name,
                             'city': record.city,
+                            'ward_id': resolve_ward_id(record.city),
                             'party': record.party,
                             'created_at': datetime.combine(record.publication_date, datetime.min.time()).replace(tzinfo=timezone.utc).isoformat()
                         })
@@ -278,6 +281,8 @@ def bulk_ingest_epapers_optimized(
                 
                 # Commit batch
                 db.session.commit()
+                if epaper_records:
+                    invalidate_ward_caches(d['ward_id'] or d['city'] for d in post_data)
                 log.info(f"[{worker_id}] Batch {batch_count} completed successfully")
                 
             except Exception as e:
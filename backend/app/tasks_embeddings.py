@@ -64,7 +64,7 @@ def embed_recent(days: int = 7, limit: int = 400):
           SET ward = EXCLUDED.ward,
               vec = EXCLUDED.vec,
               meta = EXCLUDED.meta
-      """), {"sid": row["id"], "ward": row.get("city") or None, "vec": vec, "meta": json_dumps(meta)})
+      """), {"sid": row["id"], "ward": row.get("city") or None, "vec": json_dumps(vec), "meta": json_dumps(meta)})
       inserted += 1
 
     for row in articles:
@@ -77,7 +77,7 @@ def embed_recent(days: int = 7, limit: int = 400):
         ON CONFLICT (source_type, source_id) DO UPDATE
           SET vec = EXCLUDED.vec,
               meta = EXCLUDED.meta
-      """), {"sid": row["id"], "dt": row.get("publication_date"), "vec": vec, "meta": json_dumps(meta)})
+      """), {"sid": row["id"], "dt": row.get("publication_date"), "vec": json_dumps(vec), "meta": json_dumps(meta)})
       inserted += 1
 
     db.session.commit()
@@ -0,0 +1,65 @@
+# backend/app/tasks_precompute.py
+"""
+Celery tasks for the nightly precompute of strategist reports and ward
+summaries (see app/precompute.py).
+
+Scheduled from celery_worker.py before office hours. ``nightly_precompute``
+plans the wards, then starts a chord: a group of NIGHTLY_PRECOMPUTE_CONCURRENCY
+chains (one lane each) followed by ``finish_precompute``, which logs the
+progress report.
+"""
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+from celery import chain, chord, group, shared_task
+from flask import current_app
+
+from .precompute import (assign_lanes, decay_ward_access, finish_progress, plan_wards, precompute_ward,
+                         record_progress, start_progress)
+
+log = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, name="app.tasks_precompute.nightly_precompute")
+def nightly_precompute(self, limit: Optional[int] = None, concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """Fan out precompute_ward over every ward, most accessed first, in bounded lanes."""
+    config = current_app.config
+    limit = limit or config.get("NIGHTLY_PRECOMPUTE_MAX_WARDS")
+    concurrency = concurrency or config.get("NIGHTLY_PRECOMPUTE_CONCURRENCY", 4)
+
+    plan = plan_wards(limit)
+    decay_ward_access()
+    run_id = self.request.id or uuid.uuid4().hex
+    lanes = assign_lanes(plan, concurrency)
+    start_progress(run_id, plan, len(lanes))
+    if not lanes:
+        return finish_progress(run_id)
+
+    header = group(chain(precompute_ward_task.si(run_id, entry) for entry in lane) for lane in lanes)
+    chord(header)(finish_precompute.si(run_id))
+    log.info(f"Nightly precompute {run_id}: {len(plan)} wards in {len(lanes)} lanes")
+    return {"run_id": run_id, "wards": len(plan), "lanes": len(lanes)}
+
+
+@shared_task(bind=True, name="app.tasks_precompute.precompute_ward", ignore_result=False)
+def precompute_ward_task(self, run_id: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    config = current_app.config
+    result = precompute_ward(
+        entry,
+        depth=config.get("NIGHTLY_PRECOMPUTE_DEPTH", "standard"),
+        report_ttl=config.get("NIGHTLY_PRECOMPUTE_REPORT_TTL_SECONDS", 18 * 3600),
+        estimated_cost_usd=config.get("NIGHTLY_PRECOMPUTE_WARD_COST_USD", 0.05),
+    )
+    record_progress(run_id, result)
+    if result["status"] != "ok":
+        log.warning(f"Precompute {result['status']} for ward {result['ward_id']}: {result['errors']}")
+    return result
+
+
+@shared_task(name="app.tasks_precompute.finish_precompute", ignore_result=False)
+def finish_precompute(run_id: str) -> Dict[str, Any]:
+    report = finish_progress(run_id)
+    log.info(f"Nightly precompute {run_id} finished: "
+             + ", ".join(f"{k}={report[k]}" for k in ("total", "ok", "partial", "failed", "skipped_budget")))
+    return report
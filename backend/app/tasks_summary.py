@@ -1,20 +1,21 @@
+from datetime import datetime, timedelta, timezone
 from celery import shared_task
 from sqlalchemy import text
 from .extensions import db
-from .rag import ann_retrieve
-from .llm import call_llm_json
-import os, json, requests
+from .rag import ann_retrieve, hybrid_retrieve
+from .llm import call_llm_json, get_embedding
+from .ward_keywords import keyword_scope, top_keywords
+from .ward_snapshot import ward_snapshots
+from .utils.ward import resolve_ward_id
+import json
 
-BACKEND_BASE_URL = os.getenv("BACKEND_BASE_URL", "http://127.0.0.1:5000")
+SOURCE_EXCERPT_CHARS = 280
 
 def fetch_ward_meta(ward: str) -> dict:
-    try:
-        r = requests.get(f"{BACKEND_BASE_URL}/api/v1/ward/meta/{ward}", timeout=15)
-        if r.status_code == 200:
-            return r.json()
-    except Exception:
-        pass
-    return {}
+    """Ward snapshot (as served by /ward/meta) for a ward id or name, read in-process."""
+    candidates = [ward] + [w for w in [resolve_ward_id(ward)] if w and w != ward]
+    snapshots = ward_snapshots(candidates)
+    return next((snapshots[w] for w in candidates if w in snapshots), {})
 
 def compute_confidence(items: list[dict], sections: dict) -> float:
     # very simple heuristic
@@ -31,6 +32,9 @@ def build_prompt(ward: str, profile: dict, items: list[dict], window_label: str)
         title = meta.get("title") or f"{it['source_type'].title()} {it['source_id']}"
         date = meta.get("date") or ""
         sources.append(f"[S{i}] {title} — {date}")
+        excerpt = " ".join((it.get("text") or "").split())
+        if excerpt:
+            sources.append(f"     {excerpt[:SOURCE_EXCERPT_CHARS]}")
 
     issues = profile.get("features", {}).get("top_issues", [])
     voters = profile.get("profile", {}).get("electors")
@@ -67,11 +71,27 @@ Return JSON strictly: {{"angle": "...", "weakness": "...",
 """
     return system, user
 
+def retrieve_sources(ward: str, days: int, k: int = 12) -> list[dict]:
+    """Ground the summary in what the ward is discussing.
+
+    The ward's top pulse keywords form the retrieval query (OR-ed for full
+    text, embedded for vectors); recency-only ANN is the fallback when the
+    ward has no keywords or nothing matches.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    scope = keyword_scope(ward)
+    keywords = [token for token, _ in top_keywords(scope, since, k=8)] if scope else []
+    if keywords:
+        items = hybrid_retrieve(" or ".join(keywords), ward=ward, window_days=days, k=k, embed=get_embedding)
+        if items:
+            return items
+    return ann_retrieve(ward=ward, window_days=days, k=k)
+
 @shared_task(name="app.tasks.generate_summary")
 def generate_summary(ward: str, window: str = "P7D"):
     days = 7 if window == "P7D" else 30
     profile = fetch_ward_meta(ward)
-    items = ann_retrieve(ward=ward, window_days=days, k=12)
+    items = retrieve_sources(ward, days)
 
     system, user = build_prompt(ward, profile, items, window)
     out = call_llm_json(system, user) or {}
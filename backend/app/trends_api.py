@@ -8,6 +8,9 @@ from flask_login import login_required
 from sqlalchemy import func
 
 from . import db
+from .analytics_views import (
+    DAILY_TRENDS_HORIZON_DAYS, daily_ward_trends, fresh_view, mark_freshness, view_ward_filter,
+)
 from .models import Post, Author
 from .utils.ward import normalize_ward
 
@@ -110,6 +113,31 @@ def _party_of(post: Post, author: Author):
     name = (author.name or "").strip()
     return PARTY_ALIAS.get(name, "Other")
 
+def _live_counts(ward, start_dt):
+    """(day, emotion, party, count) rows computed from posts."""
+    q = db.session.query(Post, Author).outerjoin(Author, Post.author_id == Author.id) \
+        .filter(Post.created_at >= start_dt)
+    ward_clause = Post.ward_filter(ward)
+    if ward_clause is not None:
+        q = q.filter(ward_clause)
+
+    for post, author in q.all():
+        dt = _post_datetime(post)
+        if not dt or dt < start_dt:
+            continue
+        yield dt.date().isoformat(), _post_emotion(post), _party_of(post, author), 1
+
+def _view_counts(ward, start_dt):
+    """(day, emotion, party, count) rows from daily_ward_trends (whole first day)."""
+    v = daily_ward_trends
+    q = db.session.query(v.c.trend_date, v.c.emotion, v.c.party, func.sum(v.c.posts)) \
+        .filter(v.c.trend_date >= start_dt.date())
+    ward_clause = view_ward_filter(v, ward)
+    if ward_clause is not None:
+        q = q.filter(ward_clause)
+    for day, emotion, party, n in q.group_by(v.c.trend_date, v.c.emotion, v.c.party):
+        yield day.isoformat(), emotion, party, int(n)
+
 # ---- API -------------------------------------------------------------------
 
 @trends_bp.route("/trends", methods=["GET"])
@@ -137,16 +165,10 @@ def get_trends():
     now = datetime.utcnow()
     start_dt = now - timedelta(days=days)
 
-    # Base query: join Author, optionally filter by ward (city)
-    q = db.session.query(Post, Author).outerjoin(Author, Post.author_id == Author.id)
-
-    if ward_key and ward_key.lower() != "all":
-        # Compare normalized city to normalized ward
-        q = q.filter(func.lower(func.trim(Post.city)) == ward_key.lower())
-
-    rows = q.all()
+    # Fresh daily_ward_trends rows replace the per-post scan
+    age = fresh_view("daily_ward_trends") if days < DAILY_TRENDS_HORIZON_DAYS else None
+    rows = _view_counts(ward, start_dt) if age is not None else _live_counts(ward, start_dt)
 
-    # Aggregate in Python (robust to missing columns / mixed date formats)
     day_emotions = defaultdict(lambda: defaultdict(int))
     day_parties = defaultdict(lambda: defaultdict(int))
     day_total = defaultdict(int)
@@ -154,24 +176,14 @@ def get_trends():
     emotion_keys = set()
     party_keys = {"BJP", "BRS", "INC", "AIMIM", "Other"}
 
-    for post, author in rows:
-        dt = _post_datetime(post)
-        if not dt:
-            continue
-        if dt < start_dt:
-            continue
-
-        dkey = dt.date().isoformat()
-
-        emo = _post_emotion(post)
+    for dkey, emo, party, n in rows:
         emotion_keys.add(emo)
-        day_emotions[dkey][emo] += 1
+        day_emotions[dkey][emo] += n
 
-        party = _party_of(post, author)
         party_keys.add(party)
-        day_parties[dkey][party] += 1
+        day_parties[dkey][party] += n
 
-        day_total[dkey] += 1
+        day_total[dkey] += n
 
     # Fill the window so charts draw continuous lines
     series = []
@@ -186,7 +198,7 @@ def get_trends():
             }
         )
 
-    return jsonify(
+    response = jsonify(
         {
             "ward": ward_key or "All",
             "days": days,
@@ -197,3 +209,4 @@ def get_trends():
             "series": series,
         }
     )
+    return mark_freshness(response, "daily_ward_trends", age)
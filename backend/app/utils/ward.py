@@ -1,10 +1,41 @@
 # backend/app/utils/ward.py
+import difflib
+import json
+import os
 import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
 
 _WARD_PREFIX = re.compile(r"(?i)^\s*ward\s*no\.?\s*\d+\s*")
 _WARD_NUM    = re.compile(r"(?i)^\s*ward\s*\d+\s*")
 _WARD_INT    = re.compile(r"^\s*\d+\s*[-–]?\s*")
 _WS          = re.compile(r"\s+")
+_WARD_NUMBER = re.compile(r"(?i)^\s*(?:ward\s*(?:no\.?)?\s*)?(\d+)\b")
+_WARD_CODE   = re.compile(r"(?i)^\s*ward[\s_-]*(\d+)\s*$")
+_NON_ALNUM   = re.compile(r"[^a-z0-9]+")
+
+GEOJSON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "ghmc_wards.geojson")
+
+# Spellings seen in feeds and map labels that differ from the GHMC boundary names.
+# Keys are ward_key() forms, values canonical ward ids.
+WARD_ALIASES = {
+    "ramnathpur": "9",
+    "himayatnagar": "79",
+    "asraonagar": "2",
+    "bnreddy": "14",
+    "kphb": "114",
+    "rahmatnagar": "102",
+    "sitaphalmandi": "145",
+    "rkpuram": "20",
+    "ramakrishnapuram": "20",
+    "bowenpally": "119",
+    "qutbullapur": "131",
+}
+
+_FUZZY_CUTOFF = 0.88
+
 
 def normalize_ward(label: str) -> str:
     """
@@ -22,3 +53,113 @@ def normalize_ward(label: str) -> str:
     s = _WARD_INT.sub("", s)
     s = _WS.sub(" ", s).strip()
     return s
+
+
+def ward_key(label: str) -> str:
+    """Case/space/punctuation-insensitive key: "Himayath-Nagar" -> "himayathnagar"."""
+    return _NON_ALNUM.sub("", normalize_ward(label).lower().replace("ghmc", ""))
+
+
+def load_ghmc_wards(path: str = GEOJSON_PATH) -> List[Dict[str, Any]]:
+    """GHMC wards as ``{ward_id, number, name, label}`` sorted by ward number."""
+    with open(path, "r", encoding="utf-8") as fh:
+        features = json.load(fh).get("features", [])
+
+    wards = []
+    for feature in features:
+        label = (feature.get("properties") or {}).get("name") or ""
+        match = _WARD_NUMBER.match(label)
+        if not match:
+            continue
+        number = int(match.group(1))
+        wards.append({
+            "ward_id": str(number),
+            "number": number,
+            "name": normalize_ward(label),
+            "label": label,
+        })
+    wards.sort(key=lambda w: w["number"])
+    return wards
+
+
+@lru_cache(maxsize=1)
+def _ward_index() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """(name key -> ward id, ward id -> canonical name) built once from the GeoJSON."""
+    by_key: Dict[str, str] = {}
+    names: Dict[str, str] = {}
+    for ward in load_ghmc_wards():
+        by_key.setdefault(ward_key(ward["name"]), ward["ward_id"])
+        names.setdefault(ward["ward_id"], ward["name"])
+    for alias, ward_id in WARD_ALIASES.items():
+        by_key.setdefault(alias, ward_id)
+    return by_key, names
+
+
+@lru_cache(maxsize=4096)
+def resolve_ward_id(label: Optional[str]) -> Optional[str]:
+    """
+    Map any ward label or alias to its canonical GHMC ward id (``"95"``).
+
+    Names win over numbers, so a mislabelled "Ward 135 Jubilee Hills" still
+    resolves to Jubilee Hills. Bare numbers and codes ("95", "Ward No. 95",
+    the Form-20 "WARD_095") resolve when they are known ward ids; close
+    misspellings resolve by fuzzy match.
+    Returns None for "All", cities and anything unrecognised.
+    """
+    if not label or not str(label).strip():
+        return None
+    by_key, names = _ward_index()
+    key = ward_key(label)
+    if key in by_key:
+        return by_key[key]
+    code = _WARD_CODE.match(str(label))
+    if not key or key.isdigit() or code:
+        match = code or _WARD_NUMBER.match(str(label))
+        if match and match.group(1).lstrip("0") in names:
+            return match.group(1).lstrip("0")
+        return None
+    if len(key) < 5:
+        return None
+    close = difflib.get_close_matches(key, by_key.keys(), n=1, cutoff=_FUZZY_CUTOFF)
+    return by_key[close[0]] if close else None
+
+
+def canonical_ward_name(ward_id: Optional[str]) -> Optional[str]:
+    """Display name for a canonical ward id ("95" -> "Jubilee Hills")."""
+    return _ward_index()[1].get(str(ward_id)) if ward_id else None
+
+
+def backfill_post_ward_ids(connection, batch_size: int = 50_000, only_missing: bool = True,
+                           commit: bool = False) -> Dict[str, int]:
+    """
+    Fill ``post.ward_id`` from ``post.city`` in primary-key batches.
+
+    Distinct city labels are resolved once in Python; each batch is a single
+    UPDATE with a CASE over the resolved labels, so large tables are never
+    locked or loaded in one go. Pass ``commit=True`` outside a migration to
+    commit after every batch.
+    """
+    post = sa.table("post", sa.column("id"), sa.column("city"), sa.column("ward_id"))
+    cities = [row[0] for row in connection.execute(
+        sa.select(post.c.city).where(post.c.city.isnot(None)).distinct()
+    )]
+    mapping = {city: ward_id for city in cities if (ward_id := resolve_ward_id(city))}
+    stats = {"cities": len(cities), "resolved_cities": len(mapping), "batches": 0, "updated": 0}
+    if not mapping:
+        return stats
+
+    low, high = connection.execute(sa.select(sa.func.min(post.c.id), sa.func.max(post.c.id))).one()
+    ward_case = sa.case(mapping, value=post.c.city)
+    for start in range(low or 0, (high or 0) + 1, batch_size):
+        stmt = (
+            sa.update(post)
+            .where(post.c.id >= start, post.c.id < start + batch_size, post.c.city.in_(list(mapping)))
+            .values(ward_id=ward_case)
+        )
+        if only_missing:
+            stmt = stmt.where(post.c.ward_id.is_(None))
+        stats["updated"] += connection.execute(stmt).rowcount or 0
+        stats["batches"] += 1
+        if commit:
+            connection.commit()
+    return stats
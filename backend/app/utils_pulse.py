@@ -1,4 +1,3 @@
-from datetime import datetime, timezone
 # backend/app/utils_pulse.py
 from __future__ import annotations
 import re
@@ -7,6 +6,8 @@ from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Tuple
 
+from .utils.ward import canonical_ward_name, normalize_ward, resolve_ward_id
+
 STOPWORDS = {
     "the","a","an","and","or","to","of","in","on","for","with","at","by","from","as","is","are","was","were",
     "be","been","being","this","that","these","those","it","its","we","our","you","your","their","they",
@@ -15,27 +16,9 @@ STOPWORDS = {
     "not","no","nor","do","does","did","done","doing","have","has","had","having"
 }
 
-WARD_ALIASES = {
-    # normalize common map labels → canonical ward names you use in DB
-    "ward 8 habsiguda": "Habsiguda",
-    "ward 79 himayath nagar": "Himayath Nagar",
-    "ward 9 ramnathpur": "Ramnathpur",
-    "ward 5 kapra": "Kapra",
-    "ward 135 jubilee hills": "Jubilee Hills",
-}
-
 def normalize_ward_name(raw: str) -> str:
-    if not raw:
-        return ""
-    s = re.sub(r"\s+", " ", raw.strip()).lower()
-    s = re.sub(r"[,.;:()\-_/]+", " ", s)
-    s = s.replace("ghmc", "").strip()
-    if s in WARD_ALIASES:
-        return WARD_ALIASES[s]
-    # strip leading "ward <num>"
-    s = re.sub(r"^ward\s*\d+\s*", "", s).strip()
-    # title case words
-    return " ".join(w.capitalize() for w in s.split())
+    """Canonical GHMC ward name for a label or alias, else the cleaned label."""
+    return canonical_ward_name(resolve_ward_id(raw)) or normalize_ward(raw)
 
 def tokenize(text: str) -> List[str]:
     text = text.lower()
@@ -10,95 +10,56 @@ Endpoints defined here:
 
 * GET /api/v1/ward/meta/<ward_id> – consolidated snapshot of electors, turnout,
   last winner info, socio-economic indices, and derived features.
+* GET /api/v1/ward/meta?ids=id,id,... – the same snapshot for several wards.
 * GET /api/v1/prediction/<ward_id> – simple heuristic prediction based on features.
+* GET /api/v1/prediction?wards=all|id,id,... – the same prediction for many
+  wards at once, as a columnar payload.
 """
 
-from datetime import datetime, timezone
-from flask import Blueprint, jsonify
-from .models import WardProfile, WardDemographics, WardFeatures
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
 
-ward_bp = Blueprint("ward_bp", __name__, url_prefix="/api/v1")
+import numpy as np
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func
 
+from .compression import precompressed
+from .extensions import db
+from .models import WardFeatures
+from .ward_snapshot import _iso, ward_snapshot, ward_snapshots
 
-def _iso(dt: datetime | None) -> str | None:
-    """Return an ISO8601 UTC (Z) string for a datetime (or None)."""
-    if dt is None:
-        return None
-    if dt.tzinfo is None:  # treat naive as UTC
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+ward_bp = Blueprint("ward_bp", __name__, url_prefix="/api/v1")
 
 
 # ---------------------------------------------------------------------------
 # META: Consolidated ward snapshot
 # ---------------------------------------------------------------------------
+MAX_META_IDS = 200
+
+
 @ward_bp.get("/ward/meta/<ward_id>")
 def ward_meta(ward_id: str):
     """Return consolidated metadata and features for a ward.
 
-    Aggregates information from WardProfile, WardDemographics and WardFeatures.
-    Missing components are returned as null. If nothing exists, 404.
+    Aggregates information from WardProfile, WardDemographics and WardFeatures
+    (see app.ward_snapshot). Missing components are returned as null. If
+    nothing exists, 404.
     """
-    profile = WardProfile.query.filter_by(ward_id=ward_id).first()
-    demographics = WardDemographics.query.filter_by(ward_id=ward_id).first()
-    features = WardFeatures.query.filter_by(ward_id=ward_id).first()
-
-    if not any([profile, demographics, features]):
+    snapshot = ward_snapshot(ward_id)
+    if snapshot is None:
         return jsonify({"status": "not_found", "ward": ward_id}), 404
+    return jsonify(snapshot)
 
-    # Build payload pieces
-    payload = {"ward": ward_id}
-
-    payload["profile"] = (
-        {
-            "electors": getattr(profile, "electors", None),
-            "votes_cast": getattr(profile, "votes_cast", None),
-            "turnout_pct": getattr(profile, "turnout_pct", None),
-            "last_winner_party": getattr(profile, "last_winner_party", None),
-            "last_winner_year": getattr(profile, "last_winner_year", None),
-            "updated_at": _iso(getattr(profile, "updated_at", None)),
-        }
-        if profile
-        else None
-    )
-
-    payload["demographics"] = (
-        {
-            "literacy_idx": getattr(demographics, "literacy_idx", None),
-            "muslim_idx": getattr(demographics, "muslim_idx", None),
-            "scst_idx": getattr(demographics, "scst_idx", None),
-            "secc_deprivation_idx": getattr(demographics, "secc_deprivation_idx", None),
-            "updated_at": _iso(getattr(demographics, "updated_at", None)),
-        }
-        if demographics
-        else None
-    )
-
-    payload["features"] = (
-        {
-            "as23_party_shares": getattr(features, "as23_party_shares", None),
-            "ls24_party_shares": getattr(features, "ls24_party_shares", None),
-            "dvi": getattr(features, "dvi", None),
-            "aci_23": getattr(features, "aci_23", None),
-            "turnout_volatility": getattr(features, "turnout_volatility", None),
-            "incumbency_weakness": getattr(features, "incumbency_weakness", None),
-            "updated_at": _iso(getattr(features, "updated_at", None)),
-        }
-        if features
-        else None
-    )
-
-    # Compute top-level updated_at = max(profile, demographics, features)
-    cand = []
-    for section in ("profile", "demographics", "features"):
-        sec = payload.get(section)
-        if sec and sec.get("updated_at"):
-            # parse ISO back to dt to compute max
-            cand.append(datetime.fromisoformat(sec["updated_at"].replace("Z", "+00:00")))
-    top_dt = max(cand) if cand else None
-    payload["updated_at"] = _iso(top_dt)
 
-    return jsonify(payload)
+@ward_bp.get("/ward/meta")
+def ward_meta_bulk():
+    """Snapshots for ``ids=id,id,...`` keyed by ward id; unknown ids go to ``missing``."""
+    ids = list(dict.fromkeys(w.strip() for w in (request.args.get("ids") or "").split(",") if w.strip()))
+    if not ids or len(ids) > MAX_META_IDS:
+        return jsonify({"error": f"ids must list 1 to {MAX_META_IDS} comma-separated ward ids"}), 400
+    snapshots = ward_snapshots(ids)
+    return jsonify({"wards": snapshots, "missing": [w for w in ids if w not in snapshots]})
 
 
 # ---------------------------------------------------------------------------
@@ -127,3 +88,117 @@ def prediction_for_ward(ward_id: str):
     confidence = max(min(base_confidence, 1.0), 0.0)
 
     return jsonify({"ward": ward_id, "scores": normalized, "confidence": confidence})
+
+
+# ---------------------------------------------------------------------------
+# PREDICTION (batch): the same heuristic for many wards, columnar
+# ---------------------------------------------------------------------------
+@dataclass
+class PredictionTable:
+    """Scores and confidence for every ward with party shares, as arrays."""
+
+    wards: List[str]
+    parties: List[str]
+    scores: np.ndarray  # (wards, parties) percent, NaN where the party is absent
+    confidence: np.ndarray  # (wards,)
+    updated_at: Optional[str] = None
+
+    @classmethod
+    def from_rows(cls, rows: Sequence, updated_at: Optional[str] = None) -> "PredictionTable":
+        """Build from (ward_id, ls24_party_shares, as23_party_shares, turnout_volatility) rows.
+
+        Same rules as :func:`prediction_for_ward`; wards without shares are skipped.
+        """
+        usable = []
+        for ward_id, ls24, as23, volatility in rows:
+            shares = dict(ls24 or {}) or dict(as23 or {})
+            if shares:
+                usable.append((str(ward_id), shares, bool(ls24 and as23), volatility or 0.0))
+        parties = sorted({p for _, shares, _, _ in usable for p in shares})
+        column = {p: i for i, p in enumerate(parties)}
+
+        raw = np.full((len(usable), len(parties)), np.nan)
+        for w, (_, shares, _, _) in enumerate(usable):
+            for party, value in shares.items():
+                raw[w, column[party]] = value or 0.0
+        total = np.nansum(raw, axis=1)
+        total[total == 0] = 1.0
+        scores = raw / total[:, None] * 100.0
+
+        volatility = np.array([v for _, _, _, v in usable], dtype=float)
+        both = np.array([b for _, _, b, _ in usable], dtype=bool)
+        confidence = 1.0 - np.minimum(volatility / 100.0, 0.9)
+        confidence = np.clip(np.where(both, confidence, confidence * 0.5), 0.0, 1.0)
+
+        return cls([w for w, _, _, _ in usable], parties, scores, confidence, updated_at)
+
+    def columns(self, wards: Optional[Sequence[str]] = None) -> dict:
+        """Columnar payload for ``wards`` (all by default); unknown ids go to ``missing``."""
+        if wards is None:
+            rows, missing = list(range(len(self.wards))), []
+        else:
+            position = {w: i for i, w in enumerate(self.wards)}
+            rows = [position[w] for w in wards if w in position]
+            missing = [w for w in wards if w not in position]
+        scores = np.round(self.scores[rows], 2)
+        present = ~np.isnan(scores)
+        return {
+            "wards": [self.wards[i] for i in rows],
+            "parties": self.parties,
+            "scores": {
+                party: [v if ok else None for v, ok in zip(scores[:, j].tolist(), present[:, j].tolist())]
+                for j, party in enumerate(self.parties)
+            },
+            "confidence": np.round(self.confidence[rows], 4).tolist(),
+            "missing": missing,
+            "updated_at": self.updated_at,
+        }
+
+
+_prediction_cache: dict = {}
+_prediction_lock = threading.Lock()
+
+
+def _features_version() -> tuple:
+    """(row count, latest updated_at); changes whenever compute_features writes."""
+    return tuple(db.session.query(func.count(WardFeatures.id), func.max(WardFeatures.updated_at)).one())
+
+
+def prediction_table(version: Optional[tuple] = None) -> PredictionTable:
+    """Process-wide table, rebuilt from one query when ward features change."""
+    version = version if version is not None else _features_version()
+    cached = _prediction_cache.get("table")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _prediction_lock:
+        cached = _prediction_cache.get("table")
+        if cached is None or cached[0] != version:
+            rows = db.session.query(WardFeatures.ward_id, WardFeatures.ls24_party_shares,
+                                    WardFeatures.as23_party_shares, WardFeatures.turnout_volatility).all()
+            cached = (version, PredictionTable.from_rows(rows, updated_at=_iso(version[1])))
+            _prediction_cache["table"] = cached
+        return cached[1]
+
+
+@ward_bp.get("/prediction")
+def prediction_batch():
+    """Heuristic predictions for ``wards=all`` (default) or a comma-separated id list.
+
+    Returns ``wards`` and ``confidence`` as parallel arrays and ``scores`` as
+    one array per party (null where the party did not contest). The table is
+    cached per process and rebuilt when ``ward_features`` rows are added or
+    rewritten; the all-wards body is also served precompressed with an ETag.
+    """
+    selector = (request.args.get("wards") or "all").strip()
+    version = _features_version()
+    if selector.lower() == "all":
+        blob = precompressed(
+            ("prediction", "all"), version,
+            lambda: current_app.json.dumps(prediction_table(version).columns()).encode("utf-8"),
+        )
+        return blob.response()
+
+    wards = list(dict.fromkeys(w.strip() for w in selector.split(",") if w.strip()))
+    if not wards:
+        return jsonify({"error": "wards must be 'all' or a comma-separated list of ward ids"}), 400
+    return jsonify(prediction_table(version).columns(wards))
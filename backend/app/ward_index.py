@@ -0,0 +1,141 @@
+"""
+Point-in-ward lookup over the GHMC ward polygons.
+
+:class:`WardIndex` packs the ward polygons from ``ghmc_wards.geojson`` into a
+shapely STRtree and assigns canonical ward ids to arrays of coordinates in one
+vectorized query (bounding-box pruning in the tree, exact predicate in GEOS),
+so 100k points take well under a second once the index is built.
+
+:func:`assign_polling_station_wards` is the batch job that re-derives
+``polling_station.ward_id``/``ward_name`` from station coordinates, replacing
+the ward columns copied from Form-20 CSVs where they name a different ward.
+"""
+
+import json
+import logging
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import shape
+from sqlalchemy import select, update
+
+from .utils.ward import GEOJSON_PATH, _WARD_NUMBER, canonical_ward_name, resolve_ward_id
+
+logger = logging.getLogger(__name__)
+
+# Coordinates this close (in degrees, ~50 m) outside every ward snap to the
+# nearest one; geocoders often place stations on the road outside a boundary
+DEFAULT_SNAP_DEGREES = 0.0005
+
+
+class WardIndex:
+    """STRtree over one (multi)polygon per canonical ward id."""
+
+    def __init__(self, ward_ids: Sequence[str], geometries: Sequence):
+        self.ward_ids = np.asarray(ward_ids, dtype=object)
+        self.geometries = list(geometries)
+        self.tree = STRtree(self.geometries)
+
+    @classmethod
+    def from_geojson(cls, path: str = GEOJSON_PATH) -> "WardIndex":
+        with open(path, "r", encoding="utf-8") as fh:
+            features = json.load(fh).get("features", [])
+        parts: Dict[str, list] = {}
+        for feature in features:
+            label = (feature.get("properties") or {}).get("name") or ""
+            number = _WARD_NUMBER.match(label)
+            ward_id = resolve_ward_id(label) or (number.group(1).lstrip("0") if number else None)
+            if not ward_id or not feature.get("geometry"):
+                continue
+            geometry = shape(feature["geometry"])
+            parts.setdefault(ward_id, []).append(geometry if geometry.is_valid else geometry.buffer(0))
+        ward_ids = sorted(parts, key=lambda w: int(w) if w.isdigit() else 0)
+        return cls(ward_ids, [shapely.union_all(parts[w]) for w in ward_ids])
+
+    def assign(self, lons, lats, snap_degrees: float = DEFAULT_SNAP_DEGREES) -> np.ndarray:
+        """Ward id (or None) for each (lon, lat) pair.
+
+        Points on a shared border go to the lower-numbered ward. Points within
+        ``snap_degrees`` of a ward but inside none take the nearest ward.
+        NaN coordinates give None.
+        """
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        result = np.full(len(lons), None, dtype=object)
+        valid = np.flatnonzero(~(np.isnan(lons) | np.isnan(lats)))
+        if not len(valid):
+            return result
+        points = shapely.points(lons[valid], lats[valid])
+
+        point_idx, tree_idx = self.tree.query(points, predicate="intersects")
+        # Keep the lowest tree index (ward number) per point
+        order = np.lexsort((tree_idx, point_idx))
+        point_idx, tree_idx = point_idx[order], tree_idx[order]
+        _, first = np.unique(point_idx, return_index=True)
+        result[valid[point_idx[first]]] = self.ward_ids[tree_idx[first]]
+
+        if snap_degrees:
+            inside = np.zeros(len(valid), dtype=bool)
+            inside[point_idx[first]] = True
+            missing = np.flatnonzero(~inside)
+            if len(missing):
+                near_point, near_tree = self.tree.query_nearest(
+                    points[missing], max_distance=snap_degrees, all_matches=False)
+                result[valid[missing[near_point]]] = self.ward_ids[near_tree]
+        return result
+
+    def ward_at(self, lon: float, lat: float) -> Optional[str]:
+        return self.assign([lon], [lat])[0]
+
+
+@lru_cache(maxsize=1)
+def ward_index() -> WardIndex:
+    """Process-wide index over the bundled GHMC ward boundaries."""
+    return WardIndex.from_geojson()
+
+
+def assign_polling_station_wards(session, index: Optional[WardIndex] = None,
+                                 batch_size: int = 10_000) -> Dict[str, int]:
+    """
+    Set ``ward_id``/``ward_name`` on every geolocated polling station from
+    its coordinates.
+
+    Reads (id, lon, lat, ward_id) in one query, assigns all points in a
+    single vectorized pass and writes only the rows whose ward changed, as
+    executemany UPDATEs of ``batch_size`` rows. CSV ids are compared after
+    resolving them, so "WARD_001" on a station inside ward "1" is left alone.
+    Stations without coordinates, or outside every ward, keep their CSV
+    ward. The caller commits.
+    """
+    from .models import PollingStation
+
+    index = index or ward_index()
+    rows = session.execute(
+        select(PollingStation.id, PollingStation.lon, PollingStation.lat, PollingStation.ward_id)
+        .where(PollingStation.lat.isnot(None), PollingStation.lon.isnot(None))
+    ).all()
+    stats = {"located": len(rows), "assigned": 0, "outside": 0, "changed": 0}
+    if not rows:
+        return stats
+
+    ids, lons, lats, current = zip(*rows)
+    wards = index.assign(lons, lats)
+    changes = []
+    for station_id, old, new in zip(ids, current, wards):
+        if new is None:
+            stats["outside"] += 1
+            continue
+        stats["assigned"] += 1
+        if resolve_ward_id(old) != new:
+            changes.append({"id": station_id, "ward_id": new, "ward_name": canonical_ward_name(new)})
+    stats["changed"] = len(changes)
+
+    for start in range(0, len(changes), batch_size):
+        session.execute(update(PollingStation), changes[start:start + batch_size])
+    if stats["outside"]:
+        logger.warning("%d polling stations lie outside every GHMC ward", stats["outside"])
+    logger.info("Polling station wards: %s", stats)
+    return stats
@@ -0,0 +1,175 @@
+"""
+Per-ward daily keyword counts for pulse briefings.
+
+``ward_keyword_daily`` holds (ward_id, day, token) -> count, maintained as
+posts are ingested: ORM inserts, edits and deletes are picked up by a session
+flush hook (see ``models.py``), and Core bulk loaders feed :class:`KeywordCounter`
+directly. Every post is also counted under the ``all`` bucket, so top-k
+keywords for a ward or for the whole city are one small aggregate over
+days x tokens, independent of how many posts the window holds.
+
+Counts are per UTC day, so a window starting mid-day includes that whole day.
+"""
+
+import re
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .extensions import db
+from .models import Post, WardKeywordDaily
+from .utils.ward import resolve_ward_id
+
+ALL_WARDS = "all"
+MAX_TOKEN_LENGTH = 64
+# Post columns a keyword row depends on, in KeywordCounter.add order
+COUNTED_POST_COLUMNS = ("ward_id", "created_at", "text")
+
+STOPWORDS = set("""
+the a an and or but of to in for on with at from by this that is are am be as it its was were
+will we our you your they their he she his her them us i about into after before over under
+again more most very can cannot could would should has have had do does did not no yes
+""".split())
+
+_CLEAN = re.compile(r"(?:https?://\S+)|[#@]|[^a-z0-9\s]")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased keyword tokens: no URLs, punctuation, stopwords or short words."""
+    return [
+        t for t in _CLEAN.sub(" ", (text or "").lower()).split()
+        if 2 < len(t) <= MAX_TOKEN_LENGTH and t not in STOPWORDS
+    ]
+
+
+def count_tokens(texts: Iterable[str], k: int = 10) -> List[Tuple[str, int]]:
+    """Top-k tokens over raw texts, for labels that have no keyword rows."""
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenize(text))
+    return counts.most_common(k)
+
+
+def keyword_scope(label: Optional[str]) -> Optional[str]:
+    """Keyword bucket for a ward label: ``all``, a ward id, or None if unindexed."""
+    if not label or label.strip().lower() == ALL_WARDS:
+        return ALL_WARDS
+    return resolve_ward_id(label)
+
+
+def _day(created_at) -> date:
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        return created_at.date()
+    return created_at
+
+
+class KeywordCounter:
+    """Accumulates (ward_id, day, token) deltas and upserts them in one batch."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add(self, ward_id: Optional[str], created_at, text: Optional[str], sign: int = 1):
+        tokens = Counter(tokenize(text))
+        if not tokens:
+            return
+        day = _day(created_at)
+        for scope in filter(None, {ward_id, ALL_WARDS}):
+            for token, n in tokens.items():
+                self.counts[(scope, day, token)] += sign * n
+
+    def flush(self, connection) -> int:
+        """Apply the accumulated deltas; returns the number of rows touched."""
+        rows = [
+            {"ward_id": ward_id, "day": day, "token": token, "count": n}
+            for (ward_id, day, token), n in self.counts.items() if n
+        ]
+        self.counts.clear()
+        if not rows:
+            return 0
+        table = WardKeywordDaily.__table__
+        dialect = connection.dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            raise NotImplementedError(f"ward keyword upsert not supported on {dialect}")
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.ward_id, table.c.day, table.c.token],
+            set_={"count": table.c.count + stmt.excluded["count"]},
+        )
+        connection.execute(stmt, rows)
+        return len(rows)
+
+
+def _flushed_values(post: Post) -> Tuple[tuple, tuple]:
+    """(before, after) values of the counted columns for a post being flushed."""
+    before = []
+    for key in COUNTED_POST_COLUMNS:
+        history = sa.inspect(post).attrs[key].history
+        before.append(history.deleted[0] if history.deleted else
+                      history.unchanged[0] if history.unchanged else None)
+    return tuple(before), tuple(getattr(post, key) for key in COUNTED_POST_COLUMNS)
+
+
+def apply_post_changes(session) -> None:
+    """Flush hook: count inserted posts, uncount deleted ones and move edited ones."""
+    counter = KeywordCounter()
+    for obj in session.new:
+        if isinstance(obj, Post):
+            counter.add(obj.ward_id, obj.created_at, obj.text)
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            counter.add(obj.ward_id, obj.created_at, obj.text, sign=-1)
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            before, after = _flushed_values(obj)
+            if before != after:
+                counter.add(*before, sign=-1)
+                counter.add(*after)
+    if counter.counts:
+        counter.flush(session.connection())
+
+
+def top_keywords(scope: str, since: datetime, until: Optional[datetime] = None,
+                 k: int = 10) -> List[Tuple[str, int]]:
+    """Top-k tokens for a keyword scope over [since, until] from the count table."""
+    total = sa.func.sum(WardKeywordDaily.count)
+    q = (
+        db.session.query(WardKeywordDaily.token, total)
+        .filter(WardKeywordDaily.ward_id == scope, WardKeywordDaily.day >= _day(since))
+    )
+    if until is not None:
+        q = q.filter(WardKeywordDaily.day <= _day(until))
+    rows = q.group_by(WardKeywordDaily.token).having(total > 0).order_by(total.desc(), WardKeywordDaily.token).limit(k).all()
+    return [(token, int(n)) for token, n in rows]
+
+
+def rebuild_ward_keywords(connection, batch_size: int = 20_000) -> dict:
+    """Recount the whole table from ``post`` in primary-key batches."""
+    post = Post.__table__
+    connection.execute(sa.delete(WardKeywordDaily.__table__))
+    stats = {"posts": 0, "upserts": 0, "batches": 0}
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(post.c.id, post.c.ward_id, post.c.created_at, post.c.text)
+            .where(post.c.id > last_id)
+            .order_by(post.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return stats
+        counter = KeywordCounter()
+        for _, ward_id, created_at, text in rows:
+            counter.add(ward_id, created_at, text)
+        stats["upserts"] += counter.flush(connection)
+        stats["posts"] += len(rows)
+        stats["batches"] += 1
+        last_id = rows[-1][0]
@@ -0,0 +1,156 @@
+"""
+In-process ward snapshot service.
+
+A snapshot is the consolidated view of one ward served by
+``/api/v1/ward/meta``: its :class:`WardProfile`, :class:`WardDemographics` and
+:class:`WardFeatures` rows plus the latest ``updated_at`` among them. All
+three tables are read with one outer-joined query, for one ward or many.
+
+Snapshots are cached per process, per ward. The cache is keyed on a
+watermark (row count and latest ``updated_at`` of each table, read in one
+statement), so any write to the three tables, including compute_features
+running in a Celery worker, invalidates it.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, select, union
+
+from .extensions import db
+from .models import WardDemographics, WardFeatures, WardProfile
+
+_TABLES = (WardProfile, WardDemographics, WardFeatures)
+
+_cache: Dict = {"version": None, "wards": {}}
+_cache_lock = threading.Lock()
+
+
+def _iso(dt: datetime | None) -> str | None:
+    """Return an ISO8601 UTC (Z) string for a datetime (or None)."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:  # treat naive as UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _utc(dt: datetime | None) -> datetime | None:
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _profile(profile: Optional[WardProfile]) -> Optional[dict]:
+    if profile is None:
+        return None
+    return {
+        "electors": profile.electors,
+        "votes_cast": profile.votes_cast,
+        "turnout_pct": profile.turnout_pct,
+        "last_winner_party": profile.last_winner_party,
+        "last_winner_year": profile.last_winner_year,
+        "updated_at": _iso(profile.updated_at),
+    }
+
+
+def _demographics(demographics: Optional[WardDemographics]) -> Optional[dict]:
+    if demographics is None:
+        return None
+    return {
+        "literacy_idx": demographics.literacy_idx,
+        "muslim_idx": demographics.muslim_idx,
+        "scst_idx": demographics.scst_idx,
+        "secc_deprivation_idx": demographics.secc_deprivation_idx,
+        "updated_at": _iso(demographics.updated_at),
+    }
+
+
+def _features(features: Optional[WardFeatures]) -> Optional[dict]:
+    if features is None:
+        return None
+    return {
+        "as23_party_shares": features.as23_party_shares,
+        "ls24_party_shares": features.ls24_party_shares,
+        "dvi": features.dvi,
+        "aci_23": features.aci_23,
+        "turnout_volatility": features.turnout_volatility,
+        "incumbency_weakness": features.incumbency_weakness,
+        "updated_at": _iso(features.updated_at),
+    }
+
+
+def version_columns() -> list:
+    """Scalar subqueries behind :func:`snapshot_version`, for callers that extend the watermark."""
+    columns = []
+    for model in _TABLES:
+        columns.append(select(func.count(model.id)).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    return columns
+
+
+def snapshot_version() -> tuple:
+    """Watermark over the three ward tables, read in a single statement."""
+    return tuple(db.session.execute(select(*version_columns())).one())
+
+
+def load_ward_snapshots(ward_ids: Iterable[str]) -> Dict[str, dict]:
+    """Snapshots for ``ward_ids`` from one outer-joined query, uncached.
+
+    Wards with no row in any of the three tables are absent from the result.
+    """
+    ward_ids = list(dict.fromkeys(ward_ids))
+    if not ward_ids:
+        return {}
+    wards = union(*(select(model.ward_id.label("ward_id")).where(model.ward_id.in_(ward_ids))
+                    for model in _TABLES)).subquery()
+    rows = db.session.execute(
+        select(wards.c.ward_id, WardProfile, WardDemographics, WardFeatures)
+        .select_from(wards)
+        .outerjoin(WardProfile, WardProfile.ward_id == wards.c.ward_id)
+        .outerjoin(WardDemographics, WardDemographics.ward_id == wards.c.ward_id)
+        .outerjoin(WardFeatures, WardFeatures.ward_id == wards.c.ward_id)
+    ).all()
+
+    snapshots = {}
+    for ward_id, profile, demographics, features in rows:
+        stamps = [_utc(row.updated_at) for row in (profile, demographics, features)
+                  if row is not None and row.updated_at is not None]
+        snapshots[ward_id] = {
+            "ward": ward_id,
+            "profile": _profile(profile),
+            "demographics": _demographics(demographics),
+            "features": _features(features),
+            "updated_at": _iso(max(stamps) if stamps else None),
+        }
+    return snapshots
+
+
+def ward_snapshots(ward_ids: Iterable[str]) -> Dict[str, dict]:
+    """Cached snapshots for ``ward_ids``; only uncached wards are queried."""
+    ward_ids = list(dict.fromkeys(ward_ids))
+    version = snapshot_version()
+    with _cache_lock:
+        if _cache["version"] != version:
+            _cache["version"], _cache["wards"] = version, {}
+        cached = {w: _cache["wards"][w] for w in ward_ids if w in _cache["wards"]}
+
+    missing = [w for w in ward_ids if w not in cached]
+    if missing:
+        loaded = load_ward_snapshots(missing)
+        with _cache_lock:
+            if _cache["version"] == version:
+                _cache["wards"].update(loaded)
+        cached.update(loaded)
+    return {w: cached[w] for w in ward_ids if w in cached}
+
+
+def ward_snapshot(ward_id: str) -> Optional[dict]:
+    """Cached snapshot for one ward, or None if no table has a row for it."""
+    return ward_snapshots([ward_id]).get(ward_id)
+
+
+def clear_ward_snapshot_cache():
+    with _cache_lock:
+        _cache["version"], _cache["wards"] = None, {}
@@ -0,0 +1,232 @@
+"""
+Simplified GHMC ward boundaries as TopoJSON, one topology per map zoom level.
+
+``app/data/ghmc_wards.geojson`` stores every ward ring in full, so borders
+shared by neighbouring wards are stored (and sent) twice. The build here
+converts it to a topology:
+
+1. Ring vertices whose neighbours differ between occurrences are junctions;
+   rings are cut at junctions into arcs and each shared border becomes a
+   single arc referenced by both wards (``~i`` when traversed in reverse).
+2. Each arc is simplified once per zoom level (Douglas-Peucker with a
+   one-pixel tolerance at 256px tiles, endpoints fixed), so neighbouring
+   wards keep an identical border and no gaps or overlaps appear.
+3. Coordinates are quantized to a quarter pixel and delta-encoded.
+
+Geometries are keyed by canonical ward id (``"95"``, see
+:func:`app.utils.ward.resolve_ward_id`) so map layers join heatmap rows by id
+rather than by name. Features resolving to the same id are merged into one
+MultiPolygon.
+
+``scripts/build_ward_tiles.py`` writes the topologies to
+``app/data/ward_tiles/``; ``GET /api/v1/geojson/topology`` serves them
+pre-compressed and builds in memory when the files are missing or older than
+the GeoJSON.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from shapely import LineString
+
+from .utils.ward import GEOJSON_PATH, _WARD_NUMBER, canonical_ward_name, normalize_ward, resolve_ward_id
+
+TILES_DIR = os.path.join(os.path.dirname(GEOJSON_PATH), "ward_tiles")
+ZOOM_LEVELS = (10, 12, 14)
+TILE_PIXELS = 256
+# Quantization grid per simplification tolerance (4 = quarter-pixel precision)
+QUANTIZE_PER_PIXEL = 4
+
+Point = Tuple[float, float]
+
+
+def tile_path(zoom: int, tiles_dir: str = TILES_DIR) -> str:
+    return os.path.join(tiles_dir, f"wards-z{zoom}.topo.json")
+
+
+def pixel_degrees(zoom: int) -> float:
+    """Width of one tile pixel in degrees of longitude at ``zoom``."""
+    return 360.0 / (TILE_PIXELS * 2 ** zoom)
+
+
+def snap_zoom(zoom: int, zooms: Sequence[int] = ZOOM_LEVELS) -> int:
+    """Coarsest built zoom level at least as detailed as ``zoom``."""
+    return next((z for z in sorted(zooms) if z >= zoom), max(zooms))
+
+
+def _polygons(geometry: dict) -> List[List[List[Point]]]:
+    if geometry.get("type") == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [[[(float(x), float(y)) for x, y, *_ in ring] for ring in polygon] for polygon in polygons]
+
+
+def _open_ring(ring: List[Point]) -> List[Point]:
+    return ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else ring
+
+
+class Topology:
+    """Shared arcs plus per-ward polygons made of arc references."""
+
+    def __init__(self):
+        self.arcs: List[List[Point]] = []
+        self.geometries: Dict[str, dict] = {}
+        self._arc_index: Dict[tuple, int] = {}
+
+    @classmethod
+    def from_features(cls, features: Sequence[dict]) -> "Topology":
+        topology = cls()
+        wards: Dict[str, dict] = {}
+        for feature in features:
+            label = (feature.get("properties") or {}).get("name") or ""
+            number = _WARD_NUMBER.match(label)
+            ward_id = resolve_ward_id(label) or (number.group(1).lstrip("0") if number else None)
+            polygons = _polygons(feature.get("geometry") or {})
+            if not ward_id or not polygons:
+                continue
+            ward = wards.setdefault(ward_id, {"labels": [], "polygons": []})
+            ward["labels"].append(label)
+            ward["polygons"] += [[_open_ring(ring) for ring in polygon if len(ring) >= 4] for polygon in polygons]
+
+        rings = [ring for ward in wards.values() for polygon in ward["polygons"] for ring in polygon]
+        junctions = topology._junctions(rings)
+        for ward_id, ward in wards.items():
+            topology.geometries[ward_id] = {
+                "polygons": [[topology._cut(ring, junctions) for ring in polygon] for polygon in ward["polygons"]],
+                "properties": {
+                    "ward_id": ward_id,
+                    "name": canonical_ward_name(ward_id) or normalize_ward(ward["labels"][0]),
+                    "label": " / ".join(ward["labels"]),
+                },
+            }
+        return topology
+
+    @staticmethod
+    def _junctions(rings: Sequence[List[Point]]) -> set:
+        """Vertices whose (unordered) neighbour pair differs between occurrences."""
+        neighbours: Dict[Point, tuple] = {}
+        junctions = set()
+        for ring in rings:
+            n = len(ring)
+            for i, point in enumerate(ring):
+                a, b = ring[i - 1], ring[(i + 1) % n]
+                pair = (a, b) if a <= b else (b, a)
+                seen = neighbours.setdefault(point, pair)
+                if seen != pair:
+                    junctions.add(point)
+        return junctions
+
+    def _arc_ref(self, points: List[Point]) -> int:
+        key = tuple(points)
+        if key in self._arc_index:
+            return self._arc_index[key]
+        reverse = key[::-1]
+        if reverse in self._arc_index:
+            return ~self._arc_index[reverse]
+        self._arc_index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+    def _cut(self, ring: List[Point], junctions: set) -> List[int]:
+        """Arc references for one (open) ring."""
+        starts = [i for i, point in enumerate(ring) if point in junctions]
+        if not starts:
+            # Ring shares no junction: one closed arc, rotated to a canonical start
+            # so an identical ring in another ward (either direction) reuses it
+            forward = min(range(len(ring)), key=ring.__getitem__)
+            backward = ring[::-1]
+            start_back = min(range(len(backward)), key=backward.__getitem__)
+            closed = ring[forward:] + ring[:forward]
+            closed_back = backward[start_back:] + backward[:start_back]
+            if tuple(closed_back + closed_back[:1]) in self._arc_index:
+                return [self._arc_ref(closed_back + closed_back[:1])]
+            return [self._arc_ref(closed + closed[:1])]
+
+        rotated = ring[starts[0]:] + ring[:starts[0]]
+        rotated.append(rotated[0])
+        refs, arc = [], [rotated[0]]
+        for point in rotated[1:]:
+            arc.append(point)
+            if point in junctions:
+                refs.append(self._arc_ref(arc))
+                arc = [point]
+        return refs
+
+    def encode(self, zoom: int) -> dict:
+        """TopoJSON for ``zoom``: simplified, quantized, delta-encoded arcs."""
+        tolerance = pixel_degrees(zoom)
+        scale = tolerance / QUANTIZE_PER_PIXEL
+        xs = [x for arc in self.arcs for x, _ in arc]
+        ys = [y for arc in self.arcs for _, y in arc]
+        x0, y0 = min(xs), min(ys)
+
+        arcs = []
+        for arc in self.arcs:
+            simplified = list(LineString(arc).simplify(tolerance, preserve_topology=False).coords)
+            if arc[0] == arc[-1] and len(simplified) < 4:
+                simplified = arc  # keep closed rings valid rather than collapse them
+            encoded, last = [], None
+            for x, y in simplified:
+                q = (round((x - x0) / scale), round((y - y0) / scale))
+                if q == last:
+                    continue
+                encoded.append([q[0] - last[0], q[1] - last[1]] if last else list(q))
+                last = q
+            if len(encoded) == 1:
+                encoded.append([0, 0])
+            arcs.append(encoded)
+
+        geometries = []
+        for ward_id, geometry in sorted(self.geometries.items(), key=lambda kv: int(kv[0]) if kv[0].isdigit() else 0):
+            polygons = geometry["polygons"]
+            geometries.append({
+                "type": "Polygon" if len(polygons) == 1 else "MultiPolygon",
+                "id": ward_id,
+                "properties": geometry["properties"],
+                "arcs": polygons[0] if len(polygons) == 1 else polygons,
+            })
+        return {
+            "type": "Topology",
+            "bbox": [x0, y0, max(xs), max(ys)],
+            "transform": {"scale": [scale, scale], "translate": [x0, y0]},
+            "arcs": arcs,
+            "objects": {"wards": {"type": "GeometryCollection", "geometries": geometries}},
+            "zoom": zoom,
+        }
+
+
+def build_ward_topologies(path: str = GEOJSON_PATH, zooms: Sequence[int] = ZOOM_LEVELS) -> Dict[int, dict]:
+    """TopoJSON per zoom level from the ward GeoJSON at ``path``."""
+    with open(path, "r", encoding="utf-8") as fh:
+        features = json.load(fh).get("features", [])
+    topology = Topology.from_features(features)
+    return {zoom: topology.encode(zoom) for zoom in zooms}
+
+
+def write_ward_tiles(path: str = GEOJSON_PATH, tiles_dir: str = TILES_DIR,
+                     zooms: Sequence[int] = ZOOM_LEVELS) -> Dict[int, Tuple[str, int]]:
+    """Write one ``wards-z{zoom}.topo.json`` per zoom; returns {zoom: (path, bytes)}."""
+    os.makedirs(tiles_dir, exist_ok=True)
+    written = {}
+    for zoom, topology in build_ward_topologies(path, zooms).items():
+        body = json.dumps(topology, separators=(",", ":")).encode("utf-8")
+        out = tile_path(zoom, tiles_dir)
+        with open(out, "wb") as fh:
+            fh.write(body)
+        written[zoom] = (out, len(body))
+    return written
+
+
+def load_ward_tile(zoom: int, path: str = GEOJSON_PATH, tiles_dir: str = TILES_DIR) -> Optional[bytes]:
+    """Built topology for ``zoom``, or a fresh build when the file is missing or stale."""
+    out = tile_path(zoom, tiles_dir)
+    if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(path):
+        with open(out, "rb") as fh:
+            return fh.read()
+    if not os.path.exists(path):
+        return None
+    return json.dumps(build_ward_topologies(path, [zoom])[zoom], separators=(",", ":")).encode("utf-8")
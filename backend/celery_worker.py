@@ -10,11 +10,13 @@ This module must expose a top-level variable named `celery`.
 """
 
 from celery.schedules import crontab
+from datetime import timedelta
 
 # Import your Flask app + celery instance
 from app import create_app
 from app.extensions import celery as _celery
 from app.celery_utils import celery_init_app
+from config import Config
 
 
 def _make_celery():
@@ -44,10 +46,23 @@ celery.conf.beat_schedule.update({
         "schedule": crontab(hour=6, minute=0),
         "args": (7, 400),
     }, 
-    "generate-summaries-6_30am": {
-        "task": "app.tasks.generate_summary",
-        "schedule": crontab(hour=6, minute=30),
-        "args": ("WARD_001", "P7D"),   # add more wards via separate entries or loop in your own scheduler
+    # 21:30 UTC = 03:00 IST: summaries and strategist reports for every ward before office hours
+    "nightly-precompute": {
+        "task": "app.tasks_precompute.nightly_precompute",
+        "schedule": crontab(hour=21, minute=30),
+        "options": {"expires": 4 * 3600},
+    },
+    "refresh-analytics-views": {
+        "task": "app.tasks_analytics.refresh_analytics_views",
+        "schedule": timedelta(minutes=Config.ANALYTICS_VIEW_REFRESH_MINUTES),
+        # drop runs that queued behind a slow one instead of stacking refreshes
+        "options": {"expires": Config.ANALYTICS_VIEW_REFRESH_MINUTES * 60},
+    },
+    # emotions for bulk-ingested posts and any that failed labelling at ingestion
+    "label-post-emotions": {
+        "task": "app.tasks.label_post_emotions",
+        "schedule": timedelta(minutes=Config.EMOTION_LABEL_INTERVAL_MINUTES),
+        "options": {"expires": Config.EMOTION_LABEL_INTERVAL_MINUTES * 60},
     },
 })
 if __name__ == "__main__":
@@ -75,6 +75,12 @@ class Config:
     else:
         ERROR_LOG_FILE = os.environ.get('ERROR_LOG_FILE', '/var/log/lokdarpan/errors.log')
 
+    # Per-request SQL profiling (response headers + /api/v1/profiling/sql report)
+    SQL_PROFILING_ENABLED = os.environ.get('SQL_PROFILING_ENABLED', 'False').lower() == 'true'
+    SQL_PROFILING_SLOW_QUERY_MS = float(os.environ.get('SQL_PROFILING_SLOW_QUERY_MS', '100'))
+    # Optional per-endpoint query budgets, e.g. {'ward_bp.ward_meta': 3}; overruns are logged
+    SQL_QUERY_BUDGETS = {}
+
     # Input Validation
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file upload
     MAX_REQUEST_SIZE = 1024 * 1024  # 1MB max request size
@@ -84,7 +90,7 @@ class Config:
         broker_url=os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0'),
         result_backend=os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0'),
         task_ignore_result=True,
-        imports=("app.tasks",)
+        imports=("app.tasks", "app.tasks_analytics", "app.tasks_precompute", "app.tasks_agents")
     )
 
     # Political Strategist Configuration
@@ -95,6 +101,62 @@ class Config:
     
     # AI Configuration
     PERPLEXITY_API_KEY = os.environ.get('PERPLEXITY_API_KEY')
+
+    # Metrics: 'redis' merges per-worker histograms/counters, 'local' keeps them per process
+    METRICS_BACKEND = os.environ.get('METRICS_BACKEND', 'redis')
+    METRICS_REDIS_URL = os.environ.get('METRICS_REDIS_URL', os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '10'))
+    METRICS_SCRAPE_TOKEN = os.environ.get('METRICS_SCRAPE_TOKEN')
+
+    # Tracing: 'none', 'file' (OTLP/JSON lines) or 'otlp' (OTLP/HTTP collector)
+    TRACING_EXPORTER = os.environ.get('TRACING_EXPORTER', 'none')
+    TRACING_FILE_PATH = os.environ.get('TRACING_FILE_PATH', 'logs/traces.jsonl')
+    TRACING_OTLP_ENDPOINT = os.environ.get('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+    TRACING_SAMPLE_RATE = float(os.environ.get('TRACING_SAMPLE_RATE', '1.0'))
+    TRACING_SERVICE_NAME = os.environ.get('TRACING_SERVICE_NAME', 'lokdarpan-backend')
+
+    # AI provider endpoints: FAKE_AI_PROVIDER_URL points every client at the local
+    # fake provider server (python -m app.services.fake_provider); per-provider
+    # *_BASE_URL / GEMINI_API_ENDPOINT settings take precedence
+    FAKE_AI_PROVIDER_URL = os.environ.get('FAKE_AI_PROVIDER_URL')
+    GEMINI_API_ENDPOINT = os.environ.get('GEMINI_API_ENDPOINT')
+    PERPLEXITY_BASE_URL = os.environ.get('PERPLEXITY_BASE_URL')
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')
+    ANTHROPIC_BASE_URL = os.environ.get('ANTHROPIC_BASE_URL')
+    LLAMA_BASE_URL = os.environ.get('LLAMA_BASE_URL')
+
+    # Materialized analytics views (app/analytics_views.py): refreshed by Celery beat;
+    # trends/heatmap endpoints read them while younger than the max age, else go live
+    ANALYTICS_VIEWS_ENABLED = os.environ.get('ANALYTICS_VIEWS_ENABLED', 'true').lower() == 'true'
+    ANALYTICS_VIEW_MAX_AGE_SECONDS = int(os.environ.get('ANALYTICS_VIEW_MAX_AGE_SECONDS', '900'))
+    ANALYTICS_VIEW_REFRESH_MINUTES = int(os.environ.get('ANALYTICS_VIEW_REFRESH_MINUTES', '10'))
+    # Heatmap windows (app/heatmap_engine.py) are rebuilt after this age even without new posts
+    HEATMAP_CACHE_TTL_SECONDS = int(os.environ.get('HEATMAP_CACHE_TTL_SECONDS', '120'))
+    # Response compression (app/compression.py): gzip, or brotli when installed, for
+    # JSON/text bodies of at least COMPRESS_MIN_BYTES when the client accepts it
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '1024'))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+    # Nightly precompute (app/precompute.py): strategist reports and summaries for every
+    # ward, most accessed first, at most NIGHTLY_PRECOMPUTE_CONCURRENCY wards at a time
+    NIGHTLY_PRECOMPUTE_CONCURRENCY = int(os.environ.get('NIGHTLY_PRECOMPUTE_CONCURRENCY', '4'))
+    NIGHTLY_PRECOMPUTE_MAX_WARDS = int(os.environ.get('NIGHTLY_PRECOMPUTE_MAX_WARDS', '150'))
+    NIGHTLY_PRECOMPUTE_DEPTH = os.environ.get('NIGHTLY_PRECOMPUTE_DEPTH', 'standard')
+    # Precomputed reports stay cached through the working day
+    NIGHTLY_PRECOMPUTE_REPORT_TTL_SECONDS = int(os.environ.get('NIGHTLY_PRECOMPUTE_REPORT_TTL_SECONDS', str(18 * 3600)))
+    # Estimated LLM spend per ward, checked against BudgetManager before each ward
+    NIGHTLY_PRECOMPUTE_WARD_COST_USD = float(os.environ.get('NIGHTLY_PRECOMPUTE_WARD_COST_USD', '0.05'))
+    # Agent batch analysis (app/agents_batch.py): wards analysed at once, per-ward timeout,
+    # and the batch size above which requests run as a Celery job
+    AGENT_BATCH_CONCURRENCY = int(os.environ.get('AGENT_BATCH_CONCURRENCY', '5'))
+    AGENT_BATCH_WARD_TIMEOUT_SECONDS = float(os.environ.get('AGENT_BATCH_WARD_TIMEOUT_SECONDS', '45'))
+    AGENT_BATCH_SYNC_MAX_WARDS = int(os.environ.get('AGENT_BATCH_SYNC_MAX_WARDS', '25'))
+    AGENT_BATCH_MAX_WARDS = int(os.environ.get('AGENT_BATCH_MAX_WARDS', '150'))
+    # Post emotion labelling (app/emotion_classifier.py): local classifier first; posts below
+    # the confidence threshold go to the LLM, at most EMOTION_LLM_MAX_PER_BATCH per batch
+    EMOTION_CONFIDENCE_THRESHOLD = float(os.environ.get('EMOTION_CONFIDENCE_THRESHOLD', '0.5'))
+    EMOTION_LLM_MAX_PER_BATCH = int(os.environ.get('EMOTION_LLM_MAX_PER_BATCH', '20'))
+    EMOTION_LABEL_INTERVAL_MINUTES = int(os.environ.get('EMOTION_LABEL_INTERVAL_MINUTES', '15'))
     
     # --- NEW: Celery Beat Schedule ---
     CELERY_BEAT_SCHEDULE = {
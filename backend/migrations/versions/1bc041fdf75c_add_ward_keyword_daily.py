@@ -0,0 +1,48 @@
+"""add ward_keyword_daily token counts
+
+Revision ID: 1bc041fdf75c
+Revises: be5b372ec872
+Create Date: 2026-10-18 22:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.ward_keywords import rebuild_ward_keywords
+
+# revision identifiers, used by Alembic.
+revision = '1bc041fdf75c'
+down_revision = 'be5b372ec872'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Ward x day x token counts for pulse keywords.
+
+    Pulse tokenized up to 800 post texts per request to find top keywords.
+    ward_keyword_daily is kept current at ingest (ORM flush hook and the
+    synthetic corpus loader), so top-k for any window is a SUM/GROUP BY over
+    at most days x tokens rows. ward_id 'all' holds the city-wide totals.
+
+    Existing posts are counted in id batches; re-run
+    scripts/rebuild_ward_keywords.py after tokenizer or alias changes.
+    """
+    op.create_table(
+        'ward_keyword_daily',
+        sa.Column('ward_id', sa.String(length=64), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('ward_id', 'day', 'token'),
+    )
+    op.create_index('ix_ward_keyword_daily_day', 'ward_keyword_daily', ['day'], unique=False)
+
+    stats = rebuild_ward_keywords(op.get_bind())
+    print(f"ward_keyword_daily backfill: {stats}")
+
+
+def downgrade():
+    op.drop_index('ix_ward_keyword_daily_day', table_name='ward_keyword_daily')
+    op.drop_table('ward_keyword_daily')
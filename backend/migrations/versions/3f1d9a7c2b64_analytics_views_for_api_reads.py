@@ -0,0 +1,163 @@
+"""reshape analytics views for API reads and track refreshes
+
+Revision ID: 3f1d9a7c2b64
+Revises: 1bc041fdf75c
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3f1d9a7c2b64'
+down_revision = '1bc041fdf75c'
+branch_labels = None
+depends_on = None
+
+
+# Mirrors trends_api._party_of: post.party (normalized), then author.party,
+# then known author-name aliases, else 'Other'.
+PARTY_SQL = """
+    CASE
+        WHEN UPPER(TRIM(p.party)) IN ('BRS', 'TRS', 'TELANGANA RASHTRA SAMITHI') THEN 'BRS'
+        WHEN UPPER(TRIM(p.party)) IN ('BJP', 'BHARATIYA JANATA PARTY') THEN 'BJP'
+        WHEN UPPER(TRIM(p.party)) IN ('INC', 'CONGRESS', 'INDIAN NATIONAL CONGRESS') THEN 'INC'
+        WHEN UPPER(TRIM(p.party)) IN ('AIMIM', 'ALL INDIA MAJLIS-E-ITTEHADUL MUSLIMEEN') THEN 'AIMIM'
+        WHEN p.party <> '' AND UPPER(TRIM(p.party)) <> 'OTHER' THEN TRIM(p.party)
+        WHEN a.id IS NULL THEN 'Other'
+        WHEN a.party <> '' THEN a.party
+        WHEN TRIM(a.name) = 'BJP Telangana' THEN 'BJP'
+        WHEN TRIM(a.name) IN ('BRS Party', 'Telangana Rashtra Samithi', 'TRS') THEN 'BRS'
+        WHEN TRIM(a.name) IN ('Indian National Congress', 'Telangana Congress', 'INC') THEN 'INC'
+        WHEN TRIM(a.name) = 'AIMIM' THEN 'AIMIM'
+        ELSE 'Other'
+    END
+"""
+
+
+def upgrade():
+    """
+    Serve trends and heatmaps from materialized views.
+
+    The 005 daily_ward_trends view was keyed on city with lower-case emotion
+    buckets that post.emotion never uses. It also had no unique index, so
+    refresh_ward_analytics() could not refresh it CONCURRENTLY.
+    It is rebuilt at the (day, ward_id, city, emotion, party) grain that
+    /trends and /heatmap/calendar aggregate, with a unique index.
+
+    ward_activity_windows precomputes the geographic heatmap for 7/30/90-day
+    windows; distinct author counts cannot be summed from daily rows.
+
+    materialized_view_refresh records each refresh so endpoints can decide
+    whether a view is fresh enough to serve.
+    """
+    op.create_table(
+        'materialized_view_refresh',
+        sa.Column('view_name', sa.String(length=64), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+        sa.Column('attempted_at', sa.DateTime(), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.Column('concurrent', sa.Boolean(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('view_name'),
+    )
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS daily_ward_trends;")
+    op.execute(f"""
+    CREATE MATERIALIZED VIEW daily_ward_trends AS
+    SELECT
+        DATE(p.created_at) AS trend_date,
+        COALESCE(p.ward_id, '') AS ward_id,
+        COALESCE(p.city, '') AS city,
+        COALESCE(NULLIF(p.emotion, ''), 'Unspecified') AS emotion,
+        {PARTY_SQL} AS party,
+        COUNT(*) AS posts,
+        MAX(p.created_at) AS latest_post_time
+    FROM post p
+    LEFT JOIN author a ON a.id = p.author_id
+    WHERE p.created_at >= CURRENT_DATE - INTERVAL '400 days'
+    GROUP BY 1, 2, 3, 4, 5;
+    """)
+    op.execute("""
+    CREATE UNIQUE INDEX ix_daily_ward_trends_key
+    ON daily_ward_trends (trend_date, ward_id, city, emotion, party);
+    """)
+    op.execute("CREATE INDEX ix_daily_ward_trends_ward_date ON daily_ward_trends (ward_id, trend_date);")
+
+    op.execute("""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS ward_activity_windows AS
+    WITH windows(window_days) AS (VALUES (7), (30), (90)),
+    scoped AS (
+        SELECT w.window_days, p.city, p.author_id, a.party AS author_party
+        FROM windows w
+        JOIN post p ON p.created_at >= NOW() - make_interval(days => w.window_days)
+                   AND p.created_at <= NOW()
+        LEFT JOIN author a ON a.id = p.author_id
+        WHERE p.city IS NOT NULL AND p.city <> ''
+    ),
+    totals AS (
+        SELECT window_days, city, COUNT(*) AS posts, COUNT(DISTINCT author_id) AS authors
+        FROM scoped
+        GROUP BY window_days, city
+    ),
+    parties AS (
+        SELECT window_days, city, jsonb_object_agg(author_party, mentions) AS party_mentions
+        FROM (
+            SELECT window_days, city, author_party, COUNT(*) AS mentions
+            FROM scoped
+            WHERE author_party IS NOT NULL
+            GROUP BY window_days, city, author_party
+        ) per_party
+        GROUP BY window_days, city
+    )
+    SELECT t.window_days, t.city, t.posts, t.authors,
+           COALESCE(pa.party_mentions, '{}'::jsonb) AS party_mentions,
+           NOW() AS computed_at
+    FROM totals t
+    LEFT JOIN parties pa USING (window_days, city);
+    """)
+    op.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ix_ward_activity_windows_key
+    ON ward_activity_windows (window_days, city);
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS ward_activity_windows;")
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS daily_ward_trends;")
+        # 005 definition
+        op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS daily_ward_trends AS
+        SELECT
+            DATE(created_at) as trend_date,
+            city as ward_name,
+            COUNT(*) as daily_posts,
+            COUNT(DISTINCT author_id) as daily_authors,
+            SUM(CASE WHEN emotion = 'positive' THEN 1 ELSE 0 END) as positive_posts,
+            SUM(CASE WHEN emotion = 'negative' THEN 1 ELSE 0 END) as negative_posts,
+            SUM(CASE WHEN emotion = 'neutral' THEN 1 ELSE 0 END) as neutral_posts,
+            SUM(CASE WHEN party = 'BJP' THEN 1 ELSE 0 END) as bjp_mentions,
+            SUM(CASE WHEN party = 'INC' THEN 1 ELSE 0 END) as inc_mentions,
+            SUM(CASE WHEN party = 'BRS' THEN 1 ELSE 0 END) as brs_mentions,
+            SUM(CASE WHEN party = 'AIMIM' THEN 1 ELSE 0 END) as aimim_mentions,
+            AVG(COUNT(*)) OVER (
+                PARTITION BY city
+                ORDER BY DATE(created_at)
+                ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
+            ) as posts_7d_avg,
+            MAX(created_at) as latest_post_time
+        FROM post
+        WHERE created_at >= NOW() - INTERVAL '90 days'
+          AND city IS NOT NULL
+        GROUP BY DATE(created_at), city
+        ORDER BY trend_date DESC, ward_name;
+        """)
+        op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_daily_trends_date_ward
+        ON daily_ward_trends (trend_date DESC, ward_name);
+        """)
+    op.drop_table('materialized_view_refresh')
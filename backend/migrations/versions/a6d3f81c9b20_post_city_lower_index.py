@@ -0,0 +1,31 @@
+"""expression index on lower(post.city)
+
+Revision ID: a6d3f81c9b20
+Revises: e2b7a95c4d13
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d3f81c9b20'
+down_revision = 'e2b7a95c4d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Serve Post.ward_filter's fallback for labels that are not GHMC wards.
+
+    The fallback compares lower(city) with the lowercased normalized label,
+    so "Hyderabad" and "HYDERABAD" match; a plain post.city B-tree cannot
+    answer that comparison.
+    """
+    op.create_index('ix_post_city_lower', 'post', [sa.text('lower(city)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_post_city_lower', table_name='post')
@@ -0,0 +1,102 @@
+"""full-text search vectors for posts and epapers
+
+Revision ID: a7c4e19d2f35
+Revises: 3f1d9a7c2b64
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c4e19d2f35'
+down_revision = '3f1d9a7c2b64'
+branch_labels = None
+depends_on = None
+
+
+# Weighted post document: body text outranks ward and party, then emotion
+POST_VECTOR_SQL = """
+    setweight(to_tsvector('english', COALESCE({p}text, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE({p}city, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE({p}party, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE({p}emotion, '')), 'C')
+"""
+
+# Posts rebuilt per UPDATE while backfilling, by primary-key range
+BACKFILL_BATCH_SIZE = 50_000
+
+
+def upgrade():
+    """
+    Back /api/v1/search with GIN-indexed tsvectors on post and epaper.
+
+    Migrations 005 and 78409aeed0d9 both installed a trigger calling
+    update_post_search_vector(), so every insert built the vector twice, and
+    the later one dropped the field weights. One weighted trigger is kept,
+    vectors written by the unweighted version are rebuilt, and the
+    duplicate GIN index is dropped. The rebuild runs as one UPDATE per
+    BACKFILL_BATCH_SIZE ids, so no single statement rewrites the whole table.
+
+    epaper.search_vector is a stored generated column: raw_text never
+    changes after ingest and no trigger is needed.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE post ADD COLUMN IF NOT EXISTS search_vector tsvector;")
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_post_search_vector ON post;")
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION update_post_search_vector()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'INSERT'
+           OR NEW.text IS DISTINCT FROM OLD.text
+           OR NEW.city IS DISTINCT FROM OLD.city
+           OR NEW.party IS DISTINCT FROM OLD.party
+           OR NEW.emotion IS DISTINCT FROM OLD.emotion THEN
+            NEW.search_vector := {POST_VECTOR_SQL.format(p='NEW.')};
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    DROP TRIGGER IF EXISTS update_post_search_vector_trigger ON post;
+    CREATE TRIGGER update_post_search_vector_trigger
+        BEFORE INSERT OR UPDATE ON post
+        FOR EACH ROW
+        EXECUTE FUNCTION update_post_search_vector();
+    """)
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text("SELECT min(id), max(id) FROM post")).one()
+    backfill = sa.text(f"UPDATE post SET search_vector = {POST_VECTOR_SQL.format(p='')} "
+                       "WHERE id >= :start AND id < :stop")
+    for start in range(low or 0, (high or 0) + 1, BACKFILL_BATCH_SIZE):
+        bind.execute(backfill, {"start": start, "stop": start + BACKFILL_BATCH_SIZE})
+    op.execute("CREATE INDEX IF NOT EXISTS ix_post_search_vector ON post USING gin (search_vector);")
+    op.execute("DROP INDEX IF EXISTS idx_post_search_vector;")
+
+    op.execute("""
+    ALTER TABLE epaper ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(publication_name, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(raw_text, '')), 'A')
+        ) STORED;
+    """)
+    op.execute("CREATE INDEX ix_epaper_search_vector ON epaper USING gin (search_vector);")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_epaper_search_vector;")
+    op.execute("ALTER TABLE epaper DROP COLUMN IF EXISTS search_vector;")
+    # Post vectors, trigger and index predate this revision; only the
+    # partial index from 78409aeed0d9 is restored.
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS idx_post_search_vector
+    ON post USING gin (search_vector)
+    WHERE search_vector IS NOT NULL;
+    """)
@@ -0,0 +1,34 @@
+"""post.updated_at for cache watermarks
+
+Revision ID: b4e8d2a61f37
+Revises: a6d3f81c9b20
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8d2a61f37'
+down_revision = 'a6d3f81c9b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Last-write time on post.
+
+    The heatmap window cache compares (count(post.id), max(post.updated_at));
+    max(post.id) alone missed edits and deletes. The server default fills
+    existing rows and raw-SQL bulk inserts; the ORM sets it on every update.
+    """
+    op.add_column('post', sa.Column('updated_at', sa.DateTime(), nullable=False,
+                                    server_default=sa.func.now()))
+    op.create_index('ix_post_updated_at', 'post', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_post_updated_at', table_name='post')
+    op.drop_column('post', 'updated_at')
@@ -0,0 +1,144 @@
+"""add canonical post.ward_id
+
+Revision ID: be5b372ec872
+Revises: 78409aeed0d9
+Create Date: 2026-10-18 21:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.ward import backfill_post_ward_ids
+
+# revision identifiers, used by Alembic.
+revision = 'be5b372ec872'
+down_revision = '78409aeed0d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Canonical ward key on post.
+
+    Ward filters used lower(trim(city)), LIKE '%ward%' or ILIKE, none of
+    which can use the post.city B-tree. post.ward_id holds the canonical
+    GHMC ward id resolved by app.utils.ward.resolve_ward_id at ingest time,
+    so APIs filter with ward_id = :id (optionally with a created_at range).
+
+    Existing rows are backfilled in id-range batches; re-run
+    scripts/backfill_post_ward_id.py after alias changes.
+    """
+    op.add_column('post', sa.Column('ward_id', sa.String(length=64), nullable=True))
+
+    bind = op.get_bind()
+    stats = backfill_post_ward_ids(bind, batch_size=50_000)
+    print(f"post.ward_id backfill: {stats}")
+
+    op.create_index('ix_post_ward_id', 'post', ['ward_id'], unique=False)
+    op.create_index('ix_post_ward_id_created_at', 'post', ['ward_id', 'created_at'], unique=False)
+
+    if bind.dialect.name == 'postgresql':
+        # Bulk ingestion writes through bulk_insert_posts(); carry ward_id through it
+        op.execute("""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'post_partitioned') THEN
+                    ALTER TABLE post_partitioned ADD COLUMN IF NOT EXISTS ward_id VARCHAR(64);
+                END IF;
+            END $$;
+        """)
+        op.execute("""
+            CREATE OR REPLACE FUNCTION bulk_insert_posts(
+                posts_data JSONB
+            ) RETURNS TABLE (
+                inserted_count INTEGER,
+                skipped_count INTEGER,
+                error_count INTEGER,
+                processing_time_ms INTEGER
+            ) AS $$
+            DECLARE
+                start_time TIMESTAMP;
+                end_time TIMESTAMP;
+                inserted_cnt INTEGER := 0;
+                skipped_cnt INTEGER := 0;
+                error_cnt INTEGER := 0;
+                post_record JSONB;
+            BEGIN
+                start_time := clock_timestamp();
+
+                CREATE TEMP TABLE IF NOT EXISTS temp_bulk_posts (
+                    text TEXT,
+                    author_name TEXT,
+                    city TEXT,
+                    ward_id TEXT,
+                    emotion TEXT,
+                    party TEXT,
+                    created_at TIMESTAMP WITH TIME ZONE,
+                    epaper_id INTEGER
+                ) ON COMMIT DROP;
+
+                FOR post_record IN SELECT * FROM jsonb_array_elements(posts_data)
+                LOOP
+                    BEGIN
+                        INSERT INTO temp_bulk_posts (text, author_name, city, ward_id, emotion, party, created_at, epaper_id)
+                        VALUES (
+                            post_record->>'text',
+                            post_record->>'author_name',
+                            post_record->>'city',
+                            NULLIF(post_record->>'ward_id', ''),
+                            post_record->>'emotion',
+                            post_record->>'party',
+                            COALESCE((post_record->>'created_at')::TIMESTAMP WITH TIME ZONE, NOW()),
+                            NULLIF(post_record->>'epaper_id', '')::INTEGER
+                        );
+                    EXCEPTION WHEN OTHERS THEN
+                        error_cnt := error_cnt + 1;
+                        CONTINUE;
+                    END;
+                END LOOP;
+
+                INSERT INTO author (name, party)
+                SELECT DISTINCT tbp.author_name, tbp.party
+                FROM temp_bulk_posts tbp
+                WHERE tbp.author_name IS NOT NULL
+                ON CONFLICT (name) DO NOTHING;
+
+                WITH author_resolved AS (
+                    SELECT
+                        tbp.*,
+                        a.id as resolved_author_id
+                    FROM temp_bulk_posts tbp
+                    LEFT JOIN author a ON a.name = tbp.author_name
+                )
+                INSERT INTO post_partitioned (text, author_id, city, ward_id, emotion, party, created_at, epaper_id)
+                SELECT
+                    ar.text,
+                    ar.resolved_author_id,
+                    ar.city,
+                    ar.ward_id,
+                    ar.emotion,
+                    ar.party,
+                    ar.created_at,
+                    ar.epaper_id
+                FROM author_resolved ar
+                WHERE ar.text IS NOT NULL;
+
+                GET DIAGNOSTICS inserted_cnt = ROW_COUNT;
+
+                end_time := clock_timestamp();
+
+                RETURN QUERY SELECT
+                    inserted_cnt,
+                    skipped_cnt,
+                    error_cnt,
+                    EXTRACT(EPOCH FROM (end_time - start_time))::INTEGER * 1000;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+
+
+def downgrade():
+    op.drop_index('ix_post_ward_id_created_at', table_name='post')
+    op.drop_index('ix_post_ward_id', table_name='post')
+    op.drop_column('post', 'ward_id')
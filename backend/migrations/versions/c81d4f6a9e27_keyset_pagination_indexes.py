@@ -0,0 +1,33 @@
+"""keyset pagination indexes for epaper and report lists
+
+Revision ID: c81d4f6a9e27
+Revises: a7c4e19d2f35
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81d4f6a9e27'
+down_revision = 'a7c4e19d2f35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Composite indexes matching the keyset order of the list endpoints.
+
+    /api/v1/epaper pages on (publication_date, id) and
+    /api/v1/multimodel/reports/list on (requested_at, id) per user; with the
+    id tiebreaker in the index the cursor predicate is a single range scan.
+    """
+    op.create_index('ix_epaper_publication_date_id', 'epaper', ['publication_date', 'id'], unique=False)
+    op.create_index('ix_geopolitical_report_user_requested', 'geopolitical_report',
+                    ['user_id', 'requested_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_geopolitical_report_user_requested', table_name='geopolitical_report')
+    op.drop_index('ix_epaper_publication_date_id', table_name='epaper')
@@ -0,0 +1,34 @@
+"""post emotion_source for locally classified emotions
+
+Revision ID: e2b7a95c4d13
+Revises: c81d4f6a9e27
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7a95c4d13'
+down_revision = 'c81d4f6a9e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Record who labelled post.emotion and index the unlabelled backlog.
+
+    emotion_source is 'model' or 'llm' for labels set at ingestion; the
+    classifier never trains on its own output. label_post_emotions walks
+    posts with a NULL emotion in id order, which the partial index serves.
+    """
+    op.add_column('post', sa.Column('emotion_source', sa.String(length=16), nullable=True))
+    op.create_index('ix_post_unlabelled_id', 'post', ['id'], unique=False,
+                    postgresql_where=sa.text('emotion IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_post_unlabelled_id', table_name='post')
+    op.drop_column('post', 'emotion_source')
@@ -0,0 +1,83 @@
+"""
+Endpoint overrides for the AI providers.
+
+Every client resolves its base URL here so the whole backend can be pointed
+at the local fake provider server (``app/services/fake_provider.py``) or a
+proxy through configuration alone:
+
+    FAKE_AI_PROVIDER_URL=http://127.0.0.1:8900   # all providers, by path prefix
+
+or per provider: GEMINI_API_ENDPOINT, PERPLEXITY_BASE_URL, OPENAI_BASE_URL,
+ANTHROPIC_BASE_URL, LLAMA_BASE_URL. With nothing set, clients keep their
+public defaults.
+
+Lives at the top level next to config.py and imports only ``os``, so both
+``app`` and ``strategist`` modules can use it without importing each other.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+_ENV_OVERRIDES = {
+    "gemini": "GEMINI_API_ENDPOINT",
+    "perplexity": "PERPLEXITY_BASE_URL",
+    "openai": "OPENAI_BASE_URL",
+    "anthropic": "ANTHROPIC_BASE_URL",
+    "llama": "LLAMA_BASE_URL",
+}
+
+# Path under the fake server, matching the base URL each SDK expects
+_FAKE_PATHS = {
+    "gemini": "/gemini",
+    "perplexity": "/perplexity",
+    "openai": "/openai/v1",
+    "anthropic": "/anthropic",
+    "llama": "/llama/v1",
+}
+
+PERPLEXITY_DEFAULT_BASE_URL = "https://api.perplexity.ai"
+
+
+def configure_provider_endpoints(config) -> None:
+    """Export endpoint settings from the Flask config to the environment.
+
+    Clients resolve endpoints from the environment so code outside an app
+    context (Celery workers, strategist modules) sees the same values.
+    Existing environment variables win.
+    """
+    for key in ("FAKE_AI_PROVIDER_URL", *_ENV_OVERRIDES.values()):
+        value = config.get(key)
+        if value:
+            os.environ.setdefault(key, str(value))
+
+
+def fake_provider_url() -> Optional[str]:
+    url = os.getenv("FAKE_AI_PROVIDER_URL", "").strip()
+    return url.rstrip("/") or None
+
+
+def provider_base_url(provider: str) -> Optional[str]:
+    """Overridden base URL for a provider, or None to use the SDK default."""
+    explicit = os.getenv(_ENV_OVERRIDES[provider], "").strip()
+    if explicit:
+        return explicit.rstrip("/")
+    fake = fake_provider_url()
+    return f"{fake}{_FAKE_PATHS[provider]}" if fake else None
+
+
+def gemini_configure_kwargs() -> Dict[str, Any]:
+    """Extra ``genai.configure`` arguments; REST transport when redirected."""
+    base = provider_base_url("gemini")
+    if not base:
+        return {}
+    return {"transport": "rest", "client_options": {"api_endpoint": base}}
+
+
+def perplexity_chat_url() -> str:
+    return f"{provider_base_url('perplexity') or PERPLEXITY_DEFAULT_BASE_URL}/chat/completions"
+
+
+def sdk_base_url_kwargs(provider: str) -> Dict[str, Any]:
+    """``base_url`` for the OpenAI/Anthropic SDK constructors when redirected."""
+    base = provider_base_url(provider)
+    return {"base_url": base} if base else {}
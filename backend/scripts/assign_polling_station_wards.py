@@ -0,0 +1,42 @@
+# scripts/assign_polling_station_wards.py
+"""
+Assign polling_station.ward_id/ward_name from station coordinates.
+
+Point-in-polygon against the GHMC ward boundaries (app/ward_index.py);
+stations whose CSV ward disagrees with their location are corrected.
+Run after geocoding stations and before aggregating results to wards.
+
+    python scripts/assign_polling_station_wards.py [--dry-run]
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app import create_app
+from app.extensions import db
+from app.ward_index import assign_polling_station_wards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assign polling station wards from coordinates")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        stats = assign_polling_station_wards(db.session, batch_size=args.batch_size)
+        if args.dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    print(f"Located: {stats['located']}, assigned: {stats['assigned']}, "
+          f"corrected: {stats['changed']}, outside GHMC: {stats['outside']}"
+          + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# scripts/backfill_post_ward_id.py
+"""
+Resolve post.ward_id from post.city in id-range batches.
+
+The migration that adds post.ward_id runs this once; re-run it after adding
+ward aliases (use --all to re-resolve rows that already have a ward_id).
+
+    python scripts/backfill_post_ward_id.py --batch-size 50000
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app import create_app
+from app.extensions import db
+from app.utils.ward import backfill_post_ward_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill post.ward_id")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--all", action="store_true", help="Re-resolve rows that already have a ward_id")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        with db.engine.connect() as conn:
+            stats = backfill_post_ward_ids(conn, batch_size=args.batch_size,
+                                           only_missing=not args.all, commit=True)
+    print(f"Cities: {stats['cities']}, resolved: {stats['resolved_cities']}, "
+          f"batches: {stats['batches']}, updated: {stats['updated']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# scripts/build_ward_tiles.py
+"""
+Build simplified ward boundary topologies from app/data/ghmc_wards.geojson.
+
+Writes app/data/ward_tiles/wards-z{zoom}.topo.json for each zoom level;
+GET /api/v1/geojson/topology serves them (and builds in memory when they are
+missing or older than the GeoJSON). Re-run after updating the GeoJSON.
+
+    python scripts/build_ward_tiles.py --zoom 10 12 14
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app.utils.ward import GEOJSON_PATH
+from app.ward_tiles import TILES_DIR, ZOOM_LEVELS, write_ward_tiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build simplified ward boundary topologies")
+    parser.add_argument("--geojson", default=GEOJSON_PATH)
+    parser.add_argument("--out", default=TILES_DIR)
+    parser.add_argument("--zoom", type=int, nargs="+", default=list(ZOOM_LEVELS))
+    args = parser.parse_args()
+
+    source_bytes = os.path.getsize(args.geojson)
+    for zoom, (path, size) in sorted(write_ward_tiles(args.geojson, args.out, args.zoom).items()):
+        print(f"z{zoom}: {path} {size} bytes ({source_bytes / size:.1f}x smaller than the GeoJSON)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Generate a reproducible synthetic LokDarpan corpus for load and benchmark runs.
+
+Bulk-loads N wards x M posts x authors x epapers built from the real GHMC ward
+list (app/data/ghmc_wards.geojson) into the configured DATABASE_URL, and can
+also write an ingestion-format JSONL file for bulk ingestion benchmarks.
+
+--replace empties the post, epaper, author and ward tables first. It only
+works against a scratch database (in-memory SQLite or a database name
+containing test, bench, scratch, synthetic or tmp).
+
+Usage:
+    DATABASE_URL=postgresql://localhost/lokdarpan_bench python scripts/generate_synthetic_corpus.py --scale 1m --replace
+    python scripts/generate_synthetic_corpus.py --posts 250000 --wards 50 --seed 7
+    python scripts/generate_synthetic_corpus.py --scale 10k --jsonl /tmp/epapers.jsonl --jsonl-records 5000 --no-load
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Make "app" importable when running as a script
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app import create_app
+from app.synthetic_corpus import SCALES, CorpusSpec, load_corpus, write_epaper_jsonl
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic LokDarpan corpus")
+    parser.add_argument("--scale", choices=sorted(SCALES), help="Preset post count (10k, 1m, 10m)")
+    parser.add_argument("--posts", type=int, help="Number of posts (overrides --scale)")
+    parser.add_argument("--wards", type=int, default=145, help="Number of GHMC wards to use (max 145)")
+    parser.add_argument("--authors", type=int, default=500)
+    parser.add_argument("--epapers", type=int, help="Number of epapers (default posts/10)")
+    parser.add_argument("--days", type=int, default=365, help="Time span covered by the corpus")
+    parser.add_argument("--end-date", help="ISO date of the newest row (default: today)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--replace", action="store_true",
+                        help="Empty post/epaper/author/ward tables first (scratch databases only)")
+    parser.add_argument("--no-load", action="store_true", help="Skip the database load")
+    parser.add_argument("--jsonl", help="Also write ingestion-format epaper JSONL to this path")
+    parser.add_argument("--jsonl-records", type=int, default=10_000)
+    parser.add_argument("--config", default="config.Config", help="Flask config import path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    posts = args.posts or SCALES[args.scale or "10k"]
+    spec = CorpusSpec(
+        posts=posts,
+        wards=args.wards,
+        authors=args.authors,
+        epapers=args.epapers,
+        days=args.days,
+        seed=args.seed,
+        end_date=args.end_date,
+    )
+
+    if args.jsonl:
+        write_epaper_jsonl(spec, args.jsonl, args.jsonl_records)
+        print(f"Wrote {args.jsonl_records} epaper records to {args.jsonl}")
+
+    if args.no_load:
+        return
+
+    app = create_app(args.config)
+    with app.app_context():
+        stats = load_corpus(spec, batch_size=args.batch_size, replace=args.replace)
+    stats.pop("wards", None)
+    print(json.dumps(stats, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# scripts/rebuild_ward_keywords.py
+"""
+Recount ward_keyword_daily from the post table in id-range batches.
+
+Ingestion keeps the counts current; run this after changing the tokenizer,
+stopwords or ward aliases, or after writing posts outside the ORM.
+
+    python scripts/rebuild_ward_keywords.py --batch-size 20000
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app import create_app
+from app.extensions import db
+from app.ward_keywords import rebuild_ward_keywords
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild ward_keyword_daily")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        with db.engine.begin() as conn:
+            stats = rebuild_ward_keywords(conn, batch_size=args.batch_size)
+    print(f"Posts: {stats['posts']}, batches: {stats['batches']}, upserts: {stats['upserts']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ from collections import deque
 from threading import Lock
 import aiohttp
 from asyncio import Semaphore
+from provider_endpoints import PERPLEXITY_DEFAULT_BASE_URL, provider_base_url
 
 logger = logging.getLogger(__name__)
 
@@ -275,7 +276,7 @@ class GeminiConnectionPool(AIConnectionPool):
             rate_limit=60,  # 60 requests per minute
             timeout=30
         )
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self.base_url = f"{provider_base_url('gemini') or 'https://generativelanguage.googleapis.com'}/v1beta"
     
     async def generate_content(self, prompt: str, model: str = "gemini-pro") -> Optional[str]:
         """
@@ -332,7 +333,7 @@ class PerplexityConnectionPool(AIConnectionPool):
             rate_limit=20,  # Lower rate limit for Perplexity
             timeout=45  # Longer timeout for search operations
         )
-        self.base_url = "https://api.perplexity.ai"
+        self.base_url = provider_base_url("perplexity") or PERPLEXITY_DEFAULT_BASE_URL
     
     async def search(self, query: str, model: str = "pplx-70b-online") -> Optional[Dict[str, Any]]:
         """
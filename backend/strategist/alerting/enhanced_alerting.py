@@ -10,6 +10,7 @@ Provides conversation-aware intelligent alerting with:
 
 import os
 import json
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional, Tuple
@@ -17,6 +18,9 @@ from enum import Enum
 from dataclasses import dataclass
 
 import google.generativeai as genai
+from provider_endpoints import gemini_configure_kwargs
+
+from ..async_model import AsyncModel
 
 logger = logging.getLogger(__name__)
 
@@ -82,8 +86,8 @@ class EnhancedAlertingEngine:
     def __init__(self):
         # Initialize Gemini for alert intelligence
         try:
-            genai.configure(api_key=os.environ["GEMINI_API_KEY"])
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            genai.configure(api_key=os.environ["GEMINI_API_KEY"], **gemini_configure_kwargs())
+            self.model = AsyncModel(genai.GenerativeModel('gemini-2.0-flash-exp'))
             self.gemini_available = True
         except KeyError:
             logger.error("GEMINI_API_KEY not set for enhanced alerting")
@@ -207,7 +211,7 @@ class EnhancedAlertingEngine:
             Ensure all recommendations are specific, realistic, and time-bound.
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.3,
@@ -298,14 +302,16 @@ class EnhancedAlertingEngine:
     ) -> List[StrategicAlert]:
         """Apply contextual scoring based on conversation and user context."""
         try:
-            for alert in alerts:
-                # Enhance conversation relevance scoring
-                if alert_context.conversation_history:
-                    relevance_score = await self._calculate_conversation_relevance(
-                        alert, alert_context.conversation_history
-                    )
+            # Enhance conversation relevance scoring (one model call per alert, run concurrently)
+            if alert_context.conversation_history:
+                relevance_scores = await asyncio.gather(*(
+                    self._calculate_conversation_relevance(alert, alert_context.conversation_history)
+                    for alert in alerts
+                ))
+                for alert, relevance_score in zip(alerts, relevance_scores):
                     alert.conversation_relevance = max(alert.conversation_relevance or 0.5, relevance_score)
-                
+            
+            for alert in alerts:
                 # Enhance campaign alignment scoring
                 if alert_context.strategic_objectives:
                     alignment_score = self._calculate_campaign_alignment(
@@ -360,7 +366,7 @@ class EnhancedAlertingEngine:
             Return only a number between 0.0 and 1.0.
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.2,
@@ -556,7 +562,7 @@ class EnhancedAlertingEngine:
             Focus on actionable strategic intelligence and pattern recognition.
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.3,
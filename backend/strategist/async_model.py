@@ -0,0 +1,64 @@
+"""
+Async adapter for the synchronous Gemini SDK model.
+
+``GenerativeModel.generate_content`` blocks for the whole request. Called
+directly inside ``async def`` it stalls the event loop, so a ward analysis
+cannot overlap its stages and every other coroutine on the loop waits too.
+
+:class:`AsyncModel` runs ``generate_content`` on a dedicated, bounded
+thread pool and is awaited like a native coroutine, which lets independent
+stages be gathered. The SDK's own ``generate_content_async`` is not used
+here: its gRPC channel is bound to the event loop it was first used on,
+while the strategist runs on fresh loops (Flask request threads, Celery
+tasks, the batch analysis thread).
+
+Pool size comes from ``STRATEGIST_LLM_WORKERS`` (default 8).
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def model_executor() -> ThreadPoolExecutor:
+    """The process-wide pool that SDK calls run on (created on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv("STRATEGIST_LLM_WORKERS", DEFAULT_WORKERS))
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="strategist-llm")
+        return _executor
+
+
+class AsyncModel:
+    """Awaitable ``generate_content`` over a synchronous SDK model; other attributes pass through."""
+
+    def __init__(self, model: Any, executor: Optional[ThreadPoolExecutor] = None):
+        self.model = model
+        self._executor = executor
+
+    async def generate_content(self, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.model.generate_content, *args, **kwargs)
+        return await loop.run_in_executor(self._executor or model_executor(), call)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
+
+def async_model(model: Any) -> Optional[AsyncModel]:
+    """Wrap ``model`` for awaiting; ``None`` (no API key) stays ``None``."""
+    if model is None or isinstance(model, AsyncModel):
+        return model
+    return AsyncModel(model)
@@ -24,6 +24,9 @@ except Exception as e:
     logger.error(f"Redis connection failed: {e}")
     r = None
 
+# Shared client for modules that talk to Redis directly (conversation sessions)
+redis_client = r
+
 
 def cget(key: str) -> Optional[Dict[str, Any]]:
     """
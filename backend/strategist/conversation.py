@@ -12,10 +12,11 @@ Provides conversational AI capabilities with:
 
 import os
 import json
+import time
 import uuid
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, AsyncGenerator
+from typing import Dict, List, Optional, Any, AsyncGenerator, Tuple
 
 import redis
 from flask import current_app
@@ -26,6 +27,28 @@ from .observability import get_observer, monitor_strategist_operation
 
 logger = logging.getLogger(__name__)
 
+SESSION_PREFIX = "conversation:session:"
+SUMMARY_PREFIX = "conversation:summary:"
+INDEX_PREFIX = "conversation:index:"
+# Set once the sessions stored before the summary/index keys existed are indexed
+INDEX_BACKFILLED_KEY = f"{INDEX_PREFIX}backfilled"
+
+
+def _index_key(user_id) -> str:
+    """Sorted set of session ids by last activity; ``all`` indexes every user."""
+    return f"{INDEX_PREFIX}{'all' if user_id is None else user_id}"
+
+
+def _activity_score(timestamp: Optional[str]) -> float:
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def _text(member) -> str:
+    return member.decode() if isinstance(member, bytes) else member
+
 
 class ConversationManager:
     """
@@ -78,13 +101,8 @@ class ConversationManager:
         }
         
         # Store session in Redis with TTL
-        session_key = f"conversation:session:{session_id}"
         try:
-            redis_client.setex(
-                session_key, 
-                self.session_ttl, 
-                json.dumps(session_data, default=str)
-            )
+            self._save_session(session_data)
             logger.info(f"Created conversation session {session_id} for ward {ward}")
             return session_id
         except Exception as e:
@@ -101,7 +119,7 @@ class ConversationManager:
         Returns:
             Session data dictionary or None
         """
-        session_key = f"conversation:session:{session_id}"
+        session_key = f"{SESSION_PREFIX}{session_id}"
         try:
             session_data = redis_client.get(session_key)
             if session_data:
@@ -131,18 +149,72 @@ class ConversationManager:
         session_data['last_activity'] = datetime.now(timezone.utc).isoformat()
         
         # Save back to Redis
-        session_key = f"conversation:session:{session_id}"
         try:
-            redis_client.setex(
-                session_key, 
-                self.session_ttl, 
-                json.dumps(session_data, default=str)
-            )
+            self._save_session(session_data)
             return True
         except Exception as e:
             logger.error(f"Failed to update session {session_id}: {e}")
             return False
     
+    def _save_session(self, session_data: Dict[str, Any]):
+        """
+        Store a session with its list summary and index entries.
+        
+        Conversation lists read the small ``conversation:summary:<id>`` records
+        through per-user sorted sets scored by last activity, so listing never
+        scans keys or loads full message histories.
+        """
+        session_id = session_data['session_id']
+        score = _activity_score(session_data.get('last_activity'))
+        pipe = redis_client.pipeline()
+        pipe.setex(f"{SESSION_PREFIX}{session_id}", self.session_ttl,
+                   json.dumps(session_data, default=str))
+        pipe.setex(f"{SUMMARY_PREFIX}{session_id}", self.session_ttl,
+                   json.dumps(self._summarize(session_data), default=str))
+        for index_key in (_index_key(session_data.get('user_id')), _index_key(None)):
+            pipe.zadd(index_key, {session_id: score})
+            pipe.expire(index_key, self.session_ttl)
+        pipe.execute()
+    
+    def _backfill_index(self) -> int:
+        """
+        Index sessions stored without summaries or index entries.
+        
+        Runs once per Redis database: the first caller to set
+        ``INDEX_BACKFILLED_KEY`` scans the session keys and re-saves each
+        unindexed session, which also renews its TTL. Returns the number of
+        sessions indexed.
+        """
+        if not redis_client.set(INDEX_BACKFILLED_KEY, datetime.now(timezone.utc).isoformat(), nx=True):
+            return 0
+        indexed = 0
+        for key in redis_client.scan_iter(match=f"{SESSION_PREFIX}*", count=500):
+            session_id = _text(key)[len(SESSION_PREFIX):]
+            if redis_client.exists(f"{SUMMARY_PREFIX}{session_id}"):
+                continue
+            raw = redis_client.get(key)
+            if raw is None:
+                continue
+            self._save_session(json.loads(raw))
+            indexed += 1
+        if indexed:
+            logger.info(f"Indexed {indexed} conversation sessions stored before the conversation index")
+        return indexed
+    
+    def _summarize(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """List-view summary of a session."""
+        return {
+            'id': session_data['session_id'],
+            'title': self._generate_conversation_title(session_data),
+            'ward': session_data.get('ward'),
+            'chat_type': session_data.get('chat_type'),
+            'language': session_data.get('language'),
+            'created_at': session_data.get('created_at'),
+            'last_updated': session_data.get('last_activity'),
+            'message_count': session_data.get('message_count', 0),
+            'last_message': self._get_last_message_preview(session_data)
+        }
+    
     def add_message(self, session_id: str, message: Dict[str, Any]) -> bool:
         """
         Add a message to the conversation history.
@@ -458,64 +530,82 @@ class ConversationManager:
         Returns:
             List of conversation summaries
         """
+        conversations, _ = self.list_conversations(user_id=user_id, ward=ward, limit=limit)
+        return conversations
+    
+    def list_conversations(self, user_id: str = None, ward: str = None, limit: int = 50,
+                           cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Page through conversation summaries, most recently active first.
+        
+        Args:
+            user_id: Optional user identifier (None lists every user's sessions)
+            ward: Optional ward filter
+            limit: Maximum number of conversations
+            cursor: next_cursor from the previous page
+            
+        Returns:
+            (conversation summaries, next_cursor or None)
+            
+        Raises:
+            InvalidCursor (a ValueError) for a malformed cursor
+        """
+        # (imported here: app imports strategist while it loads)
+        from app.pagination import decode_cursor, encode_cursor
+        
+        after = decode_cursor(cursor, float, str) if cursor else None
         try:
             # Check if Redis is available
             if not redis_client:
                 logger.warning("Redis not available, returning mock conversations for development")
-                return self._get_mock_conversations(user_id, ward, limit)
-                
-            # Test Redis connectivity
-            redis_client.ping()
+                return self._get_mock_conversations(user_id, ward, limit), None
             
-            # Search for conversation keys
-            search_pattern = "conversation:session:*"
-            conversation_keys = redis_client.keys(search_pattern)
+            self._backfill_index()
+            index_key = _index_key(user_id)
+            # Summaries expire session_ttl after their last activity
+            redis_client.zremrangebyscore(index_key, '-inf', f"({time.time() - self.session_ttl}")
             
+            max_score = after[0] if after else '+inf'
+            batch = max(limit, 20)
+            offset = 0
             conversations = []
-            for key in conversation_keys:
-                try:
-                    session_data = redis_client.get(key)
-                    if session_data:
-                        data = json.loads(session_data)
-                        
-                        # Apply filters
-                        if user_id and data.get('user_id') != user_id:
-                            continue
-                        if ward and data.get('ward') != ward:
-                            continue
-                        
-                        # Create conversation summary
-                        summary = {
-                            'id': data['session_id'],
-                            'title': self._generate_conversation_title(data),
-                            'ward': data.get('ward'),
-                            'chat_type': data.get('chat_type'),
-                            'language': data.get('language'),
-                            'created_at': data.get('created_at'),
-                            'last_updated': data.get('last_activity'),
-                            'message_count': data.get('message_count', 0),
-                            'last_message': self._get_last_message_preview(data)
-                        }
-                        conversations.append(summary)
-                        
-                except Exception as e:
-                    logger.error(f"Error processing conversation {key}: {e}")
-                    continue
-            
-            # Sort by last activity (most recent first)
-            conversations.sort(
-                key=lambda x: x.get('last_updated', ''), 
-                reverse=True
-            )
-            
-            return conversations[:limit]
+            last = None
+            while len(conversations) < limit:
+                entries = redis_client.zrevrangebyscore(index_key, max_score, '-inf',
+                                                        start=offset, num=batch, withscores=True)
+                offset += len(entries)
+                exhausted = len(entries) < batch
+                if after:
+                    # Equal scores come back in reverse member order
+                    entries = [(m, sc) for m, sc in entries if sc < after[0] or _text(m) < after[1]]
+                ids = [_text(m) for m, _ in entries]
+                summaries = redis_client.mget([f"{SUMMARY_PREFIX}{i}" for i in ids]) if ids else []
+                stale = []
+                for session_id, (_, score), raw in zip(ids, entries, summaries):
+                    if raw is None:
+                        stale.append(session_id)
+                        continue
+                    summary = json.loads(raw)
+                    if ward and summary.get('ward') != ward:
+                        continue
+                    conversations.append(summary)
+                    last = (score, session_id)
+                    if len(conversations) == limit:
+                        break
+                if stale:
+                    redis_client.zrem(index_key, *stale)
+                if exhausted:
+                    break
+            
+            next_cursor = encode_cursor(*last) if len(conversations) == limit else None
+            return conversations, next_cursor
             
         except (redis.ConnectionError, redis.exceptions.ConnectionError, AttributeError):
             logger.warning("Redis connection failed, using mock conversations")
-            return self._get_mock_conversations(user_id, ward, limit)
+            return self._get_mock_conversations(user_id, ward, limit), None
         except Exception as e:
             logger.error(f"Error getting conversations: {e}")
-            return self._get_mock_conversations(user_id, ward, limit)
+            return self._get_mock_conversations(user_id, ward, limit), None
     
     def _generate_conversation_title(self, session_data: Dict[str, Any]) -> str:
         """Generate a descriptive title for the conversation."""
@@ -592,8 +682,11 @@ class ConversationManager:
         Returns:
             Success status
         """
-        session_key = f"conversation:session:{session_id}"
+        session_key = f"{SESSION_PREFIX}{session_id}"
         try:
+            # User indexes drop the id lazily once its summary is gone
+            redis_client.zrem(_index_key(None), session_id)
+            redis_client.delete(f"{SUMMARY_PREFIX}{session_id}")
             result = redis_client.delete(session_key)
             logger.info(f"Deleted conversation session {session_id}")
             return result > 0
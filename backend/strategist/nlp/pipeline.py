@@ -7,6 +7,7 @@ Includes sentiment analysis with political context and opponent mentions.
 
 import os
 import json
+import asyncio
 import logging
 import re
 from datetime import datetime, timezone
@@ -14,6 +15,10 @@ from typing import Dict, List, Any, Optional
 from collections import Counter
 
 import google.generativeai as genai
+from provider_endpoints import gemini_configure_kwargs
+
+from ..async_model import async_model
+from ..observability.tracing import ai_call_span, record_token_usage, usage_from_response
 
 logger = logging.getLogger(__name__)
 
@@ -47,14 +52,14 @@ class NLPProcessor:
     """
     
     def __init__(self):
-        self.model = self._initialize_model()
+        self.model = async_model(self._initialize_model())
         
     def _initialize_model(self):
         """Initialize Gemini model for NLP tasks."""
         try:
             api_key = os.environ.get("GEMINI_API_KEY")
             if api_key:
-                genai.configure(api_key=api_key)
+                genai.configure(api_key=api_key, **gemini_configure_kwargs())
                 return genai.GenerativeModel('gemini-1.5-flash')
             else:
                 logger.warning("GEMINI_API_KEY not available for NLP processing")
@@ -89,11 +94,14 @@ class NLPProcessor:
             if not texts:
                 return self._empty_analysis(ward)
             
-            # Perform multilingual analysis
-            sentiment_analysis = await self._analyze_sentiment(texts, ward)
-            topic_analysis = await self._extract_topics(texts, ward)
-            entity_analysis = await self._extract_entities(texts, ward)
-            political_context = await self._analyze_political_context(texts, ward)
+            # Perform multilingual analysis; the stages are independent, so the two
+            # model calls overlap instead of running back to back
+            sentiment_analysis, topic_analysis, entity_analysis, political_context = await asyncio.gather(
+                self._analyze_sentiment(texts, ward),
+                self._extract_topics(texts, ward),
+                self._extract_entities(texts, ward),
+                self._analyze_political_context(texts, ward),
+            )
             
             # Synthesize results
             analysis = {
@@ -163,7 +171,9 @@ class NLPProcessor:
             Consider political context and party mentions.
             """
             
-            response = self.model.generate_content(prompt)
+            with ai_call_span("gemini", "gemini-1.5-flash", "sentiment", ward=ward) as span:
+                response = await self.model.generate_content(prompt)
+                record_token_usage(span, *usage_from_response(response))
             result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
             
             return result
@@ -246,7 +256,9 @@ class NLPProcessor:
             Focus on political entities relevant to Hyderabad/Telangana politics.
             """
             
-            response = self.model.generate_content(prompt)
+            with ai_call_span("gemini", "gemini-1.5-flash", "entities", ward=ward) as span:
+                response = await self.model.generate_content(prompt)
+                record_token_usage(span, *usage_from_response(response))
             result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
             
             return result
@@ -5,6 +5,7 @@ Provides comprehensive monitoring, logging, and metrics collection for the
 AI-powered political strategist system.
 """
 
+import inspect
 import logging
 import time
 from datetime import datetime
@@ -14,12 +15,23 @@ from functools import wraps
 from .metrics import (
     get_metrics, 
     get_health_monitor,
+    configure_shared_metrics,
     track_time,
     track_api_call,
     record_ai_model_call,
     record_cache_operation,
     record_user_action
 )
+from .tracing import (
+    configure_tracing,
+    current_span,
+    start_span,
+    traced,
+    ai_call_span,
+    record_token_usage,
+    usage_from_response,
+    instrument_celery,
+)
 
 # Configure structured logging
 logging.basicConfig(
@@ -109,34 +121,58 @@ def get_observer() -> StrategistObserver:
     return _observer
 
 def monitor_strategist_operation(operation_name: str):
-    """Decorator to monitor strategist operations."""
+    """Decorator to monitor strategist operations.
+
+    Records duration/success metrics and opens a ``strategist.<operation>``
+    span; works on both sync and async functions.
+    """
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            observer = get_observer()
-            
+        def _tags(args, kwargs):
             # Extract ward if available
             ward = "unknown"
             if args and hasattr(args[0], 'ward'):
                 ward = args[0].ward
             elif 'ward' in kwargs:
                 ward = kwargs['ward']
-                
-            tags = {"operation": operation_name, "ward": ward}
-            
-            try:
-                result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                observer.metrics.timing("strategist.operations", duration, tags)
+            return {"operation": operation_name, "ward": ward}
+
+        def _record(tags, start_time, error=None):
+            observer = get_observer()
+            duration = time.time() - start_time
+            observer.metrics.timing("strategist.operations", duration, tags)
+            if error is None:
                 observer.metrics.increment("strategist.operations.success", 1, tags)
+            else:
+                observer.metrics.error("strategist.operations", type(error).__name__, tags)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                tags = _tags(args, kwargs)
+                start_time = time.time()
+                with start_span(f"strategist.{operation_name}", {"ward": tags["ward"]}):
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        _record(tags, start_time, e)
+                        raise
+                _record(tags, start_time)
                 return result
-            except Exception as e:
-                duration = time.time() - start_time
-                observer.metrics.timing("strategist.operations", duration, tags)
-                observer.metrics.error("strategist.operations", type(e).__name__, tags)
-                raise
-                
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tags = _tags(args, kwargs)
+            start_time = time.time()
+            with start_span(f"strategist.{operation_name}", {"ward": tags["ward"]}):
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    _record(tags, start_time, e)
+                    raise
+            _record(tags, start_time)
+            return result
+
         return wrapper
     return decorator
 
@@ -146,6 +182,15 @@ __all__ = [
     'get_observer',
     'get_metrics',
     'get_health_monitor',
+    'configure_shared_metrics',
+    'configure_tracing',
+    'current_span',
+    'start_span',
+    'traced',
+    'ai_call_span',
+    'record_token_usage',
+    'usage_from_response',
+    'instrument_celery',
     'track_time',
     'track_api_call',
     'monitor_strategist_operation',
@@ -5,10 +5,11 @@ Provides comprehensive monitoring dashboards and health check endpoints
 for real-time system monitoring and performance analysis.
 """
 
+import hmac
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request
 from flask_login import login_required
 
 from .metrics import get_metrics, get_health_monitor
@@ -17,6 +18,8 @@ logger = logging.getLogger(__name__)
 
 observability_bp = Blueprint('observability', __name__, url_prefix='/api/v1/monitor')
 
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
 
 @observability_bp.route('/health', methods=['GET'])
 def health_check():
@@ -65,6 +68,35 @@ def metrics_summary():
         }), 500
 
 
+@observability_bp.route('/prometheus', methods=['GET'])
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Serves counters, gauges and latency/size histograms merged across all
+    workers in the text exposition format. When METRICS_SCRAPE_TOKEN is set
+    the scraper must send it as a bearer token; without a token only
+    loopback clients (a sidecar or node-local scraper) are served.
+    
+    Returns:
+        text/plain metrics exposition
+    """
+    token = current_app.config.get('METRICS_SCRAPE_TOKEN')
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            return jsonify({"error": "Unauthorized"}), 401
+    elif request.remote_addr not in LOOPBACK_ADDRESSES:
+        return jsonify({"error": "Forbidden"}), 403
+    
+    try:
+        body = get_metrics().prometheus_text()
+        return Response(body, mimetype='text/plain; version=0.0.4')
+        
+    except Exception as e:
+        logger.error(f"Error rendering Prometheus metrics: {e}")
+        return Response("# metrics unavailable\n", status=500, mimetype='text/plain')
+
+
 @observability_bp.route('/performance', methods=['GET'])
 @login_required
 def performance_dashboard():
@@ -3,11 +3,23 @@ Performance Metrics Collection for Political Strategist
 
 Implements comprehensive metrics collection for monitoring system performance,
 AI model performance, and user interaction patterns.
+
+Timings and value distributions are stored in fixed-bucket histograms so that
+recording is O(1) and percentiles never require sorting raw samples. Each
+process keeps its own counters; when a shared Redis backend is configured the
+per-process deltas are merged into Redis by a background flusher thread so
+every gunicorn worker reports the same cluster-wide numbers, both in the JSON
+summary and in the Prometheus text exposition. Request threads never wait on
+Redis.
 """
 
+import os
+import re
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from functools import wraps
@@ -33,101 +45,449 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (seconds) of latency buckets; an implicit +Inf bucket follows.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Upper bounds of buckets for size-like values (token counts, source counts).
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+REDIS_KEY_PREFIX = "lokdarpan:metrics"
+PROMETHEUS_PREFIX = "lokdarpan_"
+
+
+def bucket_quantile(bounds: Sequence[float], counts: Sequence[int], q: float) -> float:
+    """Estimate the q-quantile from per-bucket counts.
+
+    ``counts`` holds one slot per bound plus a trailing +Inf slot. Values are
+    linearly interpolated inside the matching bucket; observations in the +Inf
+    bucket are reported at the largest finite bound, like Prometheus'
+    ``histogram_quantile``.
+    """
+    total = sum(counts)
+    if not total or not bounds:
+        return 0.0
+    rank = q * total
+    cumulative = 0
+    for idx, count in enumerate(counts):
+        if count and cumulative + count >= rank:
+            if idx >= len(bounds):
+                return float(bounds[-1])
+            lower = float(bounds[idx - 1]) if idx > 0 else 0.0
+            upper = float(bounds[idx])
+            return lower + (upper - lower) * ((rank - cumulative) / count)
+        cumulative += count
+    return float(bounds[-1])
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is one bisect and a few additions."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        """Record a single observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Bucket-interpolated quantile, clamped to the observed range."""
+        return _clamped_quantile(dict(self.snapshot(), bounds=self.bounds), q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-data copy suitable for merging and export."""
+        return {
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+def _clamped_quantile(snap: Dict[str, Any], q: float) -> float:
+    value = bucket_quantile(snap["bounds"], snap["counts"], q)
+    if snap.get("min") is not None:
+        value = max(value, snap["min"])
+    if snap.get("max") is not None:
+        value = min(value, snap["max"])
+    return value
+
+
+def _summarize_histogram(snap: Dict[str, Any], bounds: Sequence[float]) -> Dict[str, Any]:
+    snap = dict(snap, bounds=bounds)
+    return {
+        "count": snap["count"],
+        "avg": snap["sum"] / snap["count"],
+        "min": _clamped_quantile(snap, 0.0),
+        "max": _clamped_quantile(snap, 1.0),
+        "p50": _clamped_quantile(snap, 0.50),
+        "p95": _clamped_quantile(snap, 0.95),
+        "p99": _clamped_quantile(snap, 0.99),
+    }
+
+
 class MetricsCollector:
-    """Collects and aggregates performance metrics."""
-    
+    """Collects and aggregates performance metrics.
+
+    Recording never takes a lock: each worker process owns its counters and
+    histograms, and an optional :class:`SharedMetricsStore` merges them across
+    processes by pushing deltas.
+    """
+
     def __init__(self):
         self.counters = defaultdict(int)
-        self.timers = defaultdict(list)
+        self.timers = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
         self.gauges = defaultdict(float)
-        self.histograms = defaultdict(lambda: deque(maxlen=1000))
+        self.histograms = defaultdict(lambda: Histogram(SIZE_BUCKETS))
         self.errors = defaultdict(int)
-        self.api_calls = defaultdict(lambda: {"count": 0, "total_time": 0.0})
-        
+        # Series key -> (metric name, sorted label pairs) for label-aware exporters
+        self.series: Dict[str, Tuple[str, Tuple[Tuple[str, str], ...]]] = {}
+        self.shared_store: Optional["SharedMetricsStore"] = None
+
     def increment(self, metric: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
         """Increment a counter metric."""
         key = self._build_key(metric, tags)
         self.counters[key] += value
         logger.debug(f"Incremented {key} by {value}")
-        
+        self._maybe_flush()
+
     def timing(self, metric: str, value: float, tags: Optional[Dict[str, str]] = None):
-        """Record a timing metric."""
+        """Record a timing metric (seconds)."""
         key = self._build_key(metric, tags)
-        self.timers[key].append(value)
-        # Keep only last 100 measurements
-        if len(self.timers[key]) > 100:
-            self.timers[key] = self.timers[key][-100:]
-        
+        self.timers[key].observe(value)
+        self._maybe_flush()
+
     def gauge(self, metric: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Set a gauge metric."""
         key = self._build_key(metric, tags)
         self.gauges[key] = value
-        
+
     def histogram(self, metric: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Add value to histogram."""
         key = self._build_key(metric, tags)
-        self.histograms[key].append({
-            'value': value,
-            'timestamp': datetime.now().isoformat()
-        })
-        
+        self.histograms[key].observe(value)
+        self._maybe_flush()
+
     def error(self, metric: str, error_type: str, tags: Optional[Dict[str, str]] = None):
         """Record an error."""
-        tags = tags or {}
+        tags = dict(tags or {})
         tags['error_type'] = error_type
         key = self._build_key(metric, tags)
         self.errors[key] += 1
-        
+
     def api_call(self, endpoint: str, duration: float, status_code: int):
         """Record API call metrics."""
-        key = f"api.{endpoint}"
-        self.api_calls[key]["count"] += 1
-        self.api_calls[key]["total_time"] += duration
-        
-        # Track status codes
-        status_key = f"api.{endpoint}.status_{status_code}"
-        self.counters[status_key] += 1
-        
+        self.timing("api.request.duration", duration, {"endpoint": endpoint})
+        self.increment("api.requests", 1, {"endpoint": endpoint, "status": str(status_code)})
+
     def _build_key(self, metric: str, tags: Optional[Dict[str, str]] = None) -> str:
         """Build metric key with tags."""
-        if not tags:
-            return metric
-        tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
-        return f"{metric},{tag_str}"
-        
+        labels = tuple(sorted((str(k), str(v)) for k, v in (tags or {}).items()))
+        key = metric if not labels else metric + "," + ",".join(f"{k}={v}" for k, v in labels)
+        if key not in self.series:
+            self.series[key] = (metric, labels)
+        return key
+
+    def _maybe_flush(self):
+        store = self.shared_store
+        if store is not None:
+            store.ensure_flusher(self)
+
+    def local_families(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of this process' metrics grouped by kind."""
+        return {
+            "counter": dict(self.counters),
+            "error": dict(self.errors),
+            "gauge": dict(self.gauges),
+            "timer": {k: h.snapshot() for k, h in list(self.timers.items())},
+            "histogram": {k: h.snapshot() for k, h in list(self.histograms.items())},
+            "series": dict(self.series),
+        }
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Metric families merged across workers, or this process' if not shared."""
+        store = self.shared_store
+        if store is not None:
+            store.push(self)
+            merged = store.pull()
+            if merged is not None:
+                return merged
+        return self.local_families()
+
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of all metrics."""
+        families = self.collect()
         summary = {
             "timestamp": datetime.now().isoformat(),
-            "counters": dict(self.counters),
-            "gauges": dict(self.gauges),
-            "errors": dict(self.errors),
+            "counters": families["counter"],
+            "gauges": families["gauge"],
+            "errors": families["error"],
             "timers": {},
+            "histograms": {},
             "api_calls": {}
         }
-        
-        # Aggregate timing metrics
-        for key, times in self.timers.items():
-            if times:
-                summary["timers"][key] = {
-                    "count": len(times),
-                    "avg": sum(times) / len(times),
-                    "min": min(times),
-                    "max": max(times),
-                    "p95": sorted(times)[int(len(times) * 0.95)] if len(times) > 20 else max(times)
-                }
-                
-        # Aggregate API call metrics
-        for key, data in self.api_calls.items():
-            if data["count"] > 0:
-                summary["api_calls"][key] = {
-                    "count": data["count"],
-                    "avg_duration": data["total_time"] / data["count"],
-                    "total_time": data["total_time"]
-                }
-                
+
+        for key, snap in families["timer"].items():
+            if snap["count"]:
+                summary["timers"][key] = _summarize_histogram(snap, LATENCY_BUCKETS)
+        for key, snap in families["histogram"].items():
+            if snap["count"]:
+                summary["histograms"][key] = _summarize_histogram(snap, SIZE_BUCKETS)
+
+        # Per-endpoint API call view derived from the request duration histogram
+        series = families["series"]
+        for key, snap in families["timer"].items():
+            name, labels = series.get(key, (key, ()))
+            if name != "api.request.duration" or not snap["count"]:
+                continue
+            endpoint = dict(labels).get("endpoint", "unknown")
+            summary["api_calls"][f"api.{endpoint}"] = {
+                "count": snap["count"],
+                "avg_duration": snap["sum"] / snap["count"],
+                "total_time": snap["sum"],
+                "p95_duration": summary["timers"][key]["p95"],
+            }
+
         return summary
 
+    def prometheus_text(self) -> str:
+        """Render merged metrics in the Prometheus text exposition format."""
+        return render_prometheus(self.collect())
+
+
+class SharedMetricsStore:
+    """Merges per-process metric deltas into Redis.
+
+    Workers never coordinate: each remembers what it last pushed and sends
+    only the difference through HINCRBY/HINCRBYFLOAT inside a MULTI block, so
+    concurrent pushes from any number of processes add up exactly. Pushes run
+    on a daemon thread per process (started lazily, so forked workers get
+    their own) every ``flush_interval`` seconds.
+    """
+
+    def __init__(self, client, prefix: str = REDIS_KEY_PREFIX, flush_interval: float = 10.0,
+                 ttl_seconds: int = 7 * 24 * 3600):
+        self.client = client
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self.ttl_seconds = ttl_seconds
+        self._retry_after = 0.0
+        self._lock = threading.Lock()
+        self._flusher_pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._pushed: Dict[Tuple[str, str], Any] = {}
+        self._known_series: set = set()
+
+    def ensure_flusher(self, collector: MetricsCollector):
+        """Start this process' background flusher if it is not running yet."""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            self._stop.clear()
+            threading.Thread(target=self._flush_loop, args=(collector,),
+                             name="metrics-flusher", daemon=True).start()
+
+    def _flush_loop(self, collector: MetricsCollector):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.push(collector)
+            except Exception as e:
+                logger.warning(f"Shared metrics flush failed: {e}")
+
+    def stop(self):
+        """Stop the background flusher (it exits after its current wait)."""
+        self._stop.set()
+        self._flusher_pid = None
+
+    def push(self, collector: MetricsCollector) -> bool:
+        """Send this process' deltas since the previous push."""
+        with self._lock:
+            return self._push(collector)
+
+    def _push(self, collector: MetricsCollector) -> bool:
+        now = time.monotonic()
+        if now < self._retry_after:
+            return False
+
+        families = collector.local_families()
+        pipe = self.client.pipeline()
+        pending: Dict[Tuple[str, str], Any] = {}
+        touched = set()
+
+        for kind in ("counter", "error"):
+            hkey = f"{self.prefix}:{kind}"
+            for key, value in families[kind].items():
+                delta = value - self._pushed.get((kind, key), 0)
+                if delta:
+                    pipe.hincrby(hkey, key, delta)
+                    pending[(kind, key)] = value
+                    touched.add(hkey)
+
+        gauge_key = f"{self.prefix}:gauge"
+        for key, value in families["gauge"].items():
+            if self._pushed.get(("gauge", key)) != value:
+                pipe.hset(gauge_key, key, value)
+                pending[("gauge", key)] = value
+                touched.add(gauge_key)
+
+        for kind in ("timer", "histogram"):
+            for key, snap in families[kind].items():
+                prev = self._pushed.get((kind, key))
+                if prev and prev["count"] == snap["count"]:
+                    continue
+                prev_counts = prev["counts"] if prev else [0] * len(snap["counts"])
+                hkey = f"{self.prefix}:{kind}:{key}"
+                for idx, (current, old) in enumerate(zip(snap["counts"], prev_counts)):
+                    if current != old:
+                        pipe.hincrby(hkey, f"b{idx}", current - old)
+                pipe.hincrbyfloat(hkey, "sum", snap["sum"] - (prev["sum"] if prev else 0.0))
+                pipe.hincrby(hkey, "count", snap["count"] - (prev["count"] if prev else 0))
+                pipe.sadd(f"{self.prefix}:{kind}:index", key)
+                pending[(kind, key)] = snap
+                touched.update((hkey, f"{self.prefix}:{kind}:index"))
+
+        new_series = {
+            key: json.dumps([name, labels])
+            for key, (name, labels) in families["series"].items()
+            if key not in self._known_series
+        }
+        if new_series:
+            pipe.hset(f"{self.prefix}:series", mapping=new_series)
+            touched.add(f"{self.prefix}:series")
+
+        if not touched:
+            return True
+        for hkey in touched:
+            pipe.expire(hkey, self.ttl_seconds)
+
+        try:
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared metrics push failed, retrying in 60s: {e}")
+            self._retry_after = now + 60
+            return False
+
+        self._pushed.update(pending)
+        self._known_series.update(new_series)
+        return True
+
+    def pull(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Read cluster-wide metric families; None if Redis is unavailable."""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for kind in ("counter", "error", "gauge", "series"):
+                pipe.hgetall(f"{self.prefix}:{kind}")
+            pipe.smembers(f"{self.prefix}:timer:index")
+            pipe.smembers(f"{self.prefix}:histogram:index")
+            counters, errors, gauges, series_raw, timer_keys, hist_keys = pipe.execute()
+
+            timer_keys, hist_keys = sorted(timer_keys), sorted(hist_keys)
+            pipe = self.client.pipeline(transaction=False)
+            for key in timer_keys:
+                pipe.hgetall(f"{self.prefix}:timer:{key}")
+            for key in hist_keys:
+                pipe.hgetall(f"{self.prefix}:histogram:{key}")
+            raw_hists = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared metrics pull failed: {e}")
+            return None
+
+        def _hist(raw: Dict[str, str], bounds: Sequence[float]) -> Dict[str, Any]:
+            return {
+                "counts": [int(raw.get(f"b{i}", 0)) for i in range(len(bounds) + 1)],
+                "sum": float(raw.get("sum", 0.0)),
+                "count": int(raw.get("count", 0)),
+                "min": None,
+                "max": None,
+            }
+
+        series = {}
+        for key, encoded in series_raw.items():
+            name, labels = json.loads(encoded)
+            series[key] = (name, tuple(tuple(pair) for pair in labels))
+
+        return {
+            "counter": {k: int(v) for k, v in counters.items()},
+            "error": {k: int(v) for k, v in errors.items()},
+            "gauge": {k: float(v) for k, v in gauges.items()},
+            "timer": {k: _hist(r, LATENCY_BUCKETS) for k, r in zip(timer_keys, raw_hists[:len(timer_keys)])},
+            "histogram": {k: _hist(r, SIZE_BUCKETS) for k, r in zip(hist_keys, raw_hists[len(timer_keys):])},
+            "series": series,
+        }
+
+
+_PROM_INVALID = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _prom_name(metric: str) -> str:
+    return PROMETHEUS_PREFIX + _PROM_INVALID.sub("_", metric)
+
+
+def _prom_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{_PROM_INVALID.sub("_", k)}="{esc(v)}"' for k, v in labels) + "}"
+
+
+def _prom_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(families: Dict[str, Dict[str, Any]]) -> str:
+    """Render metric families in the Prometheus text exposition format (0.0.4)."""
+    series = families.get("series", {})
+    lines: List[str] = []
+
+    def grouped(kind):
+        by_name = defaultdict(list)
+        for key, value in families.get(kind, {}).items():
+            name, labels = series.get(key, (key, ()))
+            by_name[name].append((tuple(labels), value))
+        return sorted(by_name.items())
+
+    for kind, suffix, prom_type in (("counter", "_total", "counter"),
+                                    ("error", "_errors_total", "counter"),
+                                    ("gauge", "", "gauge")):
+        for name, rows in grouped(kind):
+            prom = _prom_name(name) + suffix
+            lines.append(f"# TYPE {prom} {prom_type}")
+            for labels, value in sorted(rows):
+                lines.append(f"{prom}{_prom_labels(labels)} {_prom_number(value)}")
+
+    for kind, suffix, bounds in (("timer", "_seconds", LATENCY_BUCKETS),
+                                 ("histogram", "", SIZE_BUCKETS)):
+        for name, rows in grouped(kind):
+            prom = _prom_name(name) + suffix
+            lines.append(f"# TYPE {prom} histogram")
+            for labels, snap in sorted(rows, key=lambda r: r[0]):
+                cumulative = 0
+                for bound, count in zip(list(bounds) + ["+Inf"], snap["counts"]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _prom_number(bound)
+                    lines.append(f"{prom}_bucket{_prom_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{prom}_sum{_prom_labels(labels)} {_prom_number(snap['sum'])}")
+                lines.append(f"{prom}_count{_prom_labels(labels)} {snap['count']}")
+
+    return "\n".join(lines) + "\n"
+
 # Global metrics collector instance
 _metrics = MetricsCollector()
 
@@ -135,6 +495,36 @@ def get_metrics() -> MetricsCollector:
     """Get the global metrics collector instance."""
     return _metrics
 
+def configure_shared_metrics(config) -> Optional[SharedMetricsStore]:
+    """Attach a Redis-backed shared store to the global collector.
+
+    Reads METRICS_BACKEND, METRICS_REDIS_URL and METRICS_FLUSH_INTERVAL from
+    the Flask config (any mapping works). Metrics stay per-process when the
+    backend is 'local' or Redis cannot be reached.
+    """
+    _metrics.shared_store = None
+    if str(config.get('METRICS_BACKEND', 'local')).lower() != 'redis':
+        return None
+
+    redis_url = config.get('METRICS_REDIS_URL') or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    try:
+        import redis
+        client = redis.Redis.from_url(
+            redis_url,
+            decode_responses=True,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        client.ping()
+    except Exception as e:
+        logger.warning(f"Shared metrics backend unavailable, using per-process metrics: {e}")
+        return None
+
+    store = SharedMetricsStore(client, flush_interval=float(config.get('METRICS_FLUSH_INTERVAL', 10)))
+    _metrics.shared_store = store
+    logger.info("Shared metrics aggregation enabled via Redis")
+    return store
+
 def track_time(metric_name: str, tags: Optional[Dict[str, str]] = None):
     """Decorator to track execution time of functions."""
     def decorator(func):
@@ -158,22 +548,29 @@ def track_api_call(func):
     """Decorator to track API endpoint performance."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         endpoint = func.__name__
         status_code = 200
         
         try:
             result = func(*args, **kwargs)
+            status_code = _response_status(result)
             return result
         except Exception as e:
             status_code = getattr(e, 'code', 500)
             raise
         finally:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             _metrics.api_call(endpoint, duration, status_code)
             
     return wrapper
 
+def _response_status(result) -> int:
+    """Status code of a Flask view return value ((body, status) tuples or Response)."""
+    if isinstance(result, tuple) and len(result) > 1 and isinstance(result[1], int):
+        return result[1]
+    return getattr(result, 'status_code', 200)
+
 def record_ai_model_call(model: str, operation: str, duration: float, tokens_used: int, success: bool):
     """Record AI model performance metrics."""
     tags = {
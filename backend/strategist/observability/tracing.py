@@ -0,0 +1,551 @@
+"""
+Distributed tracing for the Political Strategist pipeline.
+
+A small tracer that follows the OpenTelemetry data model (trace/span ids,
+parent links, attributes, events, status) without requiring the OTel SDK.
+Spans are exported as OTLP/JSON, either appended to a local JSON-lines file
+or POSTed to any OTLP/HTTP collector (Jaeger, Tempo, otel-collector).
+
+Context travels through ``contextvars``, so spans opened inside
+``asyncio.gather`` tasks nest under the span that spawned them, and through
+W3C ``traceparent`` headers on Celery messages so background tasks join the
+request trace.
+
+Typical use::
+
+    with start_span("strategist.retrieve", {"queries": 5}):
+        ...
+
+    with ai_call_span("gemini", "gemini-2.0-flash-exp", "create_plan") as span:
+        response = model.generate_content(prompt)
+        record_token_usage(span, *usage_from_response(response))
+"""
+
+import atexit
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+SPAN_KIND_PRODUCER = 4
+SPAN_KIND_CONSUMER = 5
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# USD per 1M tokens as (input, output); unknown models fall back to the provider entry.
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "gemini-2.0-flash-exp": (0.10, 0.40),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini": (0.10, 0.40),
+    "sonar": (1.00, 1.00),
+    "sonar-pro": (3.00, 15.00),
+    "perplexity": (1.00, 1.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude": (3.00, 15.00),
+    "gpt-4o": (2.50, 10.00),
+    "openai": (2.50, 10.00),
+}
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("lokdarpan_current_span", default=None)
+
+
+class SpanContext:
+    """Identity of a span as carried across process boundaries."""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class Span:
+    """A timed operation with attributes, events and a status."""
+
+    def __init__(
+        self,
+        name: str,
+        tracer: "Tracer",
+        parent: Optional[SpanContext] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        sampled: Optional[bool] = None,
+    ):
+        self.name = name
+        self.tracer = tracer
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        if sampled is None:
+            sampled = parent.sampled if parent else tracer.should_sample()
+        self.context = SpanContext(self.trace_id, self.span_id, sampled)
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._start_perf = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        """Elapsed seconds (up to now if the span is still open)."""
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns else time.perf_counter() - self._start_perf
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": dict(attributes or {})})
+
+    def record_exception(self, exc: BaseException):
+        self.add_event("exception", {
+            "exception.type": type(exc).__name__,
+            "exception.message": str(exc),
+        })
+        self.set_status(STATUS_ERROR, str(exc))
+
+    def set_status(self, status: int, message: str = ""):
+        self.status = status
+        self.status_message = message
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = self.start_ns + int((time.perf_counter() - self._start_perf) * 1e9)
+        self.tracer.on_end(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON encoding of the span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [
+                {
+                    "name": e["name"],
+                    "timeUnixNano": str(e["time_ns"]),
+                    "attributes": _otlp_attributes(e["attributes"]),
+                }
+                for e in self.events
+            ],
+            "status": {"code": self.status, "message": self.status_message} if self.status_message else {"code": self.status},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+def otlp_payload(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Wrap finished spans in an OTLP ``ExportTraceServiceRequest`` body."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{
+                "scope": {"name": "lokdarpan.strategist"},
+                "spans": [s.to_otlp() for s in spans],
+            }],
+        }]
+    }
+
+
+class InMemorySpanExporter:
+    """Keeps exported spans in a list; used by tests and local debugging."""
+
+    def __init__(self, max_spans: int = 1000):
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span], service_name: str):
+        with self._lock:
+            self.spans.extend(spans)
+            del self.spans[:-self.max_spans]
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON ``resourceSpans`` document per batch to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span], service_name: str):
+        line = json.dumps(otlp_payload(spans, service_name), separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """POSTs OTLP/JSON batches to a collector's ``/v1/traces`` endpoint."""
+
+    def __init__(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0):
+        import requests
+
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json", **(headers or {})})
+
+    def export(self, spans: List[Span], service_name: str):
+        response = self.session.post(self.endpoint, json=otlp_payload(spans, service_name), timeout=self.timeout)
+        response.raise_for_status()
+
+
+class Tracer:
+    """Creates spans and batches finished, sampled spans to an exporter.
+
+    Spans are queued on ``end()`` and exported by a daemon thread every
+    ``flush_interval`` seconds or once ``max_batch`` spans are waiting, so the
+    request path never blocks on file or network I/O.
+    """
+
+    def __init__(
+        self,
+        service_name: str = "lokdarpan-strategist",
+        exporter=None,
+        sample_rate: float = 1.0,
+        max_batch: int = 256,
+        flush_interval: float = 5.0,
+    ):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: List[Span] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def should_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        parent: Optional[SpanContext] = None,
+    ) -> Span:
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        return Span(name, self, parent=parent, kind=kind, attributes=attributes)
+
+    def on_end(self, span: Span):
+        if self.exporter is None or not span.context.sampled:
+            return
+        with self._lock:
+            self._queue.append(span)
+            full = len(self._queue) >= self.max_batch
+        self._ensure_worker()
+        if full:
+            self._wakeup.set()
+
+    def force_flush(self):
+        """Export everything queued so far on the calling thread."""
+        with self._lock:
+            batch, self._queue = self._queue, []
+        if not batch or self.exporter is None:
+            return
+        try:
+            self.exporter.export(batch, self.service_name)
+        except Exception as e:
+            logger.warning(f"Trace export failed, dropped {len(batch)} spans: {e}")
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="lokdarpan-trace-export", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.force_flush()
+
+
+_tracer = Tracer()
+atexit.register(lambda: _tracer.force_flush())
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer instance."""
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this context, if any."""
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    parent: Optional[SpanContext] = None,
+):
+    """Open a span as the current span for the duration of the block.
+
+    Exceptions are recorded on the span and re-raised.
+    """
+    span = _tracer.start_span(name, attributes, kind=kind, parent=parent)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    else:
+        if span.status == STATUS_UNSET:
+            span.set_status(STATUS_OK)
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def traced(name: Optional[str] = None, **attributes):
+    """Decorator that wraps a sync or async function in a span."""
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name, attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(span_name, attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int, provider: Optional[str] = None) -> float:
+    """USD cost of a call from ``MODEL_PRICING``; 0.0 for unknown models."""
+    pricing = MODEL_PRICING.get(model) or MODEL_PRICING.get(provider or "")
+    if pricing is None:
+        return 0.0
+    return (input_tokens * pricing[0] + output_tokens * pricing[1]) / 1_000_000
+
+
+@contextmanager
+def ai_call_span(provider: str, model: str, operation: str, **attributes):
+    """Client span around one outbound AI request.
+
+    Tags the span with OpenTelemetry GenAI attributes and, on exit, records
+    the call into the strategist metrics (duration, tokens, success).
+    """
+    attrs = {
+        "gen_ai.system": provider,
+        "gen_ai.request.model": model,
+        "gen_ai.operation.name": operation,
+    }
+    attrs.update(attributes)
+    success = False
+    with start_span(f"ai.{provider}.{operation}", attrs, kind=SPAN_KIND_CLIENT) as span:
+        try:
+            yield span
+            success = span.status != STATUS_ERROR
+        finally:
+            from .metrics import record_ai_model_call
+
+            tokens = span.attributes.get("gen_ai.usage.input_tokens", 0) + span.attributes.get("gen_ai.usage.output_tokens", 0)
+            record_ai_model_call(model, operation, span.duration, tokens, success)
+
+
+def record_token_usage(span: Optional[Span], input_tokens: int, output_tokens: int):
+    """Attach token counts and estimated cost to an AI call span."""
+    if span is None:
+        return
+    input_tokens, output_tokens = int(input_tokens or 0), int(output_tokens or 0)
+    span.set_attributes({
+        "gen_ai.usage.input_tokens": input_tokens,
+        "gen_ai.usage.output_tokens": output_tokens,
+        "lokdarpan.cost_usd": round(estimate_cost(
+            span.attributes.get("gen_ai.request.model", ""),
+            input_tokens,
+            output_tokens,
+            span.attributes.get("gen_ai.system"),
+        ), 6),
+    })
+
+
+def usage_from_response(response: Any) -> Tuple[int, int]:
+    """(input_tokens, output_tokens) from a Gemini response or OpenAI-style JSON body."""
+    meta = getattr(response, "usage_metadata", None)
+    if meta is not None:
+        return int(getattr(meta, "prompt_token_count", 0) or 0), int(getattr(meta, "candidates_token_count", 0) or 0)
+    if isinstance(response, dict):
+        usage = response.get("usage") or {}
+        return int(usage.get("prompt_tokens", 0) or 0), int(usage.get("completion_tokens", 0) or 0)
+    return 0, 0
+
+
+def inject(carrier: Dict[str, Any]) -> Dict[str, Any]:
+    """Write the current span's W3C ``traceparent`` into a header mapping."""
+    span = _current_span.get()
+    if span is not None:
+        carrier["traceparent"] = span.context.traceparent
+    return carrier
+
+
+def extract(carrier: Optional[Dict[str, Any]]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` from a header mapping."""
+    if not carrier:
+        return None
+    match = _TRACEPARENT_RE.match(str(carrier.get("traceparent") or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return SpanContext(match.group(1), match.group(2), sampled=bool(int(match.group(3), 16) & 1))
+
+
+_celery_spans: Dict[str, Tuple[Span, Any]] = {}
+_celery_instrumented = False
+
+
+def instrument_celery():
+    """Propagate trace context through Celery messages (idempotent).
+
+    The publisher adds ``traceparent`` to the message headers; the worker
+    opens a consumer span parented to it for the lifetime of the task.
+    """
+    global _celery_instrumented
+    if _celery_instrumented:
+        return
+    from celery import signals
+
+    signals.before_task_publish.connect(_before_task_publish, weak=False)
+    signals.task_prerun.connect(_task_prerun, weak=False)
+    signals.task_postrun.connect(_task_postrun, weak=False)
+    _celery_instrumented = True
+
+
+def _before_task_publish(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        inject(headers)
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    request = getattr(task, "request", None)
+    parent = extract({"traceparent": getattr(request, "traceparent", None)})
+    span = _tracer.start_span(
+        f"celery.task {getattr(task, 'name', 'unknown')}",
+        {"celery.task_id": task_id, "celery.task_name": getattr(task, "name", None)},
+        kind=SPAN_KIND_CONSUMER,
+        parent=parent,
+    )
+    _celery_spans[task_id] = (span, _current_span.set(span))
+
+
+def _task_postrun(task_id=None, state=None, **kwargs):
+    entry = _celery_spans.pop(task_id, None)
+    if entry is None:
+        return
+    span, token = entry
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        _current_span.set(None)
+    span.set_attribute("celery.state", state)
+    span.set_status(STATUS_ERROR if state == "FAILURE" else STATUS_OK)
+    span.end()
+
+
+def configure_tracing(config) -> Tracer:
+    """Point the global tracer at the exporter named by TRACING_EXPORTER.
+
+    'file' appends OTLP/JSON to TRACING_FILE_PATH, 'otlp' posts to
+    TRACING_OTLP_ENDPOINT, 'memory' keeps spans in process and 'none'
+    (default) records spans without exporting them.
+    """
+    kind = str(config.get('TRACING_EXPORTER', 'none')).lower()
+    _tracer.service_name = config.get('TRACING_SERVICE_NAME', _tracer.service_name)
+    _tracer.sample_rate = float(config.get('TRACING_SAMPLE_RATE', 1.0))
+    _tracer.flush_interval = float(config.get('TRACING_FLUSH_INTERVAL', _tracer.flush_interval))
+
+    try:
+        if kind == 'file':
+            _tracer.exporter = FileSpanExporter(config.get('TRACING_FILE_PATH', 'logs/traces.jsonl'))
+        elif kind == 'otlp':
+            _tracer.exporter = OTLPHttpSpanExporter(
+                config.get('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces'),
+                headers=config.get('TRACING_OTLP_HEADERS') or None,
+            )
+        elif kind == 'memory':
+            _tracer.exporter = InMemorySpanExporter()
+        else:
+            _tracer.exporter = None
+    except Exception as e:
+        logger.warning(f"Trace exporter '{kind}' unavailable, spans will not be exported: {e}")
+        _tracer.exporter = None
+
+    if _tracer.exporter is not None:
+        logger.info(f"Tracing enabled ({kind} exporter, sample rate {_tracer.sample_rate})")
+    return _tracer
@@ -13,6 +13,9 @@ from typing import Dict, List, Any, Optional
 from enum import Enum
 
 import google.generativeai as genai
+from provider_endpoints import gemini_configure_kwargs
+
+from ..async_model import AsyncModel
 
 logger = logging.getLogger(__name__)
 
@@ -58,8 +61,8 @@ class PlaybookGenerator:
     def __init__(self):
         # Initialize Gemini for playbook generation
         try:
-            genai.configure(api_key=os.environ["GEMINI_API_KEY"])
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            genai.configure(api_key=os.environ["GEMINI_API_KEY"], **gemini_configure_kwargs())
+            self.model = AsyncModel(genai.GenerativeModel('gemini-2.0-flash-exp'))
             self.gemini_available = True
         except KeyError:
             logger.error("GEMINI_API_KEY not set for playbook generator")
@@ -176,7 +179,7 @@ class PlaybookGenerator:
             - Evidence-based and realistic
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.4,
@@ -339,7 +342,7 @@ class PlaybookGenerator:
             - Constructive rather than purely defensive
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.3,
@@ -422,7 +425,7 @@ class PlaybookGenerator:
             Keep core structure but enhance with conversation insights.
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.3,
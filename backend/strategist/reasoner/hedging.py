@@ -0,0 +1,97 @@
+"""
+Live latency percentiles and the hedging budget for multi-model routing.
+
+:class:`LatencyTracker` keeps a sliding window of recent call latencies per
+model; until a model has ``MIN_SAMPLES`` observations its percentiles come
+from a prior (the static average latency scaled to a tail estimate).
+
+:class:`HedgeBudget` is a token bucket that caps hedged requests at a
+fraction of all routed requests, so a slow provider cannot double the
+call volume (and spend) of the other one. Calls that lose a race are
+abandoned rather than stopped (their provider request keeps running on
+a worker thread), so each one is charged to the bucket as well.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 10
+# p90 of a latency distribution is typically ~1.5x its mean
+PRIOR_TAIL_FACTOR = 1.5
+
+
+class LatencyTracker:
+    """Sliding-window latency percentiles per model (thread-safe)."""
+
+    def __init__(self, window: int = LATENCY_WINDOW, priors: Optional[Dict[str, float]] = None):
+        self.window = window
+        self.priors: Dict[str, float] = dict(priors or {})
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(float(seconds))
+
+    def samples(self, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """The ``q``-th percentile (0-100) of recent latencies, or the prior while samples are few."""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < MIN_SAMPLES:
+            prior = self.priors.get(model)
+            if prior is None:
+                return None
+            return prior * (PRIOR_TAIL_FACTOR if q >= 75 else 1.0)
+        rank = min(len(samples) - 1, max(0, math.ceil(q / 100.0 * len(samples)) - 1))  # nearest rank
+        return samples[rank]
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        models = set(self.priors) | set(self._samples)
+        return {
+            model: {
+                "samples": self.samples(model),
+                **{f"p{q}": _round(self.percentile(model, q)) for q in (50, 90, 99)},
+            }
+            for model in sorted(models)
+        }
+
+
+class HedgeBudget:
+    """Each routed request earns ``ratio`` tokens (up to ``burst``); each hedge spends one."""
+
+    def __init__(self, ratio: float = 0.1, burst: float = 5.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def charge(self, cost: float = 1.0) -> None:
+        """Spend ``cost`` unconditionally, e.g. for an abandoned call; the debt is capped at ``burst``."""
+        with self._lock:
+            self._tokens = max(-self.burst, self._tokens - cost)
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
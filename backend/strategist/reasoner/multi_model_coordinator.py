@@ -7,13 +7,15 @@ Implements evidence aggregation, confidence scoring, and conversation awareness.
 
 import os
 import json
+import time
 import logging
 import asyncio
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 import google.generativeai as genai
+from provider_endpoints import gemini_configure_kwargs
 from enum import Enum
 
 # Circuit breaker imports for AI service resilience
@@ -23,9 +25,25 @@ from ..circuit_breaker import (
     call_perplexity_with_circuit_breaker,
     CircuitBreakerConfig
 )
+from ..async_model import AsyncModel
+from .hedging import HedgeBudget, LatencyTracker
 
 logger = logging.getLogger(__name__)
 
+# Static latency averages (seconds) used until live percentiles have enough samples
+STATIC_AVG_LATENCY = {'gemini-2.0-flash-exp': 3.2, 'perplexity-pro': 4.1}
+# Short result keys used by parallel execution and synthesis
+MODEL_KEYS = {'gemini-2.0-flash-exp': 'gemini', 'perplexity-pro': 'perplexity'}
+
+# Shared across coordinator instances so percentiles and the hedge budget
+# reflect all traffic in the process
+model_latency = LatencyTracker(priors=STATIC_AVG_LATENCY)
+hedge_budget = HedgeBudget(
+    ratio=float(os.getenv('HEDGE_BUDGET_RATIO', '0.1')),
+    burst=float(os.getenv('HEDGE_BUDGET_BURST', '5')),
+)
+hedge_stats = {'routed': 0, 'hedged': 0, 'hedge_wins': 0, 'hedges_denied': 0, 'abandoned_calls': 0}
+
 
 class QueryType(Enum):
     """Phase 3: Query type classification for intelligent routing."""
@@ -104,8 +122,10 @@ class MultiModelCoordinator:
     def __init__(self):
         # Initialize Gemini
         try:
-            genai.configure(api_key=os.environ["GEMINI_API_KEY"])
-            self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            genai.configure(api_key=os.environ["GEMINI_API_KEY"], **gemini_configure_kwargs())
+            # Executor-backed: the SDK's async client binds to one event loop and
+            # returns plain responses under the REST transport
+            self.gemini_model = AsyncModel(genai.GenerativeModel('gemini-2.0-flash-exp'))
             self.gemini_available = True
         except KeyError:
             logger.error("GEMINI_API_KEY not set for multi-model coordinator")
@@ -124,6 +144,23 @@ class MultiModelCoordinator:
         self.parallel_execution_enabled = os.getenv('PARALLEL_EXECUTION', 'true').lower() == 'true'
         self.adaptive_weighting_enabled = os.getenv('ADAPTIVE_WEIGHTING', 'true').lower() == 'true'
         
+        # Latency-aware routing and hedging: a second model is asked when the
+        # primary runs past its live p90; slower calls are cancelled once the
+        # synthesis has a usable result
+        self.latency = model_latency
+        self.hedge_budget = hedge_budget
+        self.hedging_enabled = os.getenv('HEDGING_ENABLED', 'true').lower() == 'true'
+        self.hedge_min_delay = float(os.getenv('HEDGE_MIN_DELAY_SECONDS', '0.5'))
+        self.hedge_cost_usd = float(os.getenv('HEDGE_ESTIMATED_COST_USD', '0.01'))
+        self.synthesis_grace = float(os.getenv('SYNTHESIS_GRACE_SECONDS', '1.5'))
+        self.latency_target = float(os.getenv('ROUTING_LATENCY_TARGET_SECONDS', '5.0'))
+        
+        # Semantic response cache: repeated ward questions skip the model calls
+        # (imported here: app imports strategist while it loads)
+        from app.services.semantic_cache import SemanticCache
+        self.semantic_cache = SemanticCache("coordinator")
+        self.model_call_cost_usd = float(os.getenv('MODEL_CALL_ESTIMATED_COST_USD', '0.01'))
+        
         # Phase 3: Model capability mapping
         self.model_capabilities = {
             'gemini-2.0-flash-exp': [
@@ -140,8 +177,10 @@ class MultiModelCoordinator:
         
         # Phase 3: Performance metrics tracking
         self.model_performance_history = {
-            'gemini-2.0-flash-exp': {'avg_confidence': 0.8, 'success_rate': 0.95, 'avg_latency': 3.2},
-            'perplexity-pro': {'avg_confidence': 0.75, 'success_rate': 0.88, 'avg_latency': 4.1}
+            'gemini-2.0-flash-exp': {'avg_confidence': 0.8, 'success_rate': 0.95,
+                                     'avg_latency': STATIC_AVG_LATENCY['gemini-2.0-flash-exp']},
+            'perplexity-pro': {'avg_confidence': 0.75, 'success_rate': 0.88,
+                               'avg_latency': STATIC_AVG_LATENCY['perplexity-pro']}
         }
         
         # Circuit breaker configuration for AI services
@@ -178,6 +217,19 @@ class MultiModelCoordinator:
         try:
             # Phase 3 Step 1: Intelligent query classification and model routing
             query_type = self._classify_query_type(request)
+            
+            # Follow-up turns depend on the conversation, so only standalone questions use the cache
+            cacheable = not request.conversation_history
+            cache_variant = f"{request.depth}|{request.context_mode}"
+            if cacheable:
+                started = time.monotonic()
+                hit = self.semantic_cache.lookup(request.ward, query_type.value, request.query, cache_variant)
+                if hit:
+                    from app.services.semantic_cache import record_cache_hit
+                    await record_cache_hit(hit, "strategic_analysis", int((time.monotonic() - started) * 1000))
+                    logger.info(f"Semantic cache hit for {request.ward} (similarity {hit.similarity:.2f})")
+                    return self._response_from_cache(hit.payload)
+            
             routing_decision = self._intelligent_model_routing(request, query_type)
             
             logger.info(f"Routing decision: {routing_decision.primary_model} (confidence: {routing_decision.routing_confidence:.2f})")
@@ -188,10 +240,12 @@ class MultiModelCoordinator:
                 # High-confidence single-model execution
                 result = await self._execute_primary_model(routing_decision, request)
                 synthesized_response = await self._single_model_synthesis(result, request, routing_decision)
+                answered_by = [routing_decision.primary_model] if self._usable(result) else []
             else:
                 # Parallel execution with adaptive weighting
                 results = await self._parallel_model_execution(routing_decision, request)
                 synthesized_response = await self._adaptive_response_synthesis(results, request, routing_decision)
+                answered_by = [model for model, key in MODEL_KEYS.items() if self._usable(results.get(key))]
             
             # Phase 3 Step 3: Enhanced confidence calculation with multi-factor analysis
             synthesized_response = self._calculate_enhanced_confidence_metrics(
@@ -203,6 +257,15 @@ class MultiModelCoordinator:
             # Phase 3 Step 4: Update model performance metrics
             self._update_model_performance_metrics(synthesized_response, routing_decision)
             
+            if cacheable and answered_by:
+                self.semantic_cache.store(
+                    request.ward, query_type.value, request.query, asdict(synthesized_response),
+                    cost_usd=self.model_call_cost_usd * len(answered_by),
+                    provider=MODEL_KEYS.get(answered_by[0], answered_by[0]),
+                    model="+".join(answered_by),
+                    variant=cache_variant
+                )
+            
             logger.info(f"Phase 3 multi-model analysis complete: confidence={synthesized_response.confidence_score:.2f}, routing={routing_decision.primary_model}")
             return synthesized_response
             
@@ -248,7 +311,8 @@ class MultiModelCoordinator:
                 raise Exception("Gemini API key not available")
                 
             async def gemini_service_call():
-                response = self.gemini_model.generate_content(
+                # Runs on the model executor: a blocking call here would stall hedged and parallel execution
+                response = await self.gemini_model.generate_content(
                     prompt,
                     generation_config={
                         "temperature": 0.3,
@@ -344,6 +408,12 @@ class MultiModelCoordinator:
         """Phase 3: Get model routing and performance statistics."""
         return {
             "model_performance_history": self.model_performance_history,
+            "latency_percentiles": self.latency.snapshot(),
+            "hedging": {
+                **hedge_stats,
+                "enabled": self.hedging_enabled,
+                "budget_tokens": round(self.hedge_budget.tokens, 2),
+            },
             "routing_config": {
                 "routing_confidence_threshold": self.routing_confidence_threshold,
                 "parallel_execution_enabled": self.parallel_execution_enabled,
@@ -528,11 +598,15 @@ class MultiModelCoordinator:
             performance_score = (performance['success_rate'] + performance['avg_confidence']) / 2
             
             # Availability weighting
-            availability_score = 1.0 if (model == 'gemini-2.0-flash-exp' and self.gemini_available) or \
-                                       (model == 'perplexity-pro' and self.perplexity_available) else 0.0
+            availability_score = 1.0 if self._model_available(model) else 0.0
+            
+            # Live tail latency: 1.0 at or under the target p90, falling as the model slows down
+            p90 = self.latency.percentile(model, 90)
+            latency_score = min(1.0, self.latency_target / p90) if p90 else 1.0
             
             # Combined score with weighting
-            model_scores[model] = (capability_score * 0.5 + performance_score * 0.3 + availability_score * 0.2)
+            model_scores[model] = (capability_score * 0.45 + performance_score * 0.25 +
+                                   availability_score * 0.2 + latency_score * 0.1)
         
         # Select primary model
         primary_model = max(model_scores, key=model_scores.get) if model_scores else 'gemini-2.0-flash-exp'
@@ -562,49 +636,149 @@ class MultiModelCoordinator:
             fallback_strategy=fallback_strategy
         )
     
+    def _model_available(self, model: str) -> bool:
+        return (model == 'gemini-2.0-flash-exp' and self.gemini_available) or \
+               (model == 'perplexity-pro' and self.perplexity_available)
+    
+    @staticmethod
+    def _usable(result: Any) -> bool:
+        """A real model answer: not an error, exception or circuit-breaker fallback."""
+        return isinstance(result, dict) and 'error' not in result and not result.get('fallback_mode')
+    
+    async def _timed_model_call(self, model: str, request: AnalysisRequest) -> Dict[str, Any]:
+        """Run one model and record its latency. Never raises except on cancellation.
+        
+        A cancelled call records its elapsed time as well: it is a lower bound on
+        that call's latency, and keeps a persistently slow model's p90 rising.
+        """
+        started = time.monotonic()
+        try:
+            if model == 'gemini-2.0-flash-exp':
+                result = await self._gemini_analysis(request)
+            elif model == 'perplexity-pro':
+                result = await self._perplexity_analysis(request)
+            else:
+                logger.warning(f"Unknown model: {model}")
+                return {"error": f"Unknown model: {model}"}
+        except asyncio.CancelledError:
+            self.latency.observe(model, time.monotonic() - started)
+            raise
+        except Exception as e:
+            return {"error": str(e)}
+        if self._usable(result):
+            self.latency.observe(model, time.monotonic() - started)
+        return result
+    
+    def _hedge_delay(self, model: str) -> float:
+        """How long to wait for ``model`` before hedging: its live p90."""
+        return max(self.hedge_min_delay, self.latency.percentile(model, 90) or self.hedge_min_delay)
+    
+    async def _may_hedge(self, model: str) -> bool:
+        """Hedge only within the hedge token budget and the AI spend budget."""
+        try:
+            from flask import has_app_context
+            if has_app_context():
+                from app.services.budget_manager import get_budget_manager
+                service = 'perplexity' if model == 'perplexity-pro' else 'gemini'
+                if not await get_budget_manager().can_afford_request(self.hedge_cost_usd, service):
+                    hedge_stats['hedges_denied'] += 1
+                    return False
+        except Exception as e:
+            logger.debug(f"Budget check skipped for hedge: {e}")
+        if not self.hedge_budget.try_spend():
+            hedge_stats['hedges_denied'] += 1
+            return False
+        return True
+    
+    def _abandon(self, task: asyncio.Future) -> None:
+        """Stop waiting for a model call that lost the race.
+        
+        Cancelling only cancels the wait: the provider request itself is running
+        on a worker thread (AsyncModel's pool or ``asyncio.to_thread``), carries
+        on to completion and is billed. So it is counted as abandoned, not saved,
+        and charged to the hedge budget like a hedge.
+        """
+        task.cancel()
+        hedge_stats['abandoned_calls'] += 1
+        self.hedge_budget.charge()
+    
     async def _execute_primary_model(self, routing_decision: ModelRoutingDecision, request: AnalysisRequest) -> Dict[str, Any]:
-        """Phase 3: Execute primary model based on routing decision."""
-        if routing_decision.primary_model == 'gemini-2.0-flash-exp':
-            return await self._gemini_analysis(request)
-        elif routing_decision.primary_model == 'perplexity-pro':
-            return await self._perplexity_analysis(request)
-        else:
-            logger.warning(f"Unknown primary model: {routing_decision.primary_model}")
-            return {"error": f"Unknown model: {routing_decision.primary_model}"}
+        """Phase 3: Execute primary model, hedging to another model past the primary's p90.
+        
+        The first usable answer wins and we stop waiting for the other call; if
+        neither is usable the primary's own result (usually its fallback) is
+        returned. See :meth:`_abandon` for what stopping the wait costs.
+        """
+        primary = routing_decision.primary_model
+        backup = routing_decision.secondary_model or next(
+            (m for m in MODEL_KEYS if m != primary and self._model_available(m)), None)
+        hedge_stats['routed'] += 1
+        self.hedge_budget.earn()
+        
+        primary_task = asyncio.ensure_future(self._timed_model_call(primary, request))
+        if not self.hedging_enabled or not backup or not self._model_available(backup):
+            return await primary_task
+        
+        done, _ = await asyncio.wait({primary_task}, timeout=self._hedge_delay(primary))
+        if done or not await self._may_hedge(backup):
+            return await primary_task
+        
+        hedge_stats['hedged'] += 1
+        logger.info(f"{primary} past its p90 ({self._hedge_delay(primary):.1f}s) - hedging to {backup}")
+        backup_task = asyncio.ensure_future(self._timed_model_call(backup, request))
+        pending = {primary_task, backup_task}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if self._usable(t.result())), None)
+                if winner is not None:
+                    if winner is backup_task:
+                        hedge_stats['hedge_wins'] += 1
+                    return winner.result()
+            return primary_task.result()
+        finally:
+            for task in pending:
+                self._abandon(task)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
     
     async def _parallel_model_execution(self, routing_decision: ModelRoutingDecision, request: AnalysisRequest) -> Dict[str, Any]:
-        """Phase 3: Execute models in parallel with intelligent coordination."""
-        tasks = []
-        model_names = []
-        
-        # Add primary model
-        if routing_decision.primary_model == 'gemini-2.0-flash-exp' and self.gemini_available:
-            tasks.append(self._gemini_analysis(request))
-            model_names.append('gemini')
-        elif routing_decision.primary_model == 'perplexity-pro' and self.perplexity_available:
-            tasks.append(self._perplexity_analysis(request))
-            model_names.append('perplexity')
-        
-        # Add secondary model if specified
-        if routing_decision.secondary_model:
-            if routing_decision.secondary_model == 'gemini-2.0-flash-exp' and self.gemini_available:
-                tasks.append(self._gemini_analysis(request))
-                model_names.append('gemini')
-            elif routing_decision.secondary_model == 'perplexity-pro' and self.perplexity_available:
-                tasks.append(self._perplexity_analysis(request))
-                model_names.append('perplexity')
+        """Phase 3: Execute models in parallel with intelligent coordination.
+        
+        Once one model has a usable answer, the others get at most
+        ``synthesis_grace`` seconds, and none past their own p90; calls still
+        running then are abandoned (see :meth:`_abandon`) and reported as errors.
+        """
+        tasks = {}
+        for model in (routing_decision.primary_model, routing_decision.secondary_model):
+            if model in MODEL_KEYS and self._model_available(model) and MODEL_KEYS[model] not in tasks:
+                tasks[MODEL_KEYS[model]] = (model, asyncio.ensure_future(self._timed_model_call(model, request)))
         
         if not tasks:
             return {'error': 'No available models for execution'}
+        hedge_stats['routed'] += 1
         
-        # Execute models in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        started = time.monotonic()
+        pending = {task for _, task in tasks.values()}
+        while pending and not any(self._usable(t.result()) for _, t in tasks.values() if t.done()):
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if pending:
+            elapsed = time.monotonic() - started
+            grace = max(min(self.synthesis_grace, (self.latency.percentile(model, 90) or 0.0) - elapsed)
+                        for model, task in tasks.values() if task in pending)
+            if grace > 0:
+                _, pending = await asyncio.wait(pending, timeout=grace)
+            for task in pending:
+                self._abandon(task)
+            await asyncio.gather(*pending, return_exceptions=True)
         
         # Package results with model names
         execution_results = {}
-        for i, result in enumerate(results):
-            model_name = model_names[i] if i < len(model_names) else f'model_{i}'
-            execution_results[model_name] = result if not isinstance(result, Exception) else {'error': str(result)}
+        for model_name, (model, task) in tasks.items():
+            if task.cancelled():
+                execution_results[model_name] = {'error': f'{model} cancelled: slower than its p90 after another model answered'}
+            else:
+                execution_results[model_name] = task.result()
         
         return execution_results
     
@@ -801,11 +975,21 @@ class MultiModelCoordinator:
                 success = 1.0 if response.confidence_score > 0.5 else 0.0
                 current_metrics['success_rate'] = (1 - alpha) * current_metrics['success_rate'] + alpha * success
                 
+                # Median of the live latency window (the static average until enough samples)
+                current_metrics['avg_latency'] = self.latency.percentile(primary_model, 50) or current_metrics['avg_latency']
+                
                 logger.debug(f"Updated {primary_model} metrics: confidence={current_metrics['avg_confidence']:.2f}, success_rate={current_metrics['success_rate']:.2f}")
             
         except Exception as e:
             logger.error(f"Model performance metrics update failed: {e}")
     
+    @staticmethod
+    def _response_from_cache(payload: Dict[str, Any]) -> StrategicResponse:
+        return StrategicResponse(**{
+            **payload,
+            'evidence_sources': [EvidenceSource(**source) for source in payload.get('evidence_sources', [])]
+        })
+    
     def _fallback_response(self, request: AnalysisRequest) -> StrategicResponse:
         """Phase 3: Enhanced fallback response with routing awareness."""
         return StrategicResponse(
@@ -852,7 +1036,7 @@ class MultiModelCoordinator:
             Focus on objective analysis and source reliability.
             """
             
-            response = self.gemini_model.generate_content(
+            response = await self.gemini_model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.2,
@@ -12,8 +12,11 @@ from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
 import google.generativeai as genai
+from provider_endpoints import gemini_configure_kwargs
 
+from ..async_model import async_model
 from ..prompts import STRATEGIST_PROMPTS
+from ..observability.tracing import ai_call_span, record_token_usage, usage_from_response
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +27,7 @@ model = None
 try:
     api_key = os.environ["GEMINI_API_KEY"]
     if api_key and api_key.strip() and not api_key.startswith("placeholder"):
-        genai.configure(api_key=api_key)
+        genai.configure(api_key=api_key, **gemini_configure_kwargs())
         model = genai.GenerativeModel('gemini-2.0-flash-exp')
         GEMINI_AVAILABLE = True
         logger.info("Gemini 2.0 Flash configured for strategic planning")
@@ -45,7 +48,7 @@ class StrategicPlanner:
     """
     
     def __init__(self):
-        self.model = model
+        self.model = async_model(model)
         self.gemini_available = GEMINI_AVAILABLE
         self.think_tokens = int(os.getenv('THINK_TOKENS', 4096))
         # Wave 2 enhancements
@@ -91,14 +94,16 @@ class StrategicPlanner:
             
             logger.info(f"Creating analysis plan for {ward} (depth: {depth}, mode: {context_mode})")
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.3,
-                    "max_output_tokens": 2048,
-                    "response_mime_type": "application/json"
-                }
-            )
+            with ai_call_span("gemini", "gemini-2.0-flash-exp", "create_plan", ward=ward) as span:
+                response = await self.model.generate_content(
+                    prompt,
+                    generation_config={
+                        "temperature": 0.3,
+                        "max_output_tokens": 2048,
+                        "response_mime_type": "application/json"
+                    }
+                )
+                record_token_usage(span, *usage_from_response(response))
             
             plan = json.loads(response.text)
             plan["created_at"] = datetime.now(timezone.utc).isoformat()
@@ -155,14 +160,16 @@ class StrategicPlanner:
             
             logger.info(f"Generating strategic briefing for {ward}")
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.2,
-                    "max_output_tokens": 4096,
-                    "response_mime_type": "application/json"
-                }
-            )
+            with ai_call_span("gemini", "gemini-2.0-flash-exp", "generate_briefing", ward=ward) as span:
+                response = await self.model.generate_content(
+                    prompt,
+                    generation_config={
+                        "temperature": 0.2,
+                        "max_output_tokens": 4096,
+                        "response_mime_type": "application/json"
+                    }
+                )
+                record_token_usage(span, *usage_from_response(response))
             
             briefing = json.loads(response.text)
             briefing.update({
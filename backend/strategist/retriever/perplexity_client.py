@@ -14,9 +14,11 @@ from typing import List, Dict, Any, Optional
 
 import requests
 
+from ..observability.tracing import ai_call_span, record_token_usage, usage_from_response
+from provider_endpoints import perplexity_chat_url
+
 logger = logging.getLogger(__name__)
 
-PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
 
 
 class PerplexityRetriever:
@@ -135,14 +137,20 @@ class PerplexityRetriever:
                 "search_recency_filter": "week"
             }
             
-            response = self.session.post(
-                PERPLEXITY_API_URL,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            data = response.json()
+            with ai_call_span("perplexity", payload["model"], "search", query=query[:120]) as span:
+                # requests is blocking: run it off the event loop so hedge
+                # timers and cancellations in the caller can still fire
+                response = await asyncio.to_thread(
+                    self.session.post,
+                    perplexity_chat_url(),
+                    json=payload,
+                    timeout=30
+                )
+                span.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+                
+                data = response.json()
+                record_token_usage(span, *usage_from_response(data))
             content = data['choices'][0]['message']['content']
             
             # Extract citations if available
@@ -95,6 +95,8 @@ def ward_analysis(ward):
         if_none_match = request.headers.get('If-None-Match')
         
         # Get ward report
+        from app.precompute import record_ward_access  # lazy: app imports strategist at load time
+        record_ward_access("strategist", ward_clean)
         data, etag, ttl = get_ward_report(ward_clean, depth)
         
         # Return 304 if client has current version
@@ -630,6 +632,7 @@ def list_conversations_old():
     Query Parameters:
     - ward: Filter by ward
     - limit: Maximum number of conversations
+    - cursor: next_cursor from the previous page
     """
     try:
         from flask_login import current_user
@@ -638,6 +641,7 @@ def list_conversations_old():
         
         ward = request.args.get('ward')
         limit = int(request.args.get('limit', 50))
+        cursor = request.args.get('cursor')
         user_id = getattr(current_user, 'id', None) if current_user.is_authenticated else None
         
         logger.info(f"Parameters: ward={ward}, limit={limit}, user_id={user_id}")
@@ -649,17 +653,22 @@ def list_conversations_old():
             logger.error(f"Failed to import conversation_manager: {import_error}")
             raise
         
-        conversations = conversation_manager.get_conversations_for_user(
-            user_id=user_id,
-            ward=ward,
-            limit=limit
-        )
+        try:
+            conversations, next_cursor = conversation_manager.list_conversations(
+                user_id=user_id,
+                ward=ward,
+                limit=limit,
+                cursor=cursor
+            )
+        except ValueError:
+            return jsonify({"error": "invalid cursor"}), 400
         
         logger.info(f"Got {len(conversations)} conversations")
         
         return jsonify({
             "conversations": conversations,
             "total": len(conversations),
+            "next_cursor": next_cursor,
             "ward_filter": ward
         })
         
@@ -865,6 +874,7 @@ def generate_playbook():
     }
     """
     try:
+        import asyncio
         from .playbook import PlaybookGenerator, PlaybookType
         
         data = request.get_json() or {}
@@ -894,13 +904,13 @@ def generate_playbook():
         
         # Generate playbook
         generator = PlaybookGenerator()
-        playbook = generator.generate_playbook(
+        playbook = asyncio.run(generator.generate_playbook(
             playbook_type=playbook_type,
             ward=ward,
             context=context,
             language=language,
             conversation_context=conversation_context
-        )
+        ))
         
         logger.info(f"Generated {playbook_type_str} playbook for {ward} in {language}")
         return jsonify(playbook)
@@ -929,6 +939,7 @@ def generate_opposition_response():
     }
     """
     try:
+        import asyncio
         from .playbook import PlaybookGenerator
         
         data = request.get_json() or {}
@@ -946,12 +957,12 @@ def generate_opposition_response():
         
         # Generate strategic response
         generator = PlaybookGenerator()
-        response = generator.generate_opposition_response(
+        response = asyncio.run(generator.generate_opposition_response(
             original_message=opposition_message,
             opposition_context=opposition_context,
             ward=ward,
             language=language
-        )
+        ))
         
         logger.info(f"Generated opposition response for {ward}")
         return jsonify(response)
@@ -979,6 +990,7 @@ def customize_playbook():
     }
     """
     try:
+        import asyncio
         from .playbook import PlaybookGenerator
         
         data = request.get_json() or {}
@@ -992,11 +1004,11 @@ def customize_playbook():
         
         # Customize playbook
         generator = PlaybookGenerator()
-        customized_playbook = generator.customize_playbook_for_conversation(
+        customized_playbook = asyncio.run(generator.customize_playbook_for_conversation(
             base_playbook=base_playbook,
             conversation_history=conversation_history,
             user_preferences=user_preferences
-        )
+        ))
         
         logger.info("Customized playbook based on conversation context")
         return jsonify(customized_playbook)
@@ -1023,10 +1035,15 @@ def simulate_scenario():
         "ward": "Ward name",
         "timeframe": "1_month|3_months|6_months|1_year",
         "metrics": ["electoral", "sentiment", "coalition"],
-        "parameters": {"confidence_level": 0.8, "include_uncertainty": true}
+        "parameters": {"swing": {"BJP": 2.5}, "draws": 100000, "seed": 7}
     }
+
+    Electoral scenarios are projected by the local Monte Carlo model over
+    WardFeatures (swing in percentage points per party); the LLM only
+    writes the impact narrative and recommendations.
     """
     try:
+        import asyncio
         from .scenario import ScenarioSimulator, ScenarioRequest
         
         data = request.get_json() or {}
@@ -1067,7 +1084,7 @@ def simulate_scenario():
         
         # Run simulation
         simulator = ScenarioSimulator()
-        result = simulator.simulate_scenario(scenario_request)
+        result = asyncio.run(simulator.simulate_scenario(scenario_request))
         
         # Convert result to JSON-serializable format
         result_data = {
@@ -0,0 +1,200 @@
+"""
+Vectorized Monte Carlo electoral model over all GHMC wards.
+
+Each draw perturbs every ward's baseline vote shares at once:
+
+    share[w, p] = baseline[w, p] + scenario_swing[p]
+                  + city_swing[p]            (shared by all wards in the draw)
+                  + ward_noise[w, p]         (independent per ward)
+
+The baseline is the LS24 share (AS23 when LS24 is missing) from
+``WardFeatures``; the per-ward noise scales with how far the ward already
+moved between AS23 and LS24 (``dvi``) and with ``turnout_volatility``.
+Shares are clipped at zero, renormalized, and the ward goes to the largest.
+Draws run in float32 chunks, so 100k draws over 145 wards take under a
+second on one core and memory stays bounded.
+
+:func:`simulate` returns seat and city-wide vote-share distributions with
+percentiles plus per-ward win probabilities; the scenario simulator turns
+these into projections and leaves only the narrative to the LLM.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Standard deviations in vote-share fractions (0.02 = 2 percentage points)
+CITY_SWING_SD = 0.02
+WARD_NOISE_FLOOR_SD = 0.02
+DVI_NOISE_WEIGHT = 0.5
+TURNOUT_NOISE_WEIGHT = 0.5
+DEFAULT_DRAWS = 100_000
+CHUNK_DRAWS = 4_000
+NORMAL_TABLE_SIZE = 65_536
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class ElectoralBaseline:
+    """Ward x party matrices built from ``WardFeatures`` rows."""
+
+    ward_ids: List[str]
+    parties: List[str]
+    shares: np.ndarray  # (wards, parties), rows sum to 1 over contesting parties
+    noise_sd: np.ndarray  # (wards, parties), 0 where the party did not contest
+    sources: List[str] = field(default_factory=list)  # "ls24" / "as23" per ward
+
+    @classmethod
+    def from_features(cls, rows: Sequence) -> "ElectoralBaseline":
+        """Build from objects with WardFeatures' attributes; wards without shares are skipped."""
+        usable = []
+        for row in rows:
+            shares = row.ls24_party_shares or row.as23_party_shares
+            if shares and sum(v or 0.0 for v in shares.values()) > 0:
+                usable.append((row, dict(shares), "ls24" if row.ls24_party_shares else "as23"))
+        parties = sorted({p for _, shares, _ in usable for p in shares})
+        column = {p: i for i, p in enumerate(parties)}
+
+        base = np.zeros((len(usable), len(parties)))
+        dvi = np.zeros_like(base)
+        volatility = np.zeros(len(usable))
+        for w, (row, shares, _) in enumerate(usable):
+            for party, value in shares.items():
+                base[w, column[party]] = max(float(value or 0.0), 0.0)
+            for party, value in (row.dvi or {}).items():
+                if party in column:
+                    dvi[w, column[party]] = abs(float(value or 0.0))
+            volatility[w] = float(row.turnout_volatility or 0.0) / 100.0
+        base /= base.sum(axis=1, keepdims=True).clip(min=1e-12)
+
+        noise = WARD_NOISE_FLOOR_SD + DVI_NOISE_WEIGHT * dvi + TURNOUT_NOISE_WEIGHT * volatility[:, None]
+        noise[base <= 0] = 0.0
+        return cls(
+            ward_ids=[str(row.ward_id) for row, _, _ in usable],
+            parties=parties,
+            shares=base,
+            noise_sd=noise,
+            sources=[source for _, _, source in usable],
+        )
+
+    @classmethod
+    def load(cls, session=None) -> "ElectoralBaseline":
+        """All ``WardFeatures`` rows in one query."""
+        from app.extensions import db
+        from app.models import WardFeatures
+
+        return cls.from_features((session or db.session).query(WardFeatures).all())
+
+
+def _percentiles(samples: np.ndarray, scale: float = 1.0) -> Dict[str, float]:
+    values = np.percentile(samples, PERCENTILES) * scale
+    summary = {f"p{q}": round(float(v), 3) for q, v in zip(PERCENTILES, values)}
+    summary["mean"] = round(float(samples.mean() * scale), 3)
+    return summary
+
+
+@lru_cache(maxsize=1)
+def _normal_table() -> np.ndarray:
+    """Standard normal quantiles at the midpoints of 65,536 equal-probability bins."""
+    dist = NormalDist()
+    return np.array([dist.inv_cdf((i + 0.5) / NORMAL_TABLE_SIZE) for i in range(NORMAL_TABLE_SIZE)],
+                    dtype=np.float32)
+
+
+def _standard_normal(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """float32 standard normals by inverse-CDF table lookup on random uint16s.
+
+    About 3x faster than ``Generator.standard_normal`` for the ward noise,
+    which dominates the run time; tails beyond +-4.2 sigma are truncated.
+    """
+    count = int(np.prod(shape))
+    raw = rng.bit_generator.random_raw(-(-count // 4)).view(np.uint16)[:count].reshape(shape)
+    return np.take(_normal_table(), raw)
+
+
+def simulate(baseline: ElectoralBaseline, draws: int = DEFAULT_DRAWS,
+             swing: Optional[Mapping[str, float]] = None, uncertainty: float = 1.0,
+             seed: Optional[int] = None, focus_wards: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Run ``draws`` simulated elections across every ward in ``baseline``.
+
+    Args:
+        swing: Scenario shift per party in percentage points (``{"BJP": 3}``),
+            applied where the party contests.
+        uncertainty: Multiplier on all noise (e.g. longer horizons).
+        focus_wards: Ward ids whose per-party vote-share percentiles are returned.
+
+    Returns:
+        ``seats`` and ``vote_share`` (percent, wards weighted equally) per
+        party with mean and percentiles, ``majority_probability`` per party,
+        ``ward_win_probability`` and ``ward_vote_share`` for focus wards.
+    """
+    wards, parties = baseline.shares.shape
+    if not wards or not parties:
+        raise ValueError("no ward features to simulate")
+    rng = np.random.default_rng(seed)
+
+    # Party-major (party, draw, ward) layout: reductions over parties are
+    # elementwise passes over contiguous slabs
+    contesting = baseline.shares.T > 0
+    shift = np.zeros((parties, 1), dtype=np.float32)
+    for party, points in (swing or {}).items():
+        if party in baseline.parties:
+            shift[baseline.parties.index(party)] = float(points) / 100.0
+    # Non-contesting parties sit far below zero and clip to a zero share
+    base = np.where(contesting, baseline.shares.T + shift, -10.0).astype(np.float32)[:, None, :]
+    ward_sd = (baseline.noise_sd.T * uncertainty).astype(np.float32)[:, None, :]
+    city_sd = np.float32(CITY_SWING_SD * uncertainty)
+
+    focus = [baseline.ward_ids.index(w) for w in (focus_wards or []) if w in baseline.ward_ids]
+    seats = np.empty((draws, parties), dtype=np.int32)
+    vote_share = np.empty((draws, parties), dtype=np.float32)
+    focus_share = np.empty((parties, draws, len(focus)), dtype=np.float32)
+    focus_wins = np.zeros((parties, len(focus)), dtype=np.int64)
+
+    for start in range(0, draws, CHUNK_DRAWS):
+        n = min(CHUNK_DRAWS, draws - start)
+        shares = _standard_normal(rng, (parties, n, wards))
+        shares *= ward_sd
+        shares += base
+        shares += rng.standard_normal((parties, n, 1), dtype=np.float32) * city_sd
+        np.maximum(shares, 0.0, out=shares)
+        inv_total = 1.0 / np.maximum(shares.sum(axis=0), 1e-9)
+
+        best = shares.max(axis=0)
+        for i in range(parties):
+            won = shares[i] == best
+            seats[start:start + n, i] = won.view(np.int8).sum(axis=1, dtype=np.int32)
+            vote_share[start:start + n, i] = np.einsum("nw,nw->n", shares[i], inv_total) / wards
+            if focus:
+                focus_wins[i] += won[:, focus].sum(axis=0)
+        if focus:
+            focus_share[:, start:start + n] = shares[:, :, focus] * inv_total[:, focus]
+
+    majority = wards // 2 + 1
+    win_probability = focus_wins / draws
+    result = {
+        "draws": draws,
+        "wards": wards,
+        "parties": baseline.parties,
+        "majority_seats": majority,
+        "seats": {p: _percentiles(seats[:, i]) for i, p in enumerate(baseline.parties)},
+        "vote_share": {p: _percentiles(vote_share[:, i], 100.0) for i, p in enumerate(baseline.parties)},
+        "baseline_vote_share": {p: round(float(baseline.shares[:, i].mean() * 100.0), 3)
+                                for i, p in enumerate(baseline.parties)},
+        "majority_probability": {p: round(float((seats[:, i] >= majority).mean()), 4)
+                                 for i, p in enumerate(baseline.parties)},
+        "ward_win_probability": {},
+        "ward_vote_share": {},
+    }
+    for j, w in enumerate(focus):
+        ward_id = baseline.ward_ids[w]
+        result["ward_win_probability"][ward_id] = {
+            p: round(float(win_probability[i, j]), 4) for i, p in enumerate(baseline.parties) if contesting[i, w]}
+        result["ward_vote_share"][ward_id] = {
+            p: {**_percentiles(focus_share[i, :, j], 100.0), "baseline": round(float(baseline.shares[w, i] * 100.0), 3)}
+            for i, p in enumerate(baseline.parties) if contesting[i, w]}
+    return result
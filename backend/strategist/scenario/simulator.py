@@ -10,15 +10,24 @@ Provides conversation-based "what-if" political analysis with:
 
 import os
 import json
+import math
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
 import google.generativeai as genai
+from provider_endpoints import gemini_configure_kwargs
+
+from ..async_model import AsyncModel
+from .electoral_model import DEFAULT_DRAWS, ElectoralBaseline, simulate as simulate_elections
 
 logger = logging.getLogger(__name__)
 
+TIMEFRAME_DAYS = {"1_month": 30, "3_months": 90, "6_months": 180, "1_year": 365}
+MAX_DRAWS = 200_000
+
 
 @dataclass
 class ScenarioRequest:
@@ -57,8 +66,8 @@ class ScenarioSimulator:
     def __init__(self):
         # Initialize Gemini for scenario analysis
         try:
-            genai.configure(api_key=os.environ["GEMINI_API_KEY"])
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            genai.configure(api_key=os.environ["GEMINI_API_KEY"], **gemini_configure_kwargs())
+            self.model = AsyncModel(genai.GenerativeModel('gemini-2.0-flash-exp'))
             self.gemini_available = True
         except KeyError:
             logger.error("GEMINI_API_KEY not set for scenario simulator")
@@ -135,7 +144,7 @@ class ScenarioSimulator:
                 
             else:
                 # Fallback simulation
-                result = self._generate_fallback_simulation(request, scenario_id)
+                result = await self._generate_fallback_simulation(request, scenario_id)
             
             logger.info(f"Scenario simulation complete: {scenario_id}, confidence: {result.confidence_score:.2f}")
             return result
@@ -193,7 +202,7 @@ class ScenarioSimulator:
             Consider local political dynamics, voter preferences, and historical patterns.
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.3,
@@ -226,61 +235,16 @@ class ScenarioSimulator:
         impact_analysis: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Model electoral outcomes and vote share projections."""
-        try:
-            # Only perform detailed electoral modeling for electoral scenarios
-            if request.scenario_type != 'electoral':
-                return {
-                    "electoral_relevance": "secondary",
-                    "vote_share_impact": "minimal",
-                    "model_confidence": 0.6
-                }
-            
-            prompt = f"""
-            Model electoral impact for {request.ward} ward based on scenario analysis:
-            
-            Scenario: "{request.scenario_query}"
-            Impact Analysis: {json.dumps(impact_analysis, indent=2)}
-            Timeframe: {request.timeframe}
-            
-            Provide electoral modeling in JSON format:
-            
-            1. vote_share_projections: {{
-                "party_a": {{"current": 35, "projected": 38, "confidence": 0.75}},
-                "party_b": {{"current": 30, "projected": 28, "confidence": 0.72}},
-                "others": {{"current": 35, "projected": 34, "confidence": 0.68}}
-            }}
-            2. turnout_projections: {{
-                "current_baseline": 72,
-                "projected_turnout": 75,
-                "confidence": 0.7,
-                "key_demographics": ["youth", "urban_professionals"]
-            }}
-            3. swing_factors: Array of factors that could change outcomes
-            4. coalition_implications: How alliances might shift
-            5. model_confidence: Overall modeling confidence (0.0-1.0)
-            6. uncertainty_ranges: Margin of error for projections
-            
-            Base projections on realistic Hyderabad political patterns.
-            Consider local party dynamics, demographic trends, and historical voting behavior.
-            """
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.25,
-                    "max_output_tokens": 2048,
-                    "response_mime_type": "application/json"
-                }
-            )
-            
-            electoral_model = json.loads(response.text)
-            electoral_model["modeled_at"] = datetime.now(timezone.utc).isoformat()
-            electoral_model["model_type"] = "scenario_electoral_projection"
-            
-            return electoral_model
-            
-        except Exception as e:
-            logger.error(f"Electoral modeling failed: {e}")
+        # Only perform detailed electoral modeling for electoral scenarios
+        if request.scenario_type != 'electoral':
+            return {
+                "electoral_relevance": "secondary",
+                "vote_share_impact": "minimal",
+                "model_confidence": 0.6
+            }
+
+        projections = await self._run_electoral_model(request)
+        if projections is None:
             return {
                 "vote_share_projections": self._get_default_vote_projections(),
                 "model_confidence": 0.5,
@@ -288,7 +252,83 @@ class ScenarioSimulator:
                 "fallback_mode": True,
                 "modeled_at": datetime.now(timezone.utc).isoformat()
             }
-    
+        return projections
+
+    async def _run_electoral_model(self, request: ScenarioRequest) -> Optional[Dict[str, Any]]:
+        """
+        Monte Carlo projections from ward features (strategist.scenario.electoral_model).
+
+        ``request.parameters`` may carry ``swing`` ({party: percentage points}),
+        ``draws`` and ``seed``. Noise widens with the square root of the
+        timeframe. Projections are for the requested ward when it has
+        features, else city-wide. Returns None when no features are loaded.
+        The draws (up to MAX_DRAWS) run on a worker thread, not the event loop.
+        """
+        from app.utils.ward import resolve_ward_id
+
+        try:
+            baseline = ElectoralBaseline.load()
+            if not baseline.ward_ids:
+                logger.warning("No ward features loaded; electoral model unavailable")
+                return None
+
+            params = request.parameters or {}
+            swing = params.get("swing") if isinstance(params.get("swing"), dict) else {}
+            draws = max(1_000, min(int(params.get("draws", DEFAULT_DRAWS)), MAX_DRAWS))
+            ward_id = resolve_ward_id(request.ward)
+            days = TIMEFRAME_DAYS.get(request.timeframe, 90)
+            distribution = await asyncio.to_thread(
+                simulate_elections, baseline, draws=draws, swing=swing, uncertainty=math.sqrt(days / 90),
+                seed=params.get("seed"), focus_wards=[ward_id] if ward_id else None,
+            )
+        except Exception as e:
+            logger.error(f"Electoral model failed: {e}")
+            return None
+
+        ward_shares = distribution["ward_vote_share"].get(ward_id)
+        if ward_shares:
+            win_probability = distribution["ward_win_probability"][ward_id]
+            scope = "ward"
+            vote_share_projections = {
+                party: {
+                    "current": share["baseline"],
+                    "projected": share["p50"],
+                    "range": [share["p5"], share["p95"]],
+                    "confidence": win_probability.get(party, 0.0),
+                }
+                for party, share in ward_shares.items()
+            }
+            model_confidence = max(win_probability.values())
+        else:
+            scope = "city"
+            vote_share_projections = {
+                party: {
+                    "current": distribution["baseline_vote_share"][party],
+                    "projected": share["p50"],
+                    "range": [share["p5"], share["p95"]],
+                    "confidence": distribution["majority_probability"][party],
+                }
+                for party, share in distribution["vote_share"].items()
+            }
+            model_confidence = max(distribution["majority_probability"].values())
+
+        return {
+            "model_type": "monte_carlo_ward_swing",
+            "projection_scope": scope,
+            "ward_id": ward_id,
+            "vote_share_projections": vote_share_projections,
+            "seat_projections": distribution["seats"],
+            "citywide_vote_share": distribution["vote_share"],
+            "majority_seats": distribution["majority_seats"],
+            "majority_probability": distribution["majority_probability"],
+            "ward_win_probability": distribution["ward_win_probability"].get(ward_id),
+            "applied_swing": swing,
+            "draws": distribution["draws"],
+            "wards_modeled": distribution["wards"],
+            "model_confidence": round(float(model_confidence), 4),
+            "modeled_at": datetime.now(timezone.utc).isoformat()
+        }
+
     async def _generate_strategic_recommendations(
         self,
         request: ScenarioRequest,
@@ -322,7 +362,7 @@ class ScenarioSimulator:
             - Culturally sensitive for Hyderabad context
             """
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.4,
@@ -373,11 +413,7 @@ class ScenarioSimulator:
                     "range": f"±{int((1 - base_confidence) * 20)}%",
                     "description": "Overall scenario outcome confidence"
                 },
-                "electoral_impact": {
-                    "confidence": electoral_confidence,
-                    "range": f"±{int((1 - electoral_confidence) * 15)}%",
-                    "description": "Electoral projection confidence"
-                },
+                "electoral_impact": self._electoral_interval(electoral_projections),
                 "strategic_effectiveness": {
                     "confidence": min(0.9, (base_confidence + electoral_confidence) / 2 + 0.1),
                     "range": "±10%",
@@ -410,6 +446,32 @@ class ScenarioSimulator:
                 "calculated_at": datetime.now(timezone.utc).isoformat()
             }
     
+    def _electoral_interval(self, electoral_projections: Dict[str, Any]) -> Dict[str, Any]:
+        """Electoral interval from simulated percentiles, or a heuristic without them."""
+        electoral_confidence = electoral_projections.get('model_confidence', 0.7)
+        projections = electoral_projections.get('vote_share_projections') or {}
+        simulated = {p: v for p, v in projections.items() if isinstance(v, dict) and v.get('range')}
+        if not simulated:
+            return {
+                "confidence": electoral_confidence,
+                "range": f"±{int((1 - electoral_confidence) * 15)}%",
+                "description": "Electoral projection confidence"
+            }
+
+        leader, projection = max(simulated.items(), key=lambda kv: kv[1]['projected'])
+        low, high = projection['range']
+        interval = {
+            "confidence": electoral_confidence,
+            "range": f"{leader} {low:.1f}–{high:.1f}%",
+            "description": f"90% interval of simulated {leader} vote share over "
+                           f"{electoral_projections.get('draws')} draws",
+            "vote_share_p5_p95": {p: v['range'] for p, v in simulated.items()},
+        }
+        seats = electoral_projections.get('seat_projections')
+        if seats:
+            interval["seats_p5_p95"] = {p: [s['p5'], s['p95']] for p, s in seats.items()}
+        return interval
+
     def _prepare_visualization_data(
         self,
         impact_analysis: Dict[str, Any],
@@ -480,12 +542,21 @@ class ScenarioSimulator:
                 "prepared_at": datetime.now(timezone.utc).isoformat()
             }
     
-    def _generate_fallback_simulation(
+    async def _generate_fallback_simulation(
         self,
         request: ScenarioRequest,
         scenario_id: str
     ) -> SimulationResult:
         """Generate fallback simulation when AI is unavailable."""
+        electoral_projections = (
+            await self._run_electoral_model(request) if request.scenario_type == 'electoral' else None
+        )
+        confidence_intervals = {
+            "overall_scenario": {"confidence": 0.4, "range": "±20%"},
+            "fallback_mode": True
+        }
+        if electoral_projections:
+            confidence_intervals["electoral_impact"] = self._electoral_interval(electoral_projections)
         return SimulationResult(
             scenario_id=scenario_id,
             key_impact=f"Scenario analysis for '{request.scenario_query}' in {request.ward} ward. Impact assessment indicates moderate strategic implications requiring careful monitoring and response planning.",
@@ -497,15 +568,12 @@ class ScenarioSimulator:
                 "Review and update strategic positioning"
             ],
             impact_breakdown=self._get_default_impact_breakdown(),
-            confidence_intervals={
-                "overall_scenario": {"confidence": 0.4, "range": "±20%"},
-                "fallback_mode": True
-            },
+            confidence_intervals=confidence_intervals,
             visualization_data={
                 "impact_breakdown": self._get_default_impact_breakdown(),
                 "fallback_mode": True
             },
-            electoral_projections=None,
+            electoral_projections=electoral_projections,
             risk_factors=["Limited analysis capability"],
             mitigation_strategies=["Seek additional expert input"]
         )
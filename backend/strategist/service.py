@@ -19,7 +19,7 @@ from .retriever.perplexity_client import PerplexityRetriever
 from .nlp.pipeline import NLPProcessor
 from .credibility.checks import CredibilityScorer
 from .guardrails import sanitize_and_strategize
-from .observability import get_observer, monitor_strategist_operation
+from .observability import get_observer, monitor_strategist_operation, start_span, current_span
 
 logger = logging.getLogger(__name__)
 
@@ -69,38 +69,51 @@ class PoliticalStrategist:
             # Log analysis start
             self.observer.log_analysis_start(self.ward, depth, self.context_mode)
             
+            root = current_span()
+            if root is not None:
+                root.set_attributes({"depth": depth, "context_mode": self.context_mode})
+            
             # Step 1: Generate strategic plan
             logger.info(f"Starting {depth} analysis for ward: {self.ward}")
-            plan = await self.planner.create_analysis_plan(
-                ward=self.ward,
-                depth=depth,
-                context_mode=self.context_mode
-            )
+            with start_span("strategist.plan", {"depth": depth}) as span:
+                plan = await self.planner.create_analysis_plan(
+                    ward=self.ward,
+                    depth=depth,
+                    context_mode=self.context_mode
+                )
+                span.set_attribute("queries", len(plan.get('queries', [])))
             
             # Step 2: Gather intelligence
             logger.info(f"Gathering intelligence with {len(plan.get('queries', []))} queries")
-            raw_intelligence = await self.retriever.gather_intelligence(plan.get('queries', []))
+            with start_span("strategist.retrieve") as span:
+                raw_intelligence = await self.retriever.gather_intelligence(plan.get('queries', []))
+                span.set_attribute("items", len(raw_intelligence.get('intelligence_items', [])))
             
             # Step 3: Process and score sources
-            scored_intelligence = await self.credibility.score_sources(raw_intelligence)
+            with start_span("strategist.credibility"):
+                scored_intelligence = await self.credibility.score_sources(raw_intelligence)
             
             # Step 4: NLP analysis
-            processed_data = await self.nlp.analyze_corpus(
-                data=scored_intelligence,
-                ward=self.ward,
-                depth=depth,
-                context_mode=self.context_mode
-            )
+            with start_span("strategist.nlp") as span:
+                processed_data = await self.nlp.analyze_corpus(
+                    data=scored_intelligence,
+                    ward=self.ward,
+                    depth=depth,
+                    context_mode=self.context_mode
+                )
+                span.set_attribute("text_count", processed_data.get('text_count', 0))
             
             # Step 5: Generate strategic briefing
-            briefing = await self.planner.generate_briefing(
-                plan=plan,
-                intelligence=processed_data,
-                ward=self.ward
-            )
+            with start_span("strategist.briefing"):
+                briefing = await self.planner.generate_briefing(
+                    plan=plan,
+                    intelligence=processed_data,
+                    ward=self.ward
+                )
             
             # Step 6: Apply guardrails and sanitization
-            final_result = sanitize_and_strategize(briefing)
+            with start_span("strategist.guardrails"):
+                final_result = sanitize_and_strategize(briefing)
             
             # Log analysis completion
             duration = time.time() - start_time
@@ -114,6 +127,9 @@ class PoliticalStrategist:
             
         except Exception as e:
             logger.error(f"Error in situation analysis for {self.ward}: {e}", exc_info=True)
+            span = current_span()
+            if span is not None:
+                span.record_exception(e)
             return {
                 "error": "Analysis failed",
                 "ward": self.ward,
@@ -191,17 +207,23 @@ class PoliticalStrategist:
             }
 
 
-def get_ward_report(ward: str, depth: str = "standard") -> tuple[Dict[str, Any], str, int]:
+def get_ward_report(ward: str, depth: str = "standard", ttl: Optional[int] = None,
+                    refresh: bool = False) -> tuple[Dict[str, Any], str, int]:
     """
     Get cached or generate new ward strategic report.
     
+    Args:
+        ttl: Cache lifetime for a newly generated report (default ETAG_TTL);
+            fallback reports never outlive ETAG_TTL
+        refresh: Regenerate even when a cached report exists (nightly precompute)
+    
     Returns:
         Tuple of (data, etag, ttl)
     """
     cache_key = f"strategist:ward:{ward}:{depth}"
     
     # Check cache first
-    cached = cget(cache_key)
+    cached = None if refresh else cget(cache_key)
     if cached:
         logger.info(f"Serving cached report for {ward}")
         from .observability import record_cache_operation
@@ -233,7 +255,10 @@ def get_ward_report(ward: str, depth: str = "standard") -> tuple[Dict[str, Any],
         
         # Generate ETag and TTL
         etag = hashlib.md5(str(result).encode()).hexdigest()
-        ttl = int(os.getenv('ETAG_TTL', 60))
+        default_ttl = int(os.getenv('ETAG_TTL', 60))
+        ttl = ttl or default_ttl
+        if result.get("fallback_mode"):
+            ttl = min(ttl, default_ttl)
         
         # Cache the result
         cset(cache_key, result, etag, ttl)
@@ -137,8 +137,9 @@ def _get_recent_intelligence(ward: str, since: datetime) -> Optional[dict]:
         query = Post.query
         
         # Filter by ward
-        if ward.lower() != 'all':
-            query = query.filter(Post.city.ilike(f'%{ward}%'))
+        ward_clause = Post.ward_filter(ward)
+        if ward_clause is not None:
+            query = query.filter(ward_clause)
         
         # Filter by timestamp
         if since and hasattr(Post, 'created_at'):
@@ -164,7 +164,7 @@ def phase3_enhanced_sse_stream(ward: str, since: Optional[str] = None, priority:
                             from app.models import Post
                             with current_app.app_context():
                                 recent_posts = db.session.query(Post)\
-                                    .filter(Post.city == ward)\
+                                    .filter(Post.ward_filter(ward))\
                                     .order_by(Post.created_at.desc())\
                                     .limit(3)\
                                     .all()
@@ -0,0 +1,89 @@
+"""
+Fixtures for the analytics benchmark suite.
+
+Benchmarks run only when LOKDARPAN_BENCH_SCALE is set (comma-separated list
+of 10k, 1m, 10m). They build a full app via ``create_app`` against
+LOKDARPAN_BENCH_DATABASE_URL (default: a SQLite file in the temp dir) and
+load the synthetic corpus once per scale; a database that already holds a
+corpus of the requested size is reused.
+
+    LOKDARPAN_BENCH_SCALE=10k pytest tests/benchmarks --no-cov \\
+        --benchmark-autosave --benchmark-storage=file://./.benchmarks
+
+    # later, fail on >15% median regression against the last saved run
+    LOKDARPAN_BENCH_SCALE=10k pytest tests/benchmarks --no-cov \\
+        --benchmark-storage=file://./.benchmarks --benchmark-compare \\
+        --benchmark-compare-fail=median:15%
+
+1M/10M scales are meant for PostgreSQL; point the URL at a scratch database
+whose name contains "bench" or "test" (the loader refuses to clear others).
+"""
+
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.synthetic_corpus import SCALES, CorpusSpec, corpus_loaded, load_corpus, SyntheticCorpus
+
+BENCH_SCALES = [s.strip().lower() for s in os.environ.get("LOKDARPAN_BENCH_SCALE", "").split(",") if s.strip()]
+BENCH_DATABASE_URL = os.environ.get(
+    "LOKDARPAN_BENCH_DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "lokdarpan_bench.db"),
+)
+
+
+def pytest_collection_modifyitems(config, items):
+    if BENCH_SCALES:
+        unknown = [s for s in BENCH_SCALES if s not in SCALES]
+        if unknown:
+            raise pytest.UsageError(f"Unknown LOKDARPAN_BENCH_SCALE values {unknown}; expected {sorted(SCALES)}")
+        return
+    skip = pytest.mark.skip(reason="set LOKDARPAN_BENCH_SCALE=10k[,1m,10m] to run benchmarks")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("/"):
+            item.add_marker(skip)
+
+
+class BenchConfig(Config):
+    """Full application config pointed at the benchmark database."""
+    TESTING = True
+    LOGIN_DISABLED = True
+    RATE_LIMIT_ENABLED = False
+    SQLALCHEMY_DATABASE_URI = BENCH_DATABASE_URL
+    SQLALCHEMY_ENGINE_OPTIONS = {} if BENCH_DATABASE_URL.startswith("sqlite") else Config.SQLALCHEMY_ENGINE_OPTIONS
+    METRICS_BACKEND = "local"
+
+
+@pytest.fixture(scope="session")
+def bench_app():
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+@pytest.fixture(scope="session")
+def bench_client(bench_app):
+    return bench_app.test_client()
+
+
+@pytest.fixture(scope="session", params=BENCH_SCALES or ["10k"])
+def corpus(request, bench_app):
+    """Load (or reuse) the synthetic corpus for one scale."""
+    spec = CorpusSpec.for_scale(request.param)
+    if not corpus_loaded(spec):
+        load_corpus(spec, batch_size=10_000, replace=True)
+    by_volume = SyntheticCorpus(spec).wards_by_volume()
+    return {
+        "scale": request.param,
+        "spec": spec,
+        "hot_ward": by_volume[0],
+        "cold_ward": by_volume[-1],
+        "dialect": db.engine.dialect.name,
+    }
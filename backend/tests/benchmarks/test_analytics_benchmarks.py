@@ -0,0 +1,191 @@
+"""
+Benchmarks for the analytics endpoints and bulk ingestion over the
+synthetic corpus (see tests/benchmarks/conftest.py for how to run them).
+Each benchmark is grouped by endpoint and scale so saved runs compare
+like with like.
+"""
+import os
+
+import pytest
+from sqlalchemy import delete
+
+from app.extensions import db
+from app.models import Epaper, Post
+from app.synthetic_corpus import CorpusSpec, SyntheticCorpus, _bulk_insert, write_epaper_jsonl
+
+pytestmark = pytest.mark.slow
+
+HEATMAPS = ["sentiment", "party-activity", "issues", "geographic", "calendar"]
+
+
+def _bench_get(benchmark, client, corpus, group, url):
+    benchmark.group = f"{group} @ {corpus['scale']}"
+    benchmark.extra_info.update({
+        "scale": corpus["scale"],
+        "posts": corpus["spec"].posts,
+        "dialect": corpus["dialect"],
+        "url": url,
+    })
+    response = benchmark(client.get, url)
+    assert response.status_code == 200, response.get_data(as_text=True)[:300]
+    return response
+
+
+class TestAnalyticsEndpoints:
+    @pytest.mark.parametrize("ward_kind", ["all", "hot", "cold"])
+    def test_trends(self, benchmark, bench_client, corpus, ward_kind):
+        ward = "All" if ward_kind == "all" else corpus[f"{ward_kind}_ward"]["name"]
+        _bench_get(benchmark, bench_client, corpus, f"trends:{ward_kind}", f"/api/v1/trends?ward={ward}&days=30")
+
+    @pytest.mark.parametrize("kind", HEATMAPS)
+    def test_heatmap(self, benchmark, bench_client, corpus, kind):
+        ward = corpus["hot_ward"]["name"]
+        query = "days=30" if kind == "geographic" else f"ward={ward}&days=90"
+        _bench_get(benchmark, bench_client, corpus, f"heatmap:{kind}", f"/api/v1/heatmap/{kind}?{query}")
+
+    def test_heatmap_window_build(self, benchmark, bench_app, corpus):
+        """Cold single-pass build behind the sentiment/party/issues/calendar heatmaps."""
+        from app.heatmap_engine import HeatmapWindow
+
+        benchmark.group = f"heatmap:window_build @ {corpus['scale']}"
+        benchmark.extra_info.update({"scale": corpus["scale"], "posts": corpus["spec"].posts})
+        with bench_app.app_context():
+            window = benchmark(HeatmapWindow.build, corpus["hot_ward"]["name"], 90)
+        assert window.by_day
+
+    @pytest.mark.parametrize("ward_kind", ["hot", "cold"])
+    def test_pulse(self, benchmark, bench_client, corpus, ward_kind):
+        ward = corpus[f"{ward_kind}_ward"]["name"]
+        _bench_get(benchmark, bench_client, corpus, f"pulse:{ward_kind}", f"/api/v1/pulse/{ward}?days=14")
+
+    def test_ward_meta(self, benchmark, bench_client, corpus):
+        ward_id = corpus["hot_ward"]["ward_id"]
+        response = _bench_get(benchmark, bench_client, corpus, "ward_meta", f"/api/v1/ward/meta/{ward_id}")
+        assert response.get_json()["profile"] is not None
+
+    @pytest.mark.parametrize("city", ["All", "hot"])
+    def test_epaper_listing(self, benchmark, bench_client, corpus, city):
+        city_name = corpus["hot_ward"]["name"] if city == "hot" else city
+        _bench_get(benchmark, bench_client, corpus, f"epaper:{city}", f"/api/v1/epaper?city={city_name}&limit=20")
+
+
+# Largest analytics payloads: a year-long calendar, 90-day trends and ward boundaries
+PAYLOADS = {
+    "heatmap:calendar-365": lambda corpus: f"/api/v1/heatmap/calendar?ward={corpus['hot_ward']['name']}&days=365",
+    "trends:all-90": lambda corpus: "/api/v1/trends?ward=All&days=90",
+    "geojson": lambda corpus: "/api/v1/geojson",
+}
+
+
+class TestPayloadSerialization:
+    """Serialization time per JSON provider, with bytes on the wire in extra_info."""
+
+    @pytest.mark.parametrize("provider", ["orjson", "flask-default"])
+    @pytest.mark.parametrize("endpoint", sorted(PAYLOADS))
+    def test_serialize(self, benchmark, bench_app, bench_client, corpus, endpoint, provider):
+        from flask.json.provider import DefaultJSONProvider
+
+        from app.compression import available_encodings, compress
+
+        response = bench_client.get(PAYLOADS[endpoint](corpus))
+        assert response.status_code == 200, response.get_data(as_text=True)[:300]
+        payload = response.get_json()
+        json_provider = bench_app.json if provider == "orjson" else DefaultJSONProvider(bench_app)
+
+        benchmark.group = f"serialize:{endpoint} @ {corpus['scale']}"
+        body = benchmark(json_provider.dumps, payload).encode("utf-8")
+        benchmark.extra_info.update({
+            "scale": corpus["scale"],
+            "bytes": len(body),
+            **{f"bytes_{encoding}": len(compress(body, encoding)) for encoding in available_encodings()},
+        })
+
+
+class TestWardAssignment:
+    def test_assign_100k_points(self, benchmark):
+        """STRtree point-in-ward assignment over random points in the GHMC bounding box."""
+        import numpy as np
+
+        from app.ward_index import WardIndex
+
+        index = WardIndex.from_geojson()
+        bounds = np.array([g.bounds for g in index.geometries])
+        x0, y0 = bounds[:, 0].min(), bounds[:, 1].min()
+        x1, y1 = bounds[:, 2].max(), bounds[:, 3].max()
+        rng = np.random.default_rng(42)
+        lons, lats = rng.uniform(x0, x1, 100_000), rng.uniform(y0, y1, 100_000)
+
+        benchmark.group = "ward_assignment:100k"
+        wards = benchmark(index.assign, lons, lats)
+        benchmark.extra_info["assigned"] = int(sum(w is not None for w in wards))
+
+
+class TestElectoralSimulation:
+    def test_simulate_100k_draws(self, benchmark):
+        """Monte Carlo seat/vote-share distributions over 145 synthetic wards."""
+        import numpy as np
+
+        from strategist.scenario.electoral_model import ElectoralBaseline, simulate
+
+        rng = np.random.default_rng(7)
+        shares = rng.dirichlet([4, 4, 3, 2], size=145)
+        baseline = ElectoralBaseline(
+            ward_ids=[str(w) for w in range(1, 146)],
+            parties=["AIMIM", "BJP", "BRS", "INC"],
+            shares=shares,
+            noise_sd=np.full_like(shares, 0.03),
+        )
+
+        benchmark.group = "electoral_simulation:100k"
+        result = benchmark(simulate, baseline, 100_000, seed=1, focus_wards=["95"])
+        benchmark.extra_info["majority_probability"] = result["majority_probability"]
+
+
+class TestBulkIngestion:
+    """Ingests 1% of the scale per round, then removes the ingested rows."""
+
+    def test_bulk_ingestion(self, benchmark, corpus, tmp_path):
+        if corpus["dialect"] != "postgresql":
+            pytest.skip("bulk_ingest_epapers_optimized relies on PostgreSQL bulk functions")
+        from app.tasks_bulk_ingestion import bulk_ingest_epapers_optimized
+
+        spec = corpus["spec"]
+        records = max(100, spec.posts // 100)
+        rounds = iter(range(1000))
+
+        def setup():
+            path = os.path.join(str(tmp_path), "ingest.jsonl")
+            write_epaper_jsonl(spec, path, records, offset=(next(rounds) + 1) * 10_000_000)
+            return (path,), {}
+
+        benchmark.group = f"bulk_ingestion @ {corpus['scale']}"
+        benchmark.extra_info.update({"scale": corpus["scale"], "records_per_round": records})
+        try:
+            stats = benchmark.pedantic(bulk_ingest_epapers_optimized, setup=setup, rounds=3, iterations=1)
+            assert stats.get("error_count", 0) == 0
+        finally:
+            db.session.execute(delete(Post).where(Post.id > spec.posts))
+            db.session.execute(delete(Epaper).where(Epaper.id > spec.epapers))
+            db.session.commit()
+
+    def test_synthetic_bulk_load(self, benchmark, corpus):
+        """Raw Core executemany throughput for the generator's own loader."""
+        spec = corpus["spec"]
+        sample = CorpusSpec(posts=max(1000, spec.posts // 100), epapers=spec.epapers, authors=spec.authors, seed=spec.seed + 1)
+        offset = spec.posts
+
+        def rows():
+            for row in SyntheticCorpus(sample).posts():
+                yield {**row, "id": row["id"] + offset}
+
+        def cleanup():
+            db.session.execute(delete(Post).where(Post.id > offset))
+            db.session.commit()
+
+        benchmark.group = f"bulk_load @ {corpus['scale']}"
+        benchmark.extra_info.update({"scale": corpus["scale"], "rows_per_round": sample.posts})
+        try:
+            inserted = benchmark.pedantic(lambda: _bulk_insert(Post.__table__, rows(), 10_000), setup=cleanup, rounds=3, iterations=1)
+            assert inserted == sample.posts
+        finally:
+            cleanup()
@@ -53,6 +53,8 @@ def app():
     """Create application for testing."""
     # Create app directly with test config
     app = Flask(__name__)
+    from app.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
     
     # Set config directly - strong secret key for testing
     app.config['SECRET_KEY'] = 'a7b9c2d1e3f4g5h6i7j8k9l0m1n2o3p4q5r6s7t8u9v0w1x2y3z4a5b6c7d8e9f0'
@@ -89,6 +91,10 @@ def app():
     # Import models to ensure they're registered
     from app import models, models_ai
     
+    # Same response compression as create_app
+    from app.compression import init_compression
+    init_compression(app)
+
     # Apply security middleware for testing
     from app.security import apply_security_headers
     
@@ -104,6 +110,8 @@ def app():
     from app.ward_api import ward_bp
     from app.epaper_api import bp_epaper
     from app.summary_api import summary_bp
+    from app.search_api import search_bp
+    from app.heatmap_api import heatmap_bp
     
     app.register_blueprint(main_bp)
     app.register_blueprint(trends_bp)
@@ -111,6 +119,8 @@ def app():
     app.register_blueprint(ward_bp)
     app.register_blueprint(bp_epaper)
     app.register_blueprint(summary_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(heatmap_bp)
     
     # Create application context
     ctx = app.app_context()
@@ -324,6 +334,33 @@ class TestConfig:
     MAX_RESPONSE_TIME = 2.0  # seconds
     MAX_DB_QUERY_TIME = 0.5  # seconds
     
+    # Maximum SQL statements per request, including the session user lookup
+    # on login-protected endpoints.
+    # Tighten these when an endpoint gets cheaper; never loosen to hide an N+1.
+    QUERY_BUDGETS = {
+        '/api/v1/trends?ward=All&days=30': 2,
+        '/api/v1/trends?ward=Hyderabad&days=30': 2,
+        '/api/v1/trends?ward=Ward 95 Jubilee Hills&days=30': 2,
+        '/api/v1/pulse/Hyderabad?days=14': 2,
+        '/api/v1/pulse/Jubilee Hills?days=14': 3,
+        '/api/v1/ward/meta/WARD_001': 2,
+        '/api/v1/ward/meta?ids=95,93': 2,
+        '/api/v1/prediction/WARD_001': 1,
+        '/api/v1/prediction?wards=all': 2,
+        '/api/v1/prediction?wards=95,93': 2,
+        '/api/v1/epaper?city=All': 1,
+        '/api/v1/epaper?city=Hyderabad': 1,
+        '/api/v1/posts?city=Hyderabad': 3,
+        '/api/v1/posts?city=Jubilee Hills': 3,
+        '/api/v1/search?q=test': 2,
+        '/api/v1/search?q=test&ward=Jubilee Hills&type=epaper': 2,
+        '/api/v1/heatmap/sentiment?ward=Jubilee Hills&days=30': 3,
+        '/api/v1/heatmap/party-activity?ward=All&days=30': 3,
+        '/api/v1/heatmap/issues?ward=Hyderabad&days=30': 3,
+        '/api/v1/heatmap/calendar?ward=Jubilee Hills&days=30': 3,
+        '/api/v1/heatmap/geographic?days=30': 3,
+    }
+    
     # Security test patterns
     XSS_PAYLOADS = [
         '<script>alert("xss")</script>',
@@ -372,6 +409,12 @@ def assert_response_error(response, expected_status=400, expected_error=None):
     return response
 
 
+def assert_max_queries(max_queries):
+    """Context manager failing the test if the block runs more than max_queries SQL statements."""
+    from app.sql_profiler import query_budget
+    return query_budget(max_queries)
+
+
 def create_test_post_data():
     """Create test post data."""
     return {
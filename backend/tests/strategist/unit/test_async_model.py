@@ -0,0 +1,126 @@
+"""
+Unit tests for the async Gemini model adapter and the concurrent NLP stages
+that use it.
+"""
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from strategist.async_model import AsyncModel, async_model
+from strategist.nlp.pipeline import NLPProcessor
+
+CALL_SECONDS = 0.2
+
+CORPUS = {"intelligence_items": [
+    {"content": "BJP and Congress workers clash over drainage works near Road No. 10 in Jubilee Hills"},
+    {"content": "GHMC announces new development projects and a metro feeder route for Jubilee Hills"},
+]}
+
+
+class BlockingModel:
+    """Stands in for ``GenerativeModel``: ``generate_content`` blocks the calling thread."""
+
+    model_name = "models/gemini-1.5-flash"
+
+    def __init__(self):
+        self.threads = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(CALL_SECONDS)
+        body = {"overall_sentiment": "negative", "sentiment_score": 0.3, "persons": ["KTR"], "confidence": 0.8}
+        return SimpleNamespace(text=json.dumps(body), usage_metadata=None)
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestAsyncModel:
+    def test_calls_run_off_the_event_loop(self):
+        model = BlockingModel()
+        wrapped = AsyncModel(model)
+        ticks = []
+
+        async def ticker():
+            while len(ticks) < 5:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        async def scenario():
+            started = time.perf_counter()
+            await asyncio.gather(wrapped.generate_content("a"), wrapped.generate_content("b"), ticker())
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(scenario())
+        assert elapsed < 2 * CALL_SECONDS
+        assert ticks[-1] - ticks[0] < CALL_SECONDS  # the loop kept running during the calls
+        assert all(name.startswith("strategist-llm") for name in model.threads)
+
+    def test_attributes_pass_through_and_none_stays_none(self):
+        wrapped = async_model(BlockingModel())
+        assert wrapped.model_name == "models/gemini-1.5-flash"
+        assert async_model(wrapped) is wrapped
+        assert async_model(None) is None
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestConcurrentNLPStages:
+    def test_model_stages_overlap(self):
+        processor = NLPProcessor()
+        model = BlockingModel()
+        processor.model = AsyncModel(model)
+
+        started = time.perf_counter()
+        analysis = asyncio.run(processor.analyze_corpus(CORPUS, "Jubilee Hills", "standard", "neutral"))
+        elapsed = time.perf_counter() - started
+
+        assert len(model.threads) == 2
+        assert elapsed < 1.75 * CALL_SECONDS
+        assert analysis["sentiment"]["overall_sentiment"] == "negative"
+        assert analysis["entities"]["persons"] == ["KTR"]
+        assert "bjp" in analysis["political_context"]["party_mentions"]
+        assert analysis["text_count"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestPlaybookRoutes:
+    @pytest.fixture
+    def post(self, monkeypatch):
+        from strategist.playbook import generator
+        from strategist.router import strategist_bp
+
+        model = BlockingModel()
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        monkeypatch.setattr(generator.genai, "GenerativeModel", lambda name: model)
+        app = Flask(__name__)
+        app.config["LOGIN_DISABLED"] = True
+        app.register_blueprint(strategist_bp)
+
+        def post(path, body):
+            response = app.test_client().post(f"/api/v1/strategist/playbook{path}", json=body)
+            return response.status_code, response.get_json(), model.threads
+        return post
+
+    def test_generate(self, post):
+        status, body, threads = post("/generate", {"playbook_type": "crisis_response", "ward": "Jubilee Hills"})
+        assert status == 200 and body["ward"] == "Jubilee Hills"
+        assert threads and all(name.startswith("strategist-llm") for name in threads)
+
+    def test_opposition_response(self, post):
+        status, body, threads = post("/opposition-response", {
+            "opposition_message": "BJP claims drainage works in Jubilee Hills were never finished",
+            "ward": "Jubilee Hills"})
+        assert status == 200 and isinstance(body, dict) and "error" not in body
+        assert threads
+
+    def test_customize(self, post):
+        status, body, threads = post("/customize", {"base_playbook": {"ward": "Jubilee Hills"},
+                                                    "conversation_history": [{"content": "focus on roads"}]})
+        assert status == 200 and isinstance(body, dict) and "error" not in body
+        assert threads
@@ -0,0 +1,98 @@
+"""
+Unit tests for the vectorized Monte Carlo electoral model and its use by
+the scenario simulator.
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from strategist.scenario.electoral_model import ElectoralBaseline, simulate
+
+
+def _features(ward_id, ls24, as23=None, volatility=0.0):
+    dvi = {p: ls24.get(p, 0.0) - (as23 or {}).get(p, 0.0) for p in ls24} if as23 else None
+    return SimpleNamespace(ward_id=ward_id, ls24_party_shares=ls24, as23_party_shares=as23,
+                           dvi=dvi, turnout_volatility=volatility)
+
+
+@pytest.fixture
+def baseline():
+    return ElectoralBaseline.from_features([
+        _features("1", {"BRS": 0.8, "BJP": 0.2}),
+        _features("2", {"BRS": 0.49, "BJP": 0.51}, as23={"BRS": 0.55, "BJP": 0.45}),
+        _features("3", {"INC": 0.7, "AIMIM": 0.3}),
+        _features("4", {}, as23={}),
+    ])
+
+
+@pytest.mark.unit
+class TestElectoralModel:
+    def test_baseline_matrices(self, baseline):
+        assert baseline.ward_ids == ["1", "2", "3"]
+        assert baseline.parties == ["AIMIM", "BJP", "BRS", "INC"]
+        assert baseline.noise_sd[0, baseline.parties.index("INC")] == 0.0
+        # Ward 2 moved 6 points between elections, so it is noisier than ward 1
+        assert baseline.noise_sd[1].max() > baseline.noise_sd[0].max()
+
+    def test_distributions(self, baseline):
+        result = simulate(baseline, draws=20_000, seed=1, focus_wards=["2"])
+        seats = result["seats"]
+        assert sum(s["mean"] for s in seats.values()) == pytest.approx(3, abs=0.01)
+        assert seats["INC"]["p5"] == seats["INC"]["p95"] == 1
+        assert seats["BRS"]["p5"] >= 1 and result["majority_seats"] == 2
+
+        for share in result["vote_share"].values():
+            assert share["p5"] <= share["p25"] <= share["p50"] <= share["p75"] <= share["p95"]
+
+        ward = result["ward_win_probability"]["2"]
+        assert set(ward) == {"BJP", "BRS"} and 0.5 < ward["BJP"] < 1.0
+        assert result["ward_vote_share"]["2"]["BJP"]["baseline"] == pytest.approx(51.0)
+
+    def test_swing_and_seed(self, baseline):
+        calm = simulate(baseline, draws=5_000, seed=3, focus_wards=["2"])
+        assert simulate(baseline, draws=5_000, seed=3, focus_wards=["2"]) == calm
+        swung = simulate(baseline, draws=5_000, seed=3, focus_wards=["2"], swing={"BRS": 5})
+        assert swung["ward_win_probability"]["2"]["BRS"] > calm["ward_win_probability"]["2"]["BRS"] + 0.2
+        assert swung["seats"]["BRS"]["mean"] > calm["seats"]["BRS"]["mean"]
+
+    def test_no_features(self):
+        with pytest.raises(ValueError):
+            simulate(ElectoralBaseline.from_features([]), draws=10)
+
+
+@pytest.mark.unit
+class TestScenarioElectoralProjections:
+    def test_projections_come_from_ward_features(self, db_session, monkeypatch):
+        from app.models import WardFeatures
+        from strategist.scenario import ScenarioRequest, ScenarioSimulator, simulator
+
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        threads = []
+
+        def simulate_on_thread(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return simulate(*args, **kwargs)
+
+        monkeypatch.setattr(simulator, "simulate_elections", simulate_on_thread)
+        db_session.session.add_all([
+            WardFeatures(ward_id="95", ls24_party_shares={"BJP": 0.45, "BRS": 0.40, "INC": 0.15},
+                         as23_party_shares={"BJP": 0.35, "BRS": 0.50, "INC": 0.15}, turnout_volatility=2.0),
+            WardFeatures(ward_id="93", ls24_party_shares={"BRS": 0.6, "BJP": 0.4}),
+        ])
+        db_session.session.commit()
+
+        request = ScenarioRequest(scenario_query="What if the BRS gains two points city-wide?",
+                                  scenario_type="electoral", ward="Jubilee Hills",
+                                  parameters={"swing": {"BRS": 2}, "draws": 5_000, "seed": 1})
+        result = asyncio.run(ScenarioSimulator()._generate_fallback_simulation(request, "scenario_test"))
+
+        assert threads and threads[0] is not threading.main_thread()  # draws ran off the event loop
+        projections = result.electoral_projections
+        assert projections["projection_scope"] == "ward" and projections["ward_id"] == "95"
+        bjp = projections["vote_share_projections"]["BJP"]
+        assert bjp["current"] == pytest.approx(45.0) and bjp["range"][0] < bjp["projected"] < bjp["range"][1]
+        assert set(projections["seat_projections"]) == {"BJP", "BRS", "INC"}
+        interval = result.confidence_intervals["electoral_impact"]
+        assert interval["range"].startswith("BJP ") and "BRS" in interval["vote_share_p5_p95"]
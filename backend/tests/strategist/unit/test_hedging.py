@@ -0,0 +1,256 @@
+"""
+Unit tests for latency-aware routing and hedged execution in the
+multi-model coordinator.
+"""
+import asyncio
+import time
+
+import pytest
+import requests
+from aiohttp.test_utils import TestServer
+
+from strategist.reasoner.hedging import MIN_SAMPLES, HedgeBudget, LatencyTracker
+from strategist.reasoner.multi_model_coordinator import (
+    AnalysisRequest,
+    hedge_stats,
+    ModelRoutingDecision,
+    MultiModelCoordinator,
+    QueryType,
+)
+
+GEMINI, PERPLEXITY = 'gemini-2.0-flash-exp', 'perplexity-pro'
+
+
+def _request():
+    return AnalysisRequest(ward="Jubilee Hills", query="Key issues", depth="standard", context_mode="neutral")
+
+
+def _decision(primary, secondary=None):
+    return ModelRoutingDecision(primary_model=primary, secondary_model=secondary, routing_confidence=0.9,
+                                reasoning="test", expected_capabilities=[], fallback_strategy="single_model")
+
+
+@pytest.fixture
+def coordinator(monkeypatch):
+    coordinator = MultiModelCoordinator()
+    coordinator.gemini_available = coordinator.perplexity_available = True
+    coordinator.latency = LatencyTracker(priors={GEMINI: 0.1, PERPLEXITY: 0.1})
+    coordinator.hedge_budget = HedgeBudget(ratio=0.1, burst=2.0)
+    coordinator.hedging_enabled = True
+    coordinator.hedge_min_delay = 0.01
+    coordinator.synthesis_grace = 0.05
+    calls = {GEMINI: [], PERPLEXITY: []}
+
+    def fake(model, delays):
+        async def analysis(request):
+            delay = delays[model]
+            calls[model].append("started")
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                calls[model].append("cancelled")
+                raise
+            return {"content": f"{model} answer", "model": model}
+        return analysis
+
+    coordinator.delays = {GEMINI: 0.01, PERPLEXITY: 0.01}
+    coordinator.calls = calls
+    monkeypatch.setattr(coordinator, "_gemini_analysis", fake(GEMINI, coordinator.delays))
+    monkeypatch.setattr(coordinator, "_perplexity_analysis", fake(PERPLEXITY, coordinator.delays))
+    return coordinator
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestLatencyTracker:
+    def test_prior_until_enough_samples(self):
+        tracker = LatencyTracker(priors={GEMINI: 2.0})
+        assert tracker.percentile(GEMINI, 50) == 2.0
+        assert tracker.percentile(GEMINI, 90) == 3.0
+        assert tracker.percentile("unknown", 90) is None
+
+        for seconds in range(1, MIN_SAMPLES + 1):
+            tracker.observe(GEMINI, seconds)
+        assert tracker.percentile(GEMINI, 50) == 5
+        assert tracker.percentile(GEMINI, 90) == 9
+        assert tracker.snapshot()[GEMINI]["samples"] == MIN_SAMPLES
+
+    def test_sliding_window(self):
+        tracker = LatencyTracker(window=MIN_SAMPLES)
+        for _ in range(MIN_SAMPLES):
+            tracker.observe(GEMINI, 10.0)
+        for _ in range(MIN_SAMPLES):
+            tracker.observe(GEMINI, 1.0)
+        assert tracker.percentile(GEMINI, 99) == 1.0
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestHedgeBudget:
+    def test_hedges_capped_by_earned_tokens(self):
+        budget = HedgeBudget(ratio=0.5, burst=1.0)
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+        budget.earn()
+        assert budget.try_spend() is False
+        budget.earn()
+        assert budget.try_spend() is True
+
+    def test_abandoned_calls_charged_with_capped_debt(self):
+        budget = HedgeBudget(ratio=0.5, burst=1.0)
+        budget.charge()
+        budget.charge()
+        budget.charge()
+        assert budget.tokens == -1.0
+        budget.earn()
+        assert budget.try_spend() is False
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestHedgedExecution:
+    def test_fast_primary_is_not_hedged(self, coordinator):
+        result = asyncio.run(coordinator._execute_primary_model(_decision(GEMINI), _request()))
+        assert result["model"] == GEMINI
+        assert coordinator.calls[PERPLEXITY] == []
+        assert coordinator.latency.samples(GEMINI) == 1
+
+    def test_slow_primary_hedged_and_cancelled(self, coordinator):
+        coordinator.delays[GEMINI] = 5.0
+        abandoned = hedge_stats['abandoned_calls']
+        result = asyncio.run(coordinator._execute_primary_model(_decision(GEMINI), _request()))
+        assert result["model"] == PERPLEXITY
+        assert coordinator.calls[GEMINI] == ["started", "cancelled"]
+        assert coordinator.calls[PERPLEXITY] == ["started"]
+        assert hedge_stats['abandoned_calls'] == abandoned + 1
+        assert coordinator.hedge_budget.tokens == 0.0  # one token for the hedge, one for the abandoned call
+
+    def test_no_hedge_when_budget_exhausted(self, coordinator):
+        coordinator.delays[GEMINI] = 0.3
+        coordinator.hedge_budget = HedgeBudget(ratio=0.0, burst=0.0)
+        result = asyncio.run(coordinator._execute_primary_model(_decision(GEMINI), _request()))
+        assert result["model"] == GEMINI
+        assert coordinator.calls[PERPLEXITY] == []
+
+    def test_error_from_hedge_waits_for_primary(self, coordinator, monkeypatch):
+        coordinator.delays[GEMINI] = 0.3
+
+        async def failing(request):
+            return {"error": "rate limited"}
+        monkeypatch.setattr(coordinator, "_perplexity_analysis", failing)
+
+        result = asyncio.run(coordinator._execute_primary_model(_decision(GEMINI), _request()))
+        assert result["model"] == GEMINI
+
+    def test_parallel_cancels_straggler_after_grace(self, coordinator):
+        coordinator.delays[PERPLEXITY] = 5.0
+        abandoned = hedge_stats['abandoned_calls']
+        results = asyncio.run(coordinator._parallel_model_execution(_decision(GEMINI, PERPLEXITY), _request()))
+        assert results["gemini"]["model"] == GEMINI
+        assert "cancelled" in results["perplexity"]["error"]
+        assert coordinator.calls[PERPLEXITY] == ["started", "cancelled"]
+        assert hedge_stats['abandoned_calls'] == abandoned + 1
+        assert coordinator.hedge_budget.tokens == 1.0
+
+    def test_parallel_keeps_both_within_grace(self, coordinator):
+        coordinator.delays[PERPLEXITY] = 0.02
+        results = asyncio.run(coordinator._parallel_model_execution(_decision(GEMINI, PERPLEXITY), _request()))
+        assert results["perplexity"]["model"] == PERPLEXITY
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestLatencyAwareRouting:
+    def test_slow_model_loses_primary_routing(self, coordinator):
+        for _ in range(MIN_SAMPLES):
+            coordinator.latency.observe(GEMINI, 1.0)
+            coordinator.latency.observe(PERPLEXITY, 1.0)
+        assert coordinator._intelligent_model_routing(_request(), QueryType.CRISIS_RESPONSE).primary_model == GEMINI
+
+        for _ in range(MIN_SAMPLES):
+            coordinator.latency.observe(GEMINI, 50.0)
+        decision = coordinator._intelligent_model_routing(_request(), QueryType.CRISIS_RESPONSE)
+        assert decision.primary_model == PERPLEXITY
+        assert decision.secondary_model == GEMINI
+
+    def test_statistics_include_latency_and_hedging(self, coordinator):
+        stats = coordinator.get_routing_statistics()
+        assert set(stats["latency_percentiles"]) == {GEMINI, PERPLEXITY}
+        assert {"hedged", "hedge_wins", "abandoned_calls", "enabled", "budget_tokens"} <= set(stats["hedging"])
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestHedgingAgainstFakeProvider:
+    """The hedged primary path with real Gemini SDK calls (REST transport) to the fake provider."""
+
+    def run_hedged(self, monkeypatch, gemini_ms):
+        from app.services.fake_provider import FakeProviderServer
+
+        server = FakeProviderServer({"*": {"latency": {"dist": "fixed", "median_ms": 0}, "tokens_per_sec": 0,
+                                           "output_tokens": [40, 40]}})
+        server.configure({"gemini": {"latency": {"dist": "fixed", "median_ms": gemini_ms}}})
+
+        async def scenario():
+            async with TestServer(server.make_app()) as fake:
+                monkeypatch.setenv("FAKE_AI_PROVIDER_URL", str(fake.make_url("")))
+                monkeypatch.setenv("GEMINI_API_KEY", "fake-key")
+                coordinator = MultiModelCoordinator()
+                coordinator.perplexity_available = True
+                coordinator.latency = LatencyTracker(priors={GEMINI: 0.2, PERPLEXITY: 0.2})
+                coordinator.hedge_budget = HedgeBudget(ratio=0.1, burst=2.0)
+                coordinator.hedging_enabled, coordinator.hedge_min_delay = True, 0.2
+
+                async def perplexity(request):
+                    return {"content": "perplexity answer", "model": PERPLEXITY}
+                monkeypatch.setattr(coordinator, "_perplexity_analysis", perplexity)
+
+                result = await coordinator._execute_primary_model(_decision(GEMINI), _request())
+                return coordinator, result
+
+        return asyncio.run(scenario())
+
+    def test_fast_gemini_answers_and_records_latency(self, monkeypatch):
+        coordinator, result = self.run_hedged(monkeypatch, gemini_ms=0)
+        assert result["model"] == GEMINI
+        assert result["strategic_overview"].startswith("Synthetic strategic overview")
+        assert coordinator.latency.samples(GEMINI) == 1
+
+    def test_slow_gemini_is_hedged(self, monkeypatch):
+        coordinator, result = self.run_hedged(monkeypatch, gemini_ms=3000)
+        assert result["model"] == PERPLEXITY
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestHedgingPastBlockingPerplexity:
+    """The real Perplexity path with a provider whose HTTP call blocks its thread."""
+
+    def test_hedge_starts_on_time(self, monkeypatch):
+        monkeypatch.setenv("PERPLEXITY_API_KEY", "test-key")
+
+        def blocking_post(session, url, **kwargs):
+            time.sleep(1.0)
+            raise requests.Timeout("fake provider too slow")
+        monkeypatch.setattr(requests.Session, "post", blocking_post)
+
+        coordinator = MultiModelCoordinator()
+        coordinator.perplexity_available = coordinator.gemini_available = True
+        coordinator.latency = LatencyTracker(priors={GEMINI: 0.1, PERPLEXITY: 0.1})
+        coordinator.hedge_budget = HedgeBudget(ratio=0.1, burst=2.0)
+        coordinator.hedging_enabled, coordinator.hedge_min_delay = True, 0.1
+        hedge_started = []
+
+        async def gemini(request):
+            hedge_started.append(time.monotonic())
+            return {"content": "gemini answer", "model": GEMINI}
+        monkeypatch.setattr(coordinator, "_gemini_analysis", gemini)
+
+        async def scenario():
+            started = time.monotonic()
+            result = await coordinator._execute_primary_model(_decision(PERPLEXITY, GEMINI), _request())
+            return result, started
+
+        result, started = asyncio.run(scenario())
+        assert result["model"] == GEMINI
+        assert hedge_started[0] - started < 0.5
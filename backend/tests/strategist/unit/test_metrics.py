@@ -0,0 +1,214 @@
+"""
+Unit tests for the observability metrics module.
+Tests fixed-bucket histograms, cross-worker aggregation and Prometheus export.
+"""
+import time
+
+import pytest
+from collections import defaultdict
+from flask import Flask
+
+from strategist.observability.metrics import (
+    Histogram,
+    MetricsCollector,
+    SharedMetricsStore,
+    LATENCY_BUCKETS,
+    bucket_quantile,
+    render_prometheus,
+)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands the store uses."""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+        self.sets = defaultdict(set)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        r = self.redis
+        results = []
+        for name, args, kwargs in self.ops:
+            if name == "hincrby":
+                key, field, amount = args
+                r.hashes[key][field] = str(int(r.hashes[key].get(field, 0)) + amount)
+            elif name == "hincrbyfloat":
+                key, field, amount = args
+                r.hashes[key][field] = str(float(r.hashes[key].get(field, 0)) + amount)
+            elif name == "hset":
+                key = args[0]
+                mapping = kwargs.get("mapping") or {args[1]: args[2]}
+                r.hashes[key].update({k: str(v) for k, v in mapping.items()})
+            elif name == "sadd":
+                r.sets[args[0]].add(args[1])
+            elif name == "hgetall":
+                results.append(dict(r.hashes.get(args[0], {})))
+                continue
+            elif name == "smembers":
+                results.append(set(r.sets.get(args[0], set())))
+                continue
+            results.append(True)
+        self.ops = []
+        return results
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestHistogram:
+    """Test fixed-bucket histogram behaviour."""
+
+    def test_observe_places_values_in_le_buckets(self):
+        hist = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            hist.observe(value)
+
+        assert hist.counts == [2, 1, 1]
+        assert hist.count == 4
+        assert hist.sum == pytest.approx(5.65)
+
+    def test_quantile_interpolates_and_clamps(self):
+        hist = Histogram(LATENCY_BUCKETS)
+        for i in range(1, 101):
+            hist.observe(i / 100.0)  # 10ms .. 1s uniformly
+
+        assert hist.quantile(0.0) == pytest.approx(0.01)
+        assert hist.quantile(1.0) == pytest.approx(1.0)
+        assert 0.5 <= hist.quantile(0.95) <= 1.0
+
+    def test_bucket_quantile_empty(self):
+        assert bucket_quantile((1.0, 2.0), [0, 0, 0], 0.95) == 0.0
+
+    def test_timers_are_not_truncated(self):
+        collector = MetricsCollector()
+        for _ in range(5000):
+            collector.timing("test.latency", 0.2)
+
+        summary = collector.get_metrics_summary()
+        assert summary["timers"]["test.latency"]["count"] == 5000
+        assert summary["timers"]["test.latency"]["p95"] == pytest.approx(0.2)
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestSharedMetricsStore:
+    """Test delta merging of per-process metrics through Redis."""
+
+    def test_two_workers_report_identical_merged_numbers(self):
+        redis = FakeRedis()
+        workers = []
+        for _ in range(2):
+            collector = MetricsCollector()
+            collector.shared_store = SharedMetricsStore(redis, flush_interval=3600)
+            workers.append(collector)
+
+        workers[0].api_call("ward_analysis", 0.2, 200)
+        workers[1].api_call("ward_analysis", 4.0, 500)
+        workers[1].api_call("ward_analysis", 0.3, 200)
+
+        for collector in workers:
+            collector.shared_store.push(collector)
+
+        first = workers[0].get_metrics_summary()
+        second = workers[1].get_metrics_summary()
+
+        assert first["api_calls"] == second["api_calls"]
+        assert first["api_calls"]["api.ward_analysis"]["count"] == 3
+        assert first["counters"]["api.requests,endpoint=ward_analysis,status=200"] == 2
+
+    def test_repeated_push_sends_only_deltas(self):
+        redis = FakeRedis()
+        collector = MetricsCollector()
+        store = SharedMetricsStore(redis, flush_interval=3600)
+
+        collector.increment("test.calls", 3)
+        store.push(collector)
+        store.push(collector)
+        collector.increment("test.calls", 2)
+        store.push(collector)
+
+        assert store.pull()["counter"]["test.calls"] == 5
+
+    def test_recording_does_not_flush_on_the_caller_thread(self):
+        redis = FakeRedis()
+        collector = MetricsCollector()
+        store = SharedMetricsStore(redis, flush_interval=0.05)
+        collector.shared_store = store
+        try:
+            collector.increment("test.calls", 4)
+            assert not redis.hashes  # nothing sent synchronously
+
+            deadline = time.monotonic() + 2
+            while not redis.hashes and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert store.pull()["counter"]["test.calls"] == 4
+        finally:
+            store.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestPrometheusExport:
+    """Test the text exposition rendering."""
+
+    def test_render_histogram_and_counter(self):
+        collector = MetricsCollector()
+        collector.timing("ai.model.duration", 0.3, {"model": "gemini", "operation": "briefing"})
+        collector.increment("ai.model.calls", 1, {"model": "gemini"})
+
+        text = render_prometheus(collector.local_families())
+
+        assert "# TYPE lokdarpan_ai_model_duration_seconds histogram" in text
+        assert 'lokdarpan_ai_model_duration_seconds_bucket{model="gemini",operation="briefing",le="0.5"} 1' in text
+        assert 'lokdarpan_ai_model_duration_seconds_bucket{model="gemini",operation="briefing",le="+Inf"} 1' in text
+        assert 'lokdarpan_ai_model_duration_seconds_count{model="gemini",operation="briefing"} 1' in text
+        assert 'lokdarpan_ai_model_calls_total{model="gemini"} 1' in text
+
+    def test_label_values_are_escaped(self):
+        collector = MetricsCollector()
+        collector.increment("user.actions", 1, {"ward": 'Ward "95"'})
+
+        text = render_prometheus(collector.local_families())
+
+        assert 'ward="Ward \\"95\\""' in text
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestPrometheusEndpoint:
+    """Test access control on the scrape endpoint."""
+
+    @pytest.fixture
+    def scrape(self):
+        from strategist.observability.dashboard import observability_bp
+
+        app = Flask(__name__)
+        app.register_blueprint(observability_bp)
+
+        def get(token=None, remote_addr="127.0.0.1", header=None):
+            app.config["METRICS_SCRAPE_TOKEN"] = token
+            headers = {"Authorization": header} if header else {}
+            return app.test_client().get("/api/v1/monitor/prometheus", headers=headers,
+                                         environ_base={"REMOTE_ADDR": remote_addr})
+        return get
+
+    def test_without_token_only_loopback_is_served(self, scrape):
+        assert scrape().status_code == 200
+        assert scrape(remote_addr="10.0.0.7").status_code == 403
+
+    def test_token_required_when_configured(self, scrape):
+        assert scrape(token="s3cret").status_code == 401
+        assert scrape(token="s3cret", remote_addr="10.0.0.7", header="Bearer s3cret").status_code == 200
@@ -0,0 +1,195 @@
+"""
+Unit tests for the strategist tracing module.
+Tests span nesting, W3C propagation, AI call attributes and OTLP export.
+"""
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from strategist.observability import tracing
+from strategist.observability.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    STATUS_ERROR,
+    STATUS_OK,
+    ai_call_span,
+    estimate_cost,
+    extract,
+    inject,
+    record_token_usage,
+    start_span,
+    traced,
+    usage_from_response,
+)
+
+
+@pytest.fixture
+def exporter():
+    """Route the global tracer to an in-memory exporter for one test."""
+    tracer = tracing.get_tracer()
+    previous = (tracer.exporter, tracer.sample_rate)
+    memory = InMemorySpanExporter()
+    tracer.exporter = memory
+    tracer.sample_rate = 1.0
+    yield memory
+    tracer.force_flush()
+    tracer.exporter, tracer.sample_rate = previous
+
+
+def finished(exporter):
+    tracing.get_tracer().force_flush()
+    return {s.name: s for s in exporter.spans}
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestSpans:
+    def test_nested_spans_share_trace_and_link_parents(self, exporter):
+        with start_span("root") as root:
+            with start_span("child") as child:
+                pass
+
+        spans = finished(exporter)
+        assert spans["child"].trace_id == root.trace_id
+        assert spans["child"].parent_span_id == root.span_id
+        assert spans["root"].parent_span_id is None
+        assert child.status == STATUS_OK
+        assert tracing.current_span() is None
+
+    def test_exception_marks_span_as_error(self, exporter):
+        with pytest.raises(ValueError):
+            with start_span("boom"):
+                raise ValueError("bad input")
+
+        span = finished(exporter)["boom"]
+        assert span.status == STATUS_ERROR
+        assert span.events[0]["attributes"]["exception.type"] == "ValueError"
+
+    @pytest.mark.asyncio
+    async def test_gathered_tasks_nest_under_current_span(self, exporter):
+        @traced("worker")
+        async def worker():
+            await asyncio.sleep(0)
+
+        with start_span("fanout") as parent:
+            await asyncio.gather(worker(), worker())
+
+        tracing.get_tracer().force_flush()
+        workers = [s for s in exporter.spans if s.name == "worker"]
+        assert len(workers) == 2
+        assert all(s.parent_span_id == parent.span_id for s in workers)
+
+    def test_unsampled_traces_are_not_exported(self, exporter):
+        tracing.get_tracer().sample_rate = 0.0
+        with start_span("dropped"):
+            with start_span("dropped.child"):
+                pass
+        assert finished(exporter) == {}
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestPropagation:
+    def test_traceparent_round_trip(self, exporter):
+        with start_span("publish") as span:
+            headers = inject({})
+
+        ctx = extract(headers)
+        assert headers["traceparent"] == f"00-{span.trace_id}-{span.span_id}-01"
+        assert (ctx.trace_id, ctx.span_id, ctx.sampled) == (span.trace_id, span.span_id, True)
+
+    @pytest.mark.parametrize("value", [None, "", "garbage", "00-" + "0" * 32 + "-" + "1" * 16 + "-01"])
+    def test_invalid_traceparent_is_ignored(self, value):
+        assert extract({"traceparent": value}) is None
+
+    def test_celery_task_joins_publisher_trace(self, exporter):
+        with start_span("request") as parent:
+            headers = {}
+            tracing._before_task_publish(headers=headers)
+
+        task = SimpleNamespace(name="app.tasks.ping", request=SimpleNamespace(traceparent=headers["traceparent"]))
+        tracing._task_prerun(task_id="t-1", task=task)
+        with start_span("inside.task"):
+            pass
+        tracing._task_postrun(task_id="t-1", state="SUCCESS")
+
+        spans = finished(exporter)
+        consumer = spans["celery.task app.tasks.ping"]
+        assert consumer.trace_id == parent.trace_id
+        assert consumer.parent_span_id == parent.span_id
+        assert spans["inside.task"].parent_span_id == consumer.span_id
+        assert consumer.attributes["celery.state"] == "SUCCESS"
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestAICallSpans:
+    def test_token_usage_and_cost_attributes(self, exporter):
+        response = SimpleNamespace(usage_metadata=SimpleNamespace(prompt_token_count=1000, candidates_token_count=500))
+        with patch("strategist.observability.metrics.record_ai_model_call") as record:
+            with ai_call_span("gemini", "gemini-2.0-flash-exp", "create_plan") as span:
+                record_token_usage(span, *usage_from_response(response))
+
+        attrs = finished(exporter)["ai.gemini.create_plan"].attributes
+        assert attrs["gen_ai.usage.input_tokens"] == 1000
+        assert attrs["gen_ai.usage.output_tokens"] == 500
+        assert attrs["lokdarpan.cost_usd"] == pytest.approx(estimate_cost("gemini-2.0-flash-exp", 1000, 500))
+        assert record.call_args[0][3] == 1500
+        assert record.call_args[0][4] is True
+
+    def test_openai_style_usage_and_provider_pricing_fallback(self):
+        assert usage_from_response({"usage": {"prompt_tokens": 12, "completion_tokens": 30}}) == (12, 30)
+        assert usage_from_response("no usage") == (0, 0)
+        assert estimate_cost("sonar-unknown", 1_000_000, 0, provider="perplexity") == pytest.approx(1.0)
+        assert estimate_cost("mystery", 100, 100) == 0.0
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+class TestPipelineStages:
+    @pytest.mark.asyncio
+    async def test_analyze_situation_emits_stage_spans(self, exporter):
+        from strategist.service import PoliticalStrategist
+
+        planner = MagicMock()
+        planner.create_analysis_plan = AsyncMock(return_value={"queries": ["q1", "q2"]})
+        planner.generate_briefing = AsyncMock(return_value={"confidence_score": 0.7, "source_citations": []})
+        retriever = MagicMock(gather_intelligence=AsyncMock(return_value={"intelligence_items": []}))
+        credibility = MagicMock(score_sources=AsyncMock(return_value={"intelligence_items": []}))
+        nlp = MagicMock(analyze_corpus=AsyncMock(return_value={"text_count": 0}))
+
+        with patch.multiple('strategist.service',
+                            StrategicPlanner=lambda: planner,
+                            PerplexityRetriever=lambda: retriever,
+                            NLPProcessor=lambda: nlp,
+                            CredibilityScorer=lambda: credibility,
+                            MultiModelCoordinator=MagicMock):
+            await PoliticalStrategist("Jubilee Hills").analyze_situation("quick")
+
+        spans = finished(exporter)
+        root = spans["strategist.analyze_situation"]
+        assert root.attributes["ward"] == "Jubilee Hills"
+        assert root.attributes["depth"] == "quick"
+        for stage in ("plan", "retrieve", "credibility", "nlp", "briefing", "guardrails"):
+            assert spans[f"strategist.{stage}"].parent_span_id == root.span_id
+        assert spans["strategist.plan"].attributes["queries"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.strategist
+def test_file_exporter_writes_otlp_json(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = tracing.Tracer(service_name="test-svc", exporter=FileSpanExporter(str(path)))
+    span = tracer.start_span("op", {"ward": "Begumpet", "count": 3})
+    span.end()
+    tracer.force_flush()
+
+    doc = json.loads(path.read_text().strip())
+    resource_span = doc["resourceSpans"][0]
+    assert resource_span["resource"]["attributes"][0]["value"] == {"stringValue": "test-svc"}
+    exported = resource_span["scopeSpans"][0]["spans"][0]
+    assert exported["name"] == "op"
+    assert {"key": "count", "value": {"intValue": "3"}} in exported["attributes"]
+    assert int(exported["endTimeUnixNano"]) >= int(exported["startTimeUnixNano"])
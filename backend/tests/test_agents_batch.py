@@ -0,0 +1,133 @@
+"""
+Tests for concurrent agent batch analysis (app/agents_batch.py and
+/api/v1/agents/batch-analysis).
+"""
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from app import agents_batch
+from app.agents_api import agents_bp, batch_analysis_job
+
+
+@pytest.fixture
+def agents_app():
+    app = Flask(__name__)
+    app.config.update(TESTING=True, AGENT_BATCH_CONCURRENCY=3, AGENT_BATCH_WARD_TIMEOUT_SECONDS=0.5,
+                      AGENT_BATCH_SYNC_MAX_WARDS=6)
+    app.register_blueprint(agents_bp)
+    return app
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """analyze-ward stub: 0.1s per ward, except the "Broken", "Refused" and "Stuck" wards."""
+    state = {"running": 0, "peak": 0}
+
+    async def execute(command, parameters):
+        ward = parameters["ward_name"]
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(5 if ward == "Stuck" else 0.1)
+            if ward == "Broken":
+                raise RuntimeError("provider down")
+            if ward == "Refused":
+                return {"error": "Command processing failed", "details": "no data"}
+            return {"ward": ward, "depth": parameters["depth"]}
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(agents_batch, "execute_agent_command", execute)
+    return state
+
+
+WARDS = ["Jubilee Hills", "Banjara Hills", "Broken", "Refused", "Stuck", "Himayath Nagar"]
+
+
+@pytest.mark.unit
+class TestBatchExecutor:
+    def test_bounded_concurrency_and_per_ward_outcomes(self, agents_app, fake_agent):
+        started = time.monotonic()
+        with agents_app.app_context():
+            outcomes = agents_batch.gather_batch(WARDS, concurrency=3, timeout=0.5)
+        assert time.monotonic() - started < 1.5
+        assert fake_agent["peak"] == 3 and fake_agent["running"] == 0
+
+        assert [o["ward"] for o in outcomes] == WARDS
+        assert [o["status"] for o in outcomes] == ["ok", "ok", "error", "error", "timeout", "ok"]
+        assert outcomes[2]["error"] == "provider down" and outcomes[3]["error"] == "no data"
+
+    def test_stream_yields_in_completion_order_and_cancels_on_close(self, agents_app, fake_agent):
+        with agents_app.app_context():
+            stream = agents_batch.stream_batch(["Stuck", "Jubilee Hills"], concurrency=2, timeout=0.5)
+            assert next(stream)["ward"] == "Jubilee Hills"
+            stream.close()
+        time.sleep(0.1)
+        assert fake_agent["running"] == 0
+
+    def test_close_before_the_first_item_cancels(self, agents_app, fake_agent):
+        with agents_app.app_context():
+            agents_batch.stream_batch(["Stuck"], concurrency=1, timeout=10).close()
+        deadline = time.monotonic() + 1
+        while any(t.name == "agents-batch" for t in threading.enumerate()) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not any(t.name == "agents-batch" for t in threading.enumerate())
+        assert fake_agent["running"] == 0
+
+
+@pytest.mark.unit
+class TestBatchAnalysisEndpoint:
+    def test_json(self, agents_app, fake_agent):
+        response = agents_app.test_client().post("/api/v1/agents/batch-analysis", json={"wards": WARDS})
+        body = response.get_json()
+        assert response.status_code == 200 and set(body["batch_analysis"]) == set(WARDS)
+        assert body["batch_analysis"]["Jubilee Hills"] == {"ward": "Jubilee Hills", "depth": "standard"}
+        assert body["batch_analysis"]["Stuck"]["status"] == "timeout"
+        assert (body["successful_analyses"], body["failed_analyses"], body["timed_out"]) == (3, 2, 1)
+
+    def test_ndjson_and_sse(self, agents_app, fake_agent):
+        client = agents_app.test_client()
+        response = client.post("/api/v1/agents/batch-analysis",
+                               json={"wards": ["Stuck", "Banjara Hills"], "stream": "ndjson"})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert response.mimetype == "application/x-ndjson"
+        assert [(l["type"], l.get("ward")) for l in lines] == [("ward", "Banjara Hills"), ("ward", "Stuck"),
+                                                               ("summary", None)]
+        assert lines[-1]["successful_analyses"] == 1 and lines[-1]["timed_out"] == 1
+
+        response = client.post("/api/v1/agents/batch-analysis", json={"wards": ["Banjara Hills"]},
+                               headers={"Accept": "text/event-stream"})
+        assert response.mimetype == "text/event-stream"
+        assert response.get_data(as_text=True).startswith("event: ward\ndata: ")
+
+    def test_large_batches_become_jobs(self, agents_app, monkeypatch):
+        queued = []
+        monkeypatch.setattr(batch_analysis_job, "delay",
+                            lambda wards, **options: queued.append((wards, options)) or SimpleNamespace(id="job-1"))
+        client = agents_app.test_client()
+
+        response = client.post("/api/v1/agents/batch-analysis", json={"wards": [f"Ward {i}" for i in range(7)]})
+        assert response.status_code == 202
+        assert response.get_json()["status_url"] == "/api/v1/agents/batch-analysis/job-1"
+        assert client.post("/api/v1/agents/batch-analysis",
+                           json={"wards": ["Jubilee Hills"], "mode": "async"}).status_code == 202
+        assert queued[1] == (["Jubilee Hills"], {"depth": "standard", "concurrency": 3, "timeout": 0.5})
+
+        assert client.post("/api/v1/agents/batch-analysis", json={"wards": "Jubilee Hills"}).status_code == 400
+
+    def test_job_publishes_progress(self, agents_app, fake_agent, monkeypatch):
+        progress = []
+        monkeypatch.setattr(batch_analysis_job, "update_state", lambda state, meta: progress.append(meta))
+
+        with agents_app.app_context():
+            result = batch_analysis_job.run(["Broken", "Jubilee Hills"], concurrency=2, timeout=0.5)
+
+        assert [p["completed"] for p in progress] == [1, 2]
+        assert list(result["batch_analysis"]) == ["Broken", "Jubilee Hills"]
+        assert result["successful_analyses"] == 1 and result["failed_analyses"] == 1
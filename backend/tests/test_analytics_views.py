@@ -0,0 +1,106 @@
+"""
+Tests for freshness-gated reads from the materialized analytics views.
+
+SQLite has no materialized views, so the view-path tests stand in a plain
+daily_ward_trends table and force the freshness check.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app import analytics_views, trends_api
+from app.analytics_views import FRESHNESS_HEADER, fresh_view, record_refresh, refresh_views, view_age
+from app.extensions import db
+from app.models import MaterializedViewRefresh, Post
+
+
+@pytest.fixture
+def trends_table(db_session):
+    db.session.execute(text(
+        "CREATE TABLE daily_ward_trends (trend_date DATE, ward_id TEXT, city TEXT, "
+        "emotion TEXT, party TEXT, posts INTEGER)"
+    ))
+    db.session.commit()
+    yield
+    db.session.execute(text("DROP TABLE daily_ward_trends"))
+    db.session.commit()
+
+
+@pytest.mark.unit
+class TestRefreshTracking:
+    def test_refresh_skips_without_postgres(self, db_session):
+        assert "skipped" in refresh_views()
+        assert fresh_view("daily_ward_trends") is None
+
+    def test_failed_refresh_keeps_last_success(self, db_session):
+        ok_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=5)
+        record_refresh("daily_ward_trends", ok_at, 120, concurrent=True)
+        record_refresh("daily_ward_trends", ok_at + timedelta(minutes=4), 80, concurrent=True, error="boom")
+
+        row = db.session.get(MaterializedViewRefresh, "daily_ward_trends")
+        assert row.refreshed_at == ok_at
+        assert row.last_error == "boom"
+        assert 295 <= view_age("daily_ward_trends") <= 310
+
+    def test_never_refreshed_has_no_age(self, db_session):
+        assert view_age("ward_activity_windows") is None
+
+
+@pytest.mark.unit
+class TestTrendsReadPath:
+    def test_live_path_when_views_unavailable(self, client, auth_headers):
+        db.session.add(Post(text="roads", city="Jubilee Hills", emotion="Anger",
+                            created_at=datetime.now(timezone.utc)))
+        db.session.commit()
+
+        response = client.get("/api/v1/trends?ward=Jubilee Hills&days=7", headers=auth_headers)
+        assert response.headers[FRESHNESS_HEADER] == "live"
+        assert sum(d["mentions_total"] for d in response.get_json()["series"]) == 1
+
+    def test_fresh_view_serves_trends(self, client, auth_headers, trends_table, monkeypatch):
+        today = date.today()
+        db.session.execute(text(
+            "INSERT INTO daily_ward_trends VALUES "
+            "(:d, '95', 'Jubilee Hills', 'Anger', 'BJP', 3), "
+            "(:d, '95', 'Ward 95 Jubilee Hills', 'Anger', 'BJP', 2), "
+            "(:d, '93', 'Banjara Hills', 'Joy', 'INC', 7), "
+            "(:old, '95', 'Jubilee Hills', 'Joy', 'BRS', 9)"
+        ), {"d": today.isoformat(), "old": (today - timedelta(days=60)).isoformat()})
+        db.session.commit()
+        monkeypatch.setattr(trends_api, "fresh_view", lambda name: 42.0)
+
+        response = client.get("/api/v1/trends?ward=Ward 95 Jubilee Hills&days=7", headers=auth_headers)
+        body = response.get_json()
+
+        assert response.headers[FRESHNESS_HEADER] == "view=daily_ward_trends; age=42"
+        day = next(d for d in body["series"] if d["date"] == today.isoformat())
+        assert day == {"date": today.isoformat(), "mentions_total": 5,
+                       "emotions": {"Anger": 5}, "parties": {"BJP": 5}}
+        assert sum(d["mentions_total"] for d in body["series"]) == 5
+
+    def test_view_and_live_paths_match_city_labels_alike(self, client, auth_headers, trends_table, monkeypatch):
+        now = datetime.now(timezone.utc)
+        db.session.add_all([Post(text="roads", city=city, emotion="Anger", created_at=now)
+                            for city in ("Hyderabad", "HYDERABAD", "Secunderabad")])
+        db.session.execute(text(
+            "INSERT INTO daily_ward_trends VALUES "
+            "(:d, NULL, 'Hyderabad', 'Anger', 'Other', 1), (:d, NULL, 'HYDERABAD', 'Anger', 'Other', 1), "
+            "(:d, NULL, 'Secunderabad', 'Anger', 'Other', 1)"
+        ), {"d": now.date().isoformat()})
+        db.session.commit()
+
+        def total():
+            body = client.get("/api/v1/trends?ward=hyderabad&days=7", headers=auth_headers).get_json()
+            return sum(d["mentions_total"] for d in body["series"])
+
+        live = total()
+        monkeypatch.setattr(trends_api, "fresh_view", lambda name: 42.0)
+        assert total() == live == 2
+
+    def test_stale_view_falls_back(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(analytics_views, "views_supported", lambda: True)
+        record_refresh("daily_ward_trends", datetime(2020, 1, 1), 10, concurrent=True)
+
+        response = client.get("/api/v1/trends?ward=All&days=7", headers=auth_headers)
+        assert response.headers[FRESHNESS_HEADER] == "live"
@@ -0,0 +1,122 @@
+"""
+Tests for the local emotion and driver classifier (app/emotion_classifier.py).
+"""
+import random
+import time
+
+import pytest
+
+from app import emotion_classifier
+from app.emotion_classifier import (EmotionClassifier, extract_drivers, get_classifier, label_texts,
+                                    label_unlabelled_posts)
+from app.models import Post
+
+TEMPLATES = {
+    "Anger": ["residents furious over {issue} neglect", "shameful failure on {issue}, people are fed up",
+              "outrage in {place} as {issue} collapses again"],
+    "Hopeful": ["new {issue} project brings hope to {place}", "residents welcome promise to fix {issue}",
+                "{place} looks forward to better {issue} next year"],
+    "Concerned": ["worry grows over {issue} in {place}", "families anxious about {issue} before monsoon",
+                  "experts warn of {issue} risk in {place}"],
+}
+ISSUES = ["drainage", "roads", "water supply", "garbage", "traffic", "street lights"]
+PLACES = ["Jubilee Hills", "Old City", "Secunderabad", "Kukatpally", "Malakpet"]
+
+
+def _corpus(n, seed=7):
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for _ in range(n):
+        label = rng.choice(sorted(TEMPLATES))
+        texts.append(rng.choice(TEMPLATES[label]).format(issue=rng.choice(ISSUES), place=rng.choice(PLACES)))
+        labels.append(label)
+    return texts, labels
+
+
+@pytest.fixture(autouse=True)
+def fresh_classifier():
+    emotion_classifier.clear_classifier_cache()
+    yield
+    emotion_classifier.clear_classifier_cache()
+
+
+@pytest.mark.unit
+class TestEmotionClassifier:
+    def test_learns_labelled_posts(self):
+        texts, labels = _corpus(600)
+        model = EmotionClassifier().fit(texts[:500], labels[:500])
+        predicted = [emotion for emotion, _ in model.predict(texts[500:])]
+        accuracy = sum(p == y for p, y in zip(predicted, labels[500:])) / 100
+        assert accuracy > 0.9
+        assert {"Anger", "Hopeful", "Concerned", "Angry"} <= set(model.classes)
+        assert model.trained_on == 500
+
+    def test_lexicon_labels_without_training_data(self):
+        model = EmotionClassifier().fit([], [])
+        (emotion, confidence), (_, unsure) = model.predict([
+            "Residents are furious about potholes in Old City",
+            "GHMC press release on Tuesday",
+        ])
+        assert emotion == "Angry" and confidence >= 0.5
+        assert unsure == pytest.approx(1 / len(model.classes))
+
+    def test_batch_throughput(self):
+        texts, labels = _corpus(5000)
+        model = EmotionClassifier().fit(texts, labels)
+        started = time.perf_counter()
+        label_texts(texts, llm_fallback=False, classifier=model)
+        assert len(texts) / (time.perf_counter() - started) > 2000
+
+    def test_drivers(self):
+        assert extract_drivers("Potholes and road repairs: BJP blames GHMC, potholes everywhere") == \
+            ["roads", "BJP", "GHMC"]
+        assert extract_drivers("Nothing to see here") == []
+
+
+@pytest.mark.unit
+class TestLLMFallback:
+    def test_only_unsure_posts_reach_the_llm(self, monkeypatch):
+        calls = []
+
+        def fake_llm(texts, emotions):
+            calls.append(list(texts))
+            return [{"emotion": "Neutral", "drivers": ["press release"]} for _ in texts]
+
+        monkeypatch.setattr(emotion_classifier, "llm_enabled", lambda: True)
+        monkeypatch.setattr(emotion_classifier, "_llm_labels", fake_llm)
+        texts = ["Residents are furious about potholes in Old City", "GHMC press release on Tuesday"]
+        sure, unsure = label_texts(texts, classifier=EmotionClassifier().fit([], []))
+
+        assert calls == [[texts[1]]]
+        assert (sure.emotion, sure.source) == ("Angry", "model")
+        assert (unsure.emotion, unsure.drivers, unsure.source) == ("Neutral", ["press release"], "llm")
+
+    def test_disabled_provider_keeps_model_labels(self, monkeypatch):
+        monkeypatch.setattr(emotion_classifier.llm, "LLM_PROVIDER", "none")
+        monkeypatch.setattr(emotion_classifier, "_llm_labels", pytest.fail)
+        (label,) = label_texts(["GHMC press release on Tuesday"], classifier=EmotionClassifier().fit([], []))
+        assert label.source == "model"
+
+
+@pytest.mark.unit
+class TestPostLabelling:
+    def test_trains_on_stored_labels_and_backfills(self, app, db_session, monkeypatch):
+        monkeypatch.setattr(emotion_classifier, "llm_enabled", lambda: False)
+        session = db_session.session
+        texts, labels = _corpus(200)
+        session.add_all(Post(text=t, city="Jubilee Hills", emotion=e) for t, e in zip(texts, labels))
+        # Neither of these may teach the model
+        session.add(Post(text="worry grows over drainage", city="Old City", emotion="Anger", emotion_source="model"))
+        session.add(Post(text="n/a", city="Old City", emotion="Unknown"))
+        pending = [Post(text="outrage in Malakpet as garbage collapses again", city="Malakpet"),
+                   Post(text="new metro project brings hope to Kukatpally", city="Kukatpally")]
+        session.add_all(pending)
+        session.commit()
+
+        assert get_classifier().trained_on == 200
+        assert label_unlabelled_posts(batch_size=1) == {"labelled": 2, "batches": 2}
+        session.refresh(pending[0])
+        session.refresh(pending[1])
+        assert (pending[0].emotion, pending[0].emotion_source) == ("Anger", "model")
+        assert pending[1].emotion == "Hopeful"
+        assert Post.query.filter(Post.emotion.is_(None)).count() == 0
@@ -0,0 +1,277 @@
+"""
+Tests for the fake AI provider server and endpoint overrides.
+"""
+import asyncio
+import json
+import random
+import statistics
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from app.services.fake_provider import FakeProviderServer, ProviderProfile, _parse_overrides
+import provider_endpoints
+
+INSTANT = {"*": {"latency": {"dist": "fixed", "median_ms": 0}, "tokens_per_sec": 0, "output_tokens": [40, 40]}}
+
+
+def run_against(server, scenario):
+    """Run ``scenario(client)`` against an in-process fake provider server."""
+    async def runner():
+        async with TestClient(TestServer(server.make_app())) as client:
+            return await scenario(client)
+    return asyncio.run(runner())
+
+
+def sse_data(text):
+    return [line[len("data: "):] for line in text.splitlines() if line.startswith("data: ")]
+
+
+@pytest.mark.unit
+class TestFakeProviderShapes:
+    def test_gemini_generate_content_json_mode(self):
+        async def scenario(client):
+            resp = await client.post(
+                "/gemini/v1beta/models/gemini-2.0-flash-exp:generateContent",
+                json={"contents": [{"parts": [{"text": "Ward: Jubilee Hills\nplan queries"}]}],
+                      "generationConfig": {"responseMimeType": "application/json"}},
+            )
+            return resp.status, await resp.json()
+
+        status, body = run_against(FakeProviderServer(INSTANT), scenario)
+        assert status == 200
+        plan = json.loads(body["candidates"][0]["content"]["parts"][0]["text"])
+        assert plan["queries"][0].startswith("Jubilee Hills")
+        assert body["usageMetadata"]["candidatesTokenCount"] == 40
+
+    def test_openai_stream_ends_with_done_and_usage(self):
+        async def scenario(client):
+            resp = await client.post("/openai/v1/chat/completions", json={
+                "model": "gpt-4o", "stream": True, "stream_options": {"include_usage": True},
+                "messages": [{"role": "user", "content": "hello"}],
+            })
+            return resp.headers["Content-Type"], await resp.text()
+
+        content_type, text = run_against(FakeProviderServer(INSTANT), scenario)
+        events = sse_data(text)
+        assert content_type.startswith("text/event-stream")
+        assert events[-1] == "[DONE]"
+        final = json.loads(events[-2])
+        assert final["choices"][0]["finish_reason"] == "stop"
+        assert final["usage"]["completion_tokens"] == 40
+
+    def test_anthropic_stream_event_sequence(self):
+        async def scenario(client):
+            resp = await client.post("/anthropic/v1/messages", json={
+                "model": "claude-3-5-sonnet", "max_tokens": 100, "stream": True,
+                "messages": [{"role": "user", "content": "hello"}],
+            })
+            return await resp.text()
+
+        text = run_against(FakeProviderServer(INSTANT), scenario)
+        names = [line.split(": ", 1)[1] for line in text.splitlines() if line.startswith("event: ")]
+        assert names[:2] == ["message_start", "content_block_start"]
+        assert names[-3:] == ["content_block_stop", "message_delta", "message_stop"]
+        assert "content_block_delta" in names
+
+    def test_perplexity_includes_citations(self):
+        async def scenario(client):
+            resp = await client.post("/perplexity/chat/completions", json={
+                "model": "sonar", "messages": [{"role": "user", "content": "ward news"}],
+            })
+            return await resp.json()
+
+        body = run_against(FakeProviderServer(INSTANT), scenario)
+        assert body["citations"]
+        assert body["usage"]["total_tokens"] == body["usage"]["prompt_tokens"] + 40
+
+
+@pytest.mark.unit
+class TestFakeProviderBehaviour:
+    def test_rate_limits_and_accounting(self):
+        server = FakeProviderServer(INSTANT)
+        server.configure({"openai": {"rate_limit_rate": 1.0}})
+
+        async def scenario(client):
+            limited = await client.post("/openai/v1/chat/completions", json={"model": "gpt-4o", "messages": []})
+            ok = await client.post("/llama/v1/chat/completions", json={"model": "llama", "messages": []})
+            stats = await (await client.get("/_fake/stats")).json()
+            return limited, ok.status, stats
+
+        limited, ok_status, stats = run_against(server, scenario)
+        assert limited.status == 429
+        assert limited.headers["Retry-After"] == "1"
+        assert ok_status == 200
+        rows = {row["provider"]: row for row in stats["providers"]}
+        assert rows["openai"]["rate_limited"] == 1
+        assert rows["llama"]["output_tokens"] == 40
+
+    def test_lognormal_latency_matches_profile(self):
+        profile = ProviderProfile(
+            {"latency": {"dist": "lognormal", "median_ms": 500, "p95_ms": 1500}}, random.Random(7)
+        )
+        samples = sorted(profile.first_token_delay() * 1000 for _ in range(4000))
+        assert statistics.median(samples) == pytest.approx(500, rel=0.1)
+        assert samples[int(len(samples) * 0.95)] == pytest.approx(1500, rel=0.15)
+
+    def test_cli_overrides(self):
+        assert _parse_overrides(["gemini.error_rate=0.05", "gemini.latency.median_ms=300"]) == {
+            "gemini": {"error_rate": 0.05, "latency": {"median_ms": 300}}
+        }
+
+
+@pytest.mark.unit
+class TestProviderEndpoints:
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        for key in ("FAKE_AI_PROVIDER_URL", "GEMINI_API_ENDPOINT", "PERPLEXITY_BASE_URL",
+                    "OPENAI_BASE_URL", "ANTHROPIC_BASE_URL", "LLAMA_BASE_URL"):
+            # setenv first so monkeypatch restores the variable's absence afterwards
+            monkeypatch.setenv(key, "")
+            monkeypatch.delenv(key)
+
+    def test_defaults_leave_sdks_alone(self):
+        assert provider_endpoints.gemini_configure_kwargs() == {}
+        assert provider_endpoints.sdk_base_url_kwargs("openai") == {}
+        assert provider_endpoints.perplexity_chat_url() == "https://api.perplexity.ai/chat/completions"
+
+    def test_fake_url_routes_every_provider(self, monkeypatch):
+        monkeypatch.setenv("FAKE_AI_PROVIDER_URL", "http://127.0.0.1:8900/")
+        assert provider_endpoints.gemini_configure_kwargs() == {
+            "transport": "rest", "client_options": {"api_endpoint": "http://127.0.0.1:8900/gemini"},
+        }
+        assert provider_endpoints.sdk_base_url_kwargs("anthropic") == {"base_url": "http://127.0.0.1:8900/anthropic"}
+        assert provider_endpoints.perplexity_chat_url() == "http://127.0.0.1:8900/perplexity/chat/completions"
+
+    def test_explicit_override_wins(self, monkeypatch):
+        monkeypatch.setenv("FAKE_AI_PROVIDER_URL", "http://127.0.0.1:8900")
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://proxy.local/v1")
+        assert provider_endpoints.provider_base_url("openai") == "http://proxy.local/v1"
+
+    def test_configure_from_flask_config(self):
+        provider_endpoints.configure_provider_endpoints({"FAKE_AI_PROVIDER_URL": "http://fake:8900"})
+        assert provider_endpoints.provider_base_url("llama") == "http://fake:8900/llama/v1"
+
+
+def anthropic_request(*blocks, system="You are a ward analyst. " * 40):
+    """Messages body whose system prompt and user ``blocks`` each end a cache breakpoint."""
+    return {
+        "model": "claude-3-5-sonnet", "max_tokens": 100,
+        "system": [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+        "messages": [{"role": "user", "content": [
+            {"type": "text", "text": text, **({"cache_control": {"type": "ephemeral"}} if marked else {})}
+            for text, marked in blocks
+        ]}],
+    }
+
+
+@pytest.mark.unit
+class TestFakePromptCaching:
+    WARD_BLOCK = "Ward: Jubilee Hills. " * 250
+
+    def test_marked_prefix_written_then_read(self):
+        server = FakeProviderServer(INSTANT)
+
+        async def scenario(client):
+            usages = []
+            for query in ("Top issues?", "Who is gaining ground?"):
+                resp = await client.post("/anthropic/v1/messages",
+                                         json=anthropic_request((self.WARD_BLOCK, True), (query, False)))
+                usages.append((await resp.json())["usage"])
+            stats = await (await client.get("/_fake/stats")).json()
+            return usages, stats
+
+        (first, second), stats = run_against(server, scenario)
+        assert first["cache_read_input_tokens"] == 0 and first["cache_creation_input_tokens"] > 1024
+        assert second["cache_read_input_tokens"] == first["cache_creation_input_tokens"]
+        assert second["cache_creation_input_tokens"] == 0
+        assert second["input_tokens"] < 10
+        (row,) = stats["providers"]
+        assert row["cache_read_tokens"] == row["cache_write_tokens"] == first["cache_creation_input_tokens"]
+
+    def test_short_or_changed_prefix_not_read(self):
+        server = FakeProviderServer(INSTANT)
+
+        async def scenario(client):
+            usages = []
+            for block in ("Ward: Jubilee Hills", self.WARD_BLOCK, "Ward: Banjara Hills. " * 250):
+                resp = await client.post("/anthropic/v1/messages",
+                                         json=anthropic_request((block, True), ("Top issues?", False), system="Short."))
+                usages.append((await resp.json())["usage"])
+            return usages
+
+        short, ward, other_ward = run_against(server, scenario)
+        assert short["cache_creation_input_tokens"] == short["cache_read_input_tokens"] == 0
+        assert ward["cache_creation_input_tokens"] > 0
+        assert other_ward["cache_read_input_tokens"] == 0
+
+    def test_cached_prefill_is_faster(self):
+        profile = ProviderProfile({"prefill_tokens_per_sec": 1000, "cached_prefill_speedup": 10}, random.Random(0))
+        assert profile.prefill_delay(2000) == pytest.approx(2.0)
+        assert profile.prefill_delay(20, cached_tokens=1980) == pytest.approx(0.218)
+        assert ProviderProfile({}, random.Random(0)).prefill_delay(2000) == 0.0
+
+    def test_claude_client_repeat_ward_query_reads_cache(self, monkeypatch):
+        import functools
+
+        import anthropic
+        import httpx
+
+        from app.services import claude_client
+
+        server = FakeProviderServer({"anthropic": {"latency": {"dist": "fixed", "median_ms": 0}, "tokens_per_sec": 0,
+                                                   "output_tokens": [40, 40], "prefill_tokens_per_sec": 20000}})
+        context = {"ward_context": "Jubilee Hills", "region_context": "Hyderabad", "analysis_depth": "quick",
+                   "ward_profile": {"profile": {"electors": 284000}, "notes": ["Road No. 10 flooding"] * 200}}
+
+        async def scenario():
+            async with TestServer(server.make_app()) as test_server:
+                monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
+                monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+                monkeypatch.setenv("FAKE_AI_PROVIDER_URL", str(test_server.make_url("")))
+                # an explicit http_client keeps older SDKs working with current httpx
+                monkeypatch.setattr(claude_client, "AsyncAnthropic",
+                                    functools.partial(anthropic.AsyncAnthropic, http_client=httpx.AsyncClient()))
+                client = claude_client.ClaudeClient()
+                return [await client.generate_response(query, context)
+                        for query in ("What are the top issues?", "Which party is gaining ground?")]
+
+        first, second = asyncio.run(scenario())
+        assert first.is_success and second.is_success, (first.error, second.error)
+        assert first.tokens_used["cached"] == 0 and first.tokens_used["cache_write"] > 0
+        assert second.tokens_used["cached"] == first.tokens_used["cache_write"]
+        assert second.metadata["prompt_caching_enabled"] is True
+        assert second.cost_usd < first.cost_usd
+        assert second.latency_ms < first.latency_ms
+
+
+@pytest.mark.unit
+class TestClaudePromptBlocks:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from app.services.claude_client import ClaudeClient
+
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setattr("app.services.claude_client.AsyncAnthropic", lambda **kwargs: None)
+        return ClaudeClient()
+
+    def test_stable_blocks_precede_query(self, client):
+        context = {"ward_context": "Jubilee Hills", "ward_profile": {"electors": 284000},
+                   "retrieved_context": "GHMC drainage tender delayed", "analysis_depth": "deep"}
+        system, user = client._build_prompt_blocks("Top issues?", context)
+
+        assert system == [{"type": "text", "text": client.system_prompt, "cache_control": {"type": "ephemeral"}}]
+        assert [bool(b.get("cache_control")) for b in user] == [True, True, False]
+        assert "284000" in user[0]["text"] and "GHMC" in user[1]["text"]
+        assert "Top issues?" in user[2]["text"] and "Current Time" in user[2]["text"]
+
+    def test_ward_block_identical_across_queries(self, client):
+        context = {"ward_context": "Jubilee Hills", "ward_profile": {"b": 2, "a": 1}}
+        _, first = client._build_prompt_blocks("Top issues?", context)
+        _, second = client._build_prompt_blocks("Who leads?", {**context, "analysis_depth": "quick"})
+        assert first[0] == second[0]
+
+    def test_no_markers_when_caching_disabled(self, client):
+        client.config["enable_prompt_caching"] = False
+        system, user = client._build_prompt_blocks("Top issues?", {"ward_context": "Jubilee Hills"})
+        assert not any("cache_control" in b for b in system + user)
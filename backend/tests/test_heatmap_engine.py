@@ -0,0 +1,113 @@
+"""
+Tests for the single-pass heatmap engine and its per-(ward, days) cache.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import heatmap_engine
+from app.extensions import db
+from app.heatmap_engine import HeatmapWindow, clear_heatmap_cache, heatmap_window
+from app.models import Author, Post
+
+
+@pytest.fixture
+def posts(db_session):
+    clear_heatmap_cache()
+    now = datetime.now(timezone.utc)
+    # Same UTC day as now, even just after midnight
+    earlier = max(now - timedelta(hours=1), now.replace(hour=0, minute=0, second=0, microsecond=0))
+    bjp = Author(name="BJP Telangana", party="BJP Telangana")
+    db.session.add(bjp)
+    db.session.add_all([
+        Post(text="Angry about roads and water, a failure", city="Jubilee Hills", author=bjp, created_at=now),
+        Post(text="Optimistic about water supply; Congress promises success", city="Jubilee Hills",
+             created_at=earlier),
+        Post(text="Worried about housing", city="Jubilee Hills", created_at=now - timedelta(days=3)),
+        Post(text="roads roads", city="Banjara Hills", created_at=now),
+    ])
+    db.session.commit()
+    yield now.strftime('%Y-%m-%d')
+    clear_heatmap_cache()
+
+
+def _day(series, date_str):
+    return next(d for d in series if d['date'] == date_str)
+
+
+@pytest.mark.unit
+class TestHeatmapWindow:
+    def test_series_cover_every_day_once(self, posts):
+        window = HeatmapWindow.build("Jubilee Hills", 7)
+        for series in (window.calendar_series(), window.sentiment_series(['angry'], 'sum'),
+                       window.issue_series(['water'], 'mentions')):
+            dates = [d['date'] for d in series]
+            assert len(dates) == len(set(dates)) == 8
+            assert dates == sorted(dates)
+
+    def test_projections(self, posts):
+        window = HeatmapWindow.build("Ward 95 Jubilee Hills", 7)
+        today = posts
+
+        assert _day(window.calendar_series(), today)['count'] == 2
+
+        sentiment = _day(window.sentiment_series(['angry', 'hopeful'], 'sum'), today)
+        assert sentiment['emotions'] == {'angry': 1, 'hopeful': 1}
+        assert sentiment['posts'] == 2
+
+        party = _day(window.party_series(['BJP', 'INC'], 'mentions', 'aggregate', 'BJP'), today)
+        assert party['parties'] == {'BJP': 1, 'INC': 1}
+        assert party['details']['party_breakdown']['BJP']['sentiment_score'] == -1.0
+
+        issues = _day(window.issue_series(['water', 'roads', 'housing'], 'posts'), today)
+        assert issues['keywords'] == {'water': 2, 'roads': 1}
+        assert issues['count'] == 2
+        assert _day(window.issue_series(['roads'], 'posts'), today)['count'] == 1
+
+    def test_custom_issue_keywords_scan_texts(self, posts):
+        window = HeatmapWindow.build("Jubilee Hills", 7)
+        issues = _day(window.issue_series(['supply', 'Congress'], 'mentions'), posts)
+        assert issues['keywords'] == {'supply': 1, 'Congress': 1}
+
+
+@pytest.mark.unit
+class TestHeatmapCache:
+    def test_reused_until_posts_are_ingested(self, posts, monkeypatch):
+        builds = []
+        build = HeatmapWindow.build.__func__
+        monkeypatch.setattr(HeatmapWindow, "build",
+                            classmethod(lambda cls, *a: builds.append(a) or build(cls, *a)))
+
+        first = heatmap_window("Jubilee Hills", 7)
+        assert heatmap_window("Ward 95 Jubilee Hills", 7) is first
+        assert len(builds) == 1
+
+        db.session.add(Post(text="water", city="Jubilee Hills", created_at=datetime.now(timezone.utc)))
+        db.session.commit()
+        rebuilt = heatmap_window("Jubilee Hills", 7)
+        assert rebuilt is not first
+        assert _day(rebuilt.calendar_series(), posts)['count'] == 3
+
+    def test_rebuilt_after_edits_and_deletes(self, posts):
+        first = heatmap_window("Jubilee Hills", 7)
+        post = Post.query.filter_by(text="Worried about housing").one()
+        post.created_at = datetime.now(timezone.utc)
+        db.session.commit()
+        edited = heatmap_window("Jubilee Hills", 7)
+        assert edited is not first
+        assert _day(edited.calendar_series(), posts)['count'] == 3
+
+        db.session.delete(post)
+        db.session.commit()
+        assert _day(heatmap_window("Jubilee Hills", 7).calendar_series(), posts)['count'] == 2
+
+    def test_expires_after_ttl(self, posts, app):
+        first = heatmap_window("All", 7)
+        first.built_at -= app.config.get("HEATMAP_CACHE_TTL_SECONDS", 120) + 1
+        assert heatmap_window("All", 7) is not first
+
+    def test_cache_is_bounded(self, posts, monkeypatch):
+        monkeypatch.setattr(heatmap_engine, "_CACHE_MAX_ENTRIES", 2)
+        for days in (1, 2, 3):
+            heatmap_window("All", days)
+        assert [key[1] for key in heatmap_engine._cache] == [2, 3]
@@ -0,0 +1,79 @@
+"""
+Tests for hybrid full-text + vector retrieval with reciprocal rank fusion.
+
+SQLite takes the ILIKE full-text fallback and scores vectors in Python,
+which is enough to check fusion, dedupe, filters and hydration.
+"""
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.extensions import db
+from app.models import Epaper, Post
+from app.models_ai import Embedding
+from app.rag import RRF_K, hybrid_retrieve, rrf_fuse
+
+
+@pytest.fixture
+def sources(db_session):
+    now = datetime.now(timezone.utc)
+    posts = [
+        Post(text="Flood drainage overflowing near the market", city="Jubilee Hills", created_at=now),
+        Post(text="Metro timings extended for festival", city="Jubilee Hills", created_at=now),
+        Post(text="Flood relief camps opened", city="Banjara Hills", created_at=now),
+        Post(text="Old flood drainage complaint", city="Jubilee Hills", created_at=now - timedelta(days=60)),
+    ]
+    paper = Epaper(publication_name="Deccan Daily", publication_date=date.today(),
+                   raw_text="GHMC flood drainage works announced", sha256="c" * 64)
+    db.session.add_all(posts + [paper])
+    db.session.flush()
+    vectors = {posts[0].id: [1.0, 0.0], posts[1].id: [0.9, 0.1], posts[2].id: [1.0, 0.0]}
+    db.session.add_all([
+        Embedding(source_type="post", source_id=pid, ward=posts[0].city if pid != posts[2].id else posts[2].city,
+                  created_at=now.replace(tzinfo=None), vec=json.dumps(vec))
+        for pid, vec in vectors.items()
+    ])
+    db.session.commit()
+    return {"posts": [p.id for p in posts], "epaper": paper.id}
+
+
+@pytest.mark.unit
+class TestRrfFuse:
+    def test_hits_in_both_lists_rank_first_and_dedupe(self):
+        fused = rrf_fuse([[("post", 1), ("post", 2), ("post", 1)], [("post", 3, 0.9), ("post", 1, 0.8)]], k=10)
+        assert [key for key, _ in fused] == [("post", 1), ("post", 3), ("post", 2)]
+        assert fused[0][1] == pytest.approx(1 / (RRF_K + 1) + 1 / (RRF_K + 2))
+
+    def test_top_k(self):
+        assert len(rrf_fuse([[("post", i) for i in range(20)]], k=5)) == 5
+
+
+@pytest.mark.unit
+class TestHybridRetrieve:
+    def test_fuses_full_text_and_vector_hits(self, sources):
+        flood, metro, _, _ = sources["posts"]
+        items = hybrid_retrieve("flood drainage", ward="Jubilee Hills", window_days=30, k=5, query_vec=[1.0, 0.0])
+
+        keys = [(it["source_type"], it["source_id"]) for it in items]
+        assert keys[0] == ("post", flood)
+        assert set(keys) == {("post", flood), ("post", metro), ("epaper", sources["epaper"])}
+        assert len(keys) == len(set(keys))
+
+        top = items[0]
+        assert top["lexical_rank"] and top["vector_rank"] == 1
+        assert top["text"].startswith("Flood drainage") and top["meta"]["title"] == "Jubilee Hills"
+
+    def test_similarity_threshold_and_window(self, sources):
+        flood, metro, _, old = sources["posts"]
+        items = hybrid_retrieve("metro", ward="Jubilee Hills", window_days=30, k=5,
+                                query_vec=[0.0, 1.0], min_similarity=0.5)
+        assert [(it["source_id"], it["vector_rank"]) for it in items] == [(metro, None)]
+        assert old not in [it["source_id"] for it in hybrid_retrieve("old flood", window_days=30, k=5)]
+
+    def test_failed_query_embedding_keeps_full_text_hits(self, sources):
+        def broken(_):
+            raise RuntimeError("OPENAI_API_KEY not set for embeddings")
+
+        items = hybrid_retrieve("relief camps", k=5, embed=broken)
+        assert [it["source_id"] for it in items] == [sources["posts"][2]]
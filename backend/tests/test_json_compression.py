@@ -0,0 +1,87 @@
+"""
+Tests for the orjson JSON provider and negotiated response compression.
+"""
+import gzip
+import json
+import os
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from flask import jsonify
+
+from app.compression import compress_response, precompressed
+
+
+@pytest.mark.unit
+class TestOrjsonProvider:
+    def test_analytics_types(self, app):
+        payload = {
+            "day": date(2026, 10, 18),
+            "at": datetime(2026, 10, 18, 6, 30, tzinfo=timezone.utc),
+            "score": Decimal("0.25"),
+            "series": np.array([1.5, 2.5]),
+            7: "int key",
+        }
+        assert json.loads(app.json.dumps(payload)) == {
+            "day": "2026-10-18", "at": "2026-10-18T06:30:00+00:00", "score": 0.25,
+            "series": [1.5, 2.5], "7": "int key",
+        }
+
+    def test_keeps_insertion_order_and_falls_back_for_big_ints(self, app):
+        assert app.json.dumps({"b": 1, "a": 2}) == '{"b":1,"a":2}'
+        assert json.loads(app.json.dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+    def test_jsonify_and_get_json(self, app):
+        with app.test_request_context(json={"ward": "Jubilee Hills"}):
+            from flask import request
+
+            assert request.get_json() == {"ward": "Jubilee Hills"}
+            response = jsonify(ok=True)
+        assert response.get_data() == b'{"ok":true}\n' and response.mimetype == "application/json"
+
+
+@pytest.mark.unit
+class TestCompressResponse:
+    def _respond(self, app, payload, accept="gzip, deflate"):
+        with app.test_request_context(headers={"Accept-Encoding": accept}):
+            return compress_response(jsonify(payload), min_bytes=1024)
+
+    def test_large_json_is_gzipped(self, app):
+        payload = {"series": [{"date": f"2026-01-{d % 28 + 1:02d}", "count": d} for d in range(365)]}
+        response = self._respond(app, payload)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert int(response.headers["Content-Length"]) == len(response.get_data())
+        assert json.loads(gzip.decompress(response.get_data())) == payload
+
+    def test_small_or_unaccepted_bodies_pass_through(self, app):
+        assert "Content-Encoding" not in self._respond(app, {"ok": True}).headers
+        response = self._respond(app, {"series": list(range(1000))}, accept="identity")
+        assert "Content-Encoding" not in response.headers and response.headers["Vary"] == "Accept-Encoding"
+
+
+@pytest.mark.unit
+class TestPrecompressedGeojson:
+    def test_served_from_cache_with_etag(self, app, client, auth_headers, monkeypatch):
+        import app as app_package
+
+        monkeypatch.setattr(app, "root_path", os.path.dirname(app_package.__file__))
+        first = client.get("/api/v1/geojson", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert first.status_code == 200 and first.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(first.get_data()))["type"] == "FeatureCollection"
+
+        again = client.get("/api/v1/geojson", headers={**auth_headers, "Accept-Encoding": "gzip",
+                                                      "If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+
+        plain = client.get("/api/v1/geojson", headers=auth_headers)
+        assert "Content-Encoding" not in plain.headers and plain.get_json()["features"]
+
+    def test_rebuilt_when_version_changes(self, app):
+        bodies = iter([b'{"v":1}', b'{"v":2}'])
+        first = precompressed("test-blob", 1, lambda: next(bodies))
+        assert precompressed("test-blob", 1, lambda: next(bodies)) is first
+        assert precompressed("test-blob", 2, lambda: next(bodies)).body == b'{"v":2}'
+        assert precompressed("test-unusable", 1, lambda: None) is None
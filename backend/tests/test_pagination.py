@@ -0,0 +1,182 @@
+"""
+Tests for keyset pagination on list endpoints and the conversation index.
+"""
+import fnmatch
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.epaper_api import NEXT_CURSOR_HEADER, PREVIEW_CHARS
+from app.extensions import db
+from app.models import Epaper, Post
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def papers(db_session):
+    today = date.today()
+    rows = [
+        Epaper(publication_name=f"Daily {i}", publication_date=today - timedelta(days=i // 2),
+               raw_text=("x" * 1000 if i == 0 else f"article {i}"), sha256=f"{i:064d}")
+        for i in range(7)
+    ]
+    db.session.add_all(rows)
+    db.session.flush()
+    db.session.add(Post(text="mirror", city="Jubilee Hills", epaper_id=rows[3].id,
+                        created_at=datetime.now(timezone.utc)))
+    db.session.commit()
+    return rows
+
+
+@pytest.mark.unit
+class TestCursor:
+    def test_round_trip(self):
+        token = encode_cursor(date(2026, 10, 18), 42)
+        assert decode_cursor(token, date.fromisoformat, int) == (date(2026, 10, 18), 42)
+
+    def test_rejects_malformed(self):
+        for token in ("nope", encode_cursor(1), encode_cursor("not-a-date", 1)):
+            with pytest.raises(InvalidCursor):
+                decode_cursor(token, date.fromisoformat, int)
+
+
+@pytest.mark.unit
+class TestEpaperKeyset:
+    def test_pages_cover_every_article_once(self, client, papers):
+        seen, cursor = [], None
+        while True:
+            response = client.get("/api/v1/epaper?limit=3" + (f"&cursor={cursor}" if cursor else ""))
+            assert response.status_code == 200
+            seen += [e["id"] for e in response.get_json()]
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+        expected = sorted(papers, key=lambda e: (e.publication_date, e.id), reverse=True)
+        assert seen == [e.id for e in expected]
+
+    def test_preview_is_cut_in_sql(self, client, papers):
+        first = next(e for e in client.get("/api/v1/epaper").get_json() if e["id"] == papers[0].id)
+        assert first["preview"] == "x" * PREVIEW_CHARS + "…"
+
+    def test_ward_filter(self, client, papers):
+        body = client.get("/api/v1/epaper?city=Ward 95 Jubilee Hills").get_json()
+        assert [e["id"] for e in body] == [papers[3].id]
+
+    def test_bad_cursor(self, client, papers):
+        assert client.get("/api/v1/epaper?cursor=garbage").status_code == 400
+
+
+class _FakeRedis:
+    """In-memory subset of the redis-py API used by ConversationManager."""
+
+    def __init__(self):
+        self.values, self.zsets = {}, {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value.encode()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(k) for k in keys]
+
+    def delete(self, *keys):
+        return sum(self.values.pop(k, None) is not None for k in keys)
+
+    def set(self, key, value, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value).encode()
+        return True
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def keys(self, pattern):
+        return [k for k in self.values if fnmatch.fnmatch(k, pattern)]
+
+    def scan_iter(self, match, count=None):
+        return self.keys(match)
+
+    def expire(self, key, ttl):
+        return True
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        for m in members:
+            self.zsets.get(key, {}).pop(m, None)
+
+    def zremrangebyscore(self, key, low, high):
+        bound = float(high.lstrip("("))
+        zset = self.zsets.get(key, {})
+        for m in [m for m, s in zset.items() if s < bound]:
+            del zset[m]
+
+    def zrevrangebyscore(self, key, high, low, start=0, num=None, withscores=False):
+        high = float("inf") if high == "+inf" else float(high)
+        entries = sorted(((m.encode(), s) for m, s in self.zsets.get(key, {}).items() if s <= high),
+                         key=lambda e: (e[1], e[0]), reverse=True)
+        return entries[start:start + num]
+
+
+@pytest.mark.unit
+class TestConversationIndex:
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        from strategist import conversation
+
+        monkeypatch.setattr(conversation, "redis_client", _FakeRedis())
+        return conversation.ConversationManager()
+
+    def test_keyset_pages_by_last_activity(self, manager):
+        ids = [manager.create_session("Jubilee Hills", user_id=7) for _ in range(5)]
+        manager.create_session("Banjara Hills", user_id=7)
+        manager.create_session("Jubilee Hills", user_id=8)
+        manager.add_message(ids[0], {"type": "assistant", "content": "latest"})
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = manager.list_conversations(user_id=7, ward="Jubilee Hills", limit=2, cursor=cursor)
+            seen += [c["id"] for c in page]
+            if not cursor:
+                break
+        assert seen[0] == ids[0] and sorted(seen) == sorted(ids)
+
+        assert manager.get_conversations_for_user(user_id=7, limit=10)[0]["last_message"] == "latest"
+        assert len(manager.get_conversations_for_user(limit=10)) == 7
+
+    def test_deleted_and_expired_sessions_drop_out(self, manager):
+        kept, deleted = (manager.create_session("Jubilee Hills", user_id=7) for _ in range(2))
+        manager.delete_conversation(deleted)
+        assert [c["id"] for c in manager.get_conversations_for_user(user_id=7)] == [kept]
+
+        manager.session_ttl = -1
+        manager.create_session("Jubilee Hills", user_id=9)
+        assert manager.get_conversations_for_user(user_id=9) == []
+
+    def test_sessions_saved_before_the_index_are_listed(self, manager, monkeypatch):
+        from strategist import conversation
+
+        legacy = manager.create_session("Jubilee Hills", user_id=7)
+        redis = conversation.redis_client
+        redis.zsets.clear()
+        redis.delete(f"{conversation.SUMMARY_PREFIX}{legacy}")
+        current = manager.create_session("Jubilee Hills", user_id=7)
+
+        assert {c["id"] for c in manager.get_conversations_for_user(user_id=7)} == {legacy, current}
+        monkeypatch.setattr(redis, "scan_iter", pytest.fail)
+        assert len(manager.get_conversations_for_user(user_id=7)) == 2
+
+    def test_bad_cursor(self, manager):
+        with pytest.raises(ValueError):
+            manager.list_conversations(cursor="garbage")
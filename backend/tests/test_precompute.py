@@ -0,0 +1,135 @@
+"""
+Tests for the nightly precompute pipeline (app/precompute.py,
+app/tasks_precompute.py).
+"""
+import pytest
+from celery import current_app as celery_app
+
+from app import precompute
+from app.tasks_precompute import nightly_precompute
+
+
+class _FakeRedis:
+    """In-memory subset of the redis-py API used by the precompute pipeline."""
+
+    def __init__(self):
+        self.values, self.zsets, self.hashes = {}, {}, {}
+
+    def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0.0) + amount
+
+    def zrevrange(self, key, start, end, withscores=False):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda kv: -kv[1])
+        return items if withscores else [m for m, _ in items]
+
+    def zunionstore(self, dest, keys):
+        self.zsets[dest] = {m: s * keys[dest] for m, s in self.zsets.get(dest, {}).items()}
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for m in [m for m, s in zset.items() if s <= high]:
+            del zset[m]
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self.hashes.setdefault(key, {}).update(mapping or {field: value})
+
+    def hgetall(self, key):
+        return {k: str(v) for k, v in self.hashes.get(key, {}).items()}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def expire(self, key, ttl):
+        return True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(precompute, "redis_client", redis)
+    return redis
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Stub out the LLM work; record which labels were generated."""
+    calls = {"strategist": [], "summary": []}
+
+    def fake_report(ward, depth, ttl=None, refresh=False):
+        calls["strategist"].append((ward, depth, ttl, refresh))
+        return {"ward": ward, "fallback_mode": ward == "Banjara Hills"}, "etag", ttl
+
+    def fake_summary(ward, window):
+        calls["summary"].append((ward, window))
+
+    monkeypatch.setattr("strategist.service.get_ward_report", fake_report)
+    monkeypatch.setattr("app.tasks_summary.generate_summary", fake_summary)
+    monkeypatch.setattr(precompute, "_budget_allows", lambda cost: True)
+    return calls
+
+
+@pytest.mark.unit
+class TestPlan:
+    def test_most_accessed_first_with_requested_labels(self, fake_redis):
+        for _ in range(3):
+            precompute.record_ward_access("strategist", "Ward 95 Jubilee Hills")
+        precompute.record_ward_access("strategist", "Jubilee Hills")
+        precompute.record_ward_access("summary", "Banjara Hills")
+        precompute.record_ward_access("summary", "All")
+        precompute.record_ward_access("unknown", "Jubilee Hills")
+
+        plan = precompute.plan_wards()
+        assert [e["ward_id"] for e in plan[:2]] == ["95", "93"]
+        assert plan[0] == {"ward_id": "95", "strategist": "Ward 95 Jubilee Hills", "summary": "Jubilee Hills",
+                           "hits": 4.0}
+        assert len(plan) > 140 and len({e["ward_id"] for e in plan}) == len(plan)
+        assert len(precompute.plan_wards(limit=5)) == 5
+
+        precompute.decay_ward_access()
+        assert fake_redis.zsets[precompute.ACCESS_KEYS["strategist"]] == {"Ward 95 Jubilee Hills": 1.5,
+                                                                          "Jubilee Hills": 0.5}
+
+    def test_lanes(self):
+        plan = [{"ward_id": str(i)} for i in range(7)]
+        lanes = precompute.assign_lanes(plan, 3)
+        assert [[e["ward_id"] for e in lane] for lane in lanes] == [["0", "3", "6"], ["1", "4"], ["2", "5"]]
+        assert len(precompute.assign_lanes(plan[:2], 4)) == 2 and precompute.assign_lanes([], 4) == []
+
+
+@pytest.mark.unit
+class TestPrecomputeWard:
+    def test_statuses(self, generated, monkeypatch):
+        entry = {"ward_id": "95", "strategist": "Jubilee Hills", "summary": "Jubilee Hills"}
+        result = precompute.precompute_ward(entry, depth="standard", report_ttl=3600)
+        assert result["status"] == "ok" and result["errors"] == []
+        assert generated["strategist"] == [("Jubilee Hills", "standard", 3600, True)]
+        assert generated["summary"] == [("Jubilee Hills", "P7D")]
+
+        entry = {"ward_id": "93", "strategist": "Banjara Hills", "summary": "Banjara Hills"}
+        assert precompute.precompute_ward(entry)["status"] == "partial"
+
+        monkeypatch.setattr(precompute, "_budget_allows", lambda cost: False)
+        assert precompute.precompute_ward(entry)["status"] == "skipped_budget"
+        assert len(generated["summary"]) == 2
+
+
+@pytest.mark.unit
+class TestNightlyPipeline:
+    def test_fills_every_planned_ward_and_reports(self, app, fake_redis, generated, monkeypatch):
+        monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+        precompute.record_ward_access("strategist", "Banjara Hills")
+
+        with app.app_context():
+            nightly_precompute.apply(kwargs={"limit": 5, "concurrency": 2}, task_id="run-1").get()
+
+        assert generated["strategist"][0][0] == "Banjara Hills"
+        assert len(generated["strategist"]) == len(generated["summary"]) == 5
+
+        report = precompute.progress_report()
+        assert report["run_id"] == "run-1" and report["total"] == report["completed"] == 5
+        assert (report["ok"], report["partial"], report["pending"]) == (4, 1, [])
+        assert list(report["failed_wards"]) == ["93"] and report["finished_at"]
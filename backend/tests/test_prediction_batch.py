@@ -0,0 +1,62 @@
+"""
+Tests for the batch prediction endpoint (GET /api/v1/prediction).
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.extensions import db
+from app.models import WardFeatures
+from app.ward_api import PredictionTable
+
+
+@pytest.fixture
+def features(db_session):
+    stamp = datetime(2024, 6, 5, tzinfo=timezone.utc)
+    db.session.add_all([
+        WardFeatures(ward_id="95", ls24_party_shares={"BJP": 0.45, "BRS": 0.40, "INC": 0.15},
+                     as23_party_shares={"BRS": 0.5, "BJP": 0.5}, turnout_volatility=10.0, updated_at=stamp),
+        WardFeatures(ward_id="93", as23_party_shares={"AIMIM": 3, "INC": 1}, updated_at=stamp),
+        WardFeatures(ward_id="12", updated_at=stamp),
+    ])
+    db.session.commit()
+
+
+@pytest.mark.unit
+class TestPredictionTable:
+    def test_matches_single_ward_endpoint(self, client, features):
+        batch = client.get("/api/v1/prediction").get_json()
+        assert batch["wards"] == ["95", "93"] and batch["parties"] == ["AIMIM", "BJP", "BRS", "INC"]
+        assert batch["updated_at"] == "2024-06-05T00:00:00Z"
+
+        for i, ward in enumerate(batch["wards"]):
+            single = client.get(f"/api/v1/prediction/{ward}").get_json()
+            assert batch["confidence"][i] == pytest.approx(single["confidence"])
+            scores = {p: column[i] for p, column in batch["scores"].items() if column[i] is not None}
+            assert scores == pytest.approx(single["scores"], abs=0.01)
+        assert batch["scores"]["AIMIM"] == [None, 75.0]
+
+    def test_selected_wards(self, client, features):
+        body = client.get("/api/v1/prediction?wards=93, 404,93").get_json()
+        assert body["wards"] == ["93"] and body["missing"] == ["404"]
+        assert body["confidence"] == [0.5]
+        assert client.get("/api/v1/prediction?wards=,").status_code == 400
+
+    def test_rebuilt_when_features_change(self, client, features):
+        first = client.get("/api/v1/prediction?wards=all")
+        assert client.get("/api/v1/prediction", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+        row = WardFeatures.query.filter_by(ward_id="93").one()
+        row.ls24_party_shares = {"INC": 0.6, "AIMIM": 0.4}
+        row.updated_at = datetime(2024, 6, 5, tzinfo=timezone.utc) + timedelta(hours=1)
+        db.session.commit()
+
+        second = client.get("/api/v1/prediction", headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 200
+        assert json.loads(second.get_data())["scores"]["INC"] == [15.0, 60.0]
+
+    def test_empty(self):
+        table = PredictionTable.from_rows([("1", None, {}, None)])
+        assert table.columns() == {"wards": [], "parties": [], "scores": {}, "confidence": [],
+                                   "missing": [], "updated_at": None}
@@ -0,0 +1,83 @@
+"""
+Tests for /api/v1/search.
+
+SQLite runs the ILIKE fallback (rank 0), which still exercises filtering,
+the post/epaper union and keyset pagination.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.extensions import db
+from app.models import Epaper, Post
+
+
+@pytest.fixture
+def corpus(db_session):
+    now = datetime.now(timezone.utc)
+    paper = Epaper(publication_name="Deccan Daily", publication_date=date.today(),
+                   raw_text="GHMC announces flood drainage works across the city", sha256="a" * 64)
+    old_paper = Epaper(publication_name="Deccan Daily", publication_date=date.today() - timedelta(days=30),
+                       raw_text="Flood drainage budget tabled", sha256="b" * 64)
+    db.session.add_all([paper, old_paper])
+    db.session.flush()
+    db.session.add_all([
+        Post(text="Flood drainage overflowing near the market", city="Jubilee Hills", created_at=now),
+        Post(text="Drainage works delayed again, flood fears", city="Banjara Hills",
+             created_at=now - timedelta(days=10)),
+        Post(text="Metro timings extended", city="Jubilee Hills", created_at=now),
+        Post(text="GHMC flood drainage plan", city="Jubilee Hills", epaper_id=paper.id, created_at=now),
+    ])
+    db.session.commit()
+    return now
+
+
+def _search(client, auth_headers, query):
+    response = client.get(f"/api/v1/search?{query}", headers=auth_headers)
+    return response, response.get_json()
+
+
+@pytest.mark.unit
+class TestSearchApi:
+    def test_requires_query(self, client, auth_headers):
+        response, body = _search(client, auth_headers, "q=")
+        assert response.status_code == 400
+        assert body["error"] == "q is required"
+
+    def test_matches_posts_and_epapers(self, client, auth_headers, corpus):
+        response, body = _search(client, auth_headers, "q=flood drainage")
+        assert response.status_code == 200
+        kinds = [(r["type"], r["snippet"].split()[0]) for r in body["results"]]
+        assert sorted(kinds) == [("epaper", "Flood"), ("epaper", "GHMC"),
+                                 ("post", "Drainage"), ("post", "Flood"), ("post", "GHMC")]
+        assert body["next_cursor"] is None
+
+    def test_ward_date_and_type_filters(self, client, auth_headers, corpus):
+        _, body = _search(client, auth_headers, "q=drainage&ward=Ward 95 Jubilee Hills")
+        assert {(r["type"], r.get("ward")) for r in body["results"]} == {
+            ("post", "Jubilee Hills"), ("epaper", None)}
+        assert len(body["results"]) == 3
+
+        since = (date.today() - timedelta(days=1)).isoformat()
+        _, body = _search(client, auth_headers, f"q=drainage&since={since}&type=epaper")
+        assert [r["publication_date"] for r in body["results"]] == [date.today().isoformat()]
+
+    def test_keyset_pages_cover_every_hit_once(self, client, auth_headers, corpus):
+        seen, cursor = [], None
+        while True:
+            query = "q=drainage&limit=2" + (f"&cursor={cursor}" if cursor else "")
+            _, body = _search(client, auth_headers, query)
+            assert len(body["results"]) <= 2
+            seen += [(r["type"], r["id"]) for r in body["results"]]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        assert len(seen) == len(set(seen)) == 5
+
+    def test_rejects_bad_parameters(self, client, auth_headers):
+        for query, error in (("q=x&cursor=nope", "invalid cursor"),
+                             ("q=x&since=18-10-2026", "since must be YYYY-MM-DD"),
+                             ("q=x&type=tweets", "type must be all, post or epaper")):
+            response, body = _search(client, auth_headers, query)
+            assert response.status_code == 400
+            assert body["error"] == error
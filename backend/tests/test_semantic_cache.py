@@ -0,0 +1,265 @@
+"""
+Tests for the semantic response cache (app/services/semantic_cache.py) and
+its use in AIOrchestrator and MultiModelCoordinator.
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import AIModelExecution, BudgetTracker, Post
+from app.services import semantic_cache
+from app.services.semantic_cache import SemanticCache, cache_ttl, invalidate_ward_caches
+
+WARD = "Jubilee Hills"
+QUESTION = "What are the key issues in Jubilee Hills this week?"
+
+
+class _FakeRedis:
+    """In-memory subset of the redis-py hash API used by the semantic cache."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def hlen(self, key):
+        return len(self.hashes.get(key, {}))
+
+    def expire(self, key, ttl):
+        return True
+
+    def scan_iter(self, match):
+        return [key for key in self.hashes if fnmatch.fnmatch(key, match)]
+
+    def delete(self, *keys):
+        return sum(self.hashes.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(semantic_cache, "redis_client", redis)
+    return redis
+
+
+@pytest.fixture
+def cache(app, db_session, fake_redis):
+    return SemanticCache("test", embedder="local")
+
+
+def _store(cache, query=QUESTION, ward=WARD, query_type="moderate", variant=""):
+    return cache.store(ward, query_type, query, {"content": f"answer to {query}"},
+                       cost_usd=0.04, provider="claude", model="claude-3-5-sonnet", variant=variant)
+
+
+@pytest.mark.unit
+class TestSemanticCache:
+    @pytest.mark.parametrize("query", [
+        "key issues in jubilee hills this week",
+        "Jubilee Hills: what are the key issues this week?",
+        "What are the key issues this week?",
+    ])
+    def test_rewording_hits(self, cache, query):
+        assert _store(cache)
+        hit = cache.lookup(WARD, "moderate", query)
+        assert hit is not None
+        assert hit.payload == {"content": f"answer to {QUESTION}"}
+        assert hit.similarity >= cache.threshold
+        assert hit.saved_usd == 0.04
+
+    @pytest.mark.parametrize("query", [
+        "What are the key issues in Jubilee Hills this month?",
+        "Who is leading in Jubilee Hills?",
+    ])
+    def test_different_question_misses(self, cache, query):
+        _store(cache)
+        assert cache.lookup(WARD, "moderate", query) is None
+
+    def test_keyed_by_ward_query_type_and_variant(self, cache):
+        _store(cache, variant="standard|neutral")
+        assert cache.lookup("Banjara Hills", "moderate", "What are the key issues in Banjara Hills this week?",
+                            "standard|neutral") is None
+        assert cache.lookup(WARD, "urgent", QUESTION, "standard|neutral") is None
+        assert cache.lookup(WARD, "moderate", QUESTION, "deep|offensive") is None
+        assert cache.lookup(WARD, "moderate", QUESTION, "standard|neutral") is not None
+
+    def test_new_ward_data_invalidates(self, cache, db_session):
+        _store(cache)
+        db_session.session.add(Post(text="Flooding on Road No. 10", city=WARD))
+        db_session.session.commit()
+        assert cache.lookup(WARD, "moderate", QUESTION) is None
+
+        db_session.session.add(Post(text="Metro works in Banjara Hills", city="Banjara Hills"))
+        db_session.session.commit()
+        _store(cache)
+        assert cache.lookup(WARD, "moderate", QUESTION) is not None
+
+    def test_expired_entries_miss_and_are_dropped(self, cache, fake_redis, monkeypatch):
+        _store(cache)
+        later = time.time() + cache_ttl("moderate", None) + 1
+        # Only the cache's clock: patching time.time globally makes the SQLAlchemy pool recycle connections
+        monkeypatch.setattr(semantic_cache, "time", SimpleNamespace(time=lambda: later))
+        assert cache.lookup(WARD, "moderate", QUESTION) is None
+        assert all(not entries for entries in fake_redis.hashes.values())
+
+    def test_invalidate_ward(self, cache):
+        _store(cache)
+        _store(cache, query="Key issues in Banjara Hills this week", ward="Banjara Hills")
+        assert cache.invalidate_ward(WARD) == 1
+        assert cache.lookup(WARD, "moderate", QUESTION) is None
+        assert cache.lookup("Banjara Hills", "moderate", "Key issues in Banjara Hills this week") is not None
+
+    def test_bucket_size_bounded(self, app, db_session, fake_redis):
+        cache = SemanticCache("test", embedder="local", max_entries=2)
+        for topic in ("water", "roads", "power"):
+            _store(cache, query=f"{topic} complaints this week")
+        (entries,) = fake_redis.hashes.values()
+        assert len(entries) == 2
+        assert cache.lookup(WARD, "moderate", "water complaints this week") is None
+
+    def test_no_app_context_is_a_miss(self, fake_redis, monkeypatch, caplog):
+        monkeypatch.setattr(semantic_cache, "has_app_context", lambda: False)
+        monkeypatch.setattr(semantic_cache, "_no_context_logged", False)
+        cache = SemanticCache("test", embedder="local")
+        with caplog.at_level(logging.INFO, logger=semantic_cache.__name__):
+            assert cache.store(WARD, "moderate", QUESTION, {}, 0.01, "claude", "m") is False
+            for _ in range(3):
+                assert cache.lookup(WARD, "moderate", QUESTION) is None
+        assert len(caplog.records) == 1 and caplog.records[0].levelno == logging.INFO
+
+    def test_invalidate_ward_caches_covers_every_scope(self, cache, fake_redis):
+        _store(cache)
+        _store(SemanticCache("orchestrator", embedder="local"))
+        _store(cache, query="Key issues in Banjara Hills this week", ward="Banjara Hills")
+        assert invalidate_ward_caches([WARD, None]) == 2
+        assert cache.lookup(WARD, "moderate", QUESTION) is None
+        assert cache.lookup("Banjara Hills", "moderate", "Key issues in Banjara Hills this week") is not None
+
+    def test_ingest_drops_answers_for_touched_wards(self, cache, fake_redis, tmp_path):
+        from app.tasks import ingest_epaper_jsonl
+
+        _store(cache)
+        path = tmp_path / "epapers.jsonl"
+        path.write_text(json.dumps({"publication_name": "Eenadu", "publication_date": "2025-08-10",
+                                    "title": "Drainage works", "body": "Residents angry", "city": WARD}) + "\n")
+        ingest_epaper_jsonl(str(path))
+        assert all(not key.startswith(f"semcache:test:local:{cache.ward_key(WARD)}:") for key in fake_redis.hashes)
+
+
+@pytest.mark.unit
+class TestCacheTTL:
+    def test_follows_data_age_within_bounds(self):
+        now = datetime(2025, 8, 1, 12, tzinfo=timezone.utc)
+        assert cache_ttl("urgent", now - timedelta(minutes=1), now) == 300
+        assert cache_ttl("moderate", now - timedelta(hours=2), now) == 3600
+        assert cache_ttl("moderate", now - timedelta(days=3), now) == 6 * 3600
+        assert cache_ttl("real_time_intelligence", None, now) == 1800
+
+
+@pytest.mark.unit
+class TestOrchestratorCache:
+    @pytest.fixture
+    def orchestrator(self, app, db_session, fake_redis, monkeypatch):
+        from app.services import ai_orchestrator
+        from app.services.ai_orchestrator import AIOrchestrator, AIResponse, ModelProvider
+
+        class Budget:
+            async def can_afford_request(self, cost, service="unknown"):
+                return True
+
+            async def record_spend(self, cost, service, *args, **kwargs):
+                pass
+
+        class Validator:
+            async def assess_response(self, query, content, context):
+                return 0.9
+
+        for client in ("ClaudeClient", "PerplexityClient", "OpenAIClient", "LlamaClient", "GeminiClient"):
+            monkeypatch.setattr(ai_orchestrator, client, lambda: None)
+        monkeypatch.setattr(ai_orchestrator, "QualityValidator", Validator)
+        monkeypatch.setattr(ai_orchestrator, "get_budget_manager", Budget)
+        orchestrator = AIOrchestrator()
+        orchestrator.semantic_cache = SemanticCache("orchestrator", embedder="local")
+        orchestrator.calls = []
+
+        async def call_model(provider, query, context, request_id):
+            orchestrator.calls.append(query)
+            return AIResponse(content="Water supply and roads", model_used="claude-3-5-sonnet",
+                              provider=ModelProvider.CLAUDE, tokens_used={"input": 900, "output": 400},
+                              cost_usd=0.03, latency_ms=4000, quality_score=0.0, metadata={})
+
+        orchestrator._call_model = call_model
+        return orchestrator
+
+    def test_repeat_question_served_from_cache(self, orchestrator, monkeypatch):
+        from app.services import budget_manager
+        monkeypatch.setattr(budget_manager, "budget_manager", None)
+        context = {"ward_context": WARD, "analysis_depth": "standard"}
+
+        first = asyncio.run(orchestrator.generate_response(QUESTION, context))
+        second = asyncio.run(orchestrator.generate_response("key issues in jubilee hills this week?", context))
+
+        assert orchestrator.calls == [QUESTION]
+        assert first.cost_usd == 0.03 and not first.metadata.get("cached")
+        assert second.content == first.content
+        assert second.cost_usd == 0.0
+        assert second.metadata["cache_hit"] is True and second.metadata["saved_usd"] == 0.03
+
+        hits = AIModelExecution.query.filter_by(success_status="cache_hit").all()
+        assert len(hits) == 1 and hits[0].request_metadata["cached"] is True
+        assert float(BudgetTracker.query.one().cache_savings_usd) == pytest.approx(0.03)
+
+    def test_other_depth_not_shared(self, orchestrator):
+        asyncio.run(orchestrator.generate_response(QUESTION, {"ward_context": WARD, "analysis_depth": "quick"}))
+        asyncio.run(orchestrator.generate_response(QUESTION, {"ward_context": WARD, "analysis_depth": "deep"}))
+        assert len(orchestrator.calls) == 2
+
+
+@pytest.mark.unit
+class TestCoordinatorCache:
+    def test_standalone_questions_cached_follow_ups_not(self, app, db_session, fake_redis, monkeypatch):
+        from app.services import budget_manager
+        from strategist.reasoner.multi_model_coordinator import AnalysisRequest, MultiModelCoordinator
+
+        monkeypatch.setattr(budget_manager, "budget_manager", None)
+        coordinator = MultiModelCoordinator()
+        coordinator.gemini_available, coordinator.perplexity_available = True, False
+        coordinator.hedging_enabled = False
+        coordinator.semantic_cache = SemanticCache("coordinator", embedder="local")
+        calls = []
+
+        async def gemini(request):
+            calls.append(request.query)
+            return {"strategic_summary": "Drainage dominates", "model_confidence": 0.8,
+                    "external_sources": [{"content": "GHMC notice", "type": "news"}]}
+
+        monkeypatch.setattr(coordinator, "_gemini_analysis", gemini)
+
+        def ask(query, history=None):
+            request = AnalysisRequest(ward=WARD, query=query, depth="standard", context_mode="neutral",
+                                      conversation_history=history)
+            return asyncio.run(coordinator.coordinate_strategic_analysis(request))
+
+        first = ask(QUESTION)
+        second = ask("key issues in Jubilee Hills this week")
+        assert len(calls) == 1
+        assert second.content == first.content
+        assert second.evidence_sources[0].content == "GHMC notice"
+
+        ask("key issues in Jubilee Hills this week", history=[{"role": "user", "content": "hi"}])
+        assert len(calls) == 2
+        assert AIModelExecution.query.filter_by(success_status="cache_hit").count() == 1
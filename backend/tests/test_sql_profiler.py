@@ -0,0 +1,138 @@
+"""
+Tests for per-request SQL profiling and query-count budgets.
+
+The budget tests fail when an endpoint starts issuing more queries than its
+entry in TestConfig.QUERY_BUDGETS, which is how N+1 regressions surface in CI.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from app.extensions import db
+from app.heatmap_engine import clear_heatmap_cache
+from app.models import Author, Post, WardDemographics, WardFeatures, WardProfile
+from app.sql_profiler import QueryProfile, SlowEndpointReport, init_sql_profiler, query_budget
+from tests.conftest import TestConfig, assert_max_queries
+
+
+@pytest.fixture
+def ward_rows(db_session):
+    """Ward rows for every ward id the budgets request, plus posts across wards and parties.
+
+    Posts in several wards make per-ward query loops exceed their budgets.
+    """
+    for ward_id in ('WARD_001', '95', '93'):
+        db_session.session.add_all([
+            WardProfile(ward_id=ward_id, electors=52000, votes_cast=26000, turnout_pct=50.0,
+                        last_winner_party='BJP', last_winner_year=2020),
+            WardDemographics(ward_id=ward_id, literacy_idx=0.7, muslim_idx=0.2, scst_idx=0.1,
+                             secc_deprivation_idx=0.3),
+            WardFeatures(ward_id=ward_id, as23_party_shares={'BRS': 40.0, 'INC': 35.0, 'BJP': 25.0},
+                         ls24_party_shares={'BJP': 42.0, 'INC': 33.0, 'BRS': 25.0}),
+        ])
+    authors = [Author(name=party, party=party) for party in ('BJP', 'INC', 'BRS')]
+    db_session.session.add_all(
+        Post(text=f"roads and water in {city}", city=city, author=author, created_at=datetime.now(timezone.utc))
+        for city in ('Jubilee Hills', 'Banjara Hills', 'Hyderabad', 'Kukatpally') for author in authors
+    )
+    db_session.session.commit()
+    clear_heatmap_cache()
+
+
+class TestQueryBudgets:
+    """Per-endpoint query budgets."""
+
+    @pytest.mark.parametrize('url,budget', sorted(TestConfig.QUERY_BUDGETS.items()))
+    def test_endpoint_within_budget(self, client, auth_headers, sample_post, ward_rows, url, budget):
+        """Each endpoint stays within its query budget."""
+        with assert_max_queries(budget):
+            response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200, response.get_data(as_text=True)[:300]
+
+    def test_budget_overrun_fails(self, app, db_session):
+        """Exceeding the budget raises with the offending statements listed."""
+        with pytest.raises(AssertionError, match="3 queries \\(budget 2\\)"):
+            with query_budget(2):
+                for _ in range(3):
+                    db.session.execute(text('SELECT 1'))
+
+
+class TestProfilingMiddleware:
+    """Response headers and rolling report."""
+
+    @pytest.fixture
+    def profiled_app(self):
+        profiled = Flask(__name__)
+        profiled.config.update(
+            TESTING=True,
+            SECRET_KEY='test-secret-key-for-testing-only',
+            SQLALCHEMY_DATABASE_URI='sqlite:///:memory:',
+        )
+        db.init_app(profiled)
+
+        @profiled.route('/n-plus-one')
+        def n_plus_one():
+            for _ in range(3):
+                db.session.execute(text('SELECT 1'))
+            return {'ok': True}
+
+        with profiled.app_context():
+            init_sql_profiler(profiled)
+        return profiled
+
+    def test_headers_report_query_count(self, profiled_app):
+        response = profiled_app.test_client().get('/n-plus-one')
+
+        assert response.status_code == 200
+        assert response.headers['X-DB-Query-Count'] == '3'
+        assert float(response.headers['X-DB-Time-Ms']) >= 0
+        assert 'db;dur=' in response.headers['Server-Timing']
+
+    def test_report_is_reset_by_delete_only(self, profiled_app):
+        profiled_app.config['LOGIN_DISABLED'] = True
+        client = profiled_app.test_client()
+        client.get('/n-plus-one')
+
+        def reported():
+            return {row['endpoint'] for row in client.get('/api/v1/profiling/sql').get_json()['endpoints']}
+
+        client.get('/api/v1/profiling/sql?reset=1')
+        assert 'n_plus_one' in reported()
+        assert client.delete('/api/v1/profiling/sql').status_code == 204
+        assert 'n_plus_one' not in reported()
+
+    def test_slow_endpoint_report(self):
+        report = SlowEndpointReport(window=10)
+        fast, slow = QueryProfile(), QueryProfile()
+        fast.record('SELECT 1', 1.0)
+        for _ in range(20):
+            slow.record('SELECT * FROM post', 15.0)
+        report.add('trends_bp.get_trends', fast, 5.0)
+        report.add('heatmap_bp.sentiment_heatmap', slow, 400.0)
+
+        rows = report.report()
+
+        assert rows[0]['endpoint'] == 'heatmap_bp.sentiment_heatmap'
+        assert rows[0]['max_queries'] == 20
+        assert rows[0]['slowest_statement']['statement'] == 'SELECT * FROM post'
+
+    def test_statement_log_is_bounded(self):
+        profile = QueryProfile(keep_slowest=3, keep_statements=10)
+        for i in range(10000):
+            profile.record(f'SELECT {i}', float(i % 7))
+
+        assert profile.count == 10000
+        assert len(profile.statements) == 10
+        assert len(profile.slowest) == 3
+        assert QueryProfile().statements == []
+
+    def test_nested_profiles_propagate_to_parent(self):
+        parent = QueryProfile()
+        child = QueryProfile(parent=parent)
+        child.record('SELECT 1', 2.0)
+
+        assert parent.count == 1
+        assert parent.total_ms == 2.0
@@ -139,8 +139,8 @@ class TestObservability:
         
         # Test timing
         metrics.timing("test.timer", 1.5)
-        assert len(metrics.timers["test.timer"]) == 1
-        assert metrics.timers["test.timer"][0] == 1.5
+        assert metrics.timers["test.timer"].count == 1
+        assert metrics.timers["test.timer"].sum == 1.5
         
         # Test gauge
         metrics.gauge("test.gauge", 75.5)
@@ -0,0 +1,70 @@
+"""
+Tests for STRtree point-in-ward assignment (app/ward_index.py).
+"""
+import csv
+import math
+import os
+
+import pytest
+from shapely.geometry import box
+
+from app.extensions import db
+from app.models import PollingStation
+from app.ward_index import WardIndex, assign_polling_station_wards, ward_index
+
+FORM20_SAMPLE = os.path.join(os.path.dirname(__file__), "..", "app", "data", "ls24_form20_sample.csv")
+
+
+@pytest.fixture
+def squares():
+    return WardIndex(["93", "95"], [box(78.40, 17.40, 78.41, 17.41), box(78.41, 17.40, 78.42, 17.41)])
+
+
+@pytest.mark.unit
+class TestWardIndex:
+    def test_assign(self, squares):
+        wards = squares.assign([78.405, 78.415, 78.41, 78.4203, 79.0, math.nan],
+                               [17.405, 17.405, 17.405, 17.405, 17.405, 17.405])
+        # inside, inside, shared border -> lower ward, snapped from just outside, far away, missing
+        assert list(wards) == ["93", "95", "93", "95", None, None]
+        assert squares.assign([78.4203], [17.405], snap_degrees=0)[0] is None
+
+    def test_ghmc_boundaries(self):
+        index = ward_index()
+        jubilee = index.geometries[list(index.ward_ids).index("95")].representative_point()
+        assert index.ward_at(jubilee.x, jubilee.y) == "95"
+        assert len(index.ward_ids) > 140
+
+
+@pytest.mark.unit
+class TestAssignPollingStationWards:
+    def test_corrects_csv_wards_from_coordinates(self, db_session, squares):
+        db.session.add_all([
+            PollingStation(ps_id="PS-1", lat=17.405, lon=78.415, ward_id="93", ward_name="Banjara Hills"),
+            PollingStation(ps_id="PS-2", lat=17.405, lon=78.405, ward_id="93", ward_name="Banjara Hills"),
+            PollingStation(ps_id="PS-3", lat=None, lon=None, ward_id="12"),
+            PollingStation(ps_id="PS-4", lat=18.0, lon=79.0, ward_id="12"),
+        ])
+        db.session.commit()
+
+        stats = assign_polling_station_wards(db.session, index=squares)
+        db.session.commit()
+
+        assert stats == {"located": 3, "assigned": 2, "outside": 1, "changed": 1}
+        wards = {ps.ps_id: (ps.ward_id, ps.ward_name) for ps in PollingStation.query.all()}
+        assert wards == {"PS-1": ("95", "Jubilee Hills"), "PS-2": ("93", "Banjara Hills"),
+                         "PS-3": ("12", None), "PS-4": ("12", None)}
+
+    def test_form20_ids_in_the_right_ward_are_kept(self, db_session):
+        with open(FORM20_SAMPLE, newline="") as fh:
+            stations = {row["ps_id"]: (row["ward_id"], row["ward_name"]) for row in csv.DictReader(fh)}
+        one = WardIndex(["1", "2"], [box(78.40, 17.40, 78.41, 17.41), box(78.41, 17.40, 78.42, 17.41)])
+        db.session.add_all(PollingStation(ps_id=ps_id, lat=17.405, lon=78.405, ward_id=ward_id, ward_name=name)
+                           for ps_id, (ward_id, name) in stations.items())
+        db.session.commit()
+
+        stats = assign_polling_station_wards(db.session, index=one)
+        db.session.commit()
+
+        assert stats["changed"] == 0
+        assert {ps.ps_id: (ps.ward_id, ps.ward_name) for ps in PollingStation.query.all()} == stations
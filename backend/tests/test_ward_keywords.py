@@ -0,0 +1,139 @@
+"""
+Tests for the ingest-maintained ward_keyword_daily counts behind pulse keywords.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models import Post, WardKeywordDaily
+from app.ward_keywords import (
+    ALL_WARDS, KeywordCounter, count_tokens, keyword_scope, rebuild_ward_keywords, tokenize, top_keywords,
+)
+
+
+def _counts(ward_id):
+    return {
+        (row.day, row.token): row.count
+        for row in WardKeywordDaily.query.filter_by(ward_id=ward_id).all()
+        if row.count
+    }
+
+
+@pytest.mark.unit
+class TestTokenize:
+    def test_strips_urls_tags_punctuation_and_stopwords(self):
+        assert tokenize("Roads & #drainage in the ward: https://x.io/a @ghmc fix it!") == [
+            "roads", "drainage", "ward", "ghmc", "fix",
+        ]
+
+    def test_scope(self):
+        assert keyword_scope("All") == keyword_scope("") == ALL_WARDS
+        assert keyword_scope("Ward 95 Jubilee Hills") == "95"
+        assert keyword_scope("Hyderabad") is None
+
+    def test_count_tokens(self):
+        assert count_tokens(["water water roads", "water"], k=2) == [("water", 3), ("roads", 1)]
+
+
+@pytest.mark.unit
+class TestIncrementalCounts:
+    def test_orm_inserts_and_deletes_maintain_counts(self, db_session):
+        day = datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+        first = Post(text="Water supply water", city="Jubilee Hills", created_at=day)
+        db.session.add_all([first, Post(text="water roads", city="Hyderabad", created_at=day)])
+        db.session.commit()
+
+        assert _counts("95") == {(day.date(), "water"): 2, (day.date(), "supply"): 1}
+        assert _counts(ALL_WARDS) == {
+            (day.date(), "water"): 3, (day.date(), "supply"): 1, (day.date(), "roads"): 1,
+        }
+
+        db.session.delete(first)
+        db.session.commit()
+        assert _counts("95") == {}
+        assert _counts(ALL_WARDS) == {(day.date(), "water"): 1, (day.date(), "roads"): 1}
+
+    def test_orm_edits_move_counts(self, db_session):
+        day = datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+        post = Post(text="water supply", city="Jubilee Hills", created_at=day)
+        db.session.add(post)
+        db.session.commit()
+        db.session.expire_all()
+
+        post.text = "drainage"
+        post.city = "Banjara Hills"
+        db.session.commit()
+        assert _counts("95") == {}
+        assert _counts("93") == {(day.date(), "drainage"): 1}
+
+        post.created_at = day + timedelta(days=1)
+        post.emotion = "Anger"
+        db.session.commit()
+        assert _counts("93") == {(day.date() + timedelta(days=1), "drainage"): 1}
+        assert _counts(ALL_WARDS) == _counts("93")
+
+    def test_default_created_at_is_counted_today(self, db_session):
+        db.session.add(Post(text="garbage", city="Jubilee Hills"))
+        db.session.commit()
+        assert _counts("95") == {(datetime.now(timezone.utc).date(), "garbage"): 1}
+
+    def test_counter_batches_upserts(self, db_session):
+        day = datetime(2026, 10, 2)
+        counter = KeywordCounter()
+        for _ in range(3):
+            counter.add("95", day, "metro metro")
+        assert counter.flush(db.session.connection()) == 2
+        counter.add("95", day, "metro")
+        counter.flush(db.session.connection())
+        assert _counts("95") == {(day.date(), "metro"): 7}
+
+    def test_rebuild_matches_incremental(self, db_session):
+        now = datetime.now(timezone.utc)
+        db.session.add_all([
+            Post(text=f"drainage flooding {i}", city=city, created_at=now - timedelta(days=i))
+            for i, city in enumerate(["Jubilee Hills", "Banjara Hills", "Hyderabad"] * 4)
+        ])
+        db.session.commit()
+        expected = {w: _counts(w) for w in ("95", "93", ALL_WARDS)}
+
+        db.session.execute(text("UPDATE ward_keyword_daily SET count = 0"))
+        stats = rebuild_ward_keywords(db.session.connection(), batch_size=5)
+        db.session.commit()
+
+        assert stats["posts"] == 12 and stats["batches"] == 3
+        assert {w: _counts(w) for w in expected} == expected
+
+
+@pytest.mark.unit
+class TestTopKeywords:
+    def test_window_and_ordering(self, db_session):
+        now = datetime.now(timezone.utc)
+        db.session.add_all([
+            Post(text="water roads", city="Jubilee Hills", created_at=now),
+            Post(text="water", city="Jubilee Hills", created_at=now - timedelta(days=2)),
+            Post(text="metro metro metro", city="Jubilee Hills", created_at=now - timedelta(days=20)),
+        ])
+        db.session.commit()
+
+        assert top_keywords("95", now - timedelta(days=7)) == [("water", 2), ("roads", 1)]
+        assert top_keywords("95", now - timedelta(days=30), k=1) == [("metro", 3)]
+        assert top_keywords(ALL_WARDS, now - timedelta(days=1)) == [("roads", 1), ("water", 1)]
+
+    def test_pulse_reads_keywords_from_counts(self, client, auth_headers):
+        now = datetime.now(timezone.utc)
+        db.session.add_all([
+            Post(text="Drainage overflow near the market", city="Ward 95 Jubilee Hills", created_at=now),
+            Post(text="drainage complaints pending", city="Jubilee Hills", created_at=now),
+            Post(text="metro parking", city="Banjara Hills", created_at=now),
+        ])
+        db.session.commit()
+
+        body = client.get("/api/v1/pulse/Jubilee Hills?days=7", headers=auth_headers).get_json()
+        keywords = body["metrics"]["top_keywords"]
+        assert keywords[0] == {"term": "drainage", "count": 2}
+        assert "metro" not in {k["term"] for k in keywords}
+
+        body = client.get("/api/v1/pulse/Hyderabad?days=7", headers=auth_headers).get_json()
+        assert body["briefing"] is None
@@ -0,0 +1,92 @@
+"""
+Tests for the canonical ward resolver and the indexed Post.ward_id key.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models import Post
+from app.utils.ward import backfill_post_ward_ids, canonical_ward_name, resolve_ward_id
+
+
+@pytest.mark.unit
+class TestResolveWardId:
+    @pytest.mark.parametrize("label", [
+        "Jubilee Hills", "jubilee  hills", "Ward 95 Jubilee Hills", "95 - Jubilee Hills",
+        "Ward No. 95", "95", "Jubile Hills", "Ward 135 Jubilee Hills", "WARD_095",
+    ])
+    def test_labels_and_aliases_resolve_to_one_id(self, label):
+        assert resolve_ward_id(label) == "95"
+
+    def test_known_spelling_variants(self):
+        assert resolve_ward_id("Himayatnagar") == resolve_ward_id("Himayath Nagar") == "79"
+        assert resolve_ward_id("Ramnathpur") == "9"
+        assert resolve_ward_id("KPHB") == "114"
+
+    @pytest.mark.parametrize("label", ["All", "", None, "Hyderabad", "Ward 999", "Test Ward"])
+    def test_non_wards_do_not_resolve(self, label):
+        assert resolve_ward_id(label) is None
+
+    def test_canonical_name(self):
+        assert canonical_ward_name("95") == "Jubilee Hills"
+        assert canonical_ward_name(None) is None
+
+
+@pytest.mark.unit
+class TestPostWardKey:
+    def test_ward_id_follows_city(self):
+        post = Post(text="t", city="Ward 93 Banjara Hills")
+        assert post.ward_id == "93"
+        post.city = "Hyderabad"
+        assert post.ward_id is None
+
+    def test_ward_filter_is_an_equality_on_ward_id(self):
+        clause = Post.ward_filter("Ward 95 Jubilee Hills")
+        assert str(clause.compile(compile_kwargs={"literal_binds": True})) == "post.ward_id = '95'"
+        assert Post.ward_filter("All") is None
+        assert str(Post.ward_filter("Hyderabad").left) == "lower(post.city)"
+
+    def test_non_ward_labels_match_city_case_insensitively(self, db_session):
+        db_session.session.add_all([Post(text="a", city="Hyderabad"), Post(text="b", city="HYDERABAD"),
+                                    Post(text="c", city="Secunderabad")])
+        db_session.session.commit()
+        assert Post.query.filter(Post.ward_filter(" hyderabad ")).count() == 2
+
+    def test_backfill_in_batches(self, db_session):
+        now = datetime.now(timezone.utc)
+        db_session.session.add_all([
+            Post(text=f"p{i}", city=city, created_at=now)
+            for i, city in enumerate(["Jubilee Hills", "Ward 79 Himayath Nagar", "Hyderabad", None] * 5)
+        ])
+        db_session.session.commit()
+        db_session.session.execute(text("UPDATE post SET ward_id = NULL"))
+        db_session.session.commit()
+
+        stats = backfill_post_ward_ids(db_session.session.connection(), batch_size=3)
+        db_session.session.commit()
+
+        assert stats["resolved_cities"] == 2
+        assert stats["updated"] == 10
+        assert stats["batches"] == 7
+        assert Post.query.filter_by(ward_id="95").count() == 5
+        assert Post.query.filter_by(ward_id="79").count() == 5
+
+
+@pytest.mark.unit
+class TestWardFilteredApis:
+    def test_ward_apis_accept_any_label(self, client, auth_headers):
+        now = datetime.now(timezone.utc)
+        db.session.add_all([
+            Post(text="roads", city="Jubilee Hills", created_at=now),
+            Post(text="water", city="Ward 95 Jubilee Hills", created_at=now),
+            Post(text="noise", city="Banjara Hills", created_at=now),
+        ])
+        db.session.commit()
+
+        for label in ("Jubilee Hills", "Ward 95 Jubilee Hills", "95"):
+            trends = client.get(f"/api/v1/trends?ward={label}&days=7", headers=auth_headers).get_json()
+            assert sum(day["mentions_total"] for day in trends["series"]) == 2
+            posts = client.get(f"/api/v1/posts?city={label}", headers=auth_headers).get_json()
+            assert sorted(p["text"] for p in posts["items"]) == ["roads", "water"]
@@ -0,0 +1,63 @@
+"""
+Tests for the ward snapshot service (app/ward_snapshot.py) and the
+/ward/meta endpoints built on it.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import WardDemographics, WardFeatures, WardProfile
+from app.tasks_summary import fetch_ward_meta
+from app.ward_snapshot import clear_ward_snapshot_cache, load_ward_snapshots, ward_snapshot
+from tests.conftest import assert_max_queries
+
+
+@pytest.fixture
+def wards(db_session):
+    clear_ward_snapshot_cache()
+    db.session.add_all([
+        WardProfile(ward_id="95", electors=300000, turnout_pct=47.5, last_winner_party="BRS",
+                    updated_at=datetime(2024, 6, 1)),
+        WardFeatures(ward_id="95", ls24_party_shares={"BJP": 0.45}, updated_at=datetime(2024, 6, 5, 12, 30)),
+        WardDemographics(ward_id="93", literacy_idx=0.8, updated_at=datetime(2024, 1, 1)),
+    ])
+    db.session.commit()
+
+
+@pytest.mark.unit
+class TestWardSnapshot:
+    def test_one_query_for_many_wards(self, wards):
+        with assert_max_queries(1):
+            snapshots = load_ward_snapshots(["95", "93", "404"])
+        assert set(snapshots) == {"95", "93"}
+
+        jubilee = snapshots["95"]
+        assert jubilee["profile"]["electors"] == 300000 and jubilee["demographics"] is None
+        assert jubilee["features"]["ls24_party_shares"] == {"BJP": 0.45}
+        assert jubilee["updated_at"] == "2024-06-05T12:30:00Z"
+        assert snapshots["93"]["profile"] is None and snapshots["93"]["demographics"]["literacy_idx"] == 0.8
+
+    def test_cached_until_a_table_changes(self, wards):
+        assert ward_snapshot("95")["profile"]["turnout_pct"] == 47.5
+        with assert_max_queries(1):
+            assert ward_snapshot("95")["profile"]["turnout_pct"] == 47.5
+
+        WardProfile.query.filter_by(ward_id="95").one().turnout_pct = 50.0
+        db.session.commit()
+        assert ward_snapshot("95")["profile"]["turnout_pct"] == 50.0
+
+    def test_endpoints(self, client, wards):
+        single = client.get("/api/v1/ward/meta/95")
+        assert single.status_code == 200 and single.get_json()["ward"] == "95"
+        assert client.get("/api/v1/ward/meta/404").status_code == 404
+
+        bulk = client.get("/api/v1/ward/meta?ids=95,404,93").get_json()
+        assert list(bulk["wards"]) == ["95", "93"] and bulk["missing"] == ["404"]
+        assert bulk["wards"]["95"] == single.get_json()
+        assert client.get("/api/v1/ward/meta?ids=").status_code == 400
+
+    def test_summary_reads_snapshot_in_process(self, wards):
+        assert fetch_ward_meta("Jubilee Hills")["profile"]["last_winner_party"] == "BRS"
+        assert fetch_ward_meta("93")["demographics"]["literacy_idx"] == 0.8
+        assert fetch_ward_meta("Nowhere") == {}
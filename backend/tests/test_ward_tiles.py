@@ -0,0 +1,80 @@
+"""
+Tests for simplified ward boundary topologies (app/ward_tiles.py).
+"""
+import gzip
+import json
+import os
+
+import pytest
+
+from app.utils.ward import GEOJSON_PATH
+from app.ward_tiles import Topology, build_ward_topologies, snap_zoom
+
+
+def _square(label, x0, y0, size=0.01):
+    ring = [[x0, y0], [x0 + size, y0], [x0 + size, y0 + size], [x0, y0 + size], [x0, y0]]
+    return {"properties": {"name": label}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+def _decode_rings(topojson):
+    """{ward id: exterior ring points} from a TopoJSON topology."""
+    (sx, sy), (tx, ty) = topojson["transform"]["scale"], topojson["transform"]["translate"]
+    arcs = []
+    for arc in topojson["arcs"]:
+        x = y = 0
+        points = []
+        for dx, dy in arc:
+            x, y = x + dx, y + dy
+            points.append((round(x * sx + tx, 6), round(y * sy + ty, 6)))
+        arcs.append(points)
+    rings = {}
+    for geometry in topojson["objects"]["wards"]["geometries"]:
+        exterior = geometry["arcs"][0] if geometry["type"] == "Polygon" else geometry["arcs"][0][0]
+        ring = []
+        for ref in exterior:
+            points = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+            ring += points if not ring else points[1:]
+        rings[geometry["id"]] = ring
+    return rings
+
+
+@pytest.mark.unit
+class TestTopology:
+    def test_shared_border_is_one_arc(self):
+        topology = Topology.from_features([_square("Ward 95 Jubilee Hills", 78.40, 17.40),
+                                           _square("Ward 93 Banjara Hills", 78.40 + 0.01, 17.40)])
+        jubilee, banjara = (topology.geometries[w]["polygons"][0][0] for w in ("95", "93"))
+        shared = {r if r >= 0 else ~r for r in jubilee} & {r if r >= 0 else ~r for r in banjara}
+        assert len(shared) == 1
+        assert topology.geometries["95"]["properties"]["name"] == "Jubilee Hills"
+
+        rings = _decode_rings(topology.encode(14))
+        assert rings["95"][0] == rings["95"][-1] and len(rings["95"]) == 5
+        assert len(set(rings["95"]) & set(rings["93"])) == 2  # both ends of the shared edge
+
+    def test_snap_zoom(self):
+        assert [snap_zoom(z) for z in (3, 10, 11, 14, 18)] == [10, 10, 12, 14, 14]
+
+
+@pytest.mark.unit
+class TestGhmcTopology:
+    def test_order_of_magnitude_smaller_keyed_by_ward_id(self):
+        topology = build_ward_topologies(zooms=[12])[12]
+        body = json.dumps(topology, separators=(",", ":")).encode()
+        assert len(body) * 10 < os.path.getsize(GEOJSON_PATH)
+
+        geometries = topology["objects"]["wards"]["geometries"]
+        assert len({g["id"] for g in geometries}) == len(geometries) > 140
+        assert all(g["id"].isdigit() for g in geometries)
+
+    def test_endpoint_serves_precompressed_with_etag(self, client, auth_headers):
+        first = client.get("/api/v1/geojson/topology?zoom=11", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert first.status_code == 200 and first.headers["Content-Encoding"] == "gzip"
+        body = json.loads(gzip.decompress(first.get_data()))
+        assert body["type"] == "Topology" and body["zoom"] == 12
+        assert not first.headers["ETag"].startswith("W/")
+
+        again = client.get("/api/v1/geojson/topology?zoom=12", headers={
+            **auth_headers, "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+        assert client.get("/api/v1/geojson/topology?zoom=x", headers=auth_headers).status_code == 400